@@ -0,0 +1,133 @@
+"""Shared measurement helpers for the benchmark suites.
+
+Every suite returns a list of result dicts with the same keys so that
+``run.py`` can write one JSON document and compare it against a baseline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import math
+import os
+import platform
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+SCHEMA = "onestep-bench/1"
+
+
+@dataclass
+class LatencyRecorder:
+    """Counts completions and keeps per-message latencies in seconds."""
+
+    expected: int
+    latencies: list[float] = field(default_factory=list)
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def record(self, latency_s: float) -> None:
+        self.latencies.append(latency_s)
+        if len(self.latencies) >= self.expected:
+            self.done.set()
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies)
+
+
+def percentile_ms(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+    return round(ordered[index] * 1000.0, 3)
+
+
+def current_rss_mb() -> float | None:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            pages = int(statm.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 2)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB elsewhere.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 2)
+
+
+def result(
+    *,
+    suite: str,
+    scenario: str,
+    params: dict[str, Any],
+    messages: int,
+    elapsed_s: float,
+    latencies: list[float],
+    latency: str,
+) -> dict[str, Any]:
+    """Build one result row. ``latency`` names what the percentiles measure."""
+    return {
+        "suite": suite,
+        "scenario": scenario,
+        "params": params,
+        "messages": messages,
+        "elapsed_s": round(elapsed_s, 4),
+        "msgs_per_s": round(messages / elapsed_s, 1) if elapsed_s > 0 else None,
+        "latency": latency,
+        "p50_ms": percentile_ms(latencies, 0.50),
+        "p99_ms": percentile_ms(latencies, 0.99),
+        "rss_mb": current_rss_mb(),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def environment() -> dict[str, Any]:
+    try:
+        from importlib.metadata import version
+
+        onestep_version = version("onestep")
+    except Exception:
+        onestep_version = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "onestep": onestep_version,
+    }
+
+
+async def settle() -> None:
+    """Collect garbage and let pending callbacks drain before a measurement."""
+    gc.collect()
+    await asyncio.sleep(0)
+
+
+def clock() -> float:
+    return time.perf_counter()
+
+
+def print_results(results: list[dict[str, Any]]) -> None:
+    for row in results:
+        print(
+            f"{row['suite']:>9} {row['scenario']:<28} {row['msgs_per_s'] or 0:>10.1f} msg/s "
+            f"p50={_fmt(row['p50_ms'])} p99={_fmt(row['p99_ms'])} rss={_fmt(row['rss_mb'], 'MB')}"
+            + "".join(f" {key[:-8]}/msg={row[key]}" for key in ("blocks_per_msg", "bytes_per_msg", "alloc_bytes_per_msg") if key in row)
+        )
+
+
+def _fmt(value: float | None, unit: str = "ms") -> str:
+    return "-" if value is None else f"{value:.2f}{unit}"
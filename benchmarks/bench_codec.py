@@ -0,0 +1,77 @@
+"""Envelope codec cost and size for a large payload.
+
+Each scenario encodes and decodes the same envelope (a 200-row body, about
+30 KB as JSON) ``messages`` times with one codec/compression pair, the way a
+broker sink and source would. ``bytes_per_msg`` is the encoded size on the
+wire. Pairs whose optional dependency is not installed are skipped. Latency
+is one encode plus one decode.
+
+Run with ``python benchmarks/bench_codec.py`` or via ``benchmarks/run.py``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from _harness import clock, print_results, result, settle
+
+from onestep.connectors.codec import decode_envelope, envelope_format
+from onestep.envelope import Envelope
+
+FORMATS: tuple[tuple[str, str | None], ...] = (
+    ("json", None),
+    ("orjson", None),
+    ("msgpack", None),
+    ("json", "zlib"),
+    ("orjson", "lz4"),
+    ("orjson", "zstd"),
+    ("msgpack", "zstd"),
+)
+ENVELOPE = Envelope(
+    body={
+        "rows": [
+            {"id": index, "sku": f"SKU-{index:06d}", "qty": index % 7, "price": 19.99, "tags": ["a", "b"]}
+            for index in range(200)
+        ]
+    },
+    meta={"trace_id": "trace-0001", "tenant": "acme"},
+)
+
+
+async def run(messages: int = 2_000) -> list[dict[str, Any]]:
+    results = []
+    for codec, compression in FORMATS:
+        try:
+            fmt = envelope_format(codec, compression)
+        except ModuleNotFoundError:
+            continue
+        size = len(fmt.encode(ENVELOPE))
+        latencies: list[float] = []
+        await settle()
+        started = clock()
+        for _ in range(messages):
+            call_started = clock()
+            decode_envelope(fmt.encode(ENVELOPE))
+            latencies.append(clock() - call_started)
+        elapsed = clock() - started
+        row = result(
+            suite="codec",
+            scenario=fmt.tag,
+            params={"codec": codec, "compression": compression},
+            messages=messages,
+            elapsed_s=elapsed,
+            latencies=latencies,
+            latency="encode_decode",
+        )
+        row["bytes_per_msg"] = size
+        results.append(row)
+    return results
+
+
+def main() -> None:
+    print_results(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    main()
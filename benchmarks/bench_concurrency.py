@@ -0,0 +1,79 @@
+"""Fixed versus adaptive task concurrency against a saturated backend.
+
+The handler calls a simulated backend that serves 8 requests at a time, 1 ms
+each; extra requests queue inside it. More concurrency than the backend can
+serve adds no throughput, only queueing latency. ``fixed`` rows use a static
+``concurrency``; ``aimd`` and ``gradient`` rows use ``AdaptiveConcurrency``
+capped at 64 (``aimd`` with a 5 ms latency threshold). Latency is the
+handler's backend call including its queueing; ``limit`` in the params is the
+runner's concurrency limit at the end of the run.
+
+Run with ``python benchmarks/bench_concurrency.py`` or via ``benchmarks/run.py``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from _harness import LatencyRecorder, clock, print_results, result, settle
+
+from onestep import AdaptiveConcurrency, MemoryQueue, OneStepApp
+
+BACKEND_SLOTS = 8
+BACKEND_LATENCY_S = 0.001
+SCENARIOS: tuple[tuple[str, Any], ...] = (
+    ("fixed=8", 8),
+    ("fixed=64", 64),
+    ("aimd<=64", AdaptiveConcurrency(64, latency_threshold_s=0.005)),
+    ("gradient<=64", AdaptiveConcurrency(64, algorithm="gradient")),
+)
+
+
+async def run_scenario(scenario: str, concurrency: Any, *, messages: int) -> dict[str, Any]:
+    recorder = LatencyRecorder(expected=messages)
+    backend = asyncio.Semaphore(BACKEND_SLOTS)
+    source = MemoryQueue("bench.incoming")
+    app = OneStepApp(f"bench-concurrency-{scenario}", shutdown_timeout_s=None)
+    final_limit = [0]
+
+    @app.task(source=source, concurrency=concurrency)
+    async def call_backend(ctx, payload):
+        started = clock()
+        async with backend:
+            await asyncio.sleep(BACKEND_LATENCY_S)
+        recorder.record(clock() - started)
+        if recorder.count == messages:
+            final_limit[0] = app.task_control_snapshot("call_backend")["concurrency_limit"]
+            ctx.app.request_shutdown()
+
+    for seq in range(messages):
+        await source.publish(seq)
+    await settle()
+    started = clock()
+    await app.serve()
+    elapsed = clock() - started
+    return result(
+        suite="concurrency",
+        scenario=scenario,
+        params={"limit": final_limit[0]},
+        messages=messages,
+        elapsed_s=elapsed,
+        latencies=recorder.latencies,
+        latency="backend_call",
+    )
+
+
+async def run(messages: int = 5_000) -> list[dict[str, Any]]:
+    return [
+        await run_scenario(name, concurrency, messages=messages)
+        for name, concurrency in SCENARIOS
+    ]
+
+
+def main() -> None:
+    print_results(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    main()
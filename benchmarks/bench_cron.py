@@ -0,0 +1,93 @@
+"""``CronSchedule.next_after`` cost: field-wise search versus a minute walk.
+
+Each scenario chains ``next_after`` calls from a fixed start time. The
+``minute_walk`` rows run the previous implementation (advance one minute and
+call ``matches()`` until it succeeds, giving up after two years) as a
+reference. They are capped to a few calls for sparse expressions, so compare
+``msgs_per_s`` (calls per second) rather than totals; the leap-day walk gets
+one call because its second fire is more than two years out. The
+``cold_sources`` row builds a fresh schedule per call, which is what a
+process with hundreds of ``CronSource`` objects pays on startup.
+Latency is the time of one ``next_after`` call.
+
+Run with ``python benchmarks/bench_cron.py`` or via ``benchmarks/run.py``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from _harness import clock, print_results, result, settle
+
+from onestep.connectors.schedule import CronSchedule
+
+EXPRESSIONS: tuple[tuple[str, str, int, int], ...] = (
+    # (label, expression, field-wise call cap, minute-walk call cap); the
+    # leap-day chain would otherwise run past datetime.max.
+    ("every_5m", "*/5 * * * *", 1_000_000, 2_000),
+    ("weekdays_9am", "0 9 * * 1-5", 1_000_000, 200),
+    ("leap_day", "0 0 29 2 *", 1_000, 1),
+)
+START = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def _minute_walk(schedule: CronSchedule, current: datetime) -> datetime:
+    candidate = current.astimezone(schedule.timezone).replace(second=0, microsecond=0) + timedelta(minutes=1)
+    for _ in range(366 * 24 * 60 * 2):
+        if schedule.matches(candidate):
+            return candidate
+        candidate += timedelta(minutes=1)
+    raise RuntimeError(f"no fire time for {schedule.expression!r}")
+
+
+def _chain(next_after: Any, calls: int) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+    current = START
+    started = clock()
+    for _ in range(calls):
+        call_started = clock()
+        current = next_after(current)
+        latencies.append(clock() - call_started)
+    return clock() - started, latencies
+
+
+def _row(scenario: str, expression: str, calls: int, elapsed: float, latencies: list[float]) -> dict[str, Any]:
+    return result(
+        suite="cron",
+        scenario=scenario,
+        params={"expression": expression},
+        messages=calls,
+        elapsed_s=elapsed,
+        latencies=latencies,
+        latency="next_after",
+    )
+
+
+async def run(messages: int = 2_000) -> list[dict[str, Any]]:
+    results = []
+    for label, expression, fieldwise_cap, walk_cap in EXPRESSIONS:
+        schedule = CronSchedule(expression, timezone="UTC")
+        calls = min(messages, fieldwise_cap)
+        await settle()
+        elapsed, latencies = _chain(schedule.next_after, calls)
+        results.append(_row(f"fieldwise:{label}", expression, calls, elapsed, latencies))
+
+        calls = min(messages, walk_cap)
+        await settle()
+        elapsed, latencies = _chain(lambda current: _minute_walk(schedule, current), calls)
+        results.append(_row(f"minute_walk:{label}", expression, calls, elapsed, latencies))
+
+    await settle()
+    elapsed, latencies = _chain(lambda current: CronSchedule("0 9 * * 1-5", timezone="UTC").next_after(START), messages)
+    results.append(_row("cold_sources", "0 9 * * 1-5", messages, elapsed, latencies))
+    return results
+
+
+def main() -> None:
+    print_results(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    main()
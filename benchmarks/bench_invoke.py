@@ -0,0 +1,115 @@
+"""Per-delivery callback dispatch overhead: uncached signatures vs. the arity cache.
+
+Models one delivery with three task hooks, one route predicate and two event
+handlers (STARTED + SUCCEEDED events), i.e. the callbacks DeliveryExecutor and
+OneStepApp.emit_event invoke for a typical task. The ``uncached`` row runs the
+previous implementation (``inspect.signature`` on every call) as a reference;
+``messages`` counts simulated deliveries. Latency is the dispatch time of one
+delivery's callbacks.
+
+Run with ``python benchmarks/bench_invoke.py`` or via ``benchmarks/run.py``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from typing import Any
+
+from _harness import clock, print_results, result, settle
+
+from onestep.invoke import invoke_callback
+
+
+def _uncached_invoke(callback, *args: Any) -> Any:
+    # The pre-cache implementation: inspect.signature on every call.
+    try:
+        signature = inspect.signature(callback)
+    except (TypeError, ValueError):
+        return callback(*args)
+    positional = [
+        parameter
+        for parameter in signature.parameters.values()
+        if parameter.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+    ]
+    if any(parameter.kind is inspect.Parameter.VAR_POSITIONAL for parameter in signature.parameters.values()):
+        return callback(*args)
+    if not positional:
+        return callback()
+    return callback(*args[: len(positional)])
+
+
+def before(ctx, payload):
+    return None
+
+
+def after_success(ctx, payload, result):
+    return None
+
+
+def audit(ctx):
+    return None
+
+
+def is_priority(ctx, payload, result):
+    return True
+
+
+class Metrics:
+    def __call__(self, event):
+        return None
+
+
+class Logger:
+    def handle(self, event):
+        return None
+
+
+METRICS = Metrics()
+LOGGER = Logger()
+EVENT = object()
+
+
+def _delivery(invoke) -> None:
+    invoke(before, None, {}, None)
+    invoke(audit, None, {}, None)
+    invoke(is_priority, None, {}, None)
+    invoke(after_success, None, {}, None)
+    for _ in range(2):
+        invoke(METRICS, EVENT)
+        invoke(LOGGER.handle, EVENT)
+
+
+async def run(messages: int = 20_000) -> list[dict[str, Any]]:
+    results = []
+    for label, invoke in (("uncached", _uncached_invoke), ("cached", invoke_callback)):
+        # Warm up so the cached row measures lookups, not the first resolve.
+        _delivery(invoke)
+        latencies: list[float] = []
+        await settle()
+        started = clock()
+        for _ in range(messages):
+            call_started = clock()
+            _delivery(invoke)
+            latencies.append(clock() - call_started)
+        elapsed = clock() - started
+        results.append(
+            result(
+                suite="invoke",
+                scenario=label,
+                params={"callbacks_per_delivery": 8},
+                messages=messages,
+                elapsed_s=elapsed,
+                latencies=latencies,
+                latency="delivery_dispatch",
+            )
+        )
+    return results
+
+
+def main() -> None:
+    print_results(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Memory held per inflight delivery.
+
+Builds ``messages`` inflight deliveries the way a runner holds them while a
+handler runs: a ``MemoryDelivery`` with its ``Envelope``, the ``TaskContext``
+handed to the handler, the ``ExecutionOutcome`` being filled in and the
+STARTED ``TaskEvent``. Everything is kept alive and measured with
+``tracemalloc``. Bodies share one object and meta is an empty dict, so the
+figure is the runtime's own overhead per delivery (``bytes_per_msg``,
+``blocks_per_msg``), not the payload. ``msgs_per_s`` is how fast those objects
+are built; latency is not measured.
+
+Run with ``python benchmarks/bench_memory.py`` or via ``benchmarks/run.py``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import tracemalloc
+from asyncio import Queue
+from typing import Any
+
+from _harness import clock, print_results, result, settle
+
+from onestep import MemoryQueue, OneStepApp, TaskContext, TaskEvent, TaskEventKind
+from onestep.connectors.memory import MemoryDelivery
+from onestep.context import TaskScope
+from onestep.envelope import Envelope
+from onestep.runtime.executor import ExecutionOutcome
+
+BODY = {"id": 1, "kind": "order.created"}
+
+
+def _build(app: OneStepApp, scope: TaskScope, queue: Queue, count: int) -> list[Any]:
+    task = app.tasks[0]
+    inflight = []
+    for _ in range(count):
+        envelope = Envelope(body=BODY, meta={})
+        delivery = MemoryDelivery(queue, envelope)
+        ctx = TaskContext(app=app, task=task, delivery=delivery, scope=scope)
+        event = TaskEvent(
+            kind=TaskEventKind.STARTED,
+            app=app.name,
+            task=task.name,
+            source="incoming",
+            attempts=0,
+            meta=envelope.snapshot_meta(),
+        )
+        inflight.append((delivery, ctx, ExecutionOutcome(completion="running"), event))
+    return inflight
+
+
+async def run(messages: int = 100_000) -> list[dict[str, Any]]:
+    app = OneStepApp("bench-memory")
+
+    @app.task(source=MemoryQueue("incoming"))
+    async def handle(ctx, payload):
+        return None
+
+    scope = TaskScope(app, app.tasks[0])
+    queue: Queue = Queue()
+    await settle()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        started = clock()
+        inflight = _build(app, scope, queue, messages)
+        elapsed = clock() - started
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    row = result(
+        suite="memory",
+        scenario="inflight_delivery",
+        params={},
+        messages=len(inflight),
+        elapsed_s=elapsed,
+        latencies=[],
+        latency="none",
+    )
+    row["blocks_per_msg"] = round(sum(stat.count_diff for stat in stats) / messages, 1)
+    row["bytes_per_msg"] = round(sum(stat.size_diff for stat in stats) / messages)
+    return [row]
+
+
+def main() -> None:
+    print_results(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    main()
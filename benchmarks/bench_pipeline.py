@@ -0,0 +1,153 @@
+"""End-to-end ``MemoryQueue`` -> task -> ``MemoryQueue`` throughput and latency.
+
+A closed-loop producer keeps a fixed window of messages outstanding and
+stamps each one at publish time; the emit sink records the publish-to-emit
+latency. Scenarios vary task ``concurrency``, the number of before /
+after-success hooks, the number of predicate emit routes, and the number of
+app event handlers, each against the same baseline task. ``event_bus`` rows
+dispatch the handlers through ``app.enable_event_bus()`` instead of inline;
+``slow_event`` rows add one handler that sleeps 1 ms per event.
+
+Run with ``python benchmarks/bench_pipeline.py`` or via ``benchmarks/run.py``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from _harness import LatencyRecorder, clock, print_results, result, settle
+
+from onestep import MemoryQueue, OneStepApp
+from onestep.envelope import Envelope
+from onestep.task import EmitRoute, TaskHooks
+
+SCENARIOS: tuple[tuple[str, dict[str, int]], ...] = (
+    ("baseline", {}),
+    ("concurrency=8", {"concurrency": 8}),
+    ("concurrency=64", {"concurrency": 64}),
+    ("hooks=4", {"hooks": 4}),
+    ("hooks=16", {"hooks": 16}),
+    ("routes=4", {"routes": 4}),
+    ("routes=16", {"routes": 16}),
+    ("event_handlers=4", {"event_handlers": 4}),
+    ("event_handlers=16", {"event_handlers": 16}),
+    ("event_bus,event_handlers=4", {"event_handlers": 4, "event_bus": 1}),
+    ("slow_event", {"slow_event": 1}),
+    ("event_bus,slow_event", {"slow_event": 1, "event_bus": 1}),
+)
+
+
+class TimedQueue(MemoryQueue):
+    """A ``MemoryQueue`` sink that reports publish-to-emit latency."""
+
+    def __init__(self, name: str, recorder: LatencyRecorder, window: asyncio.Semaphore) -> None:
+        super().__init__(name)
+        self._recorder = recorder
+        self._window = window
+
+    async def send(self, envelope: Envelope) -> None:
+        await super().send(envelope)
+        self._recorder.record(clock() - envelope.body["t"])
+        self._window.release()
+
+
+def _noop_hook(ctx, payload) -> None:
+    return None
+
+
+def _noop_event_handler(event) -> None:
+    return None
+
+
+async def _slow_event_handler(event) -> None:
+    await asyncio.sleep(0.001)
+
+
+def _route_predicate(index: int, routes: int):
+    def matches(ctx, payload, result) -> bool:
+        return result["seq"] % routes == index
+
+    return matches
+
+
+async def run_scenario(
+    scenario: str,
+    *,
+    messages: int,
+    concurrency: int = 1,
+    hooks: int = 0,
+    routes: int = 1,
+    event_handlers: int = 0,
+    event_bus: int = 0,
+    slow_event: int = 0,
+) -> dict[str, Any]:
+    recorder = LatencyRecorder(expected=messages)
+    window = asyncio.Semaphore(max(16, concurrency * 2))
+    source = MemoryQueue("bench.incoming")
+    sinks = [TimedQueue(f"bench.out.{index}", recorder, window) for index in range(routes)]
+    if routes == 1:
+        emit: Any = sinks[0]
+    else:
+        emit = [
+            EmitRoute(predicate=_route_predicate(index, routes), then_sinks=(sink,))
+            for index, sink in enumerate(sinks)
+        ]
+    app = OneStepApp(f"bench-pipeline-{scenario}", shutdown_timeout_s=None)
+    for _ in range(event_handlers):
+        app.on_event(_noop_event_handler)
+    if slow_event:
+        app.on_event(_slow_event_handler)
+    if event_bus:
+        app.enable_event_bus()
+
+    @app.task(
+        source=source,
+        emit=emit,
+        concurrency=concurrency,
+        hooks=TaskHooks(before=(_noop_hook,) * hooks, after_success=(_noop_hook,) * hooks),
+    )
+    async def passthrough(ctx, payload):
+        return payload
+
+    async def produce() -> None:
+        for seq in range(messages):
+            await window.acquire()
+            await source.publish({"seq": seq, "t": clock()})
+
+    await settle()
+    started = clock()
+    serving = asyncio.create_task(app.serve())
+    producing = asyncio.create_task(produce())
+    await recorder.done.wait()
+    elapsed = clock() - started
+    app.request_shutdown()
+    await asyncio.gather(serving, producing)
+    return result(
+        suite="pipeline",
+        scenario=scenario,
+        params={
+            "concurrency": concurrency,
+            "hooks": hooks,
+            "routes": routes,
+            "event_handlers": event_handlers,
+            "event_bus": bool(event_bus),
+            "slow_event": bool(slow_event),
+        },
+        messages=messages,
+        elapsed_s=elapsed,
+        latencies=recorder.latencies,
+        latency="publish_to_emit",
+    )
+
+
+async def run(messages: int = 20_000) -> list[dict[str, Any]]:
+    return [await run_scenario(name, messages=messages, **params) for name, params in SCENARIOS]
+
+
+def main() -> None:
+    print_results(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    main()
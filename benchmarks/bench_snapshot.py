@@ -0,0 +1,147 @@
+"""Event meta snapshots: shared frozen views versus a copy per event.
+
+Every delivery emits FETCHED, STARTED and SUCCEEDED events, each carrying a
+copy of the envelope meta. The ``frozen`` rows run the current code: one
+``Envelope.snapshot_meta`` per delivery, shared by its events, each wrapped
+in a copy-on-write ``ThawingDict``. The ``legacy`` rows patch in the previous
+code path as a baseline: every event got a plain dict from the old
+``events.snapshot_meta``, a shallow ``dict(meta)`` when every value is a
+scalar and ``copy.deepcopy(dict(meta))`` otherwise. ``flat`` meta holds a few
+scalar fields, ``nested`` adds a 16-entry header mapping and an 8-item tag
+list.
+
+Each scenario runs twice: once for throughput and latency, and once under
+``tracemalloc`` with an event handler that keeps every event, so nothing the
+deliveries allocate is freed and reused before the end of the run. The traced
+peak minus the traced memory at the start, divided by the message count, is
+reported as ``alloc_bytes_per_msg``; it covers the whole delivery path, so
+the difference between the two strategies is what the meta copies cost.
+Latency is the time between two consecutive handler calls.
+
+Run with ``python benchmarks/bench_snapshot.py`` or via ``benchmarks/run.py``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from _harness import LatencyRecorder, clock, print_results, result, settle
+
+from onestep import MemoryQueue, OneStepApp, TaskEvent
+from onestep.envelope import Envelope
+from onestep.runtime import executor, runner
+
+META_SHAPES: dict[str, dict[str, Any]] = {
+    "flat": {"trace_id": "trace-0001", "tenant": "acme", "priority": 3, "source_ts": 1_700_000_000.5},
+    "nested": {
+        "trace_id": "trace-0001",
+        "tenant": "acme",
+        "headers": {f"x-header-{index}": f"value-{index}" for index in range(16)},
+        "tags": [f"tag-{index}" for index in range(8)],
+    },
+}
+ALLOC_MESSAGES = 500
+_SCALAR_META_TYPES = frozenset({str, int, float, bool, type(None), bytes})
+
+
+def _legacy_snapshot_meta(meta: dict[str, Any]) -> dict[str, Any]:
+    # The removed ``onestep.events.snapshot_meta``, called once per event.
+    for value in meta.values():
+        if type(value) not in _SCALAR_META_TYPES:
+            return copy.deepcopy(dict(meta))
+    return dict(meta)
+
+
+def _plain_event_meta(meta: dict[str, Any]) -> dict[str, Any]:
+    return meta
+
+
+@contextmanager
+def _strategy(name: str) -> Iterator[None]:
+    if name == "frozen":
+        yield
+        return
+    # Events took the plain dict as-is, without a ThawingDict around it.
+    patches = [
+        (Envelope, "snapshot_meta", lambda self: _legacy_snapshot_meta(self.meta)),
+        (executor, "ThawingDict", _plain_event_meta),
+        (runner, "ThawingDict", _plain_event_meta),
+    ]
+    originals = [(target, attribute, getattr(target, attribute)) for target, attribute, _ in patches]
+    for target, attribute, replacement in patches:
+        setattr(target, attribute, replacement)
+    try:
+        yield
+    finally:
+        for target, attribute, original in originals:
+            setattr(target, attribute, original)
+
+
+async def _drive(meta: dict[str, Any], messages: int, on_event: Any) -> tuple[float, list[float]]:
+    source = MemoryQueue("incoming")
+    app = OneStepApp("bench-snapshot")
+    app.on_event(on_event)
+    recorder = LatencyRecorder(expected=messages)
+    last = [0.0]
+
+    @app.task(source=source)
+    async def handle(ctx, payload):
+        now = clock()
+        recorder.record(now - last[0])
+        last[0] = now
+        if recorder.count == messages:
+            ctx.app.request_shutdown()
+
+    for index in range(messages):
+        await source.send(Envelope(body=index, meta=copy.deepcopy(meta)))
+    await settle()
+    started = last[0] = clock()
+    await app.serve()
+    return clock() - started, recorder.latencies
+
+
+async def _measure_allocations(meta: dict[str, Any], messages: int) -> float:
+    events: list[TaskEvent] = []
+    await settle()
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        await _drive(meta, messages, events.append)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (peak - start) / messages
+
+
+async def run(messages: int = 5_000) -> list[dict[str, Any]]:
+    results = []
+    for shape, meta in META_SHAPES.items():
+        for strategy in ("frozen", "legacy"):
+            with _strategy(strategy):
+                await settle()
+                elapsed, latencies = await _drive(meta, messages, lambda event: None)
+                allocated = await _measure_allocations(meta, min(messages, ALLOC_MESSAGES))
+            row = result(
+                suite="snapshot",
+                scenario=f"{strategy}:{shape}",
+                params={"strategy": strategy, "meta": shape},
+                messages=messages,
+                elapsed_s=elapsed,
+                latencies=latencies,
+                latency="between_deliveries",
+            )
+            row["alloc_bytes_per_msg"] = round(allocated)
+            results.append(row)
+    return results
+
+
+def main() -> None:
+    print_results(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    main()
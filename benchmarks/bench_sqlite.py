@@ -0,0 +1,103 @@
+"""SQLite ``TableQueueSource`` -> task -> ``TableSink`` throughput.
+
+Rows are inserted up front into a temporary database; the task claims them
+through the table queue, writes one row per delivery through the table sink
+and acks. Latency is the per-delivery processing time (``STARTED`` to
+``SUCCEEDED``), since the claim time of a pre-filled row is not observable.
+
+Requires ``onestep-sql[sqlite]``. Run with ``python benchmarks/bench_sqlite.py``
+or via ``benchmarks/run.py``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from _harness import LatencyRecorder, clock, print_results, result, settle
+
+from onestep import OneStepApp, TaskEventKind
+
+SCENARIOS: tuple[tuple[str, dict[str, int]], ...] = (
+    ("batch_size=100", {"batch_size": 100, "concurrency": 1}),
+    ("batch_size=100,c=8", {"batch_size": 100, "concurrency": 8}),
+    ("batch_size=500,c=8", {"batch_size": 500, "concurrency": 8}),
+)
+
+
+async def run_scenario(
+    scenario: str,
+    *,
+    messages: int,
+    batch_size: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    import sqlalchemy as sa
+    from onestep_sql.sqlite import SQLiteConnector
+
+    with tempfile.TemporaryDirectory() as workdir:
+        connector = SQLiteConnector(f"sqlite:///{Path(workdir) / 'bench.db'}")
+        async with connector.engine.begin() as conn:
+            await conn.execute(sa.text("CREATE TABLE jobs (id INTEGER PRIMARY KEY, status TEXT, payload TEXT)"))
+            await conn.execute(sa.text("CREATE TABLE results (id INTEGER PRIMARY KEY, payload TEXT)"))
+            await conn.execute(
+                sa.text("INSERT INTO jobs (id, status, payload) VALUES (:id, 'new', :payload)"),
+                [{"id": index, "payload": f"job-{index}"} for index in range(messages)],
+            )
+
+        recorder = LatencyRecorder(expected=messages)
+        app = OneStepApp(f"bench-sqlite-{scenario}", shutdown_timeout_s=None)
+
+        @app.on_event
+        def record(event) -> None:
+            if event.kind is TaskEventKind.SUCCEEDED:
+                recorder.record(event.duration_s or 0.0)
+
+        @app.task(
+            source=connector.table_queue(
+                table="jobs",
+                key="id",
+                where="status = 'new'",
+                claim={"status": "claimed"},
+                ack={"status": "done"},
+                nack={"status": "new"},
+                batch_size=batch_size,
+                poll_interval_s=0.01,
+            ),
+            emit=connector.table_sink(table="results", mode="insert"),
+            concurrency=concurrency,
+        )
+        async def copy_row(ctx, row):
+            return {"id": row["id"], "payload": row["payload"]}
+
+        await settle()
+        started = clock()
+        serving = asyncio.create_task(app.serve())
+        await recorder.done.wait()
+        elapsed = clock() - started
+        app.request_shutdown()
+        await serving
+        await connector.close()
+    return result(
+        suite="sqlite",
+        scenario=scenario,
+        params={"batch_size": batch_size, "concurrency": concurrency},
+        messages=messages,
+        elapsed_s=elapsed,
+        latencies=recorder.latencies,
+        latency="processing",
+    )
+
+
+async def run(messages: int = 2_000) -> list[dict[str, Any]]:
+    return [await run_scenario(name, messages=messages, **params) for name, params in SCENARIOS]
+
+
+def main() -> None:
+    print_results(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    main()
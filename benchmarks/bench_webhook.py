@@ -0,0 +1,148 @@
+"""``WebhookSource`` HTTP ingest throughput and request latency.
+
+Client workers POST small JSON bodies to a local webhook route. The
+``clients=N`` rows open a fresh connection per request (``Connection:
+close``); ``keepalive`` rows reuse one persistent connection per client;
+``ndjson`` rows send ``batch`` newline-delimited events per request to a
+``parser="ndjson"`` route. Latency is the HTTP round trip up to the
+``202 Accepted`` response; throughput counts events until the task has
+handled all of them.
+
+Run with ``python benchmarks/bench_webhook.py`` or via ``benchmarks/run.py``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+from _harness import LatencyRecorder, clock, print_results, result, settle
+
+from onestep import OneStepApp, WebhookSource
+
+SCENARIOS: tuple[tuple[str, dict[str, Any]], ...] = (
+    ("clients=1", {"clients": 1}),
+    ("clients=16", {"clients": 16}),
+    ("clients=64", {"clients": 64}),
+    ("keepalive,clients=1", {"clients": 1, "mode": "keepalive"}),
+    ("keepalive,clients=16", {"clients": 16, "mode": "keepalive"}),
+    ("ndjson,batch=100,clients=4", {"clients": 4, "mode": "ndjson", "batch": 100}),
+)
+
+
+def _request(body: bytes, *, close: bool) -> bytes:
+    return (
+        b"POST /bench HTTP/1.1\r\n"
+        b"Host: 127.0.0.1\r\n"
+        b"Content-Type: application/json\r\n"
+        + (b"Connection: close\r\n" if close else b"")
+        + f"Content-Length: {len(body)}\r\n\r\n".encode("ascii")
+        + body
+    )
+
+
+async def _post(port: int, body: bytes) -> bytes:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(_request(body, close=True))
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return response
+
+
+async def _read_response(reader: asyncio.StreamReader) -> bytes:
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    return head + await reader.readexactly(length)
+
+
+async def run_scenario(
+    scenario: str,
+    *,
+    messages: int,
+    clients: int,
+    mode: str = "close",
+    batch: int = 1,
+) -> dict[str, Any]:
+    requests_total = -(-messages // batch)
+    messages = requests_total * batch
+    source = WebhookSource(
+        path="/bench",
+        host="127.0.0.1",
+        port=0,
+        parser="ndjson" if mode == "ndjson" else "auto",
+        queue_maxsize=max(1000, messages),
+    )
+    app = OneStepApp(f"bench-webhook-{scenario}", shutdown_timeout_s=None)
+    handled = LatencyRecorder(expected=messages)
+    requests = LatencyRecorder(expected=requests_total)
+
+    @app.task(source=source, concurrency=16)
+    async def ingest(ctx, event):
+        handled.record(0.0)
+
+    await settle()
+    serving = asyncio.create_task(app.serve())
+    while source.bound_port == 0:
+        await asyncio.sleep(0.001)
+    port = source.bound_port
+    event = json.dumps({"type": "bench", "value": 1}).encode("utf-8")
+    body = b"\n".join([event] * batch) if mode == "ndjson" else event
+    remaining = iter(range(requests_total))
+
+    async def client() -> None:
+        reader = writer = None
+        if mode != "close":
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            for _ in remaining:
+                sent = clock()
+                if writer is None:
+                    response = await _post(port, body)
+                else:
+                    writer.write(_request(body, close=False))
+                    await writer.drain()
+                    response = await _read_response(reader)
+                    if b"Connection: close" in response:
+                        # Hit max_keepalive_requests; reconnect.
+                        writer.close()
+                        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                if not response.startswith(b"HTTP/1.1 202"):
+                    raise RuntimeError(f"unexpected webhook response: {response[:64]!r}")
+                requests.record(clock() - sent)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    started = clock()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    await handled.done.wait()
+    elapsed = clock() - started
+    app.request_shutdown()
+    await serving
+    return result(
+        suite="webhook",
+        scenario=scenario,
+        params={"clients": clients, "mode": mode, "batch": batch},
+        messages=messages,
+        elapsed_s=elapsed,
+        latencies=requests.latencies,
+        latency="http_round_trip",
+    )
+
+
+async def run(messages: int = 5_000) -> list[dict[str, Any]]:
+    return [await run_scenario(name, messages=messages, **params) for name, params in SCENARIOS]
+
+
+def main() -> None:
+    print_results(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    main()
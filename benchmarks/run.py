@@ -0,0 +1,121 @@
+"""Run the benchmark suites and write machine-readable results.
+
+Examples::
+
+    python benchmarks/run.py --output bench-results.json
+    python benchmarks/run.py --suite pipeline --messages 2000
+    python benchmarks/run.py --compare baseline.json --tolerance 0.15
+
+The JSON document has the shape ``{"schema", "created_at", "environment",
+"results": [...]}``; each result row carries ``suite``, ``scenario``,
+``params``, ``messages``, ``elapsed_s``, ``msgs_per_s``, ``latency`` (what the
+percentiles measure), ``p50_ms``, ``p99_ms``, ``rss_mb`` and ``peak_rss_mb``;
+``memory`` rows add ``blocks_per_msg`` and ``bytes_per_msg``, ``snapshot``
+rows add ``alloc_bytes_per_msg`` and ``codec`` rows add ``bytes_per_msg``.
+With ``--compare`` the exit status is 1 when any scenario's throughput drops
+by more than ``--tolerance`` against the baseline file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from _harness import SCHEMA, environment, print_results  # noqa: E402
+
+SUITES = {
+    "codec": "bench_codec",
+    "concurrency": "bench_concurrency",
+    "cron": "bench_cron",
+    "invoke": "bench_invoke",
+    "memory": "bench_memory",
+    "pipeline": "bench_pipeline",
+    "snapshot": "bench_snapshot",
+    "sqlite": "bench_sqlite",
+    "webhook": "bench_webhook",
+}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run onestep runtime benchmarks")
+    parser.add_argument(
+        "--suite",
+        action="append",
+        choices=sorted(SUITES),
+        dest="suites",
+        help="Suite to run (repeatable; default: all)",
+    )
+    parser.add_argument("--messages", type=int, default=None, help="Messages per scenario (default: per suite)")
+    parser.add_argument("--output", type=Path, default=None, help="Write results JSON to this path")
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline results JSON to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="Allowed relative msgs/s drop against --compare (default: 0.10)",
+    )
+    return parser.parse_args(argv)
+
+
+async def run_suites(names: list[str], messages: int | None) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    for name in names:
+        try:
+            module = importlib.import_module(SUITES[name])
+            suite_results = await (module.run() if messages is None else module.run(messages))
+        except ImportError as exc:
+            print(f"skipping {name}: {exc}", file=sys.stderr)
+            continue
+        print_results(suite_results)
+        results.extend(suite_results)
+    return results
+
+
+def compare(results: list[dict[str, Any]], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    previous = {(row["suite"], row["scenario"]): row for row in baseline.get("results", [])}
+    regressions = []
+    for row in results:
+        before = previous.get((row["suite"], row["scenario"]))
+        if before is None or not before.get("msgs_per_s") or row["msgs_per_s"] is None:
+            continue
+        change = row["msgs_per_s"] / before["msgs_per_s"] - 1.0
+        if change < -tolerance:
+            regressions.append(
+                f"{row['suite']} {row['scenario']}: {before['msgs_per_s']:.1f} -> "
+                f"{row['msgs_per_s']:.1f} msg/s ({change:+.1%})"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    names = args.suites or list(SUITES)
+    results = asyncio.run(run_suites(names, args.messages))
+    document = {
+        "schema": SCHEMA,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(),
+        "results": results,
+    }
+    if args.output is not None:
+        args.output.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"regression: {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
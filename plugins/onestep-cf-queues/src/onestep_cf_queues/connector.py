@@ -4,6 +4,7 @@ import asyncio
 import base64
 import binascii
 import json
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -112,6 +113,10 @@ class CFQueuesDelivery(Delivery):
         await self._queue.flush_acks()
 
 
+def _lease_ids(deliveries: Sequence[Delivery]) -> list[str]:
+    return [delivery._lease_id for delivery in deliveries if isinstance(delivery, CFQueuesDelivery)]
+
+
 @dataclass
 class CFQueuesConnector:
     account_id: str
@@ -180,6 +185,9 @@ class CFQueue(Source, Sink):
     # Cloudflare pull is short-polling (returns immediately), so fetch is safe
     # to cancel: no message is claimed until the response is parsed.
     fetch_is_cancel_safe = True
+    supports_bulk_ack = True
+    # Retry delays are sent to Cloudflare as ``delay_seconds``.
+    native_retry_delay = True
 
     def __init__(
         self,
@@ -249,6 +257,11 @@ class CFQueue(Source, Sink):
                 await self._flush_locked()
         self.client = None
 
+    def lease_timeout_s(self) -> float | None:
+        if self.visibility_timeout_ms is None:
+            return None
+        return self.visibility_timeout_ms / 1000
+
     async def fetch(self, limit: int) -> list[Delivery]:
         try:
             await self.open()
@@ -300,22 +313,46 @@ class CFQueue(Source, Sink):
             },
         }
 
+    async def ack_many(self, deliveries: Sequence[Delivery]) -> None:
+        await self.stage_ack_many(_lease_ids(deliveries))
+
+    async def retry_many(
+        self,
+        deliveries: Sequence[Delivery],
+        *,
+        delay_s: float | None = None,
+    ) -> None:
+        delay = None if delay_s is None else max(0, int(delay_s))
+        await self.stage_retry_many(_lease_ids(deliveries), delay_seconds=delay)
+
     async def stage_ack(self, lease_id: str) -> None:
+        await self.stage_ack_many([lease_id])
+
+    async def stage_ack_many(self, lease_ids: Sequence[str]) -> None:
         await self.open()
         lock = self._ensure_runtime_state()
         async with lock:
-            self._pending_acks.append({"lease_id": lease_id})
+            self._pending_acks.extend({"lease_id": lease_id} for lease_id in lease_ids)
             if self._should_flush():
                 await self._flush_locked()
 
     async def stage_retry(self, lease_id: str, *, delay_seconds: int | None) -> None:
+        await self.stage_retry_many([lease_id], delay_seconds=delay_seconds)
+
+    async def stage_retry_many(
+        self,
+        lease_ids: Sequence[str],
+        *,
+        delay_seconds: int | None,
+    ) -> None:
         await self.open()
         lock = self._ensure_runtime_state()
         async with lock:
-            entry: dict[str, Any] = {"lease_id": lease_id}
-            if delay_seconds is not None:
-                entry["delay_seconds"] = min(delay_seconds, _MAX_DELAY_SECONDS)
-            self._pending_retries.append(entry)
+            for lease_id in lease_ids:
+                entry: dict[str, Any] = {"lease_id": lease_id}
+                if delay_seconds is not None:
+                    entry["delay_seconds"] = min(delay_seconds, _MAX_DELAY_SECONDS)
+                self._pending_retries.append(entry)
             if self._should_flush():
                 await self._flush_locked()
 
@@ -131,8 +131,16 @@ class ClickHouseTableSink(Sink):
         return columns, rows
 
     async def send(self, envelope: Envelope) -> None:
+        await self.send_many((envelope,))
+
+    async def send_many(self, envelopes: Sequence[Envelope]) -> None:
+        # Rows from every envelope that share a column layout go out in the
+        # same INSERT, so a BatchingSink turns N deliveries into one write.
+        groups: dict[tuple[str, ...], list[list[Any]]] = {}
         try:
-            columns, rows = self._normalize(envelope.body)
+            for envelope in envelopes:
+                columns, rows = self._normalize(envelope.body)
+                groups.setdefault(columns, []).extend(rows)
         except ClickHousePayloadError as exc:
             raise ConnectorOperationError(
                 backend="clickhouse",
@@ -144,15 +152,16 @@ class ClickHouseTableSink(Sink):
         committed = 0
         try:
             client = await self.connector._get_client()
-            for start in range(0, len(rows), self.batch_size):
-                chunk = rows[start : start + self.batch_size]
-                await client.insert(
-                    self.table,
-                    chunk,
-                    column_names=columns,
-                    settings=self.settings,
-                )
-                committed += 1
+            for columns, rows in groups.items():
+                for start in range(0, len(rows), self.batch_size):
+                    chunk = rows[start : start + self.batch_size]
+                    await client.insert(
+                        self.table,
+                        chunk,
+                        column_names=columns,
+                        settings=self.settings,
+                    )
+                    committed += 1
         except Exception as exc:
             from .resilience import (
                 classify_clickhouse_error,
@@ -113,6 +113,25 @@ async def test_send_awaits_each_chunk_in_order() -> None:
     assert [call["rows"] for call in client.calls] == [[[1], [2]], [[3]]]
 
 
+@pytest.mark.asyncio
+async def test_send_many_merges_envelopes_into_one_insert_per_layout() -> None:
+    client = FakeAsyncClient()
+    sink = ClickHouseConnector(
+        "http://clickhouse:8123/default", client=client
+    ).table_sink(table="events")
+    await sink.send_many(
+        [
+            Envelope(body={"id": 1, "kind": "a"}),
+            Envelope(body=[{"id": 2, "kind": "b"}, {"id": 3, "kind": "c"}]),
+            Envelope(body={"id": 4}),
+        ]
+    )
+    assert [(call["column_names"], call["rows"]) for call in client.calls] == [
+        (("id", "kind"), [[1, "a"], [2, "b"], [3, "c"]]),
+        (("id",), [[4]]),
+    ]
+
+
 @pytest.mark.asyncio
 async def test_invalid_send_is_permanent_before_first_network_call() -> None:
     client = FakeAsyncClient()
@@ -648,12 +648,17 @@ class ControlPlaneReporter:
     def _build_health_descriptor(self) -> dict[str, Any]:
         inflight_tasks = sum(bucket.inflight for bucket in self._metrics_by_task.values())
         status = "degraded" if self._degraded_since_last_heartbeat else "ok"
-        return {
+        health = {
             "status": status,
             "uptime_s": max(0, int((_utcnow() - self._started_at).total_seconds())),
             "inflight_tasks": inflight_tasks,
             "task_controls": self._build_task_control_states(),
         }
+        if self._instrumentation_supported():
+            loop_lag = self._app.instrumentation.rotate_loop_lag()
+            if loop_lag is not None:
+                health["loop_lag"] = loop_lag
+        return health
 
     def _identity_name(self) -> str:
         return self._service_name or self.config.service_name or "onestep"
@@ -994,9 +999,12 @@ class ControlPlaneReporter:
     def _rotate_metrics_window(self, ended_at: datetime) -> None:
         tasks: list[dict[str, Any]] = []
         include_custom_metrics = self._custom_metrics_supported()
+        include_instrumentation = self._instrumentation_supported()
         task_names = set(self._metrics_by_task)
         if include_custom_metrics and self._app is not None:
             task_names.update(self._app.custom_metrics.task_names())
+        if include_instrumentation and self._app is not None:
+            task_names.update(self._app.instrumentation.task_names())
         for task_name in sorted(task_names):
             bucket = self._metrics_by_task.setdefault(task_name, _TaskMetricsState())
             custom_metrics = (
@@ -1004,7 +1012,12 @@ class ControlPlaneReporter:
                 if include_custom_metrics and self._app is not None
                 else []
             )
-            if not bucket.has_activity() and not custom_metrics:
+            instrumentation = (
+                self._app.instrumentation.rotate_task(task_name)
+                if include_instrumentation and self._app is not None
+                else {}
+            )
+            if not bucket.has_activity() and not custom_metrics and not instrumentation:
                 continue
             snapshot = bucket.rotate()
             duration_values = snapshot.durations_ms
@@ -1030,6 +1043,8 @@ class ControlPlaneReporter:
             }
             if custom_metrics:
                 task_payload["custom_metrics"] = custom_metrics
+            if instrumentation:
+                task_payload["instrumentation"] = instrumentation
             tasks.append(task_payload)
         if tasks:
             self._pending_metric_batches.append(
@@ -1048,6 +1063,14 @@ class ControlPlaneReporter:
             return bool(supports_custom_metrics())
         return True
 
+    def _instrumentation_supported(self) -> bool:
+        if self._app is None or not self._app.instrumentation.enabled:
+            return False
+        supports_instrumentation = getattr(self._sender, "supports_instrumentation", None)
+        if callable(supports_instrumentation):
+            return bool(supports_instrumentation())
+        return True
+
     async def _flush_metric_batches(
         self,
         *,
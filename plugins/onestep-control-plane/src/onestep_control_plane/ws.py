@@ -25,6 +25,7 @@ DEFAULT_AGENT_CAPABILITIES = [
     "telemetry.heartbeat",
     "telemetry.metrics",
     "telemetry.custom_metrics",
+    "telemetry.instrumentation",
     "telemetry.events",
     "command.ping",
     "command.shutdown",
@@ -678,6 +679,13 @@ class ControlPlaneWsSender:
         accepted_capabilities = getattr(hello_ack, "accepted_capabilities", [])
         return "telemetry.custom_metrics" in accepted_capabilities
 
+    def supports_instrumentation(self) -> bool:
+        hello_ack = getattr(self._transport, "hello_ack", None)
+        if hello_ack is None:
+            return False
+        accepted_capabilities = getattr(hello_ack, "accepted_capabilities", [])
+        return "telemetry.instrumentation" in accepted_capabilities
+
     async def start(self) -> None:
         task = self._worker_task
         if task is not None and not task.done():
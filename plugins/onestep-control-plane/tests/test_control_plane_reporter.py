@@ -326,6 +326,7 @@ def test_reporter_heartbeat_includes_task_control_states() -> None:
             "parked_runner_count": 0,
             "fetching_runner_count": 0,
             "inflight_task_count": 0,
+            "concurrency_limit": 1,
         }
     ]
 
@@ -566,6 +567,35 @@ def test_reporter_omits_custom_metrics_when_sender_does_not_support_them() -> No
     assert "custom_metrics" not in metrics_payload["tasks"][0]
 
 
+def test_reporter_includes_instrumentation_windows_when_enabled() -> None:
+    recorder = SenderRecorder()
+    app = OneStepApp("billing-sync")
+    app.enable_instrumentation(loop_lag_interval_s=3600.0)
+    reporter = ControlPlaneReporter(_make_config(), sender=recorder)
+    reporter.attach(app)
+
+    async def scenario() -> None:
+        await app.startup()
+        app.instrumentation.record_stage("sync_users", "handler", 0.004)
+        app.instrumentation.record_stage("sync_users", "ack", 0.0002)
+        app.instrumentation.record_loop_lag(0.03)
+        reporter._rotate_metrics_window(datetime(2026, 3, 8, 17, 31, 0, tzinfo=timezone.utc))
+        reporter._rotate_metrics_window(datetime(2026, 3, 8, 17, 32, 0, tzinfo=timezone.utc))
+        await reporter._flush_metric_batches()
+        await reporter._send_heartbeat()
+        await app.shutdown()
+
+    asyncio.run(scenario())
+
+    metrics_payloads = [payload for channel, payload in recorder.calls if channel == "metrics"]
+    assert len(metrics_payloads) == 1
+    instrumentation = metrics_payloads[0]["tasks"][0]["instrumentation"]
+    assert sorted(instrumentation["stages"]) == ["ack", "handler"]
+    assert instrumentation["stages"]["handler"]["p95_ms"] == 4.0
+    heartbeat = [payload for channel, payload in recorder.calls if channel == "heartbeat"][-1]
+    assert heartbeat["health"]["loop_lag"]["max_ms"] == 30.0
+
+
 def test_reporter_drops_oldest_events_when_pending_buffer_overflows() -> None:
     recorder = SenderRecorder()
     config = _make_config()
@@ -514,6 +514,26 @@ class ElasticsearchBulkSink(Sink):
             await asyncio.sleep((0.05 * (2**attempt)) + random.uniform(0.0, 0.025))
         raise AssertionError("bulk retry loop exhausted without returning or raising")
 
+    async def send_many(self, envelopes: Sequence[Envelope]) -> None:
+        # Documents from every envelope share the same _bulk requests, so a
+        # BatchingSink turns N deliveries into as few requests as chunking allows.
+        try:
+            documents = [
+                document
+                for envelope in envelopes
+                for document in _logical_document_views(envelope.body)
+            ]
+        except (TypeError, ValueError) as exc:
+            raise ConnectorOperationError(
+                backend="elasticsearch",
+                operation=ConnectorOperation.SEND,
+                kind=ConnectorErrorKind.PERMANENT,
+                source_name=self.name,
+                cause=exc,
+            ) from None
+        if documents:
+            await self.send(Envelope(body=documents))
+
     async def send(self, envelope: Envelope) -> None:
         try:
             documents = _logical_document_views(envelope.body)
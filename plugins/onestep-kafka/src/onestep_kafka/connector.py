@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+from bisect import bisect_right
 from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
 from typing import Any
@@ -9,25 +11,107 @@ from onestep.envelope import Envelope
 from onestep.resilience import ConnectorOperation, ConnectorOperationError
 
 from onestep.connectors.base import Delivery, Sink, Source
-from onestep.connectors.codec import decode_envelope, encode_envelope
+from onestep.connectors.codec import DEFAULT_CODEC, decode_envelope, encode_envelope, envelope_format
 
 from .resilience import as_kafka_connector_operation_error, collect_sensitive_tokens
 
 try:  # pragma: no cover - optional dependency
     from aiokafka import AIOKafkaConsumer, AIOKafkaProducer
+    from aiokafka.abc import ConsumerRebalanceListener
     from aiokafka.structs import TopicPartition
 except ImportError:  # pragma: no cover - optional dependency
     AIOKafkaConsumer = None
     AIOKafkaProducer = None
+    ConsumerRebalanceListener = object
     TopicPartition = None
 
+logger = logging.getLogger(__name__)
+
+
+class _OffsetRanges:
+    """Sorted, disjoint half-open offset intervals ``[start, end)``.
+
+    Contiguous offsets collapse into one interval, so a partition with a
+    single slow message and a long completed tail costs two integers instead
+    of one set entry per offset. Membership, insertion and removal locate
+    the interval with ``bisect``.
+    """
+
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self) -> None:
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __contains__(self, offset: int) -> bool:
+        index = bisect_right(self._starts, offset) - 1
+        return index >= 0 and offset < self._ends[index]
+
+    def add(self, offset: int) -> None:
+        starts, ends = self._starts, self._ends
+        index = bisect_right(starts, offset) - 1
+        if index >= 0 and offset < ends[index]:
+            return
+        joins_left = index >= 0 and ends[index] == offset
+        joins_right = index + 1 < len(starts) and starts[index + 1] == offset + 1
+        if joins_left and joins_right:
+            ends[index] = ends[index + 1]
+            del starts[index + 1]
+            del ends[index + 1]
+        elif joins_left:
+            ends[index] = offset + 1
+        elif joins_right:
+            starts[index + 1] = offset
+        else:
+            starts.insert(index + 1, offset)
+            ends.insert(index + 1, offset + 1)
+
+    def discard(self, offset: int) -> None:
+        starts, ends = self._starts, self._ends
+        index = bisect_right(starts, offset) - 1
+        if index < 0 or offset >= ends[index]:
+            return
+        start, end = starts[index], ends[index]
+        if start == offset and end == offset + 1:
+            del starts[index]
+            del ends[index]
+        elif start == offset:
+            starts[index] = offset + 1
+        elif end == offset + 1:
+            ends[index] = offset
+        else:
+            ends[index] = offset
+            starts.insert(index + 1, offset + 1)
+            ends.insert(index + 1, end)
+
+    def discard_below(self, offset: int) -> None:
+        starts, ends = self._starts, self._ends
+        index = bisect_right(ends, offset)
+        del starts[:index]
+        del ends[:index]
+        if starts and starts[0] < offset:
+            starts[0] = offset
+
+    def end_of_run(self, offset: int) -> int:
+        """Return the first offset >= ``offset`` that is not in the set."""
+        index = bisect_right(self._starts, offset) - 1
+        if index >= 0 and offset < self._ends[index]:
+            return self._ends[index]
+        return offset
+
+    def max(self) -> int | None:
+        return self._ends[-1] - 1 if self._ends else None
+
 
 @dataclass
 class _PartitionOffsetState:
     next_commit_offset: int | None = None
-    fetched_offsets: set[int] = field(default_factory=set)
-    started_offsets: set[int] = field(default_factory=set)
-    completed_offsets: set[int] = field(default_factory=set)
+    fetched_offsets: _OffsetRanges = field(default_factory=_OffsetRanges)
+    started_offsets: _OffsetRanges = field(default_factory=_OffsetRanges)
+    completed_offsets: _OffsetRanges = field(default_factory=_OffsetRanges)
 
 
 class KafkaOffsetTracker:
@@ -49,15 +133,9 @@ class KafkaOffsetTracker:
 
     def mark_committed(self, topic: str, partition: int, next_offset: int) -> None:
         state = self._state(topic, partition, next_offset)
-        for offset in list(state.completed_offsets):
-            if offset < next_offset:
-                state.completed_offsets.discard(offset)
-        for offset in list(state.fetched_offsets):
-            if offset < next_offset:
-                state.fetched_offsets.discard(offset)
-        for offset in list(state.started_offsets):
-            if offset < next_offset:
-                state.started_offsets.discard(offset)
+        state.completed_offsets.discard_below(next_offset)
+        state.fetched_offsets.discard_below(next_offset)
+        state.started_offsets.discard_below(next_offset)
         state.next_commit_offset = next_offset
 
     def mark_released_unstarted(self, topic: str, partition: int, offset: int) -> int | None:
@@ -71,6 +149,22 @@ class KafkaOffsetTracker:
         state = self._states.get((topic, partition))
         return None if state is None else state.next_commit_offset
 
+    def uncommitted_span(self, topic: str, partition: int) -> int:
+        """Return how many offsets separate the commit watermark from the newest fetched one."""
+        state = self._states.get((topic, partition))
+        if state is None or state.next_commit_offset is None:
+            return 0
+        newest = state.fetched_offsets.max()
+        if newest is None:
+            return 0
+        return max(0, newest + 1 - state.next_commit_offset)
+
+    def partitions(self) -> list[tuple[str, int]]:
+        return list(self._states)
+
+    def forget(self, topic: str, partition: int) -> None:
+        self._states.pop((topic, partition), None)
+
     def _state(self, topic: str, partition: int, offset: int) -> _PartitionOffsetState:
         key = (topic, partition)
         state = self._states.get(key)
@@ -84,15 +178,15 @@ class KafkaOffsetTracker:
     def _next_committable_offset(self, state: _PartitionOffsetState) -> int | None:
         if state.next_commit_offset is None:
             return None
-        next_offset = state.next_commit_offset
-        while next_offset in state.completed_offsets:
-            next_offset += 1
+        next_offset = state.completed_offsets.end_of_run(state.next_commit_offset)
         if next_offset == state.next_commit_offset:
             return None
         return next_offset
 
 
 class KafkaDelivery(Delivery):
+    __slots__ = ("_topic", "_record")
+
     def __init__(self, topic: "KafkaTopic", record: Any) -> None:
         self._topic = topic
         self._record = record
@@ -147,6 +241,11 @@ class KafkaConnector:
         headers: dict[str, Any] | list[tuple[str, Any]] | None = None,
         consumer_options: dict[str, Any] | None = None,
         producer_options: dict[str, Any] | None = None,
+        commit_interval_ms: int | None = None,
+        commit_every_n: int | None = None,
+        max_uncommitted: int | None = None,
+        codec: str = DEFAULT_CODEC,
+        compression: str | None = None,
     ) -> "KafkaTopic":
         return KafkaTopic(
             connector=self,
@@ -159,6 +258,11 @@ class KafkaConnector:
             headers=headers,
             consumer_options=consumer_options or {},
             producer_options=producer_options or {},
+            commit_interval_ms=commit_interval_ms,
+            commit_every_n=commit_every_n,
+            max_uncommitted=max_uncommitted,
+            codec=codec,
+            compression=compression,
         )
 
     def driver(self) -> Any:
@@ -175,8 +279,51 @@ class _AiokafkaDriver:
     TopicPartition = TopicPartition
 
 
+class _RebalanceListener(ConsumerRebalanceListener):
+    """Flushes batched offset commits before partitions are revoked.
+
+    Once flushed, revoked partitions are dropped from the pending commits and
+    the offset tracker: the consumer can no longer commit them, and acks for
+    their in-flight records are ignored until they are assigned again. The
+    consumer also drops its pause state for partitions that move, so their
+    backpressure pauses are forgotten too; otherwise a reassigned partition
+    would count as paused and never be paused again.
+    """
+
+    def __init__(self, topic: "KafkaTopic") -> None:
+        self._topic = topic
+
+    async def on_partitions_revoked(self, revoked: Any) -> None:
+        await self._topic.flush_commits()
+        await self._topic._forget_revoked(revoked)
+
+    async def on_partitions_assigned(self, assigned: Any) -> None:
+        self._topic._forget_paused(assigned)
+        self._topic._revoked.difference_update((tp.topic, tp.partition) for tp in assigned)
+
+
 class KafkaTopic(Source, Sink):
+    """Kafka source and sink.
+
+    By default every contiguous watermark advance is committed before
+    ``ack()`` returns. With ``commit_interval_ms`` and/or ``commit_every_n``
+    the watermark only advances in memory on ack, and one consumer commit
+    covering every pending partition is sent in the background when the
+    interval elapses or ``commit_every_n`` acks have accumulated. Pending
+    commits are also flushed on rebalance and on ``close()``; a crash in
+    between replays at most that window (still at-least-once).
+
+    ``max_uncommitted`` caps how far fetching may run ahead of the commit
+    watermark of a partition: once the newest fetched offset is that many
+    offsets past it (typically behind one slow message), the partition is
+    paused until the watermark catches up.
+    """
+
     fetch_is_cancel_safe = False
+    # retry() seeks back to the record; fetching keeps running past it in
+    # the meantime, so the delay stays inside retry() rather than in the
+    # runtime heap.
+    native_retry_delay = True
 
     def __init__(
         self,
@@ -191,7 +338,18 @@ class KafkaTopic(Source, Sink):
         headers: dict[str, Any] | list[tuple[str, Any]] | None,
         consumer_options: dict[str, Any],
         producer_options: dict[str, Any],
+        commit_interval_ms: int | None = None,
+        commit_every_n: int | None = None,
+        max_uncommitted: int | None = None,
+        codec: str = DEFAULT_CODEC,
+        compression: str | None = None,
     ) -> None:
+        if commit_interval_ms is not None and commit_interval_ms <= 0:
+            raise ValueError("commit_interval_ms must be > 0")
+        if commit_every_n is not None and commit_every_n < 1:
+            raise ValueError("commit_every_n must be >= 1")
+        if max_uncommitted is not None and max_uncommitted < 1:
+            raise ValueError("max_uncommitted must be >= 1")
         Source.__init__(self, topic)
         Sink.__init__(self, topic)
         self.connector = connector
@@ -204,6 +362,12 @@ class KafkaTopic(Source, Sink):
         self.headers = headers
         self.consumer_options = consumer_options
         self.producer_options = producer_options
+        self.commit_interval_ms = commit_interval_ms
+        self.commit_every_n = commit_every_n
+        self.max_uncommitted = max_uncommitted
+        self.codec = codec
+        self.compression = compression
+        self._envelope_format = envelope_format(codec, compression)
         self._consumer: Any | None = None
         self._producer: Any | None = None
         self._consumer_lock: asyncio.Lock | None = None
@@ -211,12 +375,29 @@ class KafkaTopic(Source, Sink):
         self._offset_lock: asyncio.Lock | None = None
         self._loop: asyncio.AbstractEventLoop | None = None
         self._offset_tracker = KafkaOffsetTracker()
+        self._pending_commits: dict[tuple[str, int], int] = {}
+        self._acks_since_commit = 0
+        self._commit_flush_lock: asyncio.Lock | None = None
+        self._commit_timer: asyncio.Task[None] | None = None
+        self._commit_tasks: set[asyncio.Task[None]] = set()
+        self._paused_partitions: set[tuple[str, int]] = set()
+        self._revoked: set[tuple[str, int]] = set()
+
+    @property
+    def batches_commits(self) -> bool:
+        return self.commit_interval_ms is not None or self.commit_every_n is not None
 
     async def open(self) -> None:
         return None
 
     async def close(self) -> None:
         errors: list[BaseException] = []
+        if self._consumer is not None and self.batches_commits:
+            try:
+                await self._stop_commit_tasks()
+                await self.flush_commits(raise_errors=True)
+            except Exception as exc:
+                errors.append(exc)
         if self._consumer is not None:
             try:
                 await self._consumer.stop()
@@ -238,6 +419,8 @@ class KafkaTopic(Source, Sink):
         try:
             consumer = await self._open_consumer()
             max_records = max(1, min(limit, self.batch_size))
+            if self.max_uncommitted is not None:
+                await self._apply_uncommitted_backpressure(consumer)
             batches = await consumer.getmany(timeout_ms=self.poll_timeout_ms, max_records=max_records)
             deliveries: list[Delivery] = []
             async with self._runtime_offset_lock():
@@ -267,7 +450,7 @@ class KafkaTopic(Source, Sink):
             producer = await self._open_producer()
             await producer.send_and_wait(
                 self.topic,
-                value=encode_envelope(envelope),
+                value=encode_envelope(envelope, self._envelope_format),
                 key=_normalize_key(self.key),
                 headers=_normalize_headers(self.headers),
             )
@@ -285,20 +468,73 @@ class KafkaTopic(Source, Sink):
                 raise
             raise connector_error from None
 
+    def ordering_key(self, delivery: Delivery) -> Any:
+        # Partition-level ordering: Kafka only guarantees order within a
+        # partition, so deliveries of one partition share a lane.
+        if isinstance(delivery, KafkaDelivery):
+            return (delivery._record.topic, delivery._record.partition)
+        return None
+
     async def mark_started(self, record: Any) -> None:
         async with self._runtime_offset_lock():
+            if (record.topic, record.partition) in self._revoked:
+                return
             self._offset_tracker.mark_started(record.topic, record.partition, record.offset)
 
     async def ack_record(self, record: Any) -> None:
         async with self._runtime_offset_lock():
+            if (record.topic, record.partition) in self._revoked:
+                # Another member owns the partition now and resumes from
+                # its last committed offset.
+                return
             next_offset = self._offset_tracker.mark_completed(record.topic, record.partition, record.offset)
             if next_offset is None:
                 return
+            if self.batches_commits:
+                # Advance the watermark in memory; the commit itself happens
+                # in the background without holding the offset lock.
+                self._offset_tracker.mark_committed(record.topic, record.partition, next_offset)
+                self._pending_commits[(record.topic, record.partition)] = next_offset
+                self._acks_since_commit += 1
+                self._schedule_commit_flush()
+                return
             await self._commit_offset_unlocked(record.topic, record.partition, next_offset)
             self._offset_tracker.mark_committed(record.topic, record.partition, next_offset)
 
+    async def flush_commits(self, *, raise_errors: bool = False) -> None:
+        """Commit every pending partition watermark in one consumer call."""
+        self._ensure_runtime_state()
+        assert self._commit_flush_lock is not None
+        async with self._commit_flush_lock:
+            async with self._runtime_offset_lock():
+                pending, self._pending_commits = self._pending_commits, {}
+                self._acks_since_commit = 0
+            if not pending or self._consumer is None:
+                return
+            # The consumer refuses to commit partitions it no longer owns.
+            assigned = self._assigned_keys()
+            pending = {key: offset for key, offset in pending.items() if key in assigned}
+            if not pending:
+                return
+            topic_partition = self.connector.driver().TopicPartition
+            try:
+                await self._consumer.commit(
+                    {topic_partition(topic, partition): offset for (topic, partition), offset in pending.items()}
+                )
+            except Exception:
+                assigned = self._assigned_keys()
+                async with self._runtime_offset_lock():
+                    for key, offset in pending.items():
+                        if key in assigned:
+                            self._pending_commits[key] = max(offset, self._pending_commits.get(key, offset))
+                if raise_errors:
+                    raise
+                logger.warning("kafka offset commit failed; retrying with the next flush", exc_info=True)
+
     async def release_unstarted_record(self, record: Any) -> None:
         async with self._runtime_offset_lock():
+            if (record.topic, record.partition) in self._revoked:
+                return
             seek_offset = self._offset_tracker.mark_released_unstarted(
                 record.topic,
                 record.partition,
@@ -309,6 +545,8 @@ class KafkaTopic(Source, Sink):
 
     async def seek_record(self, record: Any) -> None:
         async with self._runtime_offset_lock():
+            if (record.topic, record.partition) in self._revoked:
+                return
             await self._seek_to_offset_unlocked(record.topic, record.partition, record.offset)
 
     async def commit_offset(self, topic: str, partition: int, next_offset: int) -> None:
@@ -320,6 +558,67 @@ class KafkaTopic(Source, Sink):
         async with self._runtime_offset_lock():
             await self._seek_to_offset_unlocked(topic, partition, offset)
 
+    async def _apply_uncommitted_backpressure(self, consumer: Any) -> None:
+        assert self.max_uncommitted is not None
+        async with self._runtime_offset_lock():
+            over_limit = {
+                key
+                for key in self._offset_tracker.partitions()
+                if self._offset_tracker.uncommitted_span(*key) >= self.max_uncommitted
+            }
+        assigned = {(tp.topic, tp.partition) for tp in consumer.assignment()}
+        topic_partition = self.connector.driver().TopicPartition
+        to_pause = (over_limit - self._paused_partitions) & assigned
+        to_resume = self._paused_partitions - over_limit
+        if to_pause:
+            consumer.pause(*(topic_partition(*key) for key in sorted(to_pause)))
+        resumable = to_resume & assigned
+        if resumable:
+            consumer.resume(*(topic_partition(*key) for key in sorted(resumable)))
+        self._paused_partitions = (self._paused_partitions | to_pause) - to_resume
+
+    def _assigned_keys(self) -> set[tuple[str, int]]:
+        if self._consumer is None:
+            return set()
+        return {(tp.topic, tp.partition) for tp in self._consumer.assignment()}
+
+    async def _forget_revoked(self, partitions: Any) -> None:
+        keys = {(tp.topic, tp.partition) for tp in partitions}
+        async with self._runtime_offset_lock():
+            for key in keys:
+                self._pending_commits.pop(key, None)
+                self._offset_tracker.forget(*key)
+            self._revoked |= keys
+        self._paused_partitions -= keys
+
+    def _forget_paused(self, partitions: Any) -> None:
+        self._paused_partitions -= {(tp.topic, tp.partition) for tp in partitions}
+
+    def _schedule_commit_flush(self) -> None:
+        if self.commit_every_n is not None and self._acks_since_commit >= self.commit_every_n:
+            self._acks_since_commit = 0
+            flush = asyncio.create_task(self.flush_commits())
+            self._commit_tasks.add(flush)
+            flush.add_done_callback(self._commit_tasks.discard)
+            return
+        if self.commit_interval_ms is None:
+            return
+        if self._commit_timer is None or self._commit_timer.done():
+            self._commit_timer = asyncio.create_task(self._flush_after_interval())
+
+    async def _flush_after_interval(self) -> None:
+        assert self.commit_interval_ms is not None
+        await asyncio.sleep(self.commit_interval_ms / 1000)
+        await self.flush_commits()
+
+    async def _stop_commit_tasks(self) -> None:
+        timer, self._commit_timer = self._commit_timer, None
+        if timer is not None and not timer.done():
+            timer.cancel()
+            await asyncio.gather(timer, return_exceptions=True)
+        if self._commit_tasks:
+            await asyncio.gather(*self._commit_tasks, return_exceptions=True)
+
     async def _commit_offset_unlocked(self, topic: str, partition: int, next_offset: int) -> None:
         consumer = await self._open_consumer()
         topic_partition = self.connector.driver().TopicPartition(topic, partition)
@@ -348,7 +647,13 @@ class KafkaTopic(Source, Sink):
             }
             if self.client_id is not None:
                 options["client_id"] = self.client_id
-            self._consumer = driver.AIOKafkaConsumer(self.topic, **options)
+            if self.batches_commits or self.max_uncommitted is not None:
+                # Subscribing with a listener lets pending commits flush and
+                # pause state reset when a rebalance moves partitions.
+                self._consumer = driver.AIOKafkaConsumer(**options)
+                self._consumer.subscribe(topics=[self.topic], listener=_RebalanceListener(self))
+            else:
+                self._consumer = driver.AIOKafkaConsumer(self.topic, **options)
             await self._consumer.start()
             return self._consumer
 
@@ -382,9 +687,16 @@ class KafkaTopic(Source, Sink):
             self._consumer_lock = asyncio.Lock()
             self._producer_lock = asyncio.Lock()
             self._offset_lock = asyncio.Lock()
+            self._commit_flush_lock = asyncio.Lock()
             self._consumer = None
             self._producer = None
             self._offset_tracker = KafkaOffsetTracker()
+            self._pending_commits = {}
+            self._acks_since_commit = 0
+            self._commit_timer = None
+            self._commit_tasks = set()
+            self._paused_partitions = set()
+            self._revoked = set()
 
 
 def _decode_record_envelope(record: Any) -> Envelope:
@@ -3,6 +3,7 @@ from __future__ import annotations
 from collections.abc import Mapping, Sequence
 from typing import Any
 
+from onestep.connectors.codec import DEFAULT_CODEC, ENVELOPE_CODECS, ENVELOPE_COMPRESSIONS
 from onestep.resource_registry import (
     ResourceCatalogEntry,
     ResourceCatalogField,
@@ -25,6 +26,11 @@ _KAFKA_TOPIC_FIELDS = frozenset(
         "client_id",
         "batch_size",
         "poll_timeout_ms",
+        "commit_interval_ms",
+        "commit_every_n",
+        "max_uncommitted",
+        "codec",
+        "compression",
         "key",
         "headers",
         "consumer_options",
@@ -53,6 +59,11 @@ _KAFKA_TOPIC_CATALOG = ResourceCatalogEntry(
         ResourceCatalogField("client_id", "string"),
         ResourceCatalogField("batch_size", "integer", default=100),
         ResourceCatalogField("poll_timeout_ms", "integer", default=1000),
+        ResourceCatalogField("commit_interval_ms", "integer"),
+        ResourceCatalogField("commit_every_n", "integer"),
+        ResourceCatalogField("max_uncommitted", "integer"),
+        ResourceCatalogField("codec", "string", default="json", options=ENVELOPE_CODECS),
+        ResourceCatalogField("compression", "string", options=ENVELOPE_COMPRESSIONS),
         ResourceCatalogField("key", "string"),
         ResourceCatalogField("headers", "mapping"),
         ResourceCatalogField("consumer_options", "mapping"),
@@ -100,6 +111,11 @@ def _build_kafka_topic(ctx: ResourceBuildContext, spec: Mapping[str, Any]) -> An
         client_id=spec.get("client_id"),
         batch_size=spec.get("batch_size", 100),
         poll_timeout_ms=spec.get("poll_timeout_ms", 1000),
+        commit_interval_ms=spec.get("commit_interval_ms"),
+        commit_every_n=spec.get("commit_every_n"),
+        max_uncommitted=spec.get("max_uncommitted"),
+        codec=spec.get("codec", DEFAULT_CODEC),
+        compression=spec.get("compression"),
         key=spec.get("key"),
         headers=spec.get("headers"),
         consumer_options=ctx.mapping_value(spec.get("consumer_options"), field=f"{ctx.field}.consumer_options"),
@@ -124,6 +140,9 @@ def _validate_kafka_topic(ctx: ResourceValidationContext, spec: Mapping[str, Any
         _positive_integer(spec.get("batch_size"), field=f"{ctx.field}.batch_size")
     if "poll_timeout_ms" in spec:
         _non_negative_integer(spec.get("poll_timeout_ms"), field=f"{ctx.field}.poll_timeout_ms")
+    for key in ("commit_interval_ms", "commit_every_n", "max_uncommitted"):
+        if spec.get(key) is not None:
+            _positive_integer(spec.get(key), field=f"{ctx.field}.{key}")
     if "headers" in spec:
         _validate_headers(spec.get("headers"), field=f"{ctx.field}.headers")
     for key in ("consumer_options", "producer_options"):
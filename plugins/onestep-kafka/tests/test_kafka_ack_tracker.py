@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from onestep_kafka import KafkaOffsetTracker
+from onestep_kafka.connector import _OffsetRanges
 
 
 def test_tracker_commits_contiguous_offsets_in_order() -> None:
@@ -49,3 +50,38 @@ def test_tracker_does_not_release_started_delivery() -> None:
 
     assert tracker.mark_released_unstarted("orders", 0, 10) is None
     assert tracker.mark_completed("orders", 0, 10) == 11
+
+
+def test_tracker_keeps_completed_tail_behind_slow_offset_compact() -> None:
+    tracker = KafkaOffsetTracker()
+    for offset in range(10, 10_010):
+        tracker.mark_fetched("orders", 0, offset)
+    for offset in range(11, 10_010):
+        assert tracker.mark_completed("orders", 0, offset) is None
+
+    state = tracker._states[("orders", 0)]
+    assert len(state.completed_offsets) == 1
+    assert tracker.uncommitted_span("orders", 0) == 10_000
+    assert tracker.mark_completed("orders", 0, 10) == 10_010
+    tracker.mark_committed("orders", 0, 10_010)
+    assert len(state.completed_offsets) == 0
+    assert tracker.uncommitted_span("orders", 0) == 0
+
+
+def test_offset_ranges_merge_split_and_trim() -> None:
+    ranges = _OffsetRanges()
+    for offset in (5, 7, 6, 1, 2):
+        ranges.add(offset)
+    assert (ranges._starts, ranges._ends) == ([1, 5], [3, 8])
+
+    ranges.discard(6)
+    assert (ranges._starts, ranges._ends) == ([1, 5, 7], [3, 6, 8])
+    assert 6 not in ranges and 7 in ranges
+    assert ranges.end_of_run(1) == 3
+    assert ranges.end_of_run(4) == 4
+
+    ranges.discard_below(2)
+    assert (ranges._starts, ranges._ends) == ([2, 5, 7], [3, 6, 8])
+    ranges.discard_below(7)
+    assert (ranges._starts, ranges._ends) == ([7], [8])
+    assert ranges.max() == 7
@@ -41,6 +41,14 @@ class FakeConsumer:
         self.block_getmany = False
         self.getmany_started: asyncio.Event | None = None
         self.release_getmany: asyncio.Event | None = None
+        self.listener: Any | None = None
+        self.fail_commits = 0
+        self.paused: set[FakeTopicPartition] = set()
+        self.assigned: set[FakeTopicPartition] | None = None
+
+    def subscribe(self, *, topics: list[str], listener: Any = None) -> None:
+        self.topics = tuple(topics)
+        self.listener = listener
 
     async def start(self) -> None:
         self.started = True
@@ -48,6 +56,15 @@ class FakeConsumer:
     async def stop(self) -> None:
         self.stopped = True
 
+    def assignment(self) -> set[FakeTopicPartition]:
+        return set(self.records) if self.assigned is None else set(self.assigned)
+
+    def pause(self, *partitions: FakeTopicPartition) -> None:
+        self.paused.update(partitions)
+
+    def resume(self, *partitions: FakeTopicPartition) -> None:
+        self.paused.difference_update(partitions)
+
     async def getmany(self, *, timeout_ms: int, max_records: int):
         if self.block_getmany:
             assert self.getmany_started is not None
@@ -60,6 +77,8 @@ class FakeConsumer:
         for topic_partition, records in list(self.records.items()):
             if remaining <= 0:
                 break
+            if topic_partition in self.paused:
+                continue
             batch = records[:remaining]
             self.records[topic_partition] = records[remaining:]
             if batch:
@@ -68,6 +87,13 @@ class FakeConsumer:
         return selected
 
     async def commit(self, offsets):
+        if self.fail_commits:
+            self.fail_commits -= 1
+            raise RuntimeError("commit failed")
+        unassigned = set(offsets) - self.assignment()
+        if unassigned:
+            # aiokafka raises IllegalStateError for partitions it does not own.
+            raise RuntimeError(f"partitions not assigned: {sorted(unassigned, key=str)}")
         self.commits.append(dict(offsets))
 
     def seek(self, topic_partition, offset: int) -> None:
@@ -312,3 +338,207 @@ def test_release_unstarted_does_not_commit_and_seeks_to_offset() -> None:
         assert consumer.seeks == [(tp, 10)]
 
     asyncio.run(scenario())
+
+
+def test_topic_ordering_key_is_the_record_partition() -> None:
+    async def scenario() -> None:
+        driver = FakeDriver()
+        connector = KafkaConnector("localhost:9092", driver=driver)
+        topic = connector.topic("orders.in", group_id="workers")
+        consumer = await topic._open_consumer()
+        consumer.records[FakeTopicPartition("orders.in", 0)] = [FakeRecord("orders.in", 0, 10, b'{"id": 10}')]
+        consumer.records[FakeTopicPartition("orders.in", 3)] = [FakeRecord("orders.in", 3, 7, b'{"id": 7}')]
+
+        first, second = await topic.fetch(2)
+
+        assert topic.ordering_key(first) == ("orders.in", 0)
+        assert topic.ordering_key(second) == ("orders.in", 3)
+
+    asyncio.run(scenario())
+
+
+async def _ack_records(topic: Any, count: int) -> None:
+    for delivery in await topic.fetch(count):
+        await delivery.start_processing()
+        await delivery.ack()
+
+
+def test_commit_every_n_batches_commits_across_partitions() -> None:
+    async def scenario() -> None:
+        driver = FakeDriver()
+        topic = KafkaConnector("localhost:9092", driver=driver).topic("orders.in", group_id="workers", commit_every_n=3)
+        consumer = await topic._open_consumer()
+        first = FakeTopicPartition("orders.in", 0)
+        second = FakeTopicPartition("orders.in", 1)
+        consumer.records[first] = [FakeRecord("orders.in", 0, 10, b"{}"), FakeRecord("orders.in", 0, 11, b"{}")]
+        consumer.records[second] = [FakeRecord("orders.in", 1, 4, b"{}")]
+
+        assert consumer.topics == ("orders.in",)
+        assert consumer.listener is not None
+        await _ack_records(topic, 2)
+        assert consumer.commits == []
+
+        await _ack_records(topic, 1)
+        await asyncio.sleep(0)
+        assert consumer.commits == [{first: 12, second: 5}]
+
+    asyncio.run(scenario())
+
+
+def test_commit_interval_flushes_pending_offsets_in_background() -> None:
+    async def scenario() -> None:
+        driver = FakeDriver()
+        topic = KafkaConnector("localhost:9092", driver=driver).topic("orders.in", group_id="workers", commit_interval_ms=10)
+        consumer = await topic._open_consumer()
+        tp = FakeTopicPartition("orders.in", 0)
+        consumer.records[tp] = [FakeRecord("orders.in", 0, offset, b"{}") for offset in range(3)]
+
+        await _ack_records(topic, 3)
+        assert consumer.commits == []
+
+        await asyncio.sleep(0.05)
+        assert consumer.commits == [{tp: 3}]
+
+    asyncio.run(scenario())
+
+
+def test_batched_commits_flush_on_revoke_and_close() -> None:
+    async def scenario() -> None:
+        driver = FakeDriver()
+        topic = KafkaConnector("localhost:9092", driver=driver).topic("orders.in", group_id="workers", commit_interval_ms=60_000)
+        consumer = await topic._open_consumer()
+        tp = FakeTopicPartition("orders.in", 0)
+        consumer.records[tp] = [FakeRecord("orders.in", 0, offset, b"{}") for offset in range(2)]
+
+        await _ack_records(topic, 1)
+        await consumer.listener.on_partitions_revoked({tp})
+        assert consumer.commits == [{tp: 1}]
+
+        consumer.assigned = {tp}
+        await consumer.listener.on_partitions_assigned({tp})
+        await _ack_records(topic, 1)
+        await topic.close()
+        assert consumer.commits == [{tp: 1}, {tp: 2}]
+        assert consumer.stopped is True
+
+    asyncio.run(scenario())
+
+
+def test_revoked_partition_does_not_block_later_commits() -> None:
+    async def scenario() -> None:
+        driver = FakeDriver()
+        topic = KafkaConnector("localhost:9092", driver=driver).topic(
+            "t", group_id="workers", batch_size=10, commit_interval_ms=60_000
+        )
+        consumer = await topic._open_consumer()
+        moved = FakeTopicPartition("t", 0)
+        kept = FakeTopicPartition("t", 1)
+        consumer.records[moved] = [FakeRecord("t", 0, 0, b"{}")]
+        consumer.records[kept] = [FakeRecord("t", 1, offset, b"{}") for offset in range(5)]
+        deliveries = await topic.fetch(10)
+        for delivery in deliveries:
+            await delivery.start_processing()
+
+        await consumer.listener.on_partitions_revoked({moved})
+        consumer.assigned = {kept}
+        # The in-flight record of the revoked partition finishes afterwards.
+        for delivery in deliveries:
+            await delivery.ack()
+        await topic.flush_commits(raise_errors=True)
+
+        assert consumer.commits == [{kept: 5}]
+        assert topic._pending_commits == {}
+
+    asyncio.run(scenario())
+
+
+def test_failed_batched_commit_is_retried_with_next_flush() -> None:
+    async def scenario() -> None:
+        driver = FakeDriver()
+        topic = KafkaConnector("localhost:9092", driver=driver).topic("orders.in", group_id="workers", commit_every_n=1)
+        consumer = await topic._open_consumer()
+        tp = FakeTopicPartition("orders.in", 0)
+        consumer.records[tp] = [FakeRecord("orders.in", 0, offset, b"{}") for offset in range(2)]
+        consumer.fail_commits = 1
+
+        await _ack_records(topic, 1)
+        await asyncio.sleep(0)
+        assert consumer.commits == []
+
+        await _ack_records(topic, 1)
+        await asyncio.sleep(0)
+        assert consumer.commits == [{tp: 2}]
+
+    asyncio.run(scenario())
+
+
+def test_batched_commit_options_are_validated() -> None:
+    connector = KafkaConnector("localhost:9092", driver=FakeDriver())
+
+    with pytest.raises(ValueError, match="commit_interval_ms"):
+        connector.topic("orders.in", commit_interval_ms=0)
+    with pytest.raises(ValueError, match="commit_every_n"):
+        connector.topic("orders.in", commit_every_n=0)
+
+
+def test_max_uncommitted_pauses_partition_until_watermark_advances() -> None:
+    async def scenario() -> None:
+        driver = FakeDriver()
+        topic = KafkaConnector("localhost:9092", driver=driver).topic(
+            "orders.in", group_id="workers", batch_size=2, max_uncommitted=3
+        )
+        consumer = await topic._open_consumer()
+        slow = FakeTopicPartition("orders.in", 0)
+        other = FakeTopicPartition("orders.in", 1)
+        consumer.records[slow] = [FakeRecord("orders.in", 0, offset, b"{}") for offset in range(6)]
+        consumer.records[other] = [FakeRecord("orders.in", 1, 0, b"{}")]
+
+        head, second = await topic.fetch(2)
+        await head.start_processing()
+        await second.start_processing()
+        await second.ack()
+        third, fourth = await topic.fetch(2)
+        assert [third.envelope.meta["kafka"]["offset"], fourth.envelope.meta["kafka"]["offset"]] == [2, 3]
+
+        deliveries = await topic.fetch(2)
+        assert consumer.paused == {slow}
+        assert [(d.envelope.meta["kafka"]["partition"], d.envelope.meta["kafka"]["offset"]) for d in deliveries] == [(1, 0)]
+
+        await head.ack()
+        for delivery in (third, fourth):
+            await delivery.start_processing()
+            await delivery.ack()
+        resumed = await topic.fetch(2)
+        assert consumer.paused == set()
+        assert [d.envelope.meta["kafka"]["offset"] for d in resumed] == [4, 5]
+
+    asyncio.run(scenario())
+
+
+def test_max_uncommitted_pauses_again_after_revoke_and_reassign() -> None:
+    async def scenario() -> None:
+        driver = FakeDriver()
+        topic = KafkaConnector("localhost:9092", driver=driver).topic(
+            "orders.in", group_id="workers", batch_size=2, max_uncommitted=2
+        )
+        consumer = await topic._open_consumer()
+        slow = FakeTopicPartition("orders.in", 0)
+        consumer.records[slow] = [FakeRecord("orders.in", 0, offset, b"{}") for offset in range(6)]
+
+        assert len(await topic.fetch(2)) == 2
+        assert await topic.fetch(2) == []
+        assert consumer.paused == {slow}
+
+        # A rebalance moves the partition away and back; the consumer forgets
+        # that it was paused.
+        await consumer.listener.on_partitions_revoked({slow})
+        consumer.paused.clear()
+        await consumer.listener.on_partitions_assigned({slow})
+
+        # Fetching runs ahead of the commit watermark again and is paused again.
+        assert len(await topic.fetch(2)) == 2
+        assert consumer.paused == set()
+        assert await topic.fetch(2) == []
+        assert consumer.paused == {slow}
+
+    asyncio.run(scenario())
@@ -574,14 +574,17 @@ class MongoDBCollectionSink(Sink):
         return [dict(item) for item in body]
 
     async def send(self, envelope: Envelope) -> None:
+        await self.send_many((envelope,))
+
+    async def send_many(self, envelopes: Sequence[Envelope]) -> None:
         from pymongo import UpdateOne
 
         collection = self.connector.collection(self.collection_name)
         if not collection.write_concern.acknowledged:
             raise ValueError("MongoDB sink requires acknowledged write concern")
         try:
-            single_document = isinstance(envelope.body, Mapping)
-            documents = self._documents(envelope.body)
+            single_document = len(envelopes) == 1 and isinstance(envelopes[0].body, Mapping)
+            documents = [document for envelope in envelopes for document in self._documents(envelope.body)]
             if self.mode == "upsert":
                 for index, document in enumerate(documents):
                     missing = [key for key in self.keys if key not in document]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -8,7 +9,7 @@ from onestep.envelope import Envelope
 from onestep.resilience import ConnectorOperation, ConnectorOperationError
 
 from onestep.connectors.base import Delivery, Sink, Source
-from onestep.connectors.codec import decode_envelope, encode_envelope
+from onestep.connectors.codec import DEFAULT_CODEC, decode_envelope, encode_envelope, envelope_format
 
 from .resilience import as_rabbitmq_connector_operation_error, collect_sensitive_tokens
 
@@ -19,23 +20,32 @@ except ImportError:  # pragma: no cover - optional dependency
 
 
 class RabbitMQDelivery(Delivery):
-    def __init__(self, message: Any) -> None:
+    def __init__(self, message: Any, queue: "RabbitMQQueue | None" = None) -> None:
         super().__init__(decode_envelope(message.body))
         self._message = message
+        self._queue = queue
 
     async def ack(self) -> None:
         await self._message.ack()
+        self._settled()
 
     async def release_unstarted(self) -> None:
         await self._message.nack(requeue=True)
+        self._settled()
 
     async def retry(self, *, delay_s: float | None = None) -> None:
         if delay_s:
             await asyncio.sleep(delay_s)
         await self._message.nack(requeue=True)
+        self._settled()
 
     async def fail(self, exc: Exception | None = None) -> None:
         await self._message.reject(requeue=False)
+        self._settled()
+
+    def _settled(self) -> None:
+        if self._queue is not None:
+            self._queue._forget_tags((self._message,))
 
 
 @dataclass
@@ -68,6 +78,8 @@ class RabbitMQConnector:
         poll_interval_s: float = 1.0,
         publisher_confirms: bool = True,
         persistent: bool = True,
+        codec: str = DEFAULT_CODEC,
+        compression: str | None = None,
     ) -> "RabbitMQQueue":
         return RabbitMQQueue(
             connector=self,
@@ -89,6 +101,8 @@ class RabbitMQConnector:
             poll_interval_s=poll_interval_s,
             publisher_confirms=publisher_confirms,
             persistent=persistent,
+            codec=codec,
+            compression=compression,
         )
 
     async def close(self) -> None:
@@ -135,6 +149,8 @@ class RabbitMQConnector:
 
 
 class RabbitMQQueue(Source, Sink):
+    supports_bulk_ack = True
+
     def __init__(
         self,
         *,
@@ -157,6 +173,8 @@ class RabbitMQQueue(Source, Sink):
         poll_interval_s: float,
         publisher_confirms: bool,
         persistent: bool,
+        codec: str = DEFAULT_CODEC,
+        compression: str | None = None,
     ) -> None:
         Source.__init__(self, name)
         Sink.__init__(self, name)
@@ -178,6 +196,9 @@ class RabbitMQQueue(Source, Sink):
         self.poll_interval_s = poll_interval_s
         self.publisher_confirms = publisher_confirms
         self.persistent = persistent
+        self.codec = codec
+        self.compression = compression
+        self._envelope_format = envelope_format(codec, compression)
         self._receive_channel: Any | None = None
         self._publish_channel: Any | None = None
         self._queue: Any | None = None
@@ -188,6 +209,10 @@ class RabbitMQQueue(Source, Sink):
         self._consumer_loop: asyncio.AbstractEventLoop | None = None
         self._consumer_accepting = False
         self._opened = False
+        # Messages handed to the consumer buffer but not settled yet, keyed by
+        # delivery tag on the current receive channel. A ``multiple=True``
+        # ack/nack is only safe up to the lowest tag still owned elsewhere.
+        self._unsettled: dict[int, Any] = {}
 
     def _connection_secrets(self) -> list[str]:
         """Secret-bearing config tokens used to scrub error messages."""
@@ -270,13 +295,13 @@ class RabbitMQQueue(Source, Sink):
             deliveries: list[Delivery] = []
             fetch_limit = max(1, min(limit, self.batch_size))
             message = await messages.get()
-            deliveries.append(RabbitMQDelivery(message))
+            deliveries.append(RabbitMQDelivery(message, self))
             while len(deliveries) < fetch_limit:
                 try:
                     message = messages.get_nowait()
                 except asyncio.QueueEmpty:
                     break
-                deliveries.append(RabbitMQDelivery(message))
+                deliveries.append(RabbitMQDelivery(message, self))
             return deliveries
         except asyncio.CancelledError:
             await self._reset_transport_state(release_connection=True)
@@ -332,6 +357,10 @@ class RabbitMQQueue(Source, Sink):
             messages.put_nowait(message)
         except asyncio.QueueFull:
             await message.nack(requeue=True)
+            return
+        tag = _delivery_tag(message)
+        if tag is not None:
+            self._unsettled[tag] = message
 
     async def _on_receive_channel_closed(
         self, _channel: Any, _exc: BaseException | None
@@ -340,6 +369,7 @@ class RabbitMQQueue(Source, Sink):
             return
         while not self._consumer_messages.empty():
             self._consumer_messages.get_nowait()
+        self._unsettled.clear()
 
     async def _cancel_consumer(self) -> None:
         self._consumer_accepting = False
@@ -357,6 +387,7 @@ class RabbitMQQueue(Source, Sink):
         while not self._consumer_messages.empty():
             message = self._consumer_messages.get_nowait()
             await message.nack(requeue=True)
+            self._forget_tags((message,))
 
     async def _close_channels(self) -> None:
         try:
@@ -366,6 +397,63 @@ class RabbitMQQueue(Source, Sink):
             if self._receive_channel is not None:
                 await self._receive_channel.close()
 
+    async def ack_many(self, deliveries: Sequence[Delivery]) -> None:
+        await self._settle_many(deliveries, requeue=None)
+
+    async def retry_many(
+        self,
+        deliveries: Sequence[Delivery],
+        *,
+        delay_s: float | None = None,
+    ) -> None:
+        if delay_s:
+            await asyncio.sleep(delay_s)
+        await self._settle_many(deliveries, requeue=True)
+
+    async def _settle_many(self, deliveries: Sequence[Delivery], *, requeue: bool | None) -> None:
+        """Ack (``requeue=None``) or nack ``deliveries`` with as few frames as possible.
+
+        The longest run of the oldest unsettled tags that is fully covered by
+        ``deliveries`` is settled with one ``multiple=True`` frame; the rest
+        (out-of-order tags, other channels) fall back to per-message frames.
+        """
+        messages = [
+            delivery._message for delivery in deliveries if isinstance(delivery, RabbitMQDelivery)
+        ]
+        by_tag = {
+            tag: message for message in messages if (tag := _delivery_tag(message)) is not None
+        }
+        covered: list[Any] = []
+        for tag in sorted(self._unsettled):
+            message = self._unsettled[tag]
+            if by_tag.get(tag) is not message:
+                break
+            covered.append(message)
+        if len(covered) > 1:
+            last = covered[-1]
+            if requeue is None:
+                await last.ack(multiple=True)
+            else:
+                await last.nack(multiple=True, requeue=requeue)
+            self._forget_tags(covered)
+        else:
+            covered = []
+        covered_ids = {id(message) for message in covered}
+        for message in messages:
+            if id(message) in covered_ids:
+                continue
+            if requeue is None:
+                await message.ack()
+            else:
+                await message.nack(requeue=requeue)
+            self._forget_tags((message,))
+
+    def _forget_tags(self, messages: Sequence[Any]) -> None:
+        for message in messages:
+            tag = _delivery_tag(message)
+            if tag is not None and self._unsettled.get(tag) is message:
+                del self._unsettled[tag]
+
     async def send(self, envelope: Envelope) -> None:
         try:
             await self.open()
@@ -373,8 +461,8 @@ class RabbitMQQueue(Source, Sink):
                 raise RuntimeError("RabbitMQ queue is not open")
             driver = self.connector._driver()
             message_kwargs = {
-                "body": encode_envelope(envelope),
-                "content_type": "application/json",
+                "body": encode_envelope(envelope, self._envelope_format),
+                "content_type": self._envelope_format.content_type,
             }
             delivery_mode = getattr(getattr(driver, "DeliveryMode", None), "PERSISTENT", None)
             if self.persistent and delivery_mode is not None:
@@ -420,3 +508,9 @@ class RabbitMQQueue(Source, Sink):
         self._consumer_loop = None
         self._consumer_accepting = False
         self._opened = False
+        self._unsettled = {}
+
+
+def _delivery_tag(message: Any) -> int | None:
+    tag = getattr(message, "delivery_tag", None)
+    return tag if isinstance(tag, int) else None
@@ -3,6 +3,7 @@ from __future__ import annotations
 from collections.abc import Mapping
 from typing import Any
 
+from onestep.connectors.codec import DEFAULT_CODEC, ENVELOPE_CODECS, ENVELOPE_COMPRESSIONS
 from onestep.resource_registry import (
     ResourceCatalogEntry,
     ResourceCatalogField,
@@ -37,6 +38,8 @@ _RABBITMQ_QUEUE_FIELDS = frozenset(
         "poll_interval_s",
         "publisher_confirms",
         "persistent",
+        "codec",
+        "compression",
     }
 )
 _RABBITMQ_CATALOG = ResourceCatalogEntry(
@@ -79,6 +82,8 @@ _RABBITMQ_QUEUE_CATALOG = ResourceCatalogEntry(
         ResourceCatalogField("poll_interval_s", "number", default=1.0),
         ResourceCatalogField("publisher_confirms", "boolean", default=True),
         ResourceCatalogField("persistent", "boolean", default=True),
+        ResourceCatalogField("codec", "string", default="json", options=ENVELOPE_CODECS),
+        ResourceCatalogField("compression", "string", options=ENVELOPE_COMPRESSIONS),
     ),
     topology_fields=("queue", "exchange", "routing_key", "batch_size", "poll_interval_s"),
 )
@@ -136,4 +141,6 @@ def _build_rabbitmq_queue(ctx: ResourceBuildContext, spec: Mapping[str, Any]) ->
         poll_interval_s=spec.get("poll_interval_s", 1.0),
         publisher_confirms=spec.get("publisher_confirms", True),
         persistent=spec.get("persistent", True),
+        codec=spec.get("codec", DEFAULT_CODEC),
+        compression=spec.get("compression"),
     )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -8,7 +9,7 @@ from onestep.envelope import Envelope
 from onestep.resilience import ConnectorOperation, ConnectorOperationError
 
 from onestep.connectors.base import Delivery, Sink, Source
-from onestep.connectors.codec import decode_envelope, encode_envelope
+from onestep.connectors.codec import DEFAULT_CODEC, decode_envelope, encode_envelope, envelope_format
 
 from .resilience import as_redis_connector_operation_error, collect_sensitive_tokens
 
@@ -30,16 +31,23 @@ class RedisStreamDelivery(Delivery):
         group: str,
         message_id: bytes | str,
         envelope: Envelope,
+        leased: set[bytes | str] | None = None,
     ) -> None:
         super().__init__(envelope)
         self._redis = redis
         self._stream = stream
         self._group = group
         self._message_id = message_id
+        # IDs this consumer has handed out and not yet settled; fetch()
+        # skips them when it reads the PEL, where they stay until XACK.
+        self._leased = leased
 
     async def ack(self) -> None:
         """Acknowledge message: XACK stream group message_id"""
-        await self._redis.xack(self._stream, self._group, self._message_id)
+        try:
+            await self._redis.xack(self._stream, self._group, self._message_id)
+        finally:
+            self._settle()
 
     async def retry(self, *, delay_s: float | None = None) -> None:
         """Retry message: leave in PEL for redelivery via next fetch().
@@ -47,9 +55,12 @@ class RedisStreamDelivery(Delivery):
         The message stays in PEL (Pending Entries List) and will be
         retrieved again on the next fetch() call (which checks pending first).
         """
-        if delay_s:
-            await asyncio.sleep(delay_s)
-        # Message remains in PEL - fetch() will pick it up on next cycle
+        try:
+            if delay_s:
+                await asyncio.sleep(delay_s)
+        finally:
+            # Message remains in PEL - fetch() will pick it up on next cycle
+            self._settle()
 
     async def fail(self, exc: Exception | None = None) -> None:
         """Fail message: acknowledge to remove from PEL.
@@ -63,7 +74,18 @@ class RedisStreamDelivery(Delivery):
         reprocessing loops. If dead-letter was configured, the message
         has already been sent there before fail() is called.
         """
-        await self._redis.xack(self._stream, self._group, self._message_id)
+        try:
+            await self._redis.xack(self._stream, self._group, self._message_id)
+        finally:
+            self._settle()
+
+    async def release_unstarted(self) -> None:
+        """Leave the message in the PEL and let the next fetch() take it."""
+        self._settle()
+
+    def _settle(self) -> None:
+        if self._leased is not None:
+            self._leased.discard(self._message_id)
 
 
 @dataclass
@@ -95,6 +117,8 @@ class RedisConnector:
         create_group: bool = True,
         maxlen: int | None = None,
         approximate_trim: bool = True,
+        codec: str = DEFAULT_CODEC,
+        compression: str | None = None,
     ) -> "RedisStreamQueue":
         """Create a Redis Streams queue.
         
@@ -109,6 +133,8 @@ class RedisConnector:
             create_group: Create group if not exists
             maxlen: Max stream length (for XADD TRIM)
             approximate_trim: Use approximate trimming (~)
+            codec: Envelope codec for XADD ("json", "orjson", "msgpack")
+            compression: Optional compression frame ("zlib", "zstd", "lz4")
         """
         return RedisStreamQueue(
             connector=self,
@@ -122,6 +148,8 @@ class RedisConnector:
             create_group=create_group,
             maxlen=maxlen,
             approximate_trim=approximate_trim,
+            codec=codec,
+            compression=compression,
         )
 
     async def close(self) -> None:
@@ -188,6 +216,12 @@ class RedisStreamQueue(Source, Sink):
     and can be reclaimed via XCLAIM/XAUTOCLAIM.
     """
 
+    supports_bulk_ack = True
+    # A retried message stays in this consumer's PEL, which fetch() reads
+    # first; the delay stays inside retry() so the message is only handed
+    # out again once it has passed.
+    native_retry_delay = True
+
     def __init__(
         self,
         *,
@@ -202,6 +236,8 @@ class RedisStreamQueue(Source, Sink):
         create_group: bool,
         maxlen: int | None,
         approximate_trim: bool,
+        codec: str = DEFAULT_CODEC,
+        compression: str | None = None,
     ) -> None:
         Source.__init__(self, name)
         Sink.__init__(self, name)
@@ -215,8 +251,12 @@ class RedisStreamQueue(Source, Sink):
         self.create_group = create_group
         self.maxlen = maxlen
         self.approximate_trim = approximate_trim
+        self.codec = codec
+        self.compression = compression
+        self._envelope_format = envelope_format(codec, compression)
         self._redis: Any | None = None
         self._opened = False
+        self._leased: set[bytes | str] = set()
 
     def _connection_secrets(self) -> list[str]:
         """Secret-bearing config tokens used to scrub error messages."""
@@ -294,7 +334,9 @@ class RedisStreamQueue(Source, Sink):
                 block=0,  # Non-blocking for pending check
             )
 
-            pending_deliveries = self._process_messages(pending_messages)
+            # Messages still being handled (or waiting out a retry delay) are
+            # pending too; only hand out the ones nobody holds.
+            pending_deliveries = self._process_messages(pending_messages, skip_leased=True)
             if pending_deliveries:
                 return pending_deliveries
             
@@ -327,12 +369,49 @@ class RedisStreamQueue(Source, Sink):
             await self._reset_transport_state()
             raise connector_error from None
 
-    def _process_messages(self, messages: list) -> list[Delivery]:
+    async def ack_many(self, deliveries: Sequence[Delivery]) -> None:
+        """Acknowledge deliveries with one multi-ID XACK per client."""
+        groups: dict[int, list[RedisStreamDelivery]] = {}
+        for delivery in deliveries:
+            if not isinstance(delivery, RedisStreamDelivery):
+                await delivery.ack()
+                continue
+            groups.setdefault(id(delivery._redis), []).append(delivery)
+        for group in groups.values():
+            first = group[0]
+            try:
+                await first._redis.xack(
+                    first._stream,
+                    first._group,
+                    *(delivery._message_id for delivery in group),
+                )
+            finally:
+                for delivery in group:
+                    delivery._settle()
+
+    async def retry_many(
+        self,
+        deliveries: Sequence[Delivery],
+        *,
+        delay_s: float | None = None,
+    ) -> None:
+        """Leave every delivery in the PEL after a single shared delay."""
+        try:
+            if delay_s:
+                await asyncio.sleep(delay_s)
+        finally:
+            for delivery in deliveries:
+                if isinstance(delivery, RedisStreamDelivery):
+                    delivery._settle()
+
+    def _process_messages(self, messages: list, *, skip_leased: bool = False) -> list[Delivery]:
         """Process raw xreadgroup response into Delivery objects."""
         # xreadgroup returns: [[stream_name, [(id, data), ...]]]
         deliveries: list[Delivery] = []
         for stream_name, stream_messages in messages:
             for message_id, message_data in stream_messages:
+                if skip_leased and message_id in self._leased:
+                    continue
                 # message_data is dict of field -> value
                 # We expect {"body": json_encoded_envelope}
                 body = message_data.get(b"body") or message_data.get("body")
@@ -353,8 +432,10 @@ class RedisStreamQueue(Source, Sink):
                         group=self.group,
                         message_id=message_id,
                         envelope=envelope,
+                        leased=self._leased,
                     )
                 )
+                self._leased.add(message_id)
         
         return deliveries
 
@@ -368,7 +449,7 @@ class RedisStreamQueue(Source, Sink):
             # XADD stream * body json_encoded_envelope
             add_kwargs: dict[str, Any] = {
                 "name": self.name,
-                "fields": {"body": encode_envelope(envelope)},
+                "fields": {"body": encode_envelope(envelope, self._envelope_format)},
             }
             
             if self.maxlen is not None:
@@ -3,6 +3,7 @@ from __future__ import annotations
 from collections.abc import Mapping
 from typing import Any
 
+from onestep.connectors.codec import DEFAULT_CODEC, ENVELOPE_CODECS, ENVELOPE_COMPRESSIONS
 from onestep.resource_registry import (
     ResourceCatalogEntry,
     ResourceCatalogField,
@@ -29,6 +30,8 @@ _REDIS_STREAM_FIELDS = frozenset(
         "create_group",
         "maxlen",
         "approximate_trim",
+        "codec",
+        "compression",
     }
 )
 _REDIS_CATALOG = ResourceCatalogEntry(
@@ -63,6 +66,8 @@ _REDIS_STREAM_CATALOG = ResourceCatalogEntry(
         ResourceCatalogField("create_group", "boolean", default=True),
         ResourceCatalogField("maxlen", "integer"),
         ResourceCatalogField("approximate_trim", "boolean", default=True),
+        ResourceCatalogField("codec", "string", default="json", options=ENVELOPE_CODECS),
+        ResourceCatalogField("compression", "string", options=ENVELOPE_COMPRESSIONS),
     ),
     topology_fields=("stream", "group", "consumer", "batch_size", "poll_interval_s"),
 )
@@ -109,4 +114,6 @@ def _build_redis_stream(ctx: ResourceBuildContext, spec: Mapping[str, Any]) -> A
         create_group=spec.get("create_group", True),
         maxlen=spec.get("maxlen"),
         approximate_trim=spec.get("approximate_trim", True),
+        codec=spec.get("codec", DEFAULT_CODEC),
+        compression=spec.get("compression"),
     )
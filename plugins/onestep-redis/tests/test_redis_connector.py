@@ -1,4 +1,7 @@
 """Unit tests for Redis Streams connector."""
+import asyncio
+import time
+
 import pytest
 from unittest.mock import AsyncMock, patch
 
@@ -107,6 +110,33 @@ class TestRedisStreamQueue:
                 "test-stream", "test-group", b"123-0"
             )
 
+    @pytest.mark.asyncio
+    async def test_ack_many_issues_one_multi_id_xack(self):
+        """Should acknowledge a batch of deliveries with a single XACK."""
+        from onestep.envelope import Envelope
+
+        connector = RedisConnector("redis://localhost")
+        stream = connector.stream("test-stream", group="test-group")
+
+        mock_redis = AsyncMock()
+        mock_redis.xack = AsyncMock()
+        deliveries = [
+            RedisStreamDelivery(
+                redis=mock_redis,
+                stream="test-stream",
+                group="test-group",
+                message_id=message_id,
+                envelope=Envelope(body={}),
+            )
+            for message_id in (b"1-0", b"2-0", b"3-0")
+        ]
+
+        await stream.ack_many(deliveries)
+
+        mock_redis.xack.assert_called_once_with(
+            "test-stream", "test-group", b"1-0", b"2-0", b"3-0"
+        )
+
     @pytest.mark.asyncio
     async def test_fetch_empty(self):
         """Should return empty list when no messages."""
@@ -266,3 +296,70 @@ class TestRedisStreamQueue:
                     "block": 1000,
                 },
             ]
+
+
+class FakeStreamRedis:
+    """A single-consumer stream with a pending entries list."""
+
+    def __init__(self):
+        self.entries = []
+        self.cursor = 0
+        self.pending = {}
+        self.pending_reads = 0
+
+    async def xgroup_create(self, *args, **kwargs):
+        return None
+
+    async def xadd(self, name, fields, **kwargs):
+        message_id = f"{len(self.entries) + 1}-0".encode()
+        self.entries.append((message_id, {b"body": fields["body"]}))
+        return message_id
+
+    async def xreadgroup(self, groupname, consumername, streams, count, block):
+        [(stream, position)] = streams.items()
+        if position == "0":
+            self.pending_reads += 1
+            return [[stream.encode(), list(self.pending.items())[:count]]]
+        fresh = self.entries[self.cursor : self.cursor + count]
+        self.cursor += len(fresh)
+        self.pending.update(fresh)
+        if not fresh:
+            await asyncio.sleep(block / 1000)
+            return []
+        return [[stream.encode(), fresh]]
+
+    async def xack(self, stream, group, *message_ids):
+        for message_id in message_ids:
+            self.pending.pop(message_id, None)
+
+
+def test_delayed_retry_is_not_redelivered_from_the_pel_before_its_delay():
+    from onestep import MaxAttempts, OneStepApp
+
+    async def scenario():
+        redis = FakeStreamRedis()
+        connector = RedisConnector("redis://localhost")
+        stream = connector.stream("jobs", consumer="consumer-1", block_ms=5, poll_interval_s=0.01)
+        app = OneStepApp("redis-delayed-retry")
+        calls = []
+
+        @app.task(source=stream, concurrency=4, retry=MaxAttempts(3, delay_s=0.2))
+        async def handle(ctx, payload):
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                raise RuntimeError("try again later")
+            ctx.app.request_shutdown()
+
+        with patch.object(connector, "acquire", return_value=redis), patch.object(
+            connector, "release", AsyncMock()
+        ):
+            await stream.publish({"job": 1})
+            await asyncio.wait_for(app.serve(), timeout=2)
+
+        assert len(calls) == 2
+        assert calls[1] - calls[0] >= 0.19
+        # Free slots kept polling the PEL while the retry waited.
+        assert redis.pending_reads > 2
+        assert redis.pending == {}
+
+    asyncio.run(scenario())
@@ -241,8 +241,13 @@ class PostgresTableQueueDelivery(Delivery):
         await self._source.release_row(self._row_ref)
 
 
+def _row_refs(deliveries: Sequence[Delivery]) -> list[_TableRowRef]:
+    return [delivery._row_ref for delivery in deliveries if isinstance(delivery, PostgresTableQueueDelivery)]
+
+
 class PostgresTableQueueSource(Source):
     fetch_is_cancel_safe = False
+    supports_bulk_ack = True
 
     def __init__(
         self,
@@ -322,6 +327,35 @@ class PostgresTableQueueSource(Source):
     async def release_row(self, row_ref: _TableRowRef) -> None:
         await self.update_row(row_ref, self.nack)
 
+    async def ack_many(self, deliveries: Sequence[Delivery]) -> None:
+        await self.update_rows(_row_refs(deliveries), self.ack)
+
+    async def retry_many(
+        self,
+        deliveries: Sequence[Delivery],
+        *,
+        delay_s: float | None = None,
+    ) -> None:
+        if delay_s:
+            await asyncio.sleep(delay_s)
+        await self.update_rows(_row_refs(deliveries), self.nack)
+
+    async def update_rows(
+        self,
+        row_refs: Sequence[_TableRowRef],
+        values: Mapping[str, Any],
+    ) -> None:
+        """Apply ``values`` to every referenced row with one ``UPDATE ... WHERE key IN``."""
+        if not values or not row_refs:
+            return
+        table = await self.connector._table(row_refs[0].table)
+        async with self.connector.engine.begin() as conn:
+            await conn.execute(
+                sa.update(table)
+                .where(table.c[row_refs[0].key].in_([row_ref.key_value for row_ref in row_refs]))
+                .values(**dict(values))
+            )
+
     async def update_row(self, row_ref: _TableRowRef, values: Mapping[str, Any]) -> None:
         if not values:
             return
@@ -363,6 +397,9 @@ class IncrementalDelivery(Delivery):
 
 
 class PostgresIncrementalSource(Source):
+    # Retried rows carry their own ``ready_at`` and are re-emitted by fetch.
+    native_retry_delay = True
+
     def __init__(
         self,
         *,
@@ -651,6 +688,9 @@ logger = logging.getLogger(__name__)
 
 
 class PostgresTableSink(TableSinkUpdatePolicy, Sink):
+    # _send_many runs the whole batch in one transaction.
+    send_many_is_atomic = True
+
     def __init__(
         self,
         *,
@@ -704,25 +744,55 @@ class PostgresTableSink(TableSinkUpdatePolicy, Sink):
                 raise
             raise connector_error from None
 
+    async def send_many(self, envelopes: Sequence[Envelope]) -> None:
+        payloads: list[dict[str, Any]] = []
+        for envelope in envelopes:
+            if not isinstance(envelope.body, Mapping):
+                raise TypeError("PostgresTableSink only accepts mapping payloads")
+            payloads.append(dict(envelope.body))
+        try:
+            await self._send_many(payloads)
+        except Exception as exc:
+            connector_error = as_postgres_connector_operation_error(
+                operation=ConnectorOperation.SEND,
+                exc=exc,
+                source_name=self.name,
+                retry_delay_s=1.0,
+                secrets=self.connector.secret_tokens(),
+            )
+            if connector_error is None:
+                raise
+            raise connector_error from None
+
     async def _send(self, payload: dict[str, Any]) -> None:
+        await self._send_many([payload])
+
+    async def _send_many(self, payloads: Sequence[dict[str, Any]]) -> None:
+        # Every statement of a batch runs inside one transaction so a
+        # BatchingSink pays a single commit round trip for N deliveries.
         table = await self.connector._table(self.table_name)
-        stmt = self._build_statement(payload, table)
-        if stmt is None:
-            logger.info(
-                "postgres table sink %s skipped write: all update columns are null under "
-                "skip_null policy (keys=%s)",
-                self.name,
-                {key: payload.get(key) for key in self.keys},
-            )
-            return
-        async with self.connector.engine.begin() as conn:
-            result = await conn.execute(stmt)
-            if self.mode == "update" and result.rowcount == 0:
+        statements = [(payload, self._build_statement(payload, table)) for payload in payloads]
+        for payload, stmt in statements:
+            if stmt is None:
                 logger.info(
-                    "postgres table sink %s update matched no rows (keys=%s)",
+                    "postgres table sink %s skipped write: all update columns are null under "
+                    "skip_null policy (keys=%s)",
                     self.name,
                     {key: payload.get(key) for key in self.keys},
                 )
+        if all(stmt is None for _, stmt in statements):
+            return
+        async with self.connector.engine.begin() as conn:
+            for payload, stmt in statements:
+                if stmt is None:
+                    continue
+                result = await conn.execute(stmt)
+                if self.mode == "update" and result.rowcount == 0:
+                    logger.info(
+                        "postgres table sink %s update matched no rows (keys=%s)",
+                        self.name,
+                        {key: payload.get(key) for key in self.keys},
+                    )
 
     def _build_statement(self, payload: dict[str, Any], table: sa.Table) -> Any | None:
         payload = self._coerce_json_values(payload, table)
@@ -100,6 +100,8 @@ def _validate_execution_source_options(
 
 class PostgresExecutionSource(Source):
     fetch_is_cancel_safe = False
+    # Retry delays are persisted as the execution's next available time.
+    native_retry_delay = True
 
     def __init__(
         self,
@@ -223,6 +225,9 @@ class PostgresExecutionSource(Source):
     async def open(self) -> None:
         await self.backend.open()
 
+    def lease_timeout_s(self) -> float | None:
+        return self.lease_duration_s
+
     async def fetch(self, limit: int) -> list[Delivery]:
         try:
             leases = await self.backend.claim(
@@ -1,22 +1,35 @@
 from __future__ import annotations
 
 import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from typing import Any
 
 from onestep.envelope import Envelope
-from onestep.resilience import ConnectorOperation, ConnectorOperationError
+from onestep.resilience import ConnectorBatchError, ConnectorOperation, ConnectorOperationError
 
 from onestep.connectors.base import Delivery, Sink, Source
-from onestep.connectors.codec import decode_envelope, encode_envelope
+from onestep.connectors.codec import DEFAULT_CODEC, decode_envelope, encode_envelope_text, envelope_format
 
-from .resilience import as_sqs_connector_operation_error, collect_sensitive_tokens
+from .resilience import (
+    as_sqs_batch_entry_error,
+    as_sqs_connector_operation_error,
+    collect_sensitive_tokens,
+)
 
 try:  # pragma: no cover - optional dependency
     import boto3
 except ImportError:  # pragma: no cover - optional dependency
     boto3 = None
 
+# SQS caps every batch call at ten entries and a send batch at 256 KiB of
+# message bodies and attributes in total.
+_MAX_BATCH_ENTRIES = 10
+_MAX_BATCH_BYTES = 262_144
+
 
 class SQSDelivery(Delivery):
     def __init__(self, queue: "SQSQueue", message: dict[str, Any]) -> None:
@@ -113,6 +126,9 @@ class SQSConnector:
         delete_flush_interval_s: float = 0.5,
         heartbeat_interval_s: float | None = None,
         heartbeat_visibility_timeout: int | None = None,
+        codec: str = DEFAULT_CODEC,
+        compression: str | None = None,
+        receivers: int = 1,
     ) -> "SQSQueue":
         if on_fail not in {"leave", "release", "delete"}:
             raise ValueError("on_fail must be one of: leave, release, delete")
@@ -130,6 +146,9 @@ class SQSConnector:
             delete_flush_interval_s=delete_flush_interval_s,
             heartbeat_interval_s=heartbeat_interval_s,
             heartbeat_visibility_timeout=heartbeat_visibility_timeout,
+            codec=codec,
+            compression=compression,
+            receivers=receivers,
         )
 
     def get_client(self) -> Any:
@@ -147,6 +166,9 @@ class SQSConnector:
 
 class SQSQueue(Source, Sink):
     fetch_is_cancel_safe = False
+    supports_bulk_ack = True
+    # Retry delays map onto the message visibility timeout.
+    native_retry_delay = True
 
     def __init__(
         self,
@@ -164,6 +186,9 @@ class SQSQueue(Source, Sink):
         delete_flush_interval_s: float,
         heartbeat_interval_s: float | None,
         heartbeat_visibility_timeout: int | None,
+        codec: str = DEFAULT_CODEC,
+        compression: str | None = None,
+        receivers: int = 1,
     ) -> None:
         Source.__init__(self, url)
         Sink.__init__(self, url)
@@ -171,6 +196,8 @@ class SQSQueue(Source, Sink):
             raise ValueError("batch_size must be between 1 and 10 for SQS")
         if delete_batch_size < 1 or delete_batch_size > 10:
             raise ValueError("delete_batch_size must be between 1 and 10 for SQS")
+        if receivers < 1:
+            raise ValueError("receivers must be >= 1")
         self.connector = connector
         self.url = url
         self.wait_time_s = wait_time_s
@@ -188,12 +215,22 @@ class SQSQueue(Source, Sink):
             if heartbeat_visibility_timeout is not None
             else visibility_timeout or 60
         )
+        self.receivers = receivers
+        self.codec = codec
+        self.compression = compression
+        # SQS bodies are text, so framed codecs are base64-wrapped.
+        self._envelope_format = envelope_format(codec, compression)
         self.client: Any | None = None
         self._pending_delete: list[dict[str, str]] = []
         self._delete_lock: asyncio.Lock | None = None
         self._delete_flusher_task: asyncio.Task[None] | None = None
         self._loop: asyncio.AbstractEventLoop | None = None
         self._delete_counter = 0
+        # With ``receivers > 1`` receive calls that were still long-polling
+        # when a fetch returned keep running; their messages wait here for
+        # the next fetch, stamped with the monotonic time they arrived.
+        self._receive_calls: set[asyncio.Task[tuple[float, list[dict[str, Any]]]]] = set()
+        self._received: deque[tuple[float, dict[str, Any]]] = deque()
 
     async def open(self) -> None:
         try:
@@ -222,25 +259,24 @@ class SQSQueue(Source, Sink):
             except asyncio.CancelledError:
                 pass
             self._delete_flusher_task = None
+        await self._release_received()
         if self._delete_lock is not None:
             async with self._delete_lock:
                 await self._flush_locked()
         self.client = None
 
+    def lease_timeout_s(self) -> float | None:
+        # Without an explicit timeout the queue's own default applies, which
+        # is not known here.
+        return None if self.visibility_timeout is None else float(self.visibility_timeout)
+
     async def fetch(self, limit: int) -> list[Delivery]:
         try:
             await self.open()
-            params = {
-                "QueueUrl": self.url,
-                "MaxNumberOfMessages": max(1, min(limit, self.batch_size, 10)),
-                "WaitTimeSeconds": self.wait_time_s,
-                "MessageAttributeNames": ["All"],
-                "AttributeNames": ["All"],
-            }
-            if self.visibility_timeout is not None:
-                params["VisibilityTimeout"] = self.visibility_timeout
-            response = await asyncio.to_thread(self.client.receive_message, **params)
-            messages = response.get("Messages", [])
+            if self.receivers > 1:
+                messages = await self._receive_pooled(max(1, limit))
+            else:
+                messages = await self._receive(max(1, min(limit, self.batch_size)))
             return [SQSDelivery(self, message) for message in messages]
         except ConnectorOperationError:
             raise
@@ -259,18 +295,11 @@ class SQSQueue(Source, Sink):
     async def send(self, envelope: Envelope) -> None:
         try:
             await self.open()
-            params = {
-                "QueueUrl": self.url,
-                "MessageBody": encode_envelope(envelope).decode("utf-8"),
-            }
-            if self.url.endswith(".fifo"):
-                group_id = self.message_group_id
-                if not group_id:
-                    raise ValueError("FIFO SQS queues require message_group_id")
-                params["MessageGroupId"] = group_id
-                if self.deduplication_id_factory is not None:
-                    params["MessageDeduplicationId"] = self.deduplication_id_factory(envelope)
-            await asyncio.to_thread(self.client.send_message, **params)
+            await asyncio.to_thread(
+                self.client.send_message,
+                QueueUrl=self.url,
+                **self._message_params(envelope),
+            )
         except ConnectorOperationError:
             raise
         except Exception as exc:
@@ -285,19 +314,278 @@ class SQSQueue(Source, Sink):
                 raise
             raise connector_error from None
 
+    async def send_many(self, envelopes: Sequence[Envelope]) -> None:
+        """Send with ``send_message_batch``, grouping by entry count and body size.
+
+        Each call carries at most ten messages and 256 KiB of bodies. Entries
+        SQS rejects are classified one by one from their error code and raised
+        together as a ``ConnectorBatchError`` keyed by position in
+        ``envelopes``, after the remaining batches were sent.
+        """
+        if not envelopes:
+            return
+        errors: dict[int, ConnectorOperationError] = {}
+        try:
+            await self.open()
+            for entries in self._send_batches(envelopes):
+                response = await asyncio.to_thread(
+                    self.client.send_message_batch,
+                    QueueUrl=self.url,
+                    Entries=entries,
+                )
+                failed = response.get("Failed", []) if isinstance(response, dict) else []
+                for item in failed:
+                    if not isinstance(item, dict) or not str(item.get("Id", "")).startswith("msg_"):
+                        continue
+                    errors[int(item["Id"][4:])] = as_sqs_batch_entry_error(
+                        operation=ConnectorOperation.SEND,
+                        entry=item,
+                        source_name=self.name,
+                        retry_delay_s=max(self.poll_interval_s, float(self.wait_time_s)),
+                        secrets=self.connector._secret_tokens(),
+                    )
+        except ConnectorOperationError:
+            raise
+        except Exception as exc:
+            connector_error = as_sqs_connector_operation_error(
+                operation=ConnectorOperation.SEND,
+                exc=exc,
+                source_name=self.name,
+                retry_delay_s=max(self.poll_interval_s, float(self.wait_time_s)),
+                secrets=self.connector._secret_tokens(),
+            )
+            if connector_error is None:
+                raise
+            raise connector_error from None
+        if errors:
+            raise ConnectorBatchError(
+                errors,
+                message=f"SQS batch send partially failed for {len(errors)} entries"
+                f" ({len(envelopes) - len(errors)} succeeded)",
+            )
+
+    def _message_params(self, envelope: Envelope) -> dict[str, Any]:
+        params: dict[str, Any] = {
+            "MessageBody": encode_envelope_text(envelope, self._envelope_format),
+        }
+        if self.url.endswith(".fifo"):
+            group_id = self.message_group_id
+            if not group_id:
+                raise ValueError("FIFO SQS queues require message_group_id")
+            params["MessageGroupId"] = group_id
+            if self.deduplication_id_factory is not None:
+                params["MessageDeduplicationId"] = self.deduplication_id_factory(envelope)
+        return params
+
+    def _send_batches(self, envelopes: Sequence[Envelope]) -> list[list[dict[str, Any]]]:
+        batches: list[list[dict[str, Any]]] = []
+        entries: list[dict[str, Any]] = []
+        batch_bytes = 0
+        for index, envelope in enumerate(envelopes):
+            entry = {"Id": f"msg_{index}", **self._message_params(envelope)}
+            size = len(entry["MessageBody"].encode("utf-8"))
+            # A body over the limit on its own still goes out alone, so SQS
+            # reports it instead of it being dropped here.
+            if entries and (
+                len(entries) >= _MAX_BATCH_ENTRIES or batch_bytes + size > _MAX_BATCH_BYTES
+            ):
+                batches.append(entries)
+                entries = []
+                batch_bytes = 0
+            entries.append(entry)
+            batch_bytes += size
+        if entries:
+            batches.append(entries)
+        return batches
+
+    async def _receive(self, max_messages: int) -> list[dict[str, Any]]:
+        params = {
+            "QueueUrl": self.url,
+            "MaxNumberOfMessages": max(1, min(max_messages, _MAX_BATCH_ENTRIES)),
+            "WaitTimeSeconds": self.wait_time_s,
+            "MessageAttributeNames": ["All"],
+            "AttributeNames": ["All"],
+        }
+        if self.visibility_timeout is not None:
+            params["VisibilityTimeout"] = self.visibility_timeout
+        response = await asyncio.to_thread(self.client.receive_message, **params)
+        return response.get("Messages", [])
+
+    async def _receive_timed(self, max_messages: int) -> tuple[float, list[dict[str, Any]]]:
+        messages = await self._receive(max_messages)
+        return time.monotonic(), messages
+
+    async def _receive_pooled(self, limit: int) -> list[dict[str, Any]]:
+        self._ensure_runtime_state()
+        received = self._received
+        calls = self._receive_calls
+        await self._release_expired()
+        # Start enough receive calls (up to ``receivers`` at once) to cover
+        # ``limit`` beyond what is already received or being received.
+        missing = limit - len(received) - len(calls) * self.batch_size
+        for _ in range(min(self.receivers - len(calls), math.ceil(max(0, missing) / self.batch_size))):
+            calls.add(asyncio.create_task(self._receive_timed(self.batch_size)))
+        if not received and calls:
+            # Return with the first call that finishes rather than the
+            # slowest: an idle long poll would otherwise hold up messages
+            # the other calls already have.
+            await asyncio.wait(set(calls), return_when=asyncio.FIRST_COMPLETED)
+        error: BaseException | None = None
+        for call in [call for call in calls if call.done()]:
+            calls.discard(call)
+            if call.cancelled():
+                continue
+            if call.exception() is not None:
+                error = error or call.exception()
+                continue
+            received_at, messages = call.result()
+            received.extend((received_at, message) for message in messages)
+        await self._release_expired()
+        if not received and error is not None:
+            raise error
+        # With messages in hand a failed call is dropped; the next fetch
+        # reports the error again if the backend is still failing.
+        return [received.popleft()[1] for _ in range(min(limit, len(received)))]
+
+    async def _release_expired(self) -> None:
+        # A buffered message has no heartbeat: once it has waited out its
+        # visibility timeout SQS may already have handed it to another
+        # consumer, so it is released instead of handed to a task.
+        lease_timeout_s = self.lease_timeout_s()
+        if lease_timeout_s is None or not self._received:
+            return
+        deadline = time.monotonic() - lease_timeout_s
+        expired = [message for received_at, message in self._received if received_at <= deadline]
+        if not expired:
+            return
+        kept = [item for item in self._received if item[0] > deadline]
+        self._received.clear()
+        self._received.extend(kept)
+        try:
+            await self.change_visibility_many(expired, 0)
+        except Exception:
+            # Expired receipt handles may be rejected; those messages are
+            # visible again already.
+            return
+
+    async def _release_received(self) -> None:
+        if self._loop is not asyncio.get_running_loop():
+            # State left by another event loop cannot be awaited from here.
+            self._receive_calls = set()
+            self._received = deque()
+            return
+        calls, self._receive_calls = self._receive_calls, set()
+        messages = [message for _, message in self._received]
+        self._received.clear()
+        if calls:
+            # Receive calls run in threads and cannot be interrupted; wait
+            # for them so their messages are released rather than left
+            # invisible until the visibility timeout.
+            results = await asyncio.gather(*calls, return_exceptions=True)
+            for result in results:
+                if isinstance(result, tuple):
+                    messages.extend(result[1])
+        if not messages or self.client is None:
+            return
+        try:
+            await self.change_visibility_many(messages, 0)
+        except Exception:
+            # Unreleased messages become visible again after their timeout.
+            return
+
+    async def ack_many(self, deliveries: Sequence[Delivery]) -> None:
+        sqs_deliveries = [delivery for delivery in deliveries if isinstance(delivery, SQSDelivery)]
+        for delivery in sqs_deliveries:
+            await delivery._stop_heartbeat()
+        await self.stage_delete_many([delivery._message for delivery in sqs_deliveries])
+
+    async def retry_many(
+        self,
+        deliveries: Sequence[Delivery],
+        *,
+        delay_s: float | None = None,
+    ) -> None:
+        sqs_deliveries = [delivery for delivery in deliveries if isinstance(delivery, SQSDelivery)]
+        for delivery in sqs_deliveries:
+            await delivery._stop_heartbeat()
+        timeout = 0 if delay_s is None else max(0, int(delay_s))
+        try:
+            await self.change_visibility_many(
+                [delivery._message for delivery in sqs_deliveries],
+                timeout,
+            )
+        except ConnectorBatchError as exc:
+            # Positions refer to the SQS deliveries; report them against the
+            # batch the caller passed in.
+            positions = [
+                index for index, delivery in enumerate(deliveries) if isinstance(delivery, SQSDelivery)
+            ]
+            raise ConnectorBatchError(
+                {positions[index]: error for index, error in exc.errors.items()},
+                message=str(exc),
+            ) from None
+
     async def stage_delete(self, message: dict[str, Any]) -> None:
+        await self.stage_delete_many([message])
+
+    async def stage_delete_many(self, messages: Sequence[dict[str, Any]]) -> None:
         await self.open()
         lock = self._ensure_runtime_state()
         async with lock:
-            self._delete_counter += 1
-            entry = {
-                "Id": f"msg_{self._delete_counter}",
-                "ReceiptHandle": message["ReceiptHandle"],
-            }
-            self._pending_delete.append(entry)
+            for message in messages:
+                self._delete_counter += 1
+                entry = {
+                    "Id": f"msg_{self._delete_counter}",
+                    "ReceiptHandle": message["ReceiptHandle"],
+                }
+                self._pending_delete.append(entry)
             if len(self._pending_delete) >= self.delete_batch_size or self.delete_flush_interval_s <= 0:
                 await self._flush_locked()
 
+    async def change_visibility_many(
+        self,
+        messages: Sequence[dict[str, Any]],
+        timeout: int,
+    ) -> None:
+        """Change visibility with ``change_message_visibility_batch`` (10 entries per call).
+
+        Entries SQS rejects are classified one by one from their error code
+        and raised together as a ``ConnectorBatchError`` keyed by position in
+        ``messages``, after the remaining calls were made.
+        """
+        await self.open()
+        errors: dict[int, ConnectorOperationError] = {}
+        for start in range(0, len(messages), 10):
+            entries = [
+                {
+                    "Id": f"msg_{index}",
+                    "ReceiptHandle": message["ReceiptHandle"],
+                    "VisibilityTimeout": timeout,
+                }
+                for index, message in enumerate(messages[start : start + 10], start)
+            ]
+            response = await asyncio.to_thread(
+                self.client.change_message_visibility_batch,
+                QueueUrl=self.url,
+                Entries=entries,
+            )
+            failed = response.get("Failed", []) if isinstance(response, dict) else []
+            for item in failed:
+                if not isinstance(item, dict) or not str(item.get("Id", "")).startswith("msg_"):
+                    continue
+                errors[int(item["Id"][4:])] = as_sqs_batch_entry_error(
+                    operation=ConnectorOperation.RETRY,
+                    entry=item,
+                    source_name=self.name,
+                    secrets=self.connector._secret_tokens(),
+                )
+        if errors:
+            raise ConnectorBatchError(
+                errors,
+                message=f"SQS batch visibility change partially failed for {len(errors)} entries"
+                f" ({len(messages) - len(errors)} succeeded)",
+            )
+
     async def flush_deletes(self) -> None:
         await self.open()
         lock = self._ensure_runtime_state()
@@ -312,6 +600,8 @@ class SQSQueue(Source, Sink):
             self._pending_delete = []
             self._delete_flusher_task = None
             self._delete_counter = 0
+            self._receive_calls = set()
+            self._received = deque()
         return self._delete_lock
 
     async def _delete_flush_loop(self) -> None:
@@ -90,29 +90,55 @@ def classify_sqs_error(exc: BaseException) -> ConnectorErrorKind | None:
 
     client_error = getattr(botocore_exceptions, "ClientError", None)
     if isinstance(client_error, type) and isinstance(exc, client_error):
-        code = str(exc.response.get("Error", {}).get("Code", "")).lower()
-        if code in {
-            "throttling",
-            "throttlingexception",
-            "requestthrottled",
-            "toomanyrequestsexception",
-            "slowdown",
-        }:
-            return ConnectorErrorKind.THROTTLED
-        if code in {"requesttimeout", "internalerror", "serviceunavailable"}:
-            return ConnectorErrorKind.TRANSIENT
-        if code in {
-            "accessdenied",
-            "accessdeniedexception",
-            "invalidclienttokenid",
-            "signaturedoesnotmatch",
-            "aws.simplequeueservice.nonexistentqueue",
-        }:
-            return ConnectorErrorKind.MISCONFIGURED
-        return ConnectorErrorKind.PERMANENT
+        return classify_sqs_error_code(str(exc.response.get("Error", {}).get("Code", "")))
     return None
 
 
+def classify_sqs_error_code(code: str) -> ConnectorErrorKind:
+    """Classify an SQS error code, from a ``ClientError`` or a failed batch entry."""
+    code = code.lower()
+    if code in {
+        "throttling",
+        "throttlingexception",
+        "requestthrottled",
+        "toomanyrequestsexception",
+        "slowdown",
+    }:
+        return ConnectorErrorKind.THROTTLED
+    if code in {"requesttimeout", "internalerror", "serviceunavailable"}:
+        return ConnectorErrorKind.TRANSIENT
+    if code in {
+        "accessdenied",
+        "accessdeniedexception",
+        "invalidclienttokenid",
+        "signaturedoesnotmatch",
+        "aws.simplequeueservice.nonexistentqueue",
+    }:
+        return ConnectorErrorKind.MISCONFIGURED
+    return ConnectorErrorKind.PERMANENT
+
+
+def as_sqs_batch_entry_error(
+    *,
+    operation: ConnectorOperation,
+    entry: Mapping[str, object],
+    source_name: str | None = None,
+    retry_delay_s: float | None = None,
+    secrets: list[str] | None = None,
+) -> ConnectorOperationError:
+    """Build the error for one entry of a batch response's ``Failed`` list."""
+    code = str(entry.get("Code", ""))
+    message = str(entry.get("Message", "")) or code
+    return ConnectorOperationError(
+        backend="sqs",
+        operation=operation,
+        kind=classify_sqs_error_code(code),
+        source_name=source_name,
+        retry_delay_s=retry_delay_s,
+        cause=SQSErrorCause(_redact_message(f"{code}: {message}", secrets or [])),
+    )
+
+
 def as_sqs_connector_operation_error(
     *,
     operation: ConnectorOperation,
@@ -3,6 +3,7 @@ from __future__ import annotations
 from collections.abc import Mapping
 from typing import Any
 
+from onestep.connectors.codec import DEFAULT_CODEC, ENVELOPE_CODECS, ENVELOPE_COMPRESSIONS
 from onestep.resource_registry import (
     ResourceCatalogEntry,
     ResourceCatalogField,
@@ -46,6 +47,9 @@ _SQS_QUEUE_FIELDS = frozenset(
         "delete_flush_interval_s",
         "heartbeat_interval_s",
         "heartbeat_visibility_timeout",
+        "codec",
+        "compression",
+        "receivers",
     }
 )
 _SQS_CATALOG = ResourceCatalogEntry(
@@ -77,6 +81,9 @@ _SQS_QUEUE_CATALOG = ResourceCatalogEntry(
         ResourceCatalogField("delete_flush_interval_s", "number", default=0.5),
         ResourceCatalogField("heartbeat_interval_s", "number"),
         ResourceCatalogField("heartbeat_visibility_timeout", "integer"),
+        ResourceCatalogField("codec", "string", default="json", options=ENVELOPE_CODECS),
+        ResourceCatalogField("compression", "string", options=ENVELOPE_COMPRESSIONS),
+        ResourceCatalogField("receivers", "integer", default=1),
     ),
     topology_fields=("url", "wait_time_s", "visibility_timeout", "batch_size", "poll_interval_s"),
 )
@@ -170,6 +177,9 @@ def _build_sqs_queue(ctx: ResourceBuildContext, spec: Mapping[str, Any]) -> Any:
         delete_flush_interval_s=spec.get("delete_flush_interval_s", 0.5),
         heartbeat_interval_s=spec.get("heartbeat_interval_s"),
         heartbeat_visibility_timeout=spec.get("heartbeat_visibility_timeout"),
+        codec=spec.get("codec", DEFAULT_CODEC),
+        compression=spec.get("compression"),
+        receivers=spec.get("receivers", 1),
     )
 
 
@@ -1,6 +1,14 @@
 import asyncio
-
-from onestep import ConnectorOperation, ConnectorOperationError
+import threading
+import time
+
+from onestep import (
+    ConnectorBatchError,
+    ConnectorErrorKind,
+    ConnectorOperation,
+    ConnectorOperationError,
+    Envelope,
+)
 from onestep_sqs import SQSConnector
 
 
@@ -11,7 +19,10 @@ class FakeSQSClient:
         self.deleted = []
         self.deleted_batches = []
         self.visibility_changes = []
+        self.visibility_batches = []
+        self.visibility_failures = {}
         self.sent = []
+        self.sent_batches = []
         self._counter = 0
 
     def send_message(self, **kwargs):
@@ -26,6 +37,12 @@ class FakeSQSClient:
         self.available.append(message)
         return {"MessageId": message["MessageId"]}
 
+    def send_message_batch(self, QueueUrl, Entries):
+        self.sent_batches.append(Entries)
+        for entry in Entries:
+            self.send_message(QueueUrl=QueueUrl, **{k: v for k, v in entry.items() if k != "Id"})
+        return {"Successful": [{"Id": entry["Id"]} for entry in Entries], "Failed": []}
+
     def receive_message(self, **kwargs):
         take = kwargs["MaxNumberOfMessages"]
         messages = []
@@ -56,6 +73,20 @@ class FakeSQSClient:
             self.available.append(message)
             self.inflight.pop(ReceiptHandle, None)
 
+    def change_message_visibility_batch(self, QueueUrl, Entries):
+        self.visibility_batches.append((QueueUrl, Entries))
+        successful, failed = [], []
+        for entry in Entries:
+            code = self.visibility_failures.get(entry["ReceiptHandle"])
+            if code is not None:
+                failed.append({"Id": entry["Id"], "SenderFault": True, "Code": code, "Message": "rejected"})
+                continue
+            self.change_message_visibility(
+                QueueUrl, entry["ReceiptHandle"], entry["VisibilityTimeout"]
+            )
+            successful.append({"Id": entry["Id"]})
+        return {"Successful": successful, "Failed": failed}
+
 
 def test_sqs_queue_fetch_is_not_cancel_safe():
     connector = SQSConnector(region_name="ap-southeast-1", client=FakeSQSClient())
@@ -131,6 +162,76 @@ def test_sqs_delivery_release_unstarted_stops_heartbeat():
     asyncio.run(scenario())
 
 
+def test_sqs_queue_settles_deliveries_in_bulk():
+    async def scenario():
+        client = FakeSQSClient()
+        for index in range(4):
+            client.available.append(
+                {
+                    "MessageId": f"msg-{index}",
+                    "ReceiptHandle": f"rh-{index}",
+                    "Body": '{"value": 1}',
+                }
+            )
+        connector = SQSConnector(region_name="ap-southeast-1", client=client)
+        queue = connector.queue(
+            "https://sqs.ap-southeast-1.amazonaws.com/123456789/jobs",
+            wait_time_s=0,
+            delete_batch_size=2,
+            delete_flush_interval_s=0,
+        )
+        deliveries = await queue.fetch(4)
+
+        await queue.ack_many(deliveries[:2])
+        await queue.retry_many(deliveries[2:], delay_s=15)
+
+        assert len(client.deleted_batches) == 1
+        assert [receipt for _, receipt in client.deleted] == ["rh-0", "rh-1"]
+        assert len(client.visibility_batches) == 1
+        assert [entry["VisibilityTimeout"] for entry in client.visibility_batches[0][1]] == [15, 15]
+
+    asyncio.run(scenario())
+
+
+def test_sqs_queue_retry_many_classifies_each_rejected_entry():
+    async def scenario():
+        client = FakeSQSClient()
+        for index in range(12):
+            client.available.append(
+                {
+                    "MessageId": f"msg-{index}",
+                    "ReceiptHandle": f"rh-{index}",
+                    "Body": '{"value": 1}',
+                }
+            )
+        client.visibility_failures = {"rh-3": "ReceiptHandleIsInvalid", "rh-11": "InternalError"}
+        connector = SQSConnector(region_name="ap-southeast-1", client=client)
+        queue = connector.queue(
+            "https://sqs.ap-southeast-1.amazonaws.com/123456789/jobs",
+            wait_time_s=0,
+            batch_size=10,
+        )
+        deliveries = await queue.fetch(10) + await queue.fetch(10)
+
+        try:
+            await queue.retry_many(deliveries, delay_s=5)
+        except ConnectorBatchError as exc:
+            errors = exc.errors
+        else:
+            raise AssertionError("retry_many should report the rejected entries")
+
+        assert sorted(errors) == [3, 11]
+        assert all(isinstance(error, ConnectorOperationError) for error in errors.values())
+        assert errors[3].operation is ConnectorOperation.RETRY
+        assert errors[3].kind is ConnectorErrorKind.PERMANENT
+        assert errors[11].kind is ConnectorErrorKind.TRANSIENT
+        assert "InternalError" in str(errors[11].cause)
+        assert len(client.visibility_batches) == 2
+        assert len(client.visibility_changes) == 10
+
+    asyncio.run(scenario())
+
+
 def test_sqs_delivery_exposes_system_message_metadata():
     async def scenario():
         client = FakeSQSClient()
@@ -361,6 +462,198 @@ def test_sqs_queue_send_fetch_batch_delete_and_fail_delete():
     asyncio.run(scenario())
 
 
+def test_sqs_queue_reads_compressed_and_plain_json_producers():
+    async def scenario():
+        client = FakeSQSClient()
+        connector = SQSConnector(region_name="ap-southeast-1", client=client)
+        url = "https://sqs.ap-southeast-1.amazonaws.com/123456789/jobs"
+        compressed = connector.queue(url, wait_time_s=0, codec="json", compression="zlib")
+        plain = connector.queue(url, wait_time_s=0)
+
+        await compressed.publish({"value": "x" * 500}, meta={"source": "new"})
+        await plain.publish({"value": 2}, meta={"source": "old"})
+
+        body = client.sent[0]["MessageBody"]
+        assert body.startswith("~os1;json+zlib;")
+        assert len(body) < 200
+        assert client.sent[1]["MessageBody"].startswith('{"body"')
+
+        batch = await plain.fetch(2)
+        assert [delivery.payload for delivery in batch] == [{"value": "x" * 500}, {"value": 2}]
+        assert batch[0].envelope.meta["source"] == "new"
+        await connector.close()
+
+    asyncio.run(scenario())
+
+
+def test_sqs_queue_send_many_groups_batches_by_count_and_bytes():
+    async def scenario():
+        client = FakeSQSClient()
+        connector = SQSConnector(region_name="ap-southeast-1", client=client)
+        queue = connector.queue(
+            "https://sqs.ap-southeast-1.amazonaws.com/123456789/jobs.fifo",
+            wait_time_s=0,
+            message_group_id="workers",
+        )
+
+        await queue.send_many([Envelope(body={"value": index}) for index in range(25)])
+        assert [len(entries) for entries in client.sent_batches] == [10, 10, 5]
+        assert all(entry["MessageGroupId"] == "workers" for entry in client.sent_batches[0])
+
+        client.sent_batches.clear()
+        # Five ~100 KB bodies: two fit under the 256 KiB batch limit.
+        await queue.send_many([Envelope(body="x" * 100_000) for _ in range(5)])
+        assert [len(entries) for entries in client.sent_batches] == [2, 2, 1]
+
+        batch = await queue.fetch(3)
+        assert [delivery.payload for delivery in batch] == [{"value": 0}, {"value": 1}, {"value": 2}]
+        await connector.close()
+
+    asyncio.run(scenario())
+
+
+def test_sqs_queue_send_many_reports_rejected_entries_by_position():
+    class RejectingClient(FakeSQSClient):
+        def send_message_batch(self, QueueUrl, Entries):
+            self.sent_batches.append(Entries)
+            successful, failed = [], []
+            for entry in Entries:
+                if "reject" in entry["MessageBody"]:
+                    failed.append({"Id": entry["Id"], "SenderFault": True, "Code": "InvalidMessageContents", "Message": "bad"})
+                    continue
+                self.send_message(QueueUrl=QueueUrl, MessageBody=entry["MessageBody"])
+                successful.append({"Id": entry["Id"]})
+            return {"Successful": successful, "Failed": failed}
+
+    async def scenario():
+        client = RejectingClient()
+        connector = SQSConnector(region_name="ap-southeast-1", client=client)
+        queue = connector.queue("https://sqs.ap-southeast-1.amazonaws.com/123456789/jobs", wait_time_s=0)
+        bodies = [{"value": index} for index in range(12)]
+        bodies[3] = {"value": "reject"}
+        bodies[11] = {"value": "reject"}
+
+        try:
+            await queue.send_many([Envelope(body=body) for body in bodies])
+        except ConnectorBatchError as exc:
+            errors = exc.errors
+        else:
+            raise AssertionError("expected ConnectorBatchError")
+
+        assert [len(entries) for entries in client.sent_batches] == [10, 2]
+        assert sorted(errors) == [3, 11]
+        assert all(isinstance(error, ConnectorOperationError) for error in errors.values())
+        assert errors[3].operation is ConnectorOperation.SEND
+        assert errors[3].kind is ConnectorErrorKind.PERMANENT
+        assert len(client.available) == 10
+        await connector.close()
+
+    asyncio.run(scenario())
+
+
+def test_sqs_queue_receivers_poll_concurrently_and_release_leftovers_on_close():
+    class SlowClient(FakeSQSClient):
+        def __init__(self):
+            super().__init__()
+            self.active = 0
+            self.peak = 0
+            self.lock = threading.Lock()
+
+        def receive_message(self, **kwargs):
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(0.05)
+            with self.lock:
+                self.active -= 1
+                return super().receive_message(**kwargs)
+
+    async def scenario():
+        client = SlowClient()
+        connector = SQSConnector(region_name="ap-southeast-1", client=client)
+        queue = connector.queue(
+            "https://sqs.ap-southeast-1.amazonaws.com/123456789/jobs",
+            wait_time_s=0,
+            receivers=4,
+        )
+        for index in range(45):
+            await queue.publish({"value": index})
+
+        received = []
+        while len(received) < 38:
+            received.extend(await queue.fetch(38 - len(received)))
+        # Four receive calls ran side by side instead of one per round trip.
+        assert client.peak == 4
+        assert len(received) == 38
+        assert len({delivery.payload["value"] for delivery in received}) == 38
+
+        # Messages received beyond the fetch limit go back on close.
+        await queue.close()
+        assert len(client.available) == 45 - 38
+        await connector.close()
+
+    asyncio.run(scenario())
+
+    connector = SQSConnector(region_name="ap-southeast-1", client=FakeSQSClient())
+    try:
+        connector.queue("https://sqs.ap-southeast-1.amazonaws.com/123456789/jobs", receivers=0)
+    except ValueError as exc:
+        assert "receivers" in str(exc)
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_sqs_queue_receivers_release_buffered_messages_past_visibility_timeout(monkeypatch):
+    import types
+
+    import onestep_sqs.connector as connector_module
+
+    now = [0.0]
+    monkeypatch.setattr(connector_module, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+
+    class HeldClient(FakeSQSClient):
+        def __init__(self):
+            super().__init__()
+            self.calls = 0
+            self.release = threading.Event()
+
+        def receive_message(self, **kwargs):
+            self.calls += 1
+            if self.calls == 2:
+                self.release.wait(5)
+            return super().receive_message(**kwargs)
+
+    async def scenario():
+        client = HeldClient()
+        connector = SQSConnector(region_name="ap-southeast-1", client=client)
+        queue = connector.queue(
+            "https://sqs.ap-southeast-1.amazonaws.com/123456789/jobs",
+            wait_time_s=0,
+            visibility_timeout=30,
+            batch_size=2,
+            receivers=2,
+        )
+        for index in range(4):
+            await queue.publish({"value": index})
+
+        first = await queue.fetch(3)
+        assert [delivery.payload["value"] for delivery in first] == [0, 1]
+        # The held call returns after the fetch, so its messages are buffered.
+        client.release.set()
+        await asyncio.gather(*queue._receive_calls)
+
+        # They outlived their visibility timeout before the next fetch, so
+        # they are released rather than handed out under an expired lease.
+        now[0] = 31.0
+        assert await queue.fetch(1) == []
+        released = client.visibility_batches[-1][1]
+        assert [entry["VisibilityTimeout"] for entry in released] == [0, 0]
+        assert len(client.available) == 2
+        await connector.close()
+
+    asyncio.run(scenario())
+
+
 def test_sqs_queue_retry_and_heartbeat_release():
     async def scenario():
         client = FakeSQSClient()
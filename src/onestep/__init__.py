@@ -3,8 +3,9 @@ from importlib.util import find_spec as _find_spec
 
 from .app import OneStepApp
 from .capture import FailureCaptureConfig
+from .concurrency import AdaptiveConcurrency
 from .config import load_app_config, load_resource_catalog, load_yaml_app
-from .context import TaskContext
+from .context import BatchTaskContext, TaskContext
 from .envelope import Envelope
 from .execution import (
     Execution,
@@ -39,6 +40,7 @@ from .identity_store import (
     build_default_state_dir,
     derive_replica_instance_id,
 )
+from .instrumentation import Instrumentation
 from .metrics import CounterMetric, CustomMetricsRegistry, GaugeMetric, TaskMetrics
 from .resource_registry import (
     CATALOG_FIELD_TYPES,
@@ -54,7 +56,9 @@ from .resource_registry import (
     load_resource_plugins,
     register_resource_type,
 )
+from .ratelimit import RateLimit
 from .resilience import (
+    ConnectorBatchError,
     ConnectorErrorKind,
     ConnectorOperation,
     ConnectorOperationError,
@@ -70,8 +74,11 @@ from .retry import (
     RetryDecision,
     RetryPolicy,
 )
+from .snapshot import FrozenDict, FrozenList
 from .state import CursorStore, InMemoryCursorStore, InMemoryStateStore, ScopedState, StateStore
 from .connectors.base import Delivery, Sink, Source
+from .connectors.batching import BatchingSink
+from .connectors.ratelimit import RateLimitedSink
 from .connectors.http import HttpSink, HttpSinkStatusError
 from .connectors.memory import MemoryQueue
 from .connectors.schedule import CronSource, IntervalSource
@@ -107,9 +114,13 @@ def __getattr__(name: str):
 
 
 _CORE_EXPORTS = [
+    "AdaptiveConcurrency",
+    "BatchTaskContext",
+    "BatchingSink",
     "BearerAuth",
     "CronSource",
     "CursorStore",
+    "ConnectorBatchError",
     "ConnectorErrorKind",
     "ConnectorOperation",
     "ConnectorOperationError",
@@ -140,6 +151,8 @@ _CORE_EXPORTS = [
     "FailureInfo",
     "FailureCaptureConfig",
     "FailureKind",
+    "FrozenDict",
+    "FrozenList",
     "GaugeMetric",
     "HeartbeatResult",
     "HttpSink",
@@ -150,6 +163,7 @@ _CORE_EXPORTS = [
     "InMemoryMetrics",
     "InMemoryCursorStore",
     "InMemoryStateStore",
+    "Instrumentation",
     "IntervalSource",
     "ByFailureKind",
     "ExponentialBackoff",
@@ -161,6 +175,8 @@ _CORE_EXPORTS = [
     "OneStepApp",
     "CATALOG_FIELD_TYPES",
     "CATALOG_ROLES",
+    "RateLimit",
+    "RateLimitedSink",
     "ResourceBuildContext",
     "ResourceCatalogEntry",
     "ResourceCatalogField",
@@ -12,13 +12,18 @@ from typing import Any
 
 from .capture.config import FailureCaptureConfig
 from .capture.writer import FailureCaptureWriter
+from .concurrency import AdaptiveConcurrency
 from .connectors.base import Sink, Source
 from .envelope import Envelope
-from .events import StructuredEventLogger, TaskEvent
-from .invoke import invoke_callback
+from .events import EventBus, StructuredEventLogger, TaskEvent
+from .instrumentation import Instrumentation
+from .invoke import callback_arity, invoke_callback
 from .metrics import CustomMetricsRegistry
+from .ratelimit import RateLimit
 from .retry import RetryPolicy
+from .runtime.offload import HandlerPools
 from .runtime.runner import TaskRunner
+from .snapshot import thaw
 from .state import InMemoryStateStore, StateStore
 from .task import EmitTarget, TaskHandler, TaskHooks, TaskSpec
 
@@ -45,8 +50,8 @@ class _SyntheticManualRunDelivery:
         self.retry_requested = True
         self.retry_delay_s = delay_s
         self.envelope = Envelope(
-            body=copy.deepcopy(self.envelope.body),
-            meta=copy.deepcopy(self.envelope.meta),
+            body=thaw(self.envelope.body),
+            meta=thaw(self.envelope.meta),
             attempts=self.envelope.attempts + 1,
         )
 
@@ -77,6 +82,8 @@ class OneStepApp:
             else None
         )
         self.custom_metrics = CustomMetricsRegistry()
+        self.handler_pools = HandlerPools()
+        self.instrumentation = Instrumentation()
         self._tasks: list[TaskSpec] = []
         self._named_resources: dict[str, Any] = {}
         self._shutdown: asyncio.Event | None = None
@@ -99,6 +106,7 @@ class OneStepApp:
         self._reporter_summary: dict[str, Any] | None = None
         self._loop: asyncio.AbstractEventLoop | None = None
         self._events_logger = logging.getLogger(f"onestep.{name}.events")
+        self.event_bus = EventBus(logger=self._events_logger)
 
     @property
     def tasks(self) -> tuple[TaskSpec, ...]:
@@ -566,6 +574,12 @@ class OneStepApp:
         parked_runner_count = sum(1 for runner in runners if runner.is_pause_parked)
         inflight_task_count = sum(runner.inflight_count for runner in runners)
         runner_count = len(runners)
+        if runners:
+            concurrency_limit = sum(runner.concurrency_limit for runner in runners)
+        elif task.adaptive_concurrency is not None:
+            concurrency_limit = task.adaptive_concurrency.initial_concurrency
+        else:
+            concurrency_limit = task.concurrency
         paused = (
             pause_requested
             and inflight_task_count == 0
@@ -582,6 +596,7 @@ class OneStepApp:
             "parked_runner_count": parked_runner_count,
             "fetching_runner_count": fetching_runner_count,
             "inflight_task_count": inflight_task_count,
+            "concurrency_limit": concurrency_limit,
         }
 
     def task_control_snapshots(self) -> list[dict[str, Any]]:
@@ -647,6 +662,42 @@ class OneStepApp:
         self.on_event(handler)
         return handler
 
+    def enable_event_bus(
+        self,
+        *,
+        maxsize: int = 1024,
+        batch_size: int = 64,
+        policy: str = "drop_oldest",
+        drain_timeout_s: float = 5.0,
+    ) -> EventBus:
+        """Dispatch ``on_event`` handlers from background workers instead of inline.
+
+        Call before ``serve()``. Events queued at shutdown are delivered for up
+        to ``drain_timeout_s`` before the shutdown hooks run.
+        """
+        return self.event_bus.enable(
+            maxsize=maxsize,
+            batch_size=batch_size,
+            policy=policy,
+            drain_timeout_s=drain_timeout_s,
+        )
+
+    def enable_instrumentation(
+        self,
+        *,
+        loop_lag_interval_s: float = 0.5,
+        profile_interval_s: float | None = None,
+    ) -> Instrumentation:
+        """Record per-stage latencies and loop lag; sample handler stacks if ``profile_interval_s`` is set.
+
+        Call before ``serve()``: runners only install the stage checkpoint when
+        instrumentation is already enabled.
+        """
+        return self.instrumentation.enable(
+            loop_lag_interval_s=loop_lag_interval_s,
+            profile_interval_s=profile_interval_s,
+        )
+
     def task(
         self,
         *,
@@ -659,9 +710,16 @@ class OneStepApp:
         metadata: Mapping[str, Any] | None = None,
         handler_ref: str | None = None,
         hooks: TaskHooks | None = None,
-        concurrency: int = 1,
+        concurrency: int | AdaptiveConcurrency = 1,
         retry: RetryPolicy | None = None,
         timeout_s: float | None = None,
+        batch: int | None = None,
+        executor: str = "loop",
+        ordering_key: str | Callable[..., Any] | None = None,
+        rate_limit: RateLimit | None = None,
+        emit_mode: str = "sequential",
+        emit_timeout_s: float | None = None,
+        prefetch: int = 0,
     ):
         def decorator(func: TaskHandler) -> TaskHandler:
             task_name = name or func.__name__
@@ -682,6 +740,13 @@ class OneStepApp:
                 concurrency=concurrency,
                 retry=retry,
                 timeout_s=timeout_s,
+                batch=batch,
+                executor=executor,
+                ordering_key=ordering_key,
+                rate_limit=rate_limit,
+                emit_mode=emit_mode,
+                emit_timeout_s=emit_timeout_s,
+                prefetch=prefetch,
             )
             self._tasks.append(task)
             return func
@@ -726,6 +791,8 @@ class OneStepApp:
                 opened.append(resource)
             self._resources = list(opened)
             await self._run_hooks(self._startup_hooks)
+            await self.instrumentation.start(self._tasks)
+            await self.event_bus.start()
         except Exception:
             await self._close_resources(opened, suppress_exceptions=True)
             self._resources = []
@@ -737,12 +804,15 @@ class OneStepApp:
             self._shutdown.set()
         hook_error: BaseException | None = None
         try:
+            await self.event_bus.stop()
             await self._run_hooks(self._shutdown_hooks)
         except BaseException as exc:
             hook_error = exc
         finally:
             close_error = await self._close_resources(self._resources, suppress_exceptions=False)
             self._resources = []
+            self.handler_pools.shutdown()
+            await self.instrumentation.stop()
             # Cancel any runner task handles that somehow outlived serve()'s own
             # gather/wait (e.g. a per-task restart spawned a new runner right as
             # shutdown began). Swallow CancelledError — we are tearing down.
@@ -855,6 +925,8 @@ class OneStepApp:
                 "shutdown": len(self._shutdown_hooks),
                 "events": len(self._event_handlers),
             },
+            "instrumentation": self.instrumentation.describe(),
+            "event_bus": self.event_bus.describe(),
             "tasks": [
                 {
                     "name": task.name,
@@ -878,6 +950,20 @@ class OneStepApp:
                         "on_failure": len(task.hooks.on_failure),
                     },
                     "concurrency": task.concurrency,
+                    "adaptive_concurrency": (
+                        task.adaptive_concurrency.describe()
+                        if task.adaptive_concurrency is not None
+                        else None
+                    ),
+                    "emit_mode": task.emit_mode,
+                    "emit_timeout_s": task.emit_timeout_s,
+                    "prefetch": task.prefetch,
+                    "rate_limit": (
+                        task.rate_limit.describe() if task.rate_limit is not None else None
+                    ),
+                    "batch": task.batch,
+                    "executor": task.executor,
+                    "ordering_key": _describe_ordering_key(task.ordering_key),
                     "timeout_s": task.timeout_s,
                     "retry": task.retry.__class__.__name__,
                 }
@@ -914,6 +1000,7 @@ class OneStepApp:
         func: Callable[..., Any] | None,
     ):
         def decorator(callback: Callable[..., Any]) -> Callable[..., Any]:
+            callback_arity(callback)
             storage.append(callback)
             return callback
 
@@ -927,7 +1014,14 @@ class OneStepApp:
             if inspect.isawaitable(result):
                 await result
 
+    @property
+    def has_event_handlers(self) -> bool:
+        return bool(self._event_handlers)
+
     async def emit_event(self, event: TaskEvent) -> None:
+        if self.event_bus.running and self._event_handlers:
+            await self.event_bus.publish(event, self._event_handlers)
+            return
         for handler in self._event_handlers:
             try:
                 result = invoke_callback(handler, event)
@@ -1030,12 +1124,12 @@ class OneStepApp:
         if "payload" not in dead_letter_envelope.body:
             raise ValueError("dead-letter envelope body is missing payload")
 
-        original_payload = copy.deepcopy(dead_letter_envelope.body["payload"])
+        original_payload = thaw(dead_letter_envelope.body["payload"])
         original_meta = dead_letter_envelope.meta.get("original_meta")
         if not isinstance(original_meta, Mapping):
             replay_meta: dict[str, Any] = {}
         else:
-            replay_meta = copy.deepcopy(dict(original_meta))
+            replay_meta = thaw(dict(original_meta))
 
         original_attempts = dead_letter_envelope.meta.get("original_attempts")
         replay_attempts = original_attempts if isinstance(original_attempts, int) and original_attempts >= 0 else 0
@@ -1096,6 +1190,14 @@ def _describe_resource(resource: Source | Sink | None) -> dict[str, str] | None:
     }
 
 
+def _describe_ordering_key(ordering_key: str | Callable[..., Any] | None) -> str | None:
+    if ordering_key is None or isinstance(ordering_key, str):
+        return ordering_key
+    module = getattr(ordering_key, "__module__", None)
+    qualname = getattr(ordering_key, "__qualname__", None) or type(ordering_key).__qualname__
+    return f"{module}:{qualname}" if module else qualname
+
+
 async def _open_resource(resource: Any) -> None:
     opener = getattr(resource, "open", None)
     if not callable(opener):
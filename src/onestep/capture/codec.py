@@ -10,6 +10,8 @@ from enum import Enum
 from typing import Any
 from uuid import UUID
 
+from onestep.snapshot import FrozenDict, FrozenList, ThawingDict
+
 TAG = "$onestep"
 
 
@@ -126,12 +128,12 @@ def encode_value(value: Any, *, _path: str = "") -> Any:
             "frozenset" if type(value) is frozenset else "set",
             values=encoded,
         )
-    if type(value) is list:
+    if type(value) is list or type(value) is FrozenList:
         return [
             encode_value(item, _path=_pointer(_path, str(index)))
             for index, item in enumerate(value)
         ]
-    if type(value) is dict:
+    if type(value) is dict or type(value) is FrozenDict or type(value) is ThawingDict:
         for key in value:
             if not isinstance(key, str):
                 raise CaptureEncodingError(
@@ -7,6 +7,7 @@ import logging
 import math
 import sys
 from importlib.metadata import PackageNotFoundError, version
+from typing import Any
 
 from .app import OneStepApp
 from .build import BuildOptions, BuildResult, build_worker_package
@@ -63,6 +64,18 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         default=True,
         help="Emit task lifecycle events as logs (default: enabled)",
     )
+    run_parser.add_argument(
+        "--instrument",
+        action="store_true",
+        help="Record per-stage latencies and event-loop lag; print a report on exit",
+    )
+    run_parser.add_argument(
+        "--profile-interval-ms",
+        type=_positive_milliseconds,
+        dest="profile_interval_ms",
+        default=None,
+        help="Sample handler stacks at this interval (implies --instrument)",
+    )
 
     check_parser = subparsers.add_parser("check", help="Load a target or YAML config and print its task summary")
     check_parser.add_argument("target", help="Python target (package.module:app) or path to *.yaml")
@@ -319,7 +332,17 @@ def main(argv: list[str] | None = None) -> int:
         cli_logging_state = _configure_run_logging(explicit_level=args.log_level)
         if args.task_events:
             app.enable_structured_event_logging()
+        if args.instrument or args.profile_interval_ms is not None:
+            app.enable_instrumentation(
+                profile_interval_s=(
+                    args.profile_interval_ms / 1000.0
+                    if args.profile_interval_ms is not None
+                    else None
+                )
+            )
         app.run()
+        if app.instrumentation.enabled:
+            _print_instrumentation_report(app.describe()["instrumentation"], file=sys.stderr)
     except Exception as exc:
         print(f"onestep: {args.target} failed while running: {exc}", file=sys.stderr)
         return 1
@@ -365,6 +388,18 @@ def _positive_seconds(value: str) -> float:
     return parsed
 
 
+def _positive_milliseconds(value: str) -> float:
+    try:
+        parsed = float(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            "must be a positive number of milliseconds"
+        ) from exc
+    if not math.isfinite(parsed) or parsed <= 0:
+        raise argparse.ArgumentTypeError("must be a positive number of milliseconds")
+    return parsed
+
+
 def _add_diagnostic_options(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "--send",
@@ -456,6 +491,8 @@ def _print_summary(target: str, app: OneStepApp, *, as_json: bool) -> None:
     print(f"Reporter: {_format_reporter(summary.get('reporter'))}")
     print(f"Resources: {_format_resource_inventory(summary['resources'])}")
     print(f"Hooks: {_format_hook_counts(summary['hooks'])}")
+    if summary.get("instrumentation"):
+        print(f"Instrumentation: {_format_instrumentation(summary['instrumentation'])}")
     print(f"Tasks: {len(summary['tasks'])}")
     for task in summary["tasks"]:
         source = _format_resource(task["source"])
@@ -649,8 +686,64 @@ def _format_hook_counts(hooks: dict[str, int]) -> str:
     return " ".join(f"{name}={hooks[name]}" for name in ("startup", "shutdown", "events"))
 
 
+def _format_instrumentation(instrumentation: dict[str, Any]) -> str:
+    parts = [f"loop_lag_interval={instrumentation['loop_lag_interval_s']}s"]
+    profile_interval_s = instrumentation.get("profile_interval_s")
+    parts.append(
+        f"profile_interval={profile_interval_s * 1000:g}ms" if profile_interval_s else "profile=off"
+    )
+    return " ".join(parts)
+
+
+def _format_latency(histogram: dict[str, Any]) -> str:
+    def value(key: str) -> str:
+        amount = histogram.get(key)
+        return "-" if amount is None else f"{amount:.3f}ms"
+
+    return (
+        f"count={histogram['count']} p50={value('p50_ms')} p95={value('p95_ms')} "
+        f"p99={value('p99_ms')} max={value('max_ms')}"
+    )
+
+
+def _print_instrumentation_report(instrumentation: dict[str, Any], *, file) -> None:
+    print("Instrumentation report:", file=file)
+    print(f"  loop lag: {_format_latency(instrumentation['loop_lag'])}", file=file)
+    for task_name, task in instrumentation["tasks"].items():
+        print(f"  task {task_name}:", file=file)
+        for stage, histogram in task["stages"].items():
+            print(f"    {stage}: {_format_latency(histogram)}", file=file)
+        profile = task.get("profile")
+        if profile:
+            print(f"    profile ({profile['samples']} samples):", file=file)
+            for entry in profile["top"]:
+                print(f"      {entry['samples']:>6} {entry['stack']}", file=file)
+
+
 def _format_task_details(task: dict[str, object]) -> str:
     parts: list[str] = []
+    batch = task.get("batch")
+    if isinstance(batch, int):
+        parts.append(f"batch={batch}")
+    executor = task.get("executor")
+    if isinstance(executor, str) and executor != "loop":
+        parts.append(f"executor={executor}")
+    ordering_key = task.get("ordering_key")
+    if isinstance(ordering_key, str) and ordering_key:
+        parts.append(f"ordering_key={ordering_key}")
+    if task.get("emit_mode") == "parallel":
+        parts.append("emit=parallel")
+    prefetch = task.get("prefetch")
+    if isinstance(prefetch, int) and prefetch:
+        parts.append(f"prefetch={prefetch}")
+    rate_limit = task.get("rate_limit")
+    if isinstance(rate_limit, dict):
+        parts.append(f"rate_limit={rate_limit['rate']:g}/s")
+    adaptive = task.get("adaptive_concurrency")
+    if isinstance(adaptive, dict):
+        parts.append(
+            f"adaptive={adaptive['algorithm']}:{adaptive['min_concurrency']}-{adaptive['max_concurrency']}"
+        )
     handler_ref = task.get("handler_ref")
     if isinstance(handler_ref, str) and handler_ref:
         parts.append(f"handler={handler_ref}")
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import math
+from typing import Any
+
+CONCURRENCY_ALGORITHMS = ("aimd", "gradient")
+
+
+class AdaptiveConcurrency:
+    """Let a task tune its own concurrency between two bounds.
+
+    Pass it as ``concurrency=`` instead of an integer. Each runner starts at
+    ``initial_concurrency`` and adjusts the limit from every finished
+    delivery: how long the handler, emit sinks and ack took, and whether it
+    failed with a timeout or a retryable ``ConnectorOperationError``.
+
+    - ``"aimd"``: grow by one slot per delivery while below the first
+      overload (slow start), then by one slot per ``limit`` deliveries; on an
+      overload, or latency above ``latency_threshold_s``, shrink to
+      ``limit * backoff_ratio`` at most once per window of ``limit``
+      deliveries.
+    - ``"gradient"``: compare short-term latency with the no-load baseline
+      (the lowest latency seen, drifting slowly up), TCP Vegas style. While
+      latency stays within ``tolerance`` times the baseline the limit grows
+      by about ``sqrt(limit)``; as latency rises above it the limit shrinks
+      proportionally. Overloads shrink it by ``backoff_ratio``.
+
+    The limit only grows while at least half of it is in use, so an idle
+    task does not drift to ``max_concurrency``.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        *,
+        min_concurrency: int = 1,
+        initial_concurrency: int | None = None,
+        algorithm: str = "aimd",
+        backoff_ratio: float = 0.9,
+        latency_threshold_s: float | None = None,
+        tolerance: float = 2.0,
+        smoothing: float = 0.2,
+    ) -> None:
+        if min_concurrency < 1:
+            raise ValueError("min_concurrency must be >= 1")
+        if max_concurrency < min_concurrency:
+            raise ValueError("max_concurrency must be >= min_concurrency")
+        if initial_concurrency is None:
+            initial_concurrency = min_concurrency
+        if not min_concurrency <= initial_concurrency <= max_concurrency:
+            raise ValueError("initial_concurrency must be between min_concurrency and max_concurrency")
+        if algorithm not in CONCURRENCY_ALGORITHMS:
+            raise ValueError(f"algorithm must be one of {', '.join(CONCURRENCY_ALGORITHMS)}")
+        if not 0 < backoff_ratio < 1:
+            raise ValueError("backoff_ratio must be between 0 and 1")
+        if latency_threshold_s is not None and latency_threshold_s <= 0:
+            raise ValueError("latency_threshold_s must be > 0")
+        if tolerance < 1:
+            raise ValueError("tolerance must be >= 1")
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be between 0 and 1")
+
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.initial_concurrency = initial_concurrency
+        self.algorithm = algorithm
+        self.backoff_ratio = backoff_ratio
+        self.latency_threshold_s = latency_threshold_s
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+
+    def new_limiter(self) -> "ConcurrencyLimiter":
+        if self.algorithm == "gradient":
+            return GradientLimiter(self)
+        return AimdLimiter(self)
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "algorithm": self.algorithm,
+            "min_concurrency": self.min_concurrency,
+            "max_concurrency": self.max_concurrency,
+            "initial_concurrency": self.initial_concurrency,
+        }
+
+
+class ConcurrencyLimiter:
+    """Per-runner state of an ``AdaptiveConcurrency`` policy."""
+
+    def __init__(self, policy: AdaptiveConcurrency) -> None:
+        self.policy = policy
+        self._limit = float(policy.initial_concurrency)
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def on_sample(self, latency_s: float, *, inflight: int, overloaded: bool) -> None:
+        """Record one finished delivery (or batch handler call).
+
+        ``inflight`` is the number of deliveries running when it finished,
+        itself included.
+        """
+        raise NotImplementedError
+
+    def _set_limit(self, value: float) -> None:
+        self._limit = min(float(self.policy.max_concurrency), max(float(self.policy.min_concurrency), value))
+
+    def _limit_bound(self, inflight: int) -> bool:
+        return inflight * 2 >= self.limit
+
+
+class AimdLimiter(ConcurrencyLimiter):
+    def __init__(self, policy: AdaptiveConcurrency) -> None:
+        super().__init__(policy)
+        self._slow_start = True
+        self._since_decrease = 0
+
+    def on_sample(self, latency_s: float, *, inflight: int, overloaded: bool) -> None:
+        self._since_decrease += 1
+        threshold_s = self.policy.latency_threshold_s
+        if overloaded or (threshold_s is not None and latency_s > threshold_s):
+            # Deliveries that started before the last decrease report the
+            # same overload; wait one window before shrinking again.
+            if self._slow_start or self._since_decrease >= self.limit:
+                self._slow_start = False
+                self._since_decrease = 0
+                self._set_limit(math.floor(self._limit * self.policy.backoff_ratio))
+            return
+        if not self._limit_bound(inflight):
+            return
+        self._set_limit(self._limit + (1.0 if self._slow_start else 1.0 / self._limit))
+
+
+class GradientLimiter(ConcurrencyLimiter):
+    # Weight of each sample in the short-term latency average, and how fast
+    # the no-load baseline creeps up towards slower samples.
+    _SHORT_WEIGHT = 0.5
+    _BASELINE_DRIFT = 0.001
+
+    def __init__(self, policy: AdaptiveConcurrency) -> None:
+        super().__init__(policy)
+        self._short_s: float | None = None
+        self._baseline_s: float | None = None
+
+    def on_sample(self, latency_s: float, *, inflight: int, overloaded: bool) -> None:
+        if overloaded:
+            self._set_limit(self._limit * self.policy.backoff_ratio)
+            return
+        if self._short_s is None or self._baseline_s is None:
+            self._short_s = self._baseline_s = latency_s
+        else:
+            self._short_s += (latency_s - self._short_s) * self._SHORT_WEIGHT
+            if latency_s < self._baseline_s:
+                self._baseline_s = latency_s
+            else:
+                # Follow a lasting change in the backend (a slower query
+                # plan, a farther region) instead of pinning the limit low.
+                self._baseline_s += (latency_s - self._baseline_s) * self._BASELINE_DRIFT
+        if not self._limit_bound(inflight):
+            return
+        if self._short_s <= 0:
+            gradient = 1.0
+        else:
+            gradient = max(0.5, min(1.0, self.policy.tolerance * self._baseline_s / self._short_s))
+        target = self._limit * gradient + math.sqrt(self._limit)
+        self._set_limit(self._limit + (target - self._limit) * self.policy.smoothing)
+
+
+__all__ = [
+    "AdaptiveConcurrency",
+    "AimdLimiter",
+    "CONCURRENCY_ALGORITHMS",
+    "ConcurrencyLimiter",
+    "GradientLimiter",
+]
@@ -13,7 +13,9 @@ from typing import Any
 
 from .app import OneStepApp
 from .capture.config import FailureCaptureConfig
+from .concurrency import AdaptiveConcurrency
 from .connectors.base import Sink, Source
+from .ratelimit import RateLimit
 from .reporter_registry import (
     ReporterRegistry,
     ReporterSpecHandler,
@@ -89,7 +91,7 @@ _STRICT_APP_FIELDS = frozenset(
 _STRICT_APP_LOGGING_FIELDS = frozenset({"level"})
 _STRICT_HANDLER_FIELDS = frozenset({"ref", "params"})
 _STRICT_EMIT_ROUTE_FIELDS = frozenset({"when", "then", "otherwise"})
-_STRICT_EMIT_BINDING_FIELDS = frozenset({"sink", "transform"})
+_STRICT_EMIT_BINDING_FIELDS = frozenset({"sink", "transform", "timeout_s"})
 _STRICT_APP_HOOK_FIELDS = frozenset({"startup", "shutdown", "events"})
 _STRICT_TASK_HOOK_FIELDS = frozenset({"before", "after_success", "on_failure"})
 _STRICT_TASK_FIELDS = frozenset(
@@ -106,6 +108,26 @@ _STRICT_TASK_FIELDS = frozenset(
         "concurrency",
         "retry",
         "timeout_s",
+        "batch",
+        "executor",
+        "ordering_key",
+        "rate_limit",
+        "emit_mode",
+        "emit_timeout_s",
+        "prefetch",
+    }
+)
+_STRICT_RATE_LIMIT_FIELDS = frozenset({"rate", "burst", "key", "max_keys"})
+_STRICT_ADAPTIVE_CONCURRENCY_FIELDS = frozenset(
+    {
+        "algorithm",
+        "min",
+        "max",
+        "initial",
+        "backoff_ratio",
+        "latency_threshold_s",
+        "tolerance",
+        "smoothing",
     }
 )
 _STRICT_RETRY_FIELDS: dict[str, frozenset[str]] = {
@@ -479,9 +501,22 @@ def load_app_config(
             metadata=_mapping_value(task_config.get("metadata"), field=f"tasks[{index}].metadata"),
             handler_ref=handler_ref,
             hooks=_build_task_hooks(task_config.get("hooks"), task_index=index),
-            concurrency=task_config.get("concurrency", 1),
+            concurrency=_build_concurrency(
+                task_config.get("concurrency", 1),
+                field=f"tasks[{index}].concurrency",
+            ),
             retry=_build_retry(task_config.get("retry")),
             timeout_s=task_config.get("timeout_s"),
+            batch=task_config.get("batch"),
+            executor=task_config.get("executor", "loop"),
+            ordering_key=task_config.get("ordering_key"),
+            rate_limit=_build_rate_limit(
+                task_config.get("rate_limit"),
+                field=f"tasks[{index}].rate_limit",
+            ),
+            emit_mode=task_config.get("emit_mode", "sequential"),
+            emit_timeout_s=task_config.get("emit_timeout_s"),
+            prefetch=task_config.get("prefetch", 0),
         )(handler)
 
     _register_app_hooks(app, config.get("hooks"))
@@ -614,6 +649,34 @@ def _build_handler(raw_handler: Any, *, task_name: str | None):
     return bound_handler, ref
 
 
+def _build_concurrency(raw_concurrency: Any, *, field: str) -> int | AdaptiveConcurrency:
+    if not isinstance(raw_concurrency, Mapping):
+        return raw_concurrency
+    if "max" not in raw_concurrency:
+        raise ValueError(f"{field}.max is required")
+    return AdaptiveConcurrency(
+        raw_concurrency["max"],
+        min_concurrency=raw_concurrency.get("min", 1),
+        initial_concurrency=raw_concurrency.get("initial"),
+        algorithm=raw_concurrency.get("algorithm", "aimd"),
+        backoff_ratio=raw_concurrency.get("backoff_ratio", 0.9),
+        latency_threshold_s=raw_concurrency.get("latency_threshold_s"),
+        tolerance=raw_concurrency.get("tolerance", 2.0),
+        smoothing=raw_concurrency.get("smoothing", 0.2),
+    )
+
+
+def _build_rate_limit(raw_rate_limit: Any, *, field: str) -> RateLimit | None:
+    if raw_rate_limit is None:
+        return None
+    if not isinstance(raw_rate_limit, Mapping):
+        return RateLimit(raw_rate_limit)
+    if "rate" not in raw_rate_limit:
+        raise ValueError(f"{field}.rate is required")
+    options = {name: raw_rate_limit[name] for name in ("burst", "key", "max_keys") if name in raw_rate_limit}
+    return RateLimit(raw_rate_limit["rate"], **options)
+
+
 def _build_retry(raw_retry: Any) -> RetryPolicy | None:
     if raw_retry is None:
         return None
@@ -726,7 +789,12 @@ def _resolve_emit_binding(
             value["transform"],
             field=f"{field}.transform",
         )
-    return EmitBinding(sink=sink, transform=transform, transform_ref=transform_ref)
+    return EmitBinding(
+        sink=sink,
+        transform=transform,
+        transform_ref=transform_ref,
+        timeout_s=value.get("timeout_s"),
+    )
 
 
 def _resolve_emit_route(resources: Mapping[str, Any], value: Any, *, field: str) -> EmitRoute:
@@ -891,6 +959,20 @@ def _validate_tasks(raw_tasks: Any) -> None:
             allowed=_STRICT_TASK_HOOK_FIELDS,
         )
         _validate_retry(raw_task.get("retry"), field=f"{field}.retry")
+        raw_rate_limit = raw_task.get("rate_limit")
+        if isinstance(raw_rate_limit, Mapping):
+            _validate_unknown_fields(
+                raw_rate_limit,
+                _STRICT_RATE_LIMIT_FIELDS,
+                field=f"{field}.rate_limit",
+            )
+        raw_concurrency = raw_task.get("concurrency")
+        if isinstance(raw_concurrency, Mapping):
+            _validate_unknown_fields(
+                raw_concurrency,
+                _STRICT_ADAPTIVE_CONCURRENCY_FIELDS,
+                field=f"{field}.concurrency",
+            )
 
 
 def _validate_reporter_config(raw_reporter: Any) -> None:
@@ -1,10 +1,12 @@
 from .base import Delivery, Sink, Source
+from .batching import BatchingSink
 from .http import HttpSink, HttpSinkStatusError
 from .memory import MemoryQueue
 from .schedule import CronSource, IntervalSource
 from .webhook import BearerAuth, WebhookResponse, WebhookSource
 
 __all__ = [
+    "BatchingSink",
     "BearerAuth",
     "CronSource",
     "Delivery",
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import abc
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from onestep.envelope import Envelope
 
 
 class Delivery(abc.ABC):
+    # Subclasses that list their own attributes in ``__slots__`` keep
+    # deliveries dict-free; a prefetch backlog can hold many thousands.
+    __slots__ = ("envelope",)
+
     def __init__(self, envelope: Envelope) -> None:
         self.envelope = envelope
 
@@ -21,6 +25,11 @@ class Delivery(abc.ABC):
     async def release_unstarted(self) -> None:
         return None
 
+    def set_result(self, result: Any) -> None:
+        # Called with the handler result just before a successful ack(), for
+        # deliveries that answer a waiting caller (request/response webhooks).
+        return None
+
     @abc.abstractmethod
     async def ack(self) -> None:
         raise NotImplementedError
@@ -39,6 +48,16 @@ class Source(abc.ABC):
     poll_interval_s: float = 1.0
     supports_manual_run: bool = False
     fetch_is_cancel_safe: bool = True
+    supports_bulk_ack: bool = False
+    ack_window_ms: float = 2.0
+    # Sources whose ``retry(delay_s=...)`` defers redelivery in the backend
+    # (visibility timeouts, ready-at columns) set this; for the others the
+    # runtime holds delayed retries itself so the delivery task can finish.
+    # Sources that redeliver by position (a consumer's pending list, a
+    # partition offset) set it too: fetching would hand the message out
+    # again while the runtime still holds it, so the delay has to stay
+    # inside ``retry``.
+    native_retry_delay: bool = False
 
     def __init__(self, name: str) -> None:
         self.name = name
@@ -52,11 +71,52 @@ class Source(abc.ABC):
         # can degrade and retry the source loop without exiting the worker.
         raise NotImplementedError
 
+    async def ack_many(self, deliveries: Sequence[Delivery]) -> None:
+        # Sources that settle several deliveries in one backend call override
+        # ack_many/retry_many and set ``supports_bulk_ack``; the runtime then
+        # coalesces completions that land within ``ack_window_ms``.
+        for delivery in deliveries:
+            await delivery.ack()
+
+    async def retry_many(
+        self,
+        deliveries: Sequence[Delivery],
+        *,
+        delay_s: float | None = None,
+    ) -> None:
+        for delivery in deliveries:
+            await delivery.retry(delay_s=delay_s)
+
+    def next_fetch_delay_s(self) -> float | None:
+        # Seconds until fetch() can next return work, for sources that know
+        # it exactly (scheduled sources). Idle runners then sleep until that
+        # moment instead of polling every ``poll_interval_s``; None keeps
+        # polling.
+        return None
+
+    def lease_timeout_s(self) -> float | None:
+        # Seconds a fetched delivery stays invisible to other consumers before
+        # the backend redelivers it (visibility timeout, lease duration).
+        # Prefetching runners release buffered deliveries well before it
+        # runs out; None means fetched deliveries do not expire.
+        return None
+
+    def ordering_key(self, delivery: Delivery) -> Any:
+        # Native per-delivery ordering key used by tasks declared with
+        # ``ordering_key="source"``; None means the delivery is unordered.
+        return None
+
     async def close(self) -> None:
         return None
 
 
 class Sink(abc.ABC):
+    # Sinks whose ``send_many`` either writes the whole batch or nothing (one
+    # transaction, one statement) set this. Only their failed batches are
+    # replayed envelope by envelope by ``BatchingSink``; a partial write in
+    # any other sink would be duplicated by the replay.
+    send_many_is_atomic: bool = False
+
     def __init__(self, name: str) -> None:
         self.name = name
 
@@ -67,6 +127,14 @@ class Sink(abc.ABC):
     async def send(self, envelope: Envelope) -> None:
         raise NotImplementedError
 
+    async def send_many(self, envelopes: Sequence[Envelope]) -> None:
+        # Bulk-capable sinks override this to write every envelope in one backend
+        # call. This default stops at the first failing ``send`` with the earlier
+        # envelopes already written; sinks whose override commits all or nothing
+        # must set ``send_many_is_atomic = True``.
+        for envelope in envelopes:
+            await self.send(envelope)
+
     async def publish(
         self,
         body: Any,
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from onestep.envelope import Envelope
+from onestep.resilience import (
+    ConnectorBatchError,
+    ConnectorErrorKind,
+    ConnectorOperation,
+    ConnectorOperationError,
+)
+
+from .base import Sink
+from .codec import encode_envelope
+
+_DEFAULT_MAX_BATCH = 500
+_DEFAULT_LINGER_MS = 5.0
+
+
+@dataclass
+class _PendingSend:
+    envelope: Envelope
+    future: asyncio.Future[None]
+    size: int
+
+
+class BatchingSink(Sink):
+    """Coalesce concurrent ``send`` calls into one ``send_many`` backend write.
+
+    Every caller waits until the batch holding its envelope has been written,
+    so a delivery is only acked after its rows are durable. A batch is flushed
+    when it reaches ``max_batch`` envelopes, when its estimated encoded size
+    reaches ``max_bytes``, or ``linger_ms`` after its first envelope arrived.
+
+    The size is the envelope's JSON encoding, not what the inner sink puts on
+    the wire with its own codec, compression or row format, so ``max_bytes``
+    is approximate. It costs one extra encoding per envelope and is only
+    computed when ``max_bytes`` is set.
+
+    A batch that fails with a permanent or validation error is replayed one
+    envelope at a time only when the inner sink declares
+    ``send_many_is_atomic``; otherwise every envelope of the batch fails with
+    an ``UNCERTAIN`` ``ConnectorOperationError``. A ``ConnectorBatchError``
+    from ``send_many`` fails only the envelopes it lists.
+    """
+
+    def __init__(
+        self,
+        sink: Sink,
+        *,
+        max_batch: int = _DEFAULT_MAX_BATCH,
+        max_bytes: int | None = None,
+        linger_ms: float = _DEFAULT_LINGER_MS,
+        name: str | None = None,
+    ) -> None:
+        if not isinstance(sink, Sink):
+            raise TypeError("BatchingSink requires a Sink instance")
+        if isinstance(max_batch, bool) or not isinstance(max_batch, int):
+            raise TypeError("max_batch must be an integer")
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        if max_bytes is not None:
+            if isinstance(max_bytes, bool) or not isinstance(max_bytes, int):
+                raise TypeError("max_bytes must be an integer")
+            if max_bytes < 1:
+                raise ValueError("max_bytes must be >= 1")
+        if isinstance(linger_ms, bool) or not isinstance(linger_ms, (int, float)):
+            raise TypeError("linger_ms must be a number")
+        if linger_ms < 0:
+            raise ValueError("linger_ms must be >= 0")
+        super().__init__(name or sink.name)
+        self.sink = sink
+        self.max_batch = max_batch
+        self.max_bytes = max_bytes
+        self.linger_ms = float(linger_ms)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending: list[_PendingSend] = []
+        self._pending_bytes = 0
+        self._linger_handle: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task[None]] = set()
+
+    @property
+    def connector(self) -> Any:
+        return getattr(self.sink, "connector", None)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def open(self) -> None:
+        await self.sink.open()
+
+    async def send(self, envelope: Envelope) -> None:
+        loop = self._ensure_loop()
+        # A JSON estimate; see the class docstring.
+        size = len(encode_envelope(envelope)) if self.max_bytes is not None else 0
+        if (
+            self._pending
+            and self.max_bytes is not None
+            and self._pending_bytes + size > self.max_bytes
+        ):
+            self._flush_pending()
+        entry = _PendingSend(envelope=envelope, future=loop.create_future(), size=size)
+        self._pending.append(entry)
+        self._pending_bytes += size
+        if len(self._pending) >= self.max_batch or (
+            self.max_bytes is not None and self._pending_bytes >= self.max_bytes
+        ):
+            self._flush_pending()
+        elif self._linger_handle is None:
+            self._linger_handle = loop.call_later(self.linger_ms / 1000.0, self._flush_pending)
+        try:
+            await entry.future
+        except asyncio.CancelledError:
+            self._discard_pending(entry)
+            raise
+
+    async def send_many(self, envelopes: Sequence[Envelope]) -> None:
+        await asyncio.gather(*(self.send(envelope) for envelope in envelopes))
+
+    async def flush(self) -> None:
+        if self._loop is not None and self._loop is asyncio.get_running_loop():
+            self._flush_pending()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    async def close(self) -> None:
+        try:
+            await self.flush()
+        finally:
+            await self.sink.close()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        current_loop = asyncio.get_running_loop()
+        if self._loop is not current_loop:
+            self._loop = current_loop
+            self._pending = []
+            self._pending_bytes = 0
+            self._linger_handle = None
+            self._flushes = set()
+        return current_loop
+
+    def _discard_pending(self, entry: _PendingSend) -> None:
+        try:
+            self._pending.remove(entry)
+        except ValueError:
+            return
+        self._pending_bytes -= entry.size
+        if not self._pending and self._linger_handle is not None:
+            self._linger_handle.cancel()
+            self._linger_handle = None
+
+    def _flush_pending(self) -> None:
+        if self._linger_handle is not None:
+            self._linger_handle.cancel()
+            self._linger_handle = None
+        batch = self._pending
+        if not batch:
+            return
+        self._pending = []
+        self._pending_bytes = 0
+        assert self._loop is not None
+        flush = self._loop.create_task(self._write_batch(batch))
+        self._flushes.add(flush)
+        flush.add_done_callback(self._flushes.discard)
+
+    async def _write_batch(self, batch: list[_PendingSend]) -> None:
+        try:
+            await self.sink.send_many([entry.envelope for entry in batch])
+        except asyncio.CancelledError:
+            for entry in batch:
+                entry.future.cancel()
+            raise
+        except ConnectorBatchError as exc:
+            # Only the listed envelopes were rejected; the rest were written.
+            for index, entry in enumerate(batch):
+                if index in exc.errors:
+                    _set_exception(entry.future, exc.errors[index])
+                else:
+                    _set_result(entry.future)
+            return
+        except Exception as exc:
+            if len(batch) > 1 and _isolate_on_failure(exc):
+                if self.sink.send_many_is_atomic:
+                    # One poison envelope must not fail the rest of its batch:
+                    # an atomic send_many committed nothing, so the envelopes
+                    # are replayed one by one to pin the culprit.
+                    await self._write_individually(batch)
+                    return
+                # Part of the batch may already be written (ordered bulk
+                # inserts stop at the first bad document), so a replay could
+                # duplicate it and a plain failure would hide it.
+                exc = ConnectorOperationError(
+                    backend=type(self.sink).__name__,
+                    operation=ConnectorOperation.SEND,
+                    kind=ConnectorErrorKind.UNCERTAIN,
+                    source_name=self.sink.name,
+                    cause=exc,
+                )
+            for entry in batch:
+                _set_exception(entry.future, exc)
+            return
+        for entry in batch:
+            _set_result(entry.future)
+
+    async def _write_individually(self, batch: list[_PendingSend]) -> None:
+        for entry in batch:
+            if entry.future.done():
+                continue
+            try:
+                await self.sink.send(entry.envelope)
+            except asyncio.CancelledError:
+                for pending in batch:
+                    pending.future.cancel()
+                raise
+            except Exception as exc:
+                _set_exception(entry.future, exc)
+            else:
+                _set_result(entry.future)
+
+
+def _isolate_on_failure(exc: Exception) -> bool:
+    if isinstance(exc, ConnectorOperationError):
+        return exc.kind is ConnectorErrorKind.PERMANENT
+    return isinstance(exc, (TypeError, ValueError))
+
+
+def _set_result(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _set_exception(future: asyncio.Future[None], exc: BaseException) -> None:
+    if not future.done():
+        future.set_exception(exc)
+
+
+__all__ = ["BatchingSink"]
@@ -1,27 +1,276 @@
 from __future__ import annotations
 
+import base64
+import importlib
 import json
+import zlib
+from collections.abc import Callable
 from typing import Any
 
 from onestep.envelope import Envelope
 
+DEFAULT_CODEC = "json"
+# Built-in names, for resource catalogs; ``register_codec`` can add more.
+ENVELOPE_CODECS = ("json", "orjson", "msgpack")
+ENVELOPE_COMPRESSIONS = ("zlib", "zstd", "lz4")
 
+# Framed messages carry the codec (and compression) that produced them, so a
+# consumer decodes a mix of plain-JSON, msgpack and compressed producers.
+# Binary transports get ``MAGIC + tag length + tag + data``; text-only
+# transports (SQS, SNS, Cloudflare Queues bodies) get ``PREFIX + tag + ";" +
+# base64(data)``. Plain JSON is never framed, so existing consumers keep
+# reading it.
+_FRAME_MAGIC = b"\x00os1"
+_TEXT_FRAME_PREFIX = "~os1;"
 
-def encode_envelope(envelope: Envelope) -> bytes:
-    payload = {
-        "body": envelope.body,
-        "meta": envelope.meta,
-        "attempts": envelope.attempts,
-    }
-    return json.dumps(payload, default=str).encode("utf-8")
 
+class EnvelopeCodec:
+    """A named serializer for the ``{"body", "meta", "attempts"}`` document."""
+
+    __slots__ = ("name", "content_type", "dumps", "loads", "is_text")
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        content_type: str,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[bytes], Any],
+        is_text: bool = False,
+    ) -> None:
+        self.name = name
+        self.content_type = content_type
+        self.dumps = dumps
+        self.loads = loads
+        # JSON text needs no frame when it is not compressed.
+        self.is_text = is_text
+
+
+class EnvelopeCompression:
+    __slots__ = ("name", "compress", "decompress")
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        compress: Callable[[bytes], bytes],
+        decompress: Callable[[bytes], bytes],
+    ) -> None:
+        self.name = name
+        self.compress = compress
+        self.decompress = decompress
+
+
+def _json_codec() -> EnvelopeCodec:
+    return EnvelopeCodec(
+        "json",
+        content_type="application/json",
+        dumps=lambda payload: json.dumps(payload, default=str).encode("utf-8"),
+        loads=json.loads,
+        is_text=True,
+    )
+
+
+def _orjson_codec() -> EnvelopeCodec:
+    orjson = _import_optional("orjson", codec="orjson")
+    option = orjson.OPT_NON_STR_KEYS
+    return EnvelopeCodec(
+        "orjson",
+        content_type="application/json",
+        dumps=lambda payload: orjson.dumps(payload, default=str, option=option),
+        loads=orjson.loads,
+        is_text=True,
+    )
+
+
+def _msgpack_codec() -> EnvelopeCodec:
+    msgpack = _import_optional("msgpack", codec="msgpack")
+    return EnvelopeCodec(
+        "msgpack",
+        content_type="application/msgpack",
+        dumps=lambda payload: msgpack.packb(payload, default=str, use_bin_type=True),
+        loads=lambda raw: msgpack.unpackb(raw, raw=False, strict_map_key=False),
+    )
+
+
+def _zlib_compression() -> EnvelopeCompression:
+    return EnvelopeCompression("zlib", compress=zlib.compress, decompress=zlib.decompress)
+
+
+def _zstd_compression() -> EnvelopeCompression:
+    zstandard = _import_optional("zstandard", codec="zstd")
+    compressor = zstandard.ZstdCompressor()
+    decompressor = zstandard.ZstdDecompressor()
+    return EnvelopeCompression("zstd", compress=compressor.compress, decompress=decompressor.decompress)
+
+
+def _lz4_compression() -> EnvelopeCompression:
+    lz4_frame = _import_optional("lz4.frame", codec="lz4", package="lz4")
+    return EnvelopeCompression("lz4", compress=lz4_frame.compress, decompress=lz4_frame.decompress)
+
+
+_CODEC_FACTORIES: dict[str, Callable[[], EnvelopeCodec]] = {
+    "json": _json_codec,
+    "orjson": _orjson_codec,
+    "msgpack": _msgpack_codec,
+}
+_COMPRESSION_FACTORIES: dict[str, Callable[[], EnvelopeCompression]] = {
+    "zlib": _zlib_compression,
+    "zstd": _zstd_compression,
+    "lz4": _lz4_compression,
+}
+_CODECS: dict[str, EnvelopeCodec] = {}
+_COMPRESSIONS: dict[str, EnvelopeCompression] = {}
+
+
+def _import_optional(module: str, *, codec: str, package: str | None = None) -> Any:
+    try:
+        return importlib.import_module(module)
+    except ModuleNotFoundError as exc:
+        raise ModuleNotFoundError(
+            f"the {codec!r} envelope codec requires {package or module}. "
+            f"Install it with: pip install 'onestep[codecs]'"
+        ) from exc
+
+
+def register_codec(codec: EnvelopeCodec) -> None:
+    """Make ``codec`` selectable by name and decodable from framed messages."""
+    if not codec.name or ";" in codec.name or "+" in codec.name:
+        raise ValueError(f"invalid codec name {codec.name!r}")
+    _CODEC_FACTORIES[codec.name] = lambda: codec
+    _CODECS.pop(codec.name, None)
+
+
+def register_compression(compression: EnvelopeCompression) -> None:
+    if not compression.name or ";" in compression.name or "+" in compression.name:
+        raise ValueError(f"invalid compression name {compression.name!r}")
+    _COMPRESSION_FACTORIES[compression.name] = lambda: compression
+    _COMPRESSIONS.pop(compression.name, None)
+
+
+def get_codec(name: str) -> EnvelopeCodec:
+    codec = _CODECS.get(name)
+    if codec is None:
+        factory = _CODEC_FACTORIES.get(name)
+        if factory is None:
+            raise ValueError(f"unknown envelope codec {name!r}; expected one of {sorted(_CODEC_FACTORIES)}")
+        codec = _CODECS[name] = factory()
+    return codec
+
+
+def get_compression(name: str) -> EnvelopeCompression:
+    compression = _COMPRESSIONS.get(name)
+    if compression is None:
+        factory = _COMPRESSION_FACTORIES.get(name)
+        if factory is None:
+            raise ValueError(
+                f"unknown envelope compression {name!r}; expected one of {sorted(_COMPRESSION_FACTORIES)}"
+            )
+        compression = _COMPRESSIONS[name] = factory()
+    return compression
+
+
+class EnvelopeFormat:
+    """The codec and optional compression one queue or topic writes with.
+
+    Build it once per connector with ``envelope_format()``; it resolves the
+    codec eagerly so a missing optional dependency fails at configuration time.
+    """
+
+    __slots__ = ("codec", "compression", "tag", "_framed", "_header")
+
+    def __init__(self, codec: EnvelopeCodec, compression: EnvelopeCompression | None = None) -> None:
+        self.codec = codec
+        self.compression = compression
+        self.tag = codec.name if compression is None else f"{codec.name}+{compression.name}"
+        self._framed = compression is not None or not codec.is_text
+        encoded_tag = self.tag.encode("ascii")
+        self._header = _FRAME_MAGIC + bytes((len(encoded_tag),)) + encoded_tag
+
+    @property
+    def content_type(self) -> str:
+        """MIME type of ``encode()`` output, for brokers with a content-type header."""
+        if not self._framed:
+            return self.codec.content_type
+        return f"application/x-onestep-envelope; codec={self.tag}"
+
+    def _dump(self, envelope: Envelope) -> bytes:
+        data = self.codec.dumps(
+            {
+                "body": envelope.body,
+                "meta": envelope.meta,
+                "attempts": envelope.attempts,
+            }
+        )
+        if self.compression is not None:
+            data = self.compression.compress(data)
+        return data
+
+    def encode(self, envelope: Envelope) -> bytes:
+        data = self._dump(envelope)
+        return self._header + data if self._framed else data
+
+    def encode_text(self, envelope: Envelope) -> str:
+        """Encode for transports whose message body must be text."""
+        data = self._dump(envelope)
+        if not self._framed:
+            return data.decode("utf-8")
+        return f"{_TEXT_FRAME_PREFIX}{self.tag};{base64.b64encode(data).decode('ascii')}"
+
+
+def envelope_format(codec: str = DEFAULT_CODEC, compression: str | None = None) -> EnvelopeFormat:
+    return EnvelopeFormat(get_codec(codec), None if compression is None else get_compression(compression))
+
+
+_DEFAULT_FORMAT = EnvelopeFormat(_json_codec())
+
+
+def encode_envelope(envelope: Envelope, fmt: EnvelopeFormat | None = None) -> bytes:
+    return (fmt or _DEFAULT_FORMAT).encode(envelope)
+
+
+def encode_envelope_text(envelope: Envelope, fmt: EnvelopeFormat | None = None) -> str:
+    return (fmt or _DEFAULT_FORMAT).encode_text(envelope)
+
+
+def _loads_tagged(tag: str, data: bytes) -> Any:
+    codec_name, _, compression_name = tag.partition("+")
+    if compression_name:
+        data = get_compression(compression_name).decompress(data)
+    return get_codec(codec_name).loads(data)
+
+
+def _unframe(raw: bytes | str) -> tuple[bool, Any]:
+    try:
+        if isinstance(raw, bytes):
+            end = len(_FRAME_MAGIC) + 1 + raw[len(_FRAME_MAGIC)]
+            tag = raw[len(_FRAME_MAGIC) + 1 : end].decode("ascii")
+            return True, _loads_tagged(tag, raw[end:])
+        tag, _, data = raw[len(_TEXT_FRAME_PREFIX) :].partition(";")
+        return True, _loads_tagged(tag, base64.b64decode(data, validate=True))
+    except Exception:
+        # Unknown codec, missing optional dependency or corrupt data (codecs
+        # and decompressors raise their own error types): hand the raw message
+        # to the task like any other undecodable body.
+        return False, None
 
 
 def decode_envelope(raw: bytes | str | dict[str, Any]) -> Envelope:
-    if isinstance(raw, bytes):
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        raw = bytes(raw)
+        if raw.startswith(_FRAME_MAGIC):
+            ok, parsed = _unframe(raw)
+            if not ok:
+                return Envelope(body=raw)
+            return _envelope_from(parsed)
         raw = raw.decode("utf-8")
 
     if isinstance(raw, str):
+        if raw.startswith(_TEXT_FRAME_PREFIX):
+            ok, parsed = _unframe(raw)
+            if not ok:
+                return Envelope(body=raw)
+            return _envelope_from(parsed)
         try:
             parsed = json.loads(raw)
         except json.JSONDecodeError:
@@ -29,6 +278,10 @@ def decode_envelope(raw: bytes | str | dict[str, Any]) -> Envelope:
     else:
         parsed = raw
 
+    return _envelope_from(parsed)
+
+
+def _envelope_from(parsed: Any) -> Envelope:
     if not isinstance(parsed, dict):
         return Envelope(body=parsed)
 
@@ -42,3 +295,21 @@ def decode_envelope(raw: bytes | str | dict[str, Any]) -> Envelope:
     if not isinstance(attempts, int):
         attempts = 0
     return Envelope(body=parsed.get("body"), meta=meta, attempts=attempts)
+
+
+__all__ = [
+    "DEFAULT_CODEC",
+    "ENVELOPE_CODECS",
+    "ENVELOPE_COMPRESSIONS",
+    "EnvelopeCodec",
+    "EnvelopeCompression",
+    "EnvelopeFormat",
+    "decode_envelope",
+    "encode_envelope",
+    "encode_envelope_text",
+    "envelope_format",
+    "get_codec",
+    "get_compression",
+    "register_codec",
+    "register_compression",
+]
@@ -9,16 +9,28 @@ import urllib.error
 import urllib.request
 from collections.abc import Mapping, Sequence
 from typing import Any
-from urllib.parse import urlsplit, urlunsplit
+from urllib.parse import urljoin, urlsplit, urlunsplit
 
 from onestep.envelope import Envelope
 from onestep.resilience import ConnectorErrorKind, ConnectorOperation, ConnectorOperationError
 
 from .base import Sink
+from .http_pool import (
+    DEFAULT_KEEPALIVE_TIMEOUT_S,
+    DEFAULT_MAX_CONNECTIONS,
+    HttpConnectionPool,
+    Origin,
+    acquire_pool,
+    release_pool,
+    url_origin,
+)
 
 _DEFAULT_SUCCESS_STATUSES = (200, 201, 202, 204)
 _DEFAULT_TIMEOUT_S = 5.0
 _BODYLESS_METHODS = {"DELETE", "GET"}
+_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+# urllib's HTTPRedirectHandler.max_redirections
+_MAX_REDIRECTS = 10
 _REDACTED = "<redacted>"
 _VARIABLE_PATH = r"[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z0-9_]+)*"
 _VARIABLE_RE = re.compile(r"\{\{\s*(" + _VARIABLE_PATH + r")\s*\}\}")
@@ -46,6 +58,8 @@ class HttpSink(Sink):
         body: Any | None = None,
         timeout_s: float = _DEFAULT_TIMEOUT_S,
         success_statuses: Sequence[int] | None = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        keepalive_timeout_s: float = DEFAULT_KEEPALIVE_TIMEOUT_S,
     ) -> None:
         super().__init__(name)
         self.url = _normalize_url(url)
@@ -55,6 +69,25 @@ class HttpSink(Sink):
         self.body = _normalize_body(body)
         self.timeout_s = _normalize_timeout(timeout_s)
         self.success_statuses = _normalize_success_statuses(success_statuses)
+        self.max_connections = _normalize_max_connections(max_connections)
+        self.keepalive_timeout_s = _normalize_keepalive_timeout(keepalive_timeout_s)
+        self._pools: dict[Origin, HttpConnectionPool] = {}
+        self._pools_loop: asyncio.AbstractEventLoop | None = None
+
+    async def close(self) -> None:
+        pools, self._pools = self._pools, {}
+        if self._pools_loop is asyncio.get_running_loop():
+            for pool in pools.values():
+                await release_pool(pool)
+        self._pools_loop = None
+
+    def pool_stats(self) -> list[dict[str, Any]]:
+        """Connection pool stats for each origin this sink has sent to.
+
+        Pools are shared by every ``HttpSink`` targeting the same origin, so
+        the counters cover all of them.
+        """
+        return [pool.stats() for pool in self._pools.values()]
 
     async def send(self, envelope: Envelope) -> None:
         try:
@@ -70,14 +103,17 @@ class HttpSink(Sink):
                 cause=exc,
                 message=f"http_sink variable rendering failed for {self.name!r}: {exc}",
             ) from exc
-        request = urllib.request.Request(
-            request_url,
-            data=payload,
-            headers=headers,
-            method=self.method,
-        )
         try:
-            status, reason, body = await asyncio.to_thread(self._send_request, request)
+            if _uses_proxy(request_url):
+                request = urllib.request.Request(
+                    request_url,
+                    data=payload,
+                    headers=headers,
+                    method=self.method,
+                )
+                status, reason, body = await asyncio.to_thread(self._send_request, request)
+            else:
+                status, reason, body = await self._send_pooled(request_url, payload, headers)
         except ConnectorOperationError:
             raise
         except (TimeoutError, urllib.error.URLError, OSError) as exc:
@@ -147,6 +183,65 @@ class HttpSink(Sink):
             _set_header_default(headers, "Content-Type", "application/json")
         return headers
 
+    async def _send_pooled(
+        self,
+        request_url: str,
+        payload: bytes | None,
+        headers: Mapping[str, str],
+    ) -> tuple[int, str, bytes]:
+        method = self.method
+        for _ in range(_MAX_REDIRECTS + 1):
+            pool = self._pool_for(request_url)
+            parsed = urlsplit(request_url)
+            target = urlunsplit(("", "", parsed.path or "/", parsed.query, ""))
+            response = await pool.request(
+                method,
+                target,
+                headers=headers,
+                body=payload,
+                timeout_s=self.timeout_s,
+            )
+            location = response.headers.get("location")
+            if response.status not in _REDIRECT_STATUSES or not location:
+                break
+            # Follow redirects the way urllib does: GET and HEAD keep their
+            # method, a POST answered with 301/302/303 becomes a GET without
+            # its body, and any other redirect is returned as the response.
+            if method == "POST" and response.status in {301, 302, 303}:
+                method = "GET"
+                payload = None
+                headers = {
+                    key: value
+                    for key, value in headers.items()
+                    if key.lower() not in {"content-type", "content-length"}
+                }
+            elif method not in {"GET", "HEAD"}:
+                break
+            next_url = urljoin(request_url, location)
+            if urlsplit(next_url).scheme not in {"http", "https"}:
+                break
+            if _uses_proxy(next_url):
+                request = urllib.request.Request(next_url, data=payload, headers=dict(headers), method=method)
+                return await asyncio.to_thread(self._send_request, request)
+            request_url = next_url
+        return response.status, response.reason, response.body
+
+    def _pool_for(self, request_url: str) -> HttpConnectionPool:
+        loop = asyncio.get_running_loop()
+        if self._pools_loop is not loop:
+            self._pools = {}
+            self._pools_loop = loop
+        origin = url_origin(request_url)
+        pool = self._pools.get(origin)
+        if pool is None or pool.closed:
+            pool = acquire_pool(
+                origin,
+                max_connections=self.max_connections,
+                keepalive_timeout_s=self.keepalive_timeout_s,
+            )
+            self._pools[origin] = pool
+        return pool
+
     def _send_request(self, request: urllib.request.Request) -> tuple[int, str, bytes]:
         try:
             with urllib.request.urlopen(request, timeout=self.timeout_s) as response:
@@ -295,6 +390,23 @@ def _normalize_timeout(value: float) -> float:
     return normalized
 
 
+def _normalize_max_connections(value: int) -> int:
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise TypeError("'max_connections' must be an integer")
+    if value < 1:
+        raise ValueError("'max_connections' must be >= 1")
+    return value
+
+
+def _normalize_keepalive_timeout(value: float) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError("'keepalive_timeout_s' must be a number")
+    normalized = float(value)
+    if normalized < 0:
+        raise ValueError("'keepalive_timeout_s' must be >= 0")
+    return normalized
+
+
 def _normalize_success_statuses(value: Sequence[int] | None) -> tuple[int, ...]:
     if value is None:
         return _DEFAULT_SUCCESS_STATUSES
@@ -318,6 +430,16 @@ def _set_header_default(headers: dict[str, str], name: str, value: str) -> None:
     headers[name] = value
 
 
+def _uses_proxy(url: str) -> bool:
+    # The pooled client connects directly; URLs that urllib would route
+    # through a configured proxy keep using urllib.
+    parsed = urlsplit(url)
+    proxies = urllib.request.getproxies()
+    if parsed.scheme not in proxies:
+        return False
+    return not urllib.request.proxy_bypass(parsed.hostname or "")
+
+
 def _classify_status(status: int) -> ConnectorErrorKind:
     if status == 429:
         return ConnectorErrorKind.THROTTLED
@@ -0,0 +1,485 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import socket
+import ssl
+import sys
+import time
+from collections import deque
+from collections.abc import Mapping
+from typing import Any
+from urllib.parse import urlsplit
+
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_TIMEOUT_S = 30.0
+_MAX_HEADER_BYTES = 64 * 1024
+_NO_BODY_STATUSES = frozenset({204, 304})
+# What urllib sent before requests went through the pool.
+_DEFAULT_USER_AGENT = f"Python-urllib/{sys.version_info[0]}.{sys.version_info[1]}"
+# Methods a server may safely see twice; only these are resent after a
+# reused connection dropped once the request was on the wire.
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS", "TRACE"})
+
+Origin = tuple[str, str, int]
+
+_POOLS: dict[Origin, "HttpConnectionPool"] = {}
+_POOLS_LOOP: asyncio.AbstractEventLoop | None = None
+
+
+def _pool_registry() -> dict[Origin, "HttpConnectionPool"]:
+    global _POOLS_LOOP
+    loop = asyncio.get_running_loop()
+    if _POOLS_LOOP is not loop:
+        # Connections belong to the loop that opened them, which may be
+        # closed by now; shut down whatever the old loop left idle.
+        for pool in _POOLS.values():
+            pool._abandon()
+        _POOLS.clear()
+        _POOLS_LOOP = loop
+    return _POOLS
+
+
+def url_origin(url: str) -> Origin:
+    parsed = urlsplit(url)
+    scheme = parsed.scheme.lower()
+    host = parsed.hostname or ""
+    port = parsed.port or (443 if scheme == "https" else 80)
+    return scheme, host, port
+
+
+def acquire_pool(
+    origin: Origin,
+    *,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    keepalive_timeout_s: float = DEFAULT_KEEPALIVE_TIMEOUT_S,
+) -> "HttpConnectionPool":
+    """Return the shared pool for ``origin`` and take a reference on it.
+
+    Sinks targeting the same origin share one pool; its connection limit is
+    the largest ``max_connections`` any holder asked for.
+    """
+    pools = _pool_registry()
+    pool = pools.get(origin)
+    if pool is None or pool.closed:
+        pool = HttpConnectionPool(
+            origin,
+            max_connections=max_connections,
+            keepalive_timeout_s=keepalive_timeout_s,
+        )
+        pools[origin] = pool
+    else:
+        pool.max_connections = max(pool.max_connections, max_connections)
+        pool.keepalive_timeout_s = max(pool.keepalive_timeout_s, keepalive_timeout_s)
+    pool._refs += 1
+    return pool
+
+
+async def release_pool(pool: "HttpConnectionPool") -> None:
+    pool._refs = max(0, pool._refs - 1)
+    if pool._refs:
+        return
+    if _POOLS.get(pool.origin) is pool:
+        _POOLS.pop(pool.origin, None)
+    await pool.aclose()
+
+
+def pool_stats() -> list[dict[str, Any]]:
+    """Stats for every live pool on the running loop."""
+    return [pool.stats() for pool in _pool_registry().values()]
+
+
+class HttpResponse:
+    __slots__ = ("status", "reason", "headers", "body")
+
+    def __init__(self, status: int, reason: str, headers: dict[str, str], body: bytes) -> None:
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+
+class _Connection:
+    __slots__ = ("reader", "writer", "idle_since", "requests")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.idle_since = time.monotonic()
+        self.requests = 0
+
+    def is_usable(self, keepalive_timeout_s: float) -> bool:
+        if self.writer.is_closing() or self.reader.at_eof():
+            return False
+        return time.monotonic() - self.idle_since < keepalive_timeout_s
+
+    def close(self) -> None:
+        self.writer.close()
+
+    def abort(self) -> None:
+        # Called from another loop: the owning loop may be closed, in which
+        # case closing the transport fails, so the socket is shut down first.
+        sock = self.writer.get_extra_info("socket")
+        if sock is not None:
+            with contextlib.suppress(OSError):
+                sock.shutdown(socket.SHUT_RDWR)
+        with contextlib.suppress(RuntimeError):
+            self.writer.close()
+
+
+class _StaleConnectionError(ConnectionError):
+    """A reused connection closed before any response byte arrived.
+
+    ``sent`` tells whether the request had been written out: the server may
+    then have acted on it even though it never answered.
+    """
+
+    def __init__(self, message: str, *, sent: bool) -> None:
+        super().__init__(message)
+        self.sent = sent
+
+
+class HttpConnectionPool:
+    """HTTP/1.1 keep-alive connections to one origin, bounded per host.
+
+    ``request()`` reuses an idle connection when one is still open, opens a
+    new one while fewer than ``max_connections`` are in use, and otherwise
+    waits for a connection to be returned. Idle connections are closed after
+    ``keepalive_timeout_s``. A request that fails on a reused connection
+    before the server sent anything (the server dropped it while idle) is
+    retried once on a fresh connection, unless it is not idempotent and was
+    already written out: a POST the server may have processed is not resent.
+    """
+
+    def __init__(
+        self,
+        origin: Origin,
+        *,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        keepalive_timeout_s: float = DEFAULT_KEEPALIVE_TIMEOUT_S,
+    ) -> None:
+        if max_connections < 1:
+            raise ValueError("max_connections must be >= 1")
+        if keepalive_timeout_s < 0:
+            raise ValueError("keepalive_timeout_s must be >= 0")
+        self.origin = origin
+        self.max_connections = max_connections
+        self.keepalive_timeout_s = keepalive_timeout_s
+        self.closed = False
+        self._idle: deque[_Connection] = deque()
+        self._in_use = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._ssl: ssl.SSLContext | None = ssl.create_default_context() if origin[0] == "https" else None
+        self._refs = 0
+        self._connects = 0
+        self._reuses = 0
+        self._requests = 0
+        self._stale_retries = 0
+
+    @property
+    def host_header(self) -> str:
+        scheme, host, port = self.origin
+        if ":" in host:
+            host = f"[{host}]"
+        default_port = 443 if scheme == "https" else 80
+        return host if port == default_port else f"{host}:{port}"
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "origin": f"{self.origin[0]}://{self.host_header}",
+            "max_connections": self.max_connections,
+            "in_use": self._in_use,
+            "idle": len(self._idle),
+            "waiting": len(self._waiters),
+            "connects": self._connects,
+            "reuses": self._reuses,
+            "requests": self._requests,
+            "stale_retries": self._stale_retries,
+        }
+
+    async def request(
+        self,
+        method: str,
+        target: str,
+        *,
+        headers: Mapping[str, str],
+        body: bytes | None,
+        timeout_s: float,
+    ) -> HttpResponse:
+        if self.closed:
+            raise ConnectionError("http connection pool is closed")
+        await self._reserve()
+        try:
+            try:
+                return await asyncio.wait_for(
+                    self._request_once(method, target, headers, body),
+                    timeout=timeout_s,
+                )
+            except asyncio.TimeoutError as exc:
+                raise TimeoutError(f"HTTP request to {self.host_header} timed out after {timeout_s}s") from exc
+        finally:
+            self._unreserve()
+
+    async def aclose(self) -> None:
+        self.closed = True
+        while self._idle:
+            connection = self._idle.popleft()
+            connection.close()
+            with contextlib.suppress(Exception):
+                await connection.writer.wait_closed()
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _abandon(self) -> None:
+        """Close the pool from a loop other than the one that owns it."""
+        self.closed = True
+        while self._idle:
+            self._idle.popleft().abort()
+        # Waiters belong to the old loop and cannot be woken from this one.
+        self._waiters.clear()
+
+    async def _reserve(self) -> None:
+        while self._in_use >= self.max_connections:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(waiter)
+                if waiter.done() and not waiter.cancelled():
+                    # Woken and cancelled at once: pass the slot on.
+                    self._wake_next()
+                raise
+            if self.closed:
+                raise ConnectionError("http connection pool is closed")
+        self._in_use += 1
+
+    def _unreserve(self) -> None:
+        self._in_use -= 1
+        self._wake_next()
+
+    def _wake_next(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    async def _request_once(
+        self,
+        method: str,
+        target: str,
+        headers: Mapping[str, str],
+        body: bytes | None,
+    ) -> HttpResponse:
+        connection, reused = await self._checkout()
+        try:
+            response, keep_alive = await self._exchange(connection, method, target, headers, body, reused=reused)
+        except _StaleConnectionError as exc:
+            connection.close()
+            if exc.sent and method not in _IDEMPOTENT_METHODS:
+                raise
+            self._stale_retries += 1
+            connection, _ = await self._checkout(fresh=True)
+            try:
+                response, keep_alive = await self._exchange(connection, method, target, headers, body, reused=False)
+            except BaseException:
+                connection.close()
+                raise
+        except BaseException:
+            connection.close()
+            raise
+        self._requests += 1
+        if keep_alive and not self.closed:
+            connection.idle_since = time.monotonic()
+            self._idle.append(connection)
+        else:
+            connection.close()
+        return response
+
+    async def _checkout(self, *, fresh: bool = False) -> tuple[_Connection, bool]:
+        while self._idle and not fresh:
+            # Most recently returned first: it is the least likely to have
+            # been closed by the server's own idle timeout.
+            connection = self._idle.pop()
+            if connection.is_usable(self.keepalive_timeout_s):
+                self._reuses += 1
+                return connection, True
+            connection.close()
+        _, host, port = self.origin
+        reader, writer = await asyncio.open_connection(
+            host,
+            port,
+            ssl=self._ssl,
+            server_hostname=host if self._ssl is not None else None,
+            limit=_MAX_HEADER_BYTES,
+        )
+        self._connects += 1
+        return _Connection(reader, writer), False
+
+    async def _exchange(
+        self,
+        connection: _Connection,
+        method: str,
+        target: str,
+        headers: Mapping[str, str],
+        body: bytes | None,
+        *,
+        reused: bool,
+    ) -> tuple[HttpResponse, bool]:
+        lines = [f"{method} {target} HTTP/1.1"]
+        present = {key.lower() for key in headers}
+        if "host" not in present:
+            lines.append(f"Host: {self.host_header}")
+        if "user-agent" not in present:
+            lines.append(f"User-Agent: {_DEFAULT_USER_AGENT}")
+        for key, value in headers.items():
+            lines.append(f"{key}: {value}")
+        if body is not None and "content-length" not in present:
+            lines.append(f"Content-Length: {len(body)}")
+        lines.append("")
+        lines.append("")
+        request = "\r\n".join(lines).encode("iso-8859-1")
+        if body:
+            request += body
+
+        connection.requests += 1
+        try:
+            connection.writer.write(request)
+            await connection.writer.drain()
+        except ConnectionError as exc:
+            if reused:
+                raise _StaleConnectionError(str(exc), sent=False) from exc
+            raise
+        try:
+            status_line = await connection.reader.readline()
+        except ConnectionError as exc:
+            if reused:
+                raise _StaleConnectionError(str(exc), sent=True) from exc
+            raise
+        except ValueError as exc:
+            raise ConnectionError("response status line too long") from exc
+        if not status_line:
+            if reused:
+                raise _StaleConnectionError("connection closed before response", sent=True)
+            raise ConnectionError("connection closed before response")
+
+        status, reason, version = _parse_status_line(status_line)
+        response_headers = await _read_headers(connection.reader)
+        while 100 <= status < 200 and status != 101:
+            # Interim responses (100 Continue, 103 Early Hints) precede the
+            # final one on the same connection; only their headers are sent.
+            try:
+                status_line = await connection.reader.readline()
+            except ValueError as exc:
+                raise ConnectionError("response status line too long") from exc
+            if not status_line:
+                raise ConnectionError("connection closed before response")
+            status, reason, version = _parse_status_line(status_line)
+            response_headers = await _read_headers(connection.reader)
+        connection_tokens = {
+            token.strip().lower() for token in response_headers.get("connection", "").split(",") if token.strip()
+        }
+        if status == 101:
+            # The connection now speaks another protocol.
+            keep_alive = False
+        elif version == "HTTP/1.0":
+            keep_alive = "keep-alive" in connection_tokens
+        else:
+            keep_alive = "close" not in connection_tokens
+
+        if method == "HEAD" or status in _NO_BODY_STATUSES or status == 101:
+            payload = b""
+        elif "chunked" in response_headers.get("transfer-encoding", "").lower():
+            payload = await _read_chunked(connection.reader)
+        elif "content-length" in response_headers:
+            try:
+                length = int(response_headers["content-length"])
+            except ValueError as exc:
+                raise ConnectionError("invalid Content-Length in response") from exc
+            payload = await _read_exact(connection.reader, length)
+        else:
+            payload = await connection.reader.read()
+            keep_alive = False
+        return HttpResponse(status, reason, response_headers, payload), keep_alive
+
+
+def _parse_status_line(line: bytes) -> tuple[int, str, str]:
+    parts = line.decode("iso-8859-1").rstrip("\r\n").split(" ", 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/1."):
+        raise ConnectionError(f"invalid HTTP status line: {line[:80]!r}")
+    try:
+        status = int(parts[1])
+    except ValueError as exc:
+        raise ConnectionError(f"invalid HTTP status line: {line[:80]!r}") from exc
+    return status, parts[2] if len(parts) > 2 else "", parts[0]
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    total = 0
+    while True:
+        try:
+            line = await reader.readline()
+        except ValueError as exc:
+            raise ConnectionError("response header line too long") from exc
+        if not line:
+            raise ConnectionError("connection closed while reading response headers")
+        total += len(line)
+        if total > _MAX_HEADER_BYTES:
+            raise ConnectionError("response headers too large")
+        text = line.decode("iso-8859-1").rstrip("\r\n")
+        if not text:
+            return headers
+        key, _, value = text.partition(":")
+        name = key.strip().lower()
+        if name in headers:
+            headers[name] = f"{headers[name]}, {value.strip()}"
+        else:
+            headers[name] = value.strip()
+
+
+async def _read_exact(reader: asyncio.StreamReader, length: int) -> bytes:
+    if length <= 0:
+        return b""
+    try:
+        return await reader.readexactly(length)
+    except asyncio.IncompleteReadError as exc:
+        raise ConnectionError("connection closed while reading response body") from exc
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    chunks: list[bytes] = []
+    while True:
+        size_line = await reader.readline()
+        if not size_line:
+            raise ConnectionError("connection closed while reading chunked body")
+        try:
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+        except ValueError as exc:
+            raise ConnectionError("invalid chunk size in response") from exc
+        if size == 0:
+            break
+        chunks.append(await _read_exact(reader, size))
+        await _read_exact(reader, 2)
+    # Trailer section, terminated by an empty line.
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+    return b"".join(chunks)
+
+
+__all__ = [
+    "DEFAULT_KEEPALIVE_TIMEOUT_S",
+    "DEFAULT_MAX_CONNECTIONS",
+    "HttpConnectionPool",
+    "HttpResponse",
+    "acquire_pool",
+    "pool_stats",
+    "release_pool",
+    "url_origin",
+]
@@ -9,6 +9,8 @@ from .base import Delivery, Sink, Source
 
 
 class MemoryDelivery(Delivery):
+    __slots__ = ("_queue",)
+
     def __init__(self, queue: Queue, envelope: Envelope) -> None:
         super().__init__(envelope)
         self._queue = queue
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
 import asyncio
-import copy
+import calendar
 import heapq
 import os
+from bisect import bisect_left
 from collections import deque
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone, tzinfo
+from datetime import MAXYEAR, datetime, timedelta, timezone, tzinfo
 from typing import Any, Callable
 from zoneinfo import ZoneInfo
 
 from onestep.envelope import Envelope
+from onestep.snapshot import thaw
 
 from .base import Delivery, Source
 
@@ -47,9 +49,14 @@ CRON_ALIASES = {
     "@yearly": "0 0 1 1 *",
 }
 DEFAULT_MAX_QUEUED_RUNS = 1000
+# Upcoming cron fire times computed per refill of the per-schedule cache.
+CRON_CACHE_SIZE = 32
+CRON_SEARCH_YEARS = 9
 
 
 class ScheduleDelivery(Delivery):
+    __slots__ = ("_source",)
+
     def __init__(self, source: "BaseScheduleSource", envelope: Envelope) -> None:
         super().__init__(envelope)
         self._source = source
@@ -66,6 +73,8 @@ class ScheduleDelivery(Delivery):
 
 class BaseScheduleSource(Source):
     supports_manual_run = True
+    # Retries go into the source's own ready-at heap.
+    native_retry_delay = True
 
     def __init__(
         self,
@@ -96,6 +105,7 @@ class BaseScheduleSource(Source):
         self.timezone_name = resolve_timezone_name(resolved_timezone)
         self.poll_interval_s = max(0.01, poll_interval_s)
         self._clock = clock or self._default_now
+        self._wall_clock = clock is None
         self._initialized = False
         self._pending_immediate = immediate
         self._next_fire_at: datetime | None = None
@@ -152,6 +162,24 @@ class BaseScheduleSource(Source):
                 return []
             return self._handle_due_runs_locked(due_runs, fetch_limit)
 
+    def next_fetch_delay_s(self) -> float | None:
+        if not self._wall_clock or not self._initialized:
+            # Injected clocks do not advance with real time; keep polling.
+            return None
+        if self._loop is not asyncio.get_running_loop():
+            return None
+        if self._pending_immediate:
+            return 0.0
+        if self.overlap == "queue" and self._inflight == 0 and self._queued_runs:
+            return 0.0
+        now = self._now().timestamp()
+        deadlines = [ready_at.timestamp() for ready_at, _, _ in self._retry_heap[:1]]
+        if self._next_fire_at is not None:
+            deadlines.append(self._next_fire_at.timestamp())
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - now)
+
     async def finish_success(self) -> None:
         async with self._runtime_lock():
             self._inflight = max(0, self._inflight - 1)
@@ -163,7 +191,7 @@ class BaseScheduleSource(Source):
     async def finish_retry(self, envelope: Envelope, *, delay_s: float | None = None) -> None:
         ready_at = self._now() + timedelta(seconds=max(delay_s or 0, 0))
         retry_envelope = Envelope(
-            body=copy.deepcopy(envelope.body),
+            body=thaw(envelope.body),
             meta=dict(envelope.meta),
             attempts=envelope.attempts + 1,
         )
@@ -268,7 +296,7 @@ class BaseScheduleSource(Source):
     def _build_payload(self) -> Any:
         if callable(self.payload):
             return self.payload()
-        return copy.deepcopy(self.payload)
+        return thaw(self.payload)
 
     def _initial_fire_at(self, now: datetime) -> datetime:
         raise NotImplementedError
@@ -364,10 +392,16 @@ class CronField:
         self.names = names or {}
         self.sunday_as_zero = sunday_as_zero
         self.values = self._parse(expression)
+        self.ordered = tuple(sorted(self.values))
 
     def matches(self, value: int) -> bool:
         return value in self.values
 
+    def next_value(self, value: int) -> int | None:
+        """Return the smallest allowed value >= ``value``, or None."""
+        index = bisect_left(self.ordered, value)
+        return self.ordered[index] if index < len(self.ordered) else None
+
     def _parse(self, expression: str) -> set[int]:
         values: set[int] = set()
         for chunk in expression.split(","):
@@ -438,6 +472,8 @@ class CronSchedule:
         resolved_timezone = timezone if timezone is not None else timezone_name
         self.timezone = resolve_timezone(resolved_timezone)
         self.timezone_name = resolve_timezone_name(resolved_timezone)
+        self._upcoming: deque[tuple[datetime, datetime]] = deque()
+        self._upcoming_from: datetime | None = None
         self.minute = CronField(fields[0], minimum=0, maximum=59)
         self.hour = CronField(fields[1], minimum=0, maximum=23)
         self.day_of_month = CronField(fields[2], minimum=1, maximum=31)
@@ -479,13 +515,119 @@ class CronSchedule:
         return self.next_after(current)
 
     def next_after(self, current: datetime) -> datetime:
-        candidate = current.astimezone(self.timezone).replace(second=0, microsecond=0) + timedelta(minutes=1)
-        for _ in range(366 * 24 * 60 * 2):
-            if self.matches(candidate):
-                return candidate
-            candidate += timedelta(minutes=1)
+        """Return the first fire time strictly after ``current``.
+
+        Fire times are searched field by field on the wall clock and then
+        localized. A wall time skipped by a DST jump fires at the first
+        instant after the jump; a wall time repeated when clocks fall back
+        fires once, at its first occurrence after ``current``. When calls
+        walk forward past the cached fire times (catching up after a pause,
+        or the source's normal cadence), the next ``CRON_CACHE_SIZE`` fire
+        times are computed in one go and served from the cache.
+        """
+        # Compare in UTC: aware datetimes sharing one tzinfo compare by wall
+        # time, which is wrong across a fall-back transition.
+        instant = current.astimezone(timezone.utc)
+        upcoming = self._upcoming
+        if upcoming and self._upcoming_from is not None and self._upcoming_from <= instant < upcoming[-1][0]:
+            while upcoming[0][0] <= instant:
+                upcoming.popleft()
+            self._upcoming_from = instant
+            return upcoming[0][1]
+        # Only prefetch when continuing from the end of the cache; an
+        # unrelated lookup (e.g. a fresh source) computes a single fire time.
+        sequential = bool(upcoming) and instant == upcoming[-1][0]
+        upcoming.clear()
+        previous = instant
+        for _ in range(CRON_CACHE_SIZE if sequential else 1):
+            try:
+                fire_at = self._compute_next_after(previous)
+            except RuntimeError:
+                if not upcoming:
+                    raise
+                break
+            previous = fire_at.astimezone(timezone.utc)
+            upcoming.append((previous, fire_at))
+        self._upcoming_from = instant
+        return upcoming[0][1]
+
+    def _compute_next_after(self, instant: datetime) -> datetime:
+        local = instant.astimezone(self.timezone)
+        wall = local.replace(tzinfo=None, second=0, microsecond=0, fold=0) + timedelta(minutes=1)
+        while True:
+            wall = self._next_wall_time(wall)
+            fire_at = self._localize(wall, after=instant)
+            if fire_at is not None:
+                return fire_at
+            wall += timedelta(minutes=1)
+
+    def _next_wall_time(self, start: datetime) -> datetime:
+        """Return the first naive wall-clock minute >= ``start`` matching every field."""
+        if self.month.matches(start.month) and self._day_matches(start.year, start.month, start.day):
+            found = self._time_on_day(start.hour, start.minute)
+            if found is not None:
+                return start.replace(hour=found[0], minute=found[1])
+        # Leap-day expressions can need eight years (e.g. across 2100).
+        for year in range(start.year, min(start.year + CRON_SEARCH_YEARS, MAXYEAR + 1)):
+            first_month = start.month if year == start.year else 1
+            for month in self.month.ordered:
+                if month < first_month:
+                    continue
+                same_month = year == start.year and month == start.month
+                last_day = calendar.monthrange(year, month)[1]
+                for day in range(start.day if same_month else 1, last_day + 1):
+                    if not self._day_matches(year, month, day):
+                        continue
+                    same_day = same_month and day == start.day
+                    found = self._time_on_day(start.hour, start.minute) if same_day else self._time_on_day(0, 0)
+                    if found is not None:
+                        return datetime(year, month, day, found[0], found[1])
         raise RuntimeError(f"unable to find next fire time for cron expression {self.expression!r}")
 
+    def _time_on_day(self, hour: int, minute: int) -> tuple[int, int] | None:
+        next_hour = self.hour.next_value(hour)
+        if next_hour is None:
+            return None
+        if next_hour == hour:
+            next_minute = self.minute.next_value(minute)
+            if next_minute is not None:
+                return hour, next_minute
+            next_hour = self.hour.next_value(hour + 1)
+            if next_hour is None:
+                return None
+        return next_hour, self.minute.ordered[0]
+
+    def _day_matches(self, year: int, month: int, day: int) -> bool:
+        if self.day_of_month.any and self.day_of_week.any:
+            return True
+        dom_match = self.day_of_month.matches(day)
+        if self.day_of_week.any:
+            return dom_match
+        dow_match = self.day_of_week.matches((calendar.weekday(year, month, day) + 1) % 7)
+        if self.day_of_month.any:
+            return dow_match
+        return dom_match or dow_match
+
+    def _localize(self, wall: datetime, *, after: datetime) -> datetime | None:
+        """Return ``wall`` as an aware fire time later than the UTC ``after``."""
+        first = wall.replace(tzinfo=self.timezone, fold=0)
+        first_utc = first.astimezone(timezone.utc)
+        if isinstance(self.timezone, timezone):
+            # Fixed offsets have no gaps or repeated wall times.
+            return first if first_utc > after else None
+        normalized = first_utc.astimezone(self.timezone)
+        if normalized.replace(tzinfo=None) != wall:
+            # Nonexistent wall time: read it with the offset in force before
+            # the jump, which moves it forward by the gap (02:30 in a one-hour
+            # gap fires at 03:30), as the minute-by-minute search used to.
+            return normalized if first_utc > after else None
+        if first_utc > after:
+            return first
+        second = wall.replace(tzinfo=self.timezone, fold=1)
+        if second.utcoffset() != first.utcoffset() and second.astimezone(timezone.utc) > after:
+            return second
+        return None
+
 
 class CronSource(BaseScheduleSource):
     def __init__(
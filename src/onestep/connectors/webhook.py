@@ -17,9 +17,12 @@ from .base import Delivery, Source
 
 _DEFAULT_HEADER_TIMEOUT_S = 5.0
 _DEFAULT_RESPONSE_BODY = {"accepted": True}
-_SUPPORTED_PARSERS = {"auto", "json", "form", "text", "raw"}
+_SUPPORTED_PARSERS = {"auto", "json", "form", "text", "raw", "ndjson"}
+_SUPPORTED_MODES = {"async", "sync"}
+_MAX_CHUNK_LINE_BYTES = 1024
 _STATUS_TEXT = {
     200: "OK",
+    204: "No Content",
     401: "Unauthorized",
     202: "Accepted",
     400: "Bad Request",
@@ -31,6 +34,7 @@ _STATUS_TEXT = {
     500: "Internal Server Error",
     501: "Not Implemented",
     503: "Service Unavailable",
+    504: "Gateway Timeout",
 }
 
 _SERVERS: dict[tuple[str, int], "_WebhookServer"] = {}
@@ -69,7 +73,6 @@ class WebhookResponse:
             payload = json.dumps(body).encode("utf-8")
             headers.setdefault("Content-Type", "application/json")
         headers["Content-Length"] = str(len(payload))
-        headers.setdefault("Connection", "close")
         return self.status_code, headers, payload
 
 
@@ -105,12 +108,26 @@ class BearerAuth:
 
 
 class WebhookDelivery(Delivery):
-    def __init__(self, source: "WebhookSource", envelope: Envelope) -> None:
+    __slots__ = ("_source", "_reply", "_result")
+
+    def __init__(
+        self,
+        source: "WebhookSource",
+        envelope: Envelope,
+        reply: asyncio.Future[Any] | None = None,
+    ) -> None:
         super().__init__(envelope)
         self._source = source
+        # The waiting caller of a sync-mode request; it travels with the
+        # event through retries instead of through ``envelope.meta``.
+        self._reply = reply
+        self._result: Any = None
+
+    def set_result(self, result: Any) -> None:
+        self._result = result
 
     async def ack(self) -> None:
-        return None
+        self._source._resolve_reply(self._reply, result=self._result)
 
     async def retry(self, *, delay_s: float | None = None) -> None:
         if delay_s:
@@ -120,11 +137,12 @@ class WebhookDelivery(Delivery):
                 body=self.envelope.body,
                 meta=dict(self.envelope.meta),
                 attempts=self.envelope.attempts + 1,
-            )
+            ),
+            reply=self._reply,
         )
 
     async def fail(self, exc: Exception | None = None) -> None:
-        return None
+        self._source._resolve_reply(self._reply, error=exc or RuntimeError("delivery failed"))
 
 
 class WebhookSource(Source):
@@ -138,8 +156,12 @@ class WebhookSource(Source):
         parser: str = "auto",
         auth: BearerAuth | None = None,
         response: WebhookResponse | None = None,
+        mode: str = "async",
+        reply_timeout_s: float = 30.0,
         max_body_bytes: int = 1024 * 1024,
         read_timeout_s: float = 5.0,
+        keepalive_timeout_s: float = 5.0,
+        max_keepalive_requests: int = 1000,
         queue_maxsize: int = 1000,
         batch_size: int = 100,
         poll_interval_s: float = 0.1,
@@ -150,10 +172,20 @@ class WebhookSource(Source):
             raise ValueError(f"parser must be one of: {', '.join(sorted(_SUPPORTED_PARSERS))}")
         if not methods:
             raise ValueError("methods must contain at least one HTTP method")
+        if mode not in _SUPPORTED_MODES:
+            raise ValueError(f"mode must be one of: {', '.join(sorted(_SUPPORTED_MODES))}")
+        if mode == "sync" and parser == "ndjson":
+            raise ValueError("the ndjson parser cannot be used with mode='sync'")
+        if reply_timeout_s <= 0:
+            raise ValueError("reply_timeout_s must be > 0")
         if max_body_bytes < 0:
             raise ValueError("max_body_bytes must be >= 0")
         if read_timeout_s <= 0:
             raise ValueError("read_timeout_s must be > 0")
+        if keepalive_timeout_s < 0:
+            raise ValueError("keepalive_timeout_s must be >= 0")
+        if max_keepalive_requests < 1:
+            raise ValueError("max_keepalive_requests must be >= 1")
         if queue_maxsize < 1:
             raise ValueError("queue_maxsize must be >= 1")
 
@@ -165,14 +197,20 @@ class WebhookSource(Source):
         self.parser = parser
         self.auth = auth
         self.response = response or WebhookResponse()
+        self.mode = mode
+        self.reply_timeout_s = reply_timeout_s
         self.max_body_bytes = max_body_bytes
         self.read_timeout_s = read_timeout_s
+        self.keepalive_timeout_s = keepalive_timeout_s
+        self.max_keepalive_requests = max_keepalive_requests
         self.queue_maxsize = queue_maxsize
         self.batch_size = batch_size
         self.poll_interval_s = poll_interval_s
         self._queue: Queue | None = None
         self._loop: asyncio.AbstractEventLoop | None = None
         self._server: _WebhookServer | None = None
+        self._rendered_response = self.response.render()
+        self._replies: set[asyncio.Future[Any]] = set()
 
     @property
     def bound_port(self) -> int:
@@ -197,6 +235,10 @@ class WebhookSource(Source):
             self._server = server
 
     async def close(self) -> None:
+        replies, self._replies = self._replies, set()
+        for reply in replies:
+            if not reply.done():
+                reply.set_exception(_HTTPError(503, {"error": "shutting_down"}))
         if self._server is None:
             return None
         lock = _server_registry_lock()
@@ -216,20 +258,72 @@ class WebhookSource(Source):
         except asyncio.TimeoutError:
             return []
 
-        deliveries: list[Delivery] = [WebhookDelivery(self, first)]
+        deliveries: list[Delivery] = [WebhookDelivery(self, *first)]
         while len(deliveries) < fetch_limit:
             try:
-                envelope = queue.get_nowait()
+                queued = queue.get_nowait()
             except QueueEmpty:
                 break
-            deliveries.append(WebhookDelivery(self, envelope))
+            deliveries.append(WebhookDelivery(self, *queued))
         return deliveries
 
-    async def _enqueue(self, envelope: Envelope) -> None:
-        await self._ensure_queue().put(envelope)
+    async def _enqueue(self, envelope: Envelope, *, reply: asyncio.Future[Any] | None = None) -> None:
+        await self._ensure_queue().put((envelope, reply))
+
+    def _enqueue_nowait(self, envelope: Envelope, *, reply: asyncio.Future[Any] | None = None) -> None:
+        self._ensure_queue().put_nowait((envelope, reply))
+
+    def _enqueue_batch_nowait(
+        self,
+        envelopes: Sequence[Envelope],
+        *,
+        reply: asyncio.Future[Any] | None = None,
+    ) -> None:
+        # All or nothing: a batch that does not fit is rejected whole so the
+        # sender can retry it without duplicating the accepted part.
+        queue = self._ensure_queue()
+        if len(envelopes) > queue.maxsize - queue.qsize():
+            raise asyncio.QueueFull
+        for index, envelope in enumerate(envelopes):
+            queue.put_nowait((envelope, reply if index == 0 else None))
+
+    def next_fetch_delay_s(self) -> float | None:
+        # fetch() already blocks on the queue for up to poll_interval_s, so
+        # the runner should call it again right away rather than sleep.
+        return 0.0
+
+    def _expect_reply(self) -> asyncio.Future[Any]:
+        reply: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._replies.add(reply)
+        return reply
+
+    def _discard_reply(self, reply: asyncio.Future[Any]) -> None:
+        self._replies.discard(reply)
+
+    def _resolve_reply(
+        self,
+        reply: asyncio.Future[Any] | None,
+        *,
+        result: Any = None,
+        error: BaseException | None = None,
+    ) -> None:
+        # Replies the caller stopped waiting for were discarded; drop them.
+        if reply is None or reply not in self._replies:
+            return
+        self._replies.discard(reply)
+        if reply.done():
+            return
+        if error is not None:
+            reply.set_exception(error)
+        else:
+            reply.set_result(result)
 
-    def _enqueue_nowait(self, envelope: Envelope) -> None:
-        self._ensure_queue().put_nowait(envelope)
+    def _render_reply(self, result: Any) -> tuple[int, dict[str, str], bytes]:
+        if isinstance(result, WebhookResponse):
+            return result.render()
+        if result is None:
+            return 204, {"Content-Length": "0"}, b""
+        return WebhookResponse(status_code=200, body=result).render()
 
     def _ensure_queue(self) -> Queue:
         loop = asyncio.get_running_loop()
@@ -244,12 +338,13 @@ class WebhookSource(Source):
         method: str,
         target: str,
         headers: Mapping[str, str],
-        body: bytes,
+        body: Any,
         client: tuple[str, int] | None,
+        parsed: bool = False,
     ) -> dict[str, Any]:
         parsed_target = urlsplit(target)
         return {
-            "body": self._parse_body(body, headers),
+            "body": body if parsed else self._parse_body(body, headers),
             "headers": dict(headers),
             "query": _flatten_mapping(parse_qs(parsed_target.query, keep_blank_values=True)),
             "method": method,
@@ -272,7 +367,7 @@ class WebhookSource(Source):
             return body.decode("utf-8", errors="replace")
         if self.parser == "form":
             return _flatten_mapping(parse_qs(body.decode("utf-8"), keep_blank_values=True))
-        if self.parser == "json":
+        if self.parser in {"json", "ndjson"}:
             return _load_json(body)
 
         if content_type == "application/x-www-form-urlencoded":
@@ -287,6 +382,34 @@ class WebhookSource(Source):
         except UnicodeDecodeError:
             return body
 
+    def _build_envelopes(
+        self,
+        *,
+        method: str,
+        target: str,
+        headers: Mapping[str, str],
+        body: bytes,
+        client: tuple[str, int] | None,
+    ) -> list[Envelope]:
+        if self.parser != "ndjson":
+            event = self._build_event(method=method, target=target, headers=headers, body=body, client=client)
+            return [Envelope(body=event, meta={"source": self.name})]
+        records = _load_ndjson(body)
+        return [
+            Envelope(
+                body=self._build_event(
+                    method=method,
+                    target=target,
+                    headers=headers,
+                    body=record,
+                    client=client,
+                    parsed=True,
+                ),
+                meta={"source": self.name, "batch_index": index},
+            )
+            for index, record in enumerate(records)
+        ]
+
 
 class _WebhookServer:
     def __init__(self, host: str, requested_port: int) -> None:
@@ -295,6 +418,7 @@ class _WebhookServer:
         self._server: asyncio.AbstractServer | None = None
         self._routes: dict[tuple[str, str], WebhookSource] = {}
         self._methods_by_path: dict[str, set[str]] = {}
+        self._connections: set[asyncio.StreamWriter] = set()
 
     @property
     def bound_port(self) -> int:
@@ -333,12 +457,50 @@ class _WebhookServer:
 
         if not self._routes and self._server is not None:
             self._server.close()
+            # Persistent connections outlive the listening socket; close
+            # them so parked keep-alive readers return.
+            for writer in list(self._connections):
+                writer.close()
             await self._server.wait_closed()
             self._server = None
 
     async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Requests on one connection are served in order, so pipelined
+        # requests queue up in the reader and get their responses in turn.
+        self._connections.add(writer)
+        served = 0
+        idle_timeout_s: float | None = None
+        try:
+            while True:
+                keep_alive = await self._serve_request(reader, writer, served=served, idle_timeout_s=idle_timeout_s)
+                if keep_alive is None:
+                    return
+                served += 1
+                idle_timeout_s = keep_alive
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+    async def _serve_request(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        *,
+        served: int,
+        idle_timeout_s: float | None,
+    ) -> float | None:
+        """Serve one request; return the keep-alive idle timeout, or None to close."""
+        source: WebhookSource | None = None
+        body_consumed = False
+        keep_alive = False
         try:
-            method, target, headers = await self._read_headers(reader)
+            try:
+                method, target, version, headers = await self._read_headers(reader, idle_timeout_s=idle_timeout_s)
+            except _ConnectionIdle:
+                return None
+            keep_alive = _wants_keep_alive(version, headers)
             source, allowed_methods = self._resolve_route(method, target)
             if source is None:
                 if allowed_methods is None:
@@ -350,45 +512,108 @@ class _WebhookServer:
                         {"error": "method_not_allowed"},
                         headers={"Allow": ", ".join(sorted(allowed_methods))},
                     )
-                return
+                return None
 
+            keep_alive = (
+                keep_alive and source.keepalive_timeout_s > 0 and served + 1 < source.max_keepalive_requests
+            )
             if source.auth is not None:
                 source.auth.authorize(headers)
-            body = await self._read_body(reader, headers, source)
-            envelope = Envelope(
-                body=source._build_event(
-                    method=method,
-                    target=target,
-                    headers=headers,
-                    body=body,
-                    client=_peername(writer),
-                ),
-                meta={"source": source.name},
+            body = await self._read_body(reader, writer, headers, source)
+            body_consumed = True
+            envelopes = source._build_envelopes(
+                method=method,
+                target=target,
+                headers=headers,
+                body=body,
+                client=_peername(writer),
             )
+            reply = source._expect_reply() if source.mode == "sync" else None
             try:
-                source._enqueue_nowait(envelope)
+                if len(envelopes) == 1:
+                    source._enqueue_nowait(envelopes[0], reply=reply)
+                else:
+                    source._enqueue_batch_nowait(envelopes, reply=reply)
             except asyncio.QueueFull:
-                await _write_response(writer, 503, {"error": "queue_full"})
-                return
-
-            status_code, response_headers, payload = source.response.render()
-            await _write_response(writer, status_code, payload, headers=response_headers, body_is_bytes=True)
+                if reply is not None:
+                    source._discard_reply(reply)
+                await _write_response(writer, 503, {"error": "queue_full"}, keep_alive=keep_alive)
+                return source.keepalive_timeout_s if keep_alive else None
+
+            if reply is None:
+                status_code, response_headers, payload = source._rendered_response
+            else:
+                status_code, response_headers, payload = await self._await_reply(source, reply)
+            if any(key.lower() == "connection" and value.lower() == "close" for key, value in response_headers.items()):
+                keep_alive = False
+            await _write_response(
+                writer,
+                status_code,
+                payload,
+                headers=response_headers,
+                body_is_bytes=True,
+                keep_alive=keep_alive,
+            )
+            return source.keepalive_timeout_s if keep_alive else None
         except _HTTPError as exc:
-            await _write_response(writer, exc.status_code, exc.body, headers=exc.headers)
+            # The connection can only be reused when the request body was
+            # read in full; otherwise its framing is unknown.
+            keep_alive = keep_alive and body_consumed
+            await _write_response(writer, exc.status_code, exc.body, headers=exc.headers, keep_alive=keep_alive)
+            if keep_alive and source is not None:
+                return source.keepalive_timeout_s
+            return None
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return None
         except Exception:
-            await _write_response(writer, 500, {"error": "internal_server_error"})
-        finally:
-            writer.close()
             with contextlib.suppress(Exception):
-                await writer.wait_closed()
+                await _write_response(writer, 500, {"error": "internal_server_error"})
+            return None
 
-    async def _read_headers(self, reader: asyncio.StreamReader) -> tuple[str, str, dict[str, str]]:
+    async def _await_reply(
+        self,
+        source: WebhookSource,
+        reply: asyncio.Future[Any],
+    ) -> tuple[int, dict[str, str], bytes]:
         try:
-            raw = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=_DEFAULT_HEADER_TIMEOUT_S)
+            result = await asyncio.wait_for(asyncio.shield(reply), timeout=source.reply_timeout_s)
+        except asyncio.TimeoutError as exc:
+            # The event stays queued or in flight; only the caller stops
+            # waiting for it.
+            source._discard_reply(reply)
+            raise _HTTPError(504, {"error": "reply_timeout"}) from exc
+        except _HTTPError:
+            raise
+        except Exception as exc:
+            raise _HTTPError(500, {"error": "handler_failed", "type": type(exc).__name__}) from exc
+        try:
+            return source._render_reply(result)
+        except (TypeError, ValueError) as exc:
+            raise _HTTPError(500, {"error": "unserializable_result"}) from exc
+
+    async def _read_headers(
+        self,
+        reader: asyncio.StreamReader,
+        *,
+        idle_timeout_s: float | None = None,
+    ) -> tuple[str, str, str, dict[str, str]]:
+        if idle_timeout_s is not None:
+            # Between requests on a persistent connection: timing out or the
+            # client hanging up is a normal close, not an error.
+            try:
+                first = await asyncio.wait_for(reader.readexactly(1), timeout=idle_timeout_s)
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError) as exc:
+                raise _ConnectionIdle from exc
+        else:
+            first = b""
+        try:
+            raw = first + await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=_DEFAULT_HEADER_TIMEOUT_S)
         except asyncio.TimeoutError as exc:
             raise _HTTPError(408, {"error": "request_timeout"}) from exc
         except asyncio.IncompleteReadError as exc:
             raise _HTTPError(400, {"error": "invalid_request"}) from exc
+        except asyncio.LimitOverrunError as exc:
+            raise _HTTPError(400, {"error": "headers_too_large"}) from exc
 
         text = raw.decode("iso-8859-1")
         lines = text.split("\r\n")
@@ -408,16 +633,31 @@ class _WebhookServer:
                 raise _HTTPError(400, {"error": "invalid_header"})
             key, value = line.split(":", 1)
             headers[key.strip().lower()] = value.strip()
-        return method.upper(), target, headers
+        return method.upper(), target, version, headers
 
     async def _read_body(
         self,
         reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
         headers: Mapping[str, str],
         source: WebhookSource,
     ) -> bytes:
-        if "transfer-encoding" in headers:
-            raise _HTTPError(501, {"error": "transfer_encoding_not_supported"})
+        transfer_encoding = headers.get("transfer-encoding")
+        if transfer_encoding is not None:
+            if transfer_encoding.strip().lower() != "chunked":
+                raise _HTTPError(501, {"error": "transfer_encoding_not_supported"})
+            if "content-length" in headers:
+                raise _HTTPError(400, {"error": "invalid_content_length"})
+            await _send_continue(writer, headers)
+            try:
+                return await asyncio.wait_for(
+                    _read_chunked_body(reader, source.max_body_bytes),
+                    timeout=source.read_timeout_s,
+                )
+            except asyncio.TimeoutError as exc:
+                raise _HTTPError(408, {"error": "request_timeout"}) from exc
+            except asyncio.IncompleteReadError as exc:
+                raise _HTTPError(400, {"error": "incomplete_body"}) from exc
 
         content_length_text = headers.get("content-length")
         if content_length_text is None:
@@ -435,6 +675,7 @@ class _WebhookServer:
         if content_length == 0:
             return b""
 
+        await _send_continue(writer, headers)
         try:
             return await asyncio.wait_for(reader.readexactly(content_length), timeout=source.read_timeout_s)
         except asyncio.TimeoutError as exc:
@@ -453,6 +694,10 @@ class _WebhookServer:
         return None, None
 
 
+class _ConnectionIdle(Exception):
+    """A persistent connection closed or idled out between requests."""
+
+
 class _HTTPError(Exception):
     def __init__(
         self,
@@ -485,6 +730,58 @@ def _flatten_mapping(values: Mapping[str, list[str]]) -> dict[str, Any]:
     return flattened
 
 
+def _wants_keep_alive(version: str, headers: Mapping[str, str]) -> bool:
+    tokens = {token.strip().lower() for token in headers.get("connection", "").split(",")}
+    if version == "HTTP/1.0":
+        return "keep-alive" in tokens
+    return "close" not in tokens
+
+
+async def _send_continue(writer: asyncio.StreamWriter, headers: Mapping[str, str]) -> None:
+    if headers.get("expect", "").lower() == "100-continue":
+        writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+        await writer.drain()
+
+
+async def _read_chunked_body(reader: asyncio.StreamReader, max_body_bytes: int) -> bytes:
+    chunks: list[bytes] = []
+    total = 0
+    while True:
+        size_line = await reader.readuntil(b"\r\n")
+        if len(size_line) > _MAX_CHUNK_LINE_BYTES:
+            raise _HTTPError(400, {"error": "invalid_chunk_size"})
+        try:
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+        except ValueError as exc:
+            raise _HTTPError(400, {"error": "invalid_chunk_size"}) from exc
+        if size < 0:
+            raise _HTTPError(400, {"error": "invalid_chunk_size"})
+        if size == 0:
+            break
+        total += size
+        if total > max_body_bytes:
+            raise _HTTPError(413, {"error": "payload_too_large"})
+        chunks.append(await reader.readexactly(size))
+        if await reader.readexactly(2) != b"\r\n":
+            raise _HTTPError(400, {"error": "invalid_chunk"})
+    # Trailer fields are ignored; the section ends with an empty line.
+    while await reader.readuntil(b"\r\n") != b"\r\n":
+        pass
+    return b"".join(chunks)
+
+
+def _load_ndjson(body: bytes) -> list[Any]:
+    records: list[Any] = []
+    for number, line in enumerate(body.split(b"\n"), start=1):
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line.decode("utf-8")))
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise _HTTPError(400, {"error": "invalid_json", "line": number}) from exc
+    return records
+
+
 def _load_json(body: bytes) -> Any:
     try:
         return json.loads(body.decode("utf-8"))
@@ -506,8 +803,11 @@ async def _write_response(
     *,
     headers: Mapping[str, str] | None = None,
     body_is_bytes: bool = False,
+    keep_alive: bool = False,
 ) -> None:
-    response_headers = {str(key): str(value) for key, value in dict(headers or {}).items()}
+    response_headers = {
+        str(key): str(value) for key, value in dict(headers or {}).items() if str(key).lower() != "connection"
+    }
     if body_is_bytes:
         payload = body if isinstance(body, bytes) else bytes(body)
         response_headers.setdefault("Content-Type", "application/octet-stream")
@@ -524,7 +824,7 @@ async def _write_response(
         response_headers.setdefault("Content-Type", "application/json")
 
     response_headers["Content-Length"] = str(len(payload))
-    response_headers.setdefault("Connection", "close")
+    response_headers["Connection"] = "keep-alive" if keep_alive else "close"
 
     reason = _STATUS_TEXT.get(status_code, "OK")
     lines = [f"HTTP/1.1 {status_code} {reason}"]
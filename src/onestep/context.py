@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from typing import TYPE_CHECKING, Any
 
 from .envelope import Envelope
@@ -10,18 +11,63 @@ from .state import ScopedState
 if TYPE_CHECKING:
     from .app import OneStepApp
     from .connectors.base import Delivery, Sink
+    from .metrics import TaskMetrics
     from .task import TaskSpec
 
 
+class TaskScope:
+    """The logger, state scope and metric handle every context of one task shares.
+
+    Runners build one per task and hand it to each ``TaskContext`` so a
+    delivery does not pay for ``logging.getLogger`` and fresh state and metric
+    wrappers.
+    """
+
+    __slots__ = ("logger", "state", "metrics")
+
+    def __init__(self, app: "OneStepApp", task: "TaskSpec") -> None:
+        self.logger = logging.getLogger(f"onestep.{app.name}.{task.name}")
+        self.state = ScopedState(app.state, f"{app.name}:{task.name}")
+        self.metrics = app.custom_metrics.for_task(task.name)
+
+
 class TaskContext:
-    def __init__(self, *, app: "OneStepApp", task: "TaskSpec", delivery: "Delivery") -> None:
+    __slots__ = ("app", "task", "delivery", "_scope")
+
+    def __init__(
+        self,
+        *,
+        app: "OneStepApp",
+        task: "TaskSpec",
+        delivery: "Delivery",
+        scope: TaskScope | None = None,
+    ) -> None:
         self.app = app
         self.task = task
         self.delivery = delivery
-        self.logger = logging.getLogger(f"onestep.{app.name}.{task.name}")
-        self.config = app.config
-        self.state = ScopedState(app.state, f"{app.name}:{task.name}")
-        self.metrics = app.custom_metrics.for_task(task.name)
+        self._scope = scope
+
+    @property
+    def _task_scope(self) -> TaskScope:
+        if self._scope is None:
+            self._scope = TaskScope(self.app, self.task)
+        return self._scope
+
+    @property
+    def logger(self) -> logging.Logger:
+        return self._task_scope.logger
+
+    @property
+    def state(self) -> ScopedState:
+        return self._task_scope.state
+
+    @property
+    def metrics(self) -> "TaskMetrics":
+        return self._task_scope.metrics
+
+    @property
+    def config(self) -> dict[str, Any]:
+        return self.app.config
 
     @property
     def current(self) -> Envelope:
@@ -56,5 +102,57 @@ class TaskContext:
         if not sinks:
             raise RuntimeError("emit() requires at least one sink")
         envelope = Envelope(body=body, meta=dict(meta or {}))
-        for target in sinks:
-            await target.send(envelope)
+        timeout_s = self.task.emit_timeout_s
+        if self.task.emit_mode != "parallel" or len(sinks) == 1:
+            for target in sinks:
+                await _send(target, envelope, timeout_s)
+            return
+        results = await asyncio.gather(
+            *(_send(target, envelope, timeout_s) for target in sinks),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+
+class BatchTaskContext(TaskContext):
+    """Context handed to ``@app.task(batch=...)`` handlers.
+
+    The handler sees every delivery of the batch at once, so there is no
+    single ``current`` envelope; per-item hooks, routes and transforms still
+    receive a regular :class:`TaskContext` for their own delivery.
+    """
+
+    __slots__ = ("deliveries",)
+
+    def __init__(
+        self,
+        *,
+        app: "OneStepApp",
+        task: "TaskSpec",
+        deliveries: Sequence["Delivery"],
+        scope: TaskScope | None = None,
+    ) -> None:
+        if not deliveries:
+            raise ValueError("BatchTaskContext requires at least one delivery")
+        super().__init__(app=app, task=task, delivery=deliveries[0], scope=scope)
+        self.deliveries = tuple(deliveries)
+
+    @property
+    def current(self) -> Envelope:
+        raise RuntimeError("batch handlers have no single current envelope; use ctx.envelopes")
+
+    @property
+    def envelopes(self) -> tuple[Envelope, ...]:
+        return tuple(delivery.envelope for delivery in self.deliveries)
+
+    async def update_current_row(self, values: Mapping[str, Any]) -> None:
+        raise RuntimeError("update_current_row() is not supported in batch handlers")
+
+
+async def _send(sink: "Sink", envelope: Envelope, timeout_s: float | None) -> None:
+    if timeout_s is None:
+        await sink.send(envelope)
+    else:
+        await asyncio.wait_for(sink.send(envelope), timeout=timeout_s)
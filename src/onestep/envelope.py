@@ -1,11 +1,51 @@
 from __future__ import annotations
 
+import sys
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from typing import Any
 
+from .snapshot import FrozenDict, freeze
 
-@dataclass
-class Envelope:
+# Hot per-delivery dataclasses drop their instance ``__dict__``; ``slots=True``
+# needs Python 3.10, so 3.9 keeps the plain layout.
+_DATACLASS_SLOTS: dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class _EnvelopeFields:
     body: Any
     meta: dict[str, Any] = field(default_factory=dict)
     attempts: int = 0
+
+
+class Envelope(_EnvelopeFields):
+    # The meta snapshot cache is a plain slot rather than a dataclass field,
+    # so ``fields()``, ``asdict()`` and ``replace()`` only see the message.
+    __slots__ = ("_meta_snapshot",)
+
+    def snapshot_meta(self) -> FrozenDict:
+        """Return a read-only snapshot of ``meta`` as it is now.
+
+        Snapshots share every subtree that has not changed since the previous
+        call, so the events of one delivery reuse a single copy of its meta.
+        """
+        try:
+            base = self._meta_snapshot
+        except AttributeError:
+            base = None
+        snapshot = freeze(self.meta, base)
+        if type(snapshot) is not FrozenDict:
+            snapshot = FrozenDict(snapshot)
+        self._meta_snapshot = snapshot
+        return snapshot
+
+
+def meta_path(meta: Any, path: str) -> Any:
+    """Resolve a dotted ``meta`` path such as ``"tenant.id"``; ``None`` if missing."""
+    value = meta
+    for part in path.split("."):
+        if not isinstance(value, Mapping) or part not in value:
+            return None
+        value = value[part]
+    return value
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import inspect
 from collections import Counter
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 import logging
 from typing import Any
 
+from .envelope import _DATACLASS_SLOTS
+from .invoke import invoke_callback
 from .retry import FailureInfo, FailureKind
 
+EVENT_BUS_POLICIES = ("drop_oldest", "drop_newest", "block")
+
 
 class TaskEventKind(str, Enum):
     FETCHED = "fetched"
@@ -20,7 +27,7 @@ class TaskEventKind(str, Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class TaskEvent:
     kind: TaskEventKind
     app: str
@@ -113,7 +120,187 @@ class StructuredEventLogger:
         )
 
 
+class _HandlerLane:
+    __slots__ = (
+        "handler",
+        "name",
+        "queue",
+        "worker",
+        "delivered",
+        "dropped",
+        "failed",
+        "last_lag_s",
+        "max_lag_s",
+    )
+
+    def __init__(self, handler: Callable[..., Any], maxsize: int) -> None:
+        self.handler = handler
+        self.name = _handler_name(handler)
+        self.queue: asyncio.Queue[tuple[float, TaskEvent]] = asyncio.Queue(maxsize=maxsize)
+        self.worker: asyncio.Task[None] | None = None
+        self.delivered = 0
+        self.dropped = 0
+        self.failed = 0
+        self.last_lag_s = 0.0
+        self.max_lag_s = 0.0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "handler": self.name,
+            "pending": self.queue.qsize(),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "last_lag_s": self.last_lag_s,
+            "max_lag_s": self.max_lag_s,
+        }
+
+
+class EventBus:
+    """Opt-in asynchronous dispatch of ``TaskEvent``s to ``on_event`` handlers.
+
+    Each handler gets its own bounded queue and worker, so a slow handler
+    only lags itself. Workers drain up to ``batch_size`` queued events per
+    wakeup. When a queue is full, ``policy`` decides: ``drop_oldest``
+    (default) evicts the oldest queued event, ``drop_newest`` discards the
+    incoming one, ``block`` makes the emitting delivery wait for room.
+    ``stats()`` reports per-handler lag (time from emit to handler call),
+    drops and failures. Disabled instances leave dispatch inline.
+    """
+
+    def __init__(self, *, logger: logging.Logger | None = None) -> None:
+        self.enabled = False
+        self.maxsize = 1024
+        self.batch_size = 64
+        self.policy = "drop_oldest"
+        self.drain_timeout_s = 5.0
+        self._logger = logger or logging.getLogger("onestep.events")
+        self._lanes: dict[int, _HandlerLane] = {}
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def enable(
+        self,
+        *,
+        maxsize: int = 1024,
+        batch_size: int = 64,
+        policy: str = "drop_oldest",
+        drain_timeout_s: float = 5.0,
+    ) -> "EventBus":
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        if policy not in EVENT_BUS_POLICIES:
+            raise ValueError(f"policy must be one of: {', '.join(EVENT_BUS_POLICIES)}")
+        if drain_timeout_s < 0:
+            raise ValueError("drain_timeout_s must be >= 0")
+        self.enabled = True
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.policy = policy
+        self.drain_timeout_s = drain_timeout_s
+        return self
+
+    async def start(self) -> None:
+        if self.enabled:
+            self._lanes = {}
+            self._running = True
+
+    async def stop(self) -> None:
+        """Deliver what is queued (up to ``drain_timeout_s``), then stop workers."""
+        if not self._running:
+            return
+        self._running = False
+        lanes = list(self._lanes.values())
+        if lanes:
+            drained = asyncio.gather(*(lane.queue.join() for lane in lanes))
+            try:
+                await asyncio.wait_for(drained, timeout=self.drain_timeout_s)
+            except asyncio.TimeoutError:
+                self._logger.warning("event bus stopped with undelivered events")
+        for lane in lanes:
+            lane.dropped += lane.queue.qsize()
+            if lane.worker is not None:
+                lane.worker.cancel()
+        await asyncio.gather(*(lane.worker for lane in lanes if lane.worker is not None), return_exceptions=True)
+
+    async def publish(self, event: TaskEvent, handlers: Sequence[Callable[..., Any]]) -> None:
+        enqueued_at = asyncio.get_running_loop().time()
+        for handler in handlers:
+            lane = self._lanes.get(id(handler))
+            if lane is None or lane.handler is not handler:
+                lane = self._add_lane(handler)
+            queue = lane.queue
+            if not queue.full():
+                queue.put_nowait((enqueued_at, event))
+            elif self.policy == "block":
+                await queue.put((enqueued_at, event))
+            elif self.policy == "drop_oldest":
+                queue.get_nowait()
+                queue.task_done()
+                queue.put_nowait((enqueued_at, event))
+                lane.dropped += 1
+            else:
+                lane.dropped += 1
+
+    def stats(self) -> list[dict[str, Any]]:
+        return [lane.stats() for lane in self._lanes.values()]
+
+    def describe(self) -> dict[str, Any] | None:
+        """Snapshot for ``app.describe()`` (``None`` while disabled)."""
+        if not self.enabled:
+            return None
+        return {
+            "maxsize": self.maxsize,
+            "batch_size": self.batch_size,
+            "policy": self.policy,
+            "handlers": self.stats(),
+        }
+
+    def _add_lane(self, handler: Callable[..., Any]) -> _HandlerLane:
+        lane = _HandlerLane(handler, self.maxsize)
+        lane.worker = asyncio.create_task(self._drain_lane(lane), name=f"onestep-events:{lane.name}")
+        self._lanes[id(handler)] = lane
+        return lane
+
+    async def _drain_lane(self, lane: _HandlerLane) -> None:
+        loop = asyncio.get_running_loop()
+        queue = lane.queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            for enqueued_at, event in batch:
+                lag_s = loop.time() - enqueued_at
+                lane.last_lag_s = lag_s
+                if lag_s > lane.max_lag_s:
+                    lane.max_lag_s = lag_s
+                try:
+                    result = invoke_callback(lane.handler, event)
+                    if inspect.isawaitable(result):
+                        await result
+                    lane.delivered += 1
+                except Exception:
+                    lane.failed += 1
+                    self._logger.exception("event handler failed", extra={"event_kind": event.kind.value})
+                finally:
+                    queue.task_done()
+
+
+def _handler_name(handler: Callable[..., Any]) -> str:
+    name = getattr(handler, "__qualname__", None)
+    if isinstance(name, str):
+        return name
+    return type(handler).__name__
+
+
 __all__ = [
+    "EVENT_BUS_POLICIES",
+    "EventBus",
     "InMemoryMetrics",
     "StructuredEventLogger",
     "TaskEvent",
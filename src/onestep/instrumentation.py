@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import math
+import os
+import sys
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from threading import Lock
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from onestep.task import TaskSpec
+
+# Upper bucket bounds in milliseconds; the last bucket is open-ended.
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0, 10000.0)
+
+_PROFILE_MAX_STACKS = 1000
+_PROFILE_MAX_DEPTH = 32
+_PROFILE_TOP = 10
+_PROFILE_OTHER = "(other)"
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; quantiles resolve to bucket upper bounds."""
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def quantile(self, q: float) -> float | None:
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                if index < len(LATENCY_BUCKETS_MS):
+                    return min(LATENCY_BUCKETS_MS[index], self.max_ms)
+                return self.max_ms
+        return self.max_ms
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": _round_ms(self.total_ms / self.count) if self.count else None,
+            "p50_ms": _round_ms(self.quantile(0.50)),
+            "p95_ms": _round_ms(self.quantile(0.95)),
+            "p99_ms": _round_ms(self.quantile(0.99)),
+            "max_ms": _round_ms(self.max_ms) if self.count else None,
+            "buckets": [
+                {
+                    "le_ms": LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else None,
+                    "count": bucket_count,
+                }
+                for index, bucket_count in enumerate(self.counts)
+                if bucket_count
+            ],
+        }
+
+
+class _Series:
+    """Cumulative totals plus a window that the control-plane reporter rotates."""
+
+    __slots__ = ("total", "window")
+
+    def __init__(self) -> None:
+        self.total = LatencyHistogram()
+        self.window = LatencyHistogram()
+
+    def observe(self, value_ms: float) -> None:
+        self.total.observe(value_ms)
+        self.window.observe(value_ms)
+
+    def rotate(self) -> LatencyHistogram:
+        window, self.window = self.window, LatencyHistogram()
+        return window
+
+
+class _Profile:
+    __slots__ = ("total", "window")
+
+    def __init__(self) -> None:
+        self.total: Counter[str] = Counter()
+        self.window: Counter[str] = Counter()
+
+    def observe(self, stack: str) -> None:
+        for counter in (self.total, self.window):
+            if stack in counter or len(counter) < _PROFILE_MAX_STACKS:
+                counter[stack] += 1
+            else:
+                counter[_PROFILE_OTHER] += 1
+
+
+class Instrumentation:
+    """Opt-in runtime instrumentation for an app.
+
+    Records per-stage latency histograms from the executor checkpoints
+    (``before_hook``, ``handler``, ``route``, ``transform``, ``sink``, ``ack``
+    ...), event-loop lag samples, and optionally a sampling profile of the
+    frames executing inside task handlers. Disabled instances cost nothing:
+    runners only install the checkpoint when ``enabled`` is true.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.loop_lag_interval_s = 0.5
+        self.profile_interval_s: float | None = None
+        self._lock = Lock()
+        self._stages: dict[str, dict[str, _Series]] = {}
+        self._profiles: dict[str, _Profile] = {}
+        self._loop_lag = _Series()
+        self._last_loop_lag_ms: float | None = None
+        self._lag_task: asyncio.Task[None] | None = None
+        self._sampler: _HandlerSampler | None = None
+
+    def enable(
+        self,
+        *,
+        loop_lag_interval_s: float = 0.5,
+        profile_interval_s: float | None = None,
+    ) -> "Instrumentation":
+        if loop_lag_interval_s <= 0:
+            raise ValueError("loop_lag_interval_s must be > 0")
+        if profile_interval_s is not None and profile_interval_s <= 0:
+            raise ValueError("profile_interval_s must be > 0")
+        self.enabled = True
+        self.loop_lag_interval_s = loop_lag_interval_s
+        self.profile_interval_s = profile_interval_s
+        return self
+
+    def checkpoint(self, task_name: str) -> Callable[[str, str, Mapping[str, Any]], Awaitable[None]]:
+        """Return a ``DeliveryExecutor`` checkpoint that times stages for ``task_name``.
+
+        Each delivery runs in its own asyncio task, so entered timestamps are
+        kept per task; a stage that raises never completes and is dropped with
+        the task.
+        """
+        entered: weakref.WeakKeyDictionary[asyncio.Task[Any], dict[str, float]] = weakref.WeakKeyDictionary()
+        clock = time.perf_counter
+
+        async def checkpoint(stage: str, transition: str, details: Mapping[str, Any]) -> None:
+            current = asyncio.current_task()
+            if current is None:
+                return
+            if transition == "entered":
+                started = entered.get(current)
+                if started is None:
+                    entered[current] = {stage: clock()}
+                else:
+                    started[stage] = clock()
+                return
+            started = entered.get(current)
+            began = None if started is None else started.pop(stage, None)
+            if began is not None:
+                self.record_stage(task_name, stage, clock() - began)
+
+        return checkpoint
+
+    def record_stage(self, task_name: str, stage: str, duration_s: float) -> None:
+        with self._lock:
+            stages = self._stages.get(task_name)
+            if stages is None:
+                stages = self._stages[task_name] = {}
+            series = stages.get(stage)
+            if series is None:
+                series = stages[stage] = _Series()
+            series.observe(duration_s * 1000.0)
+
+    def record_loop_lag(self, lag_s: float) -> None:
+        lag_ms = max(0.0, lag_s) * 1000.0
+        with self._lock:
+            self._loop_lag.observe(lag_ms)
+            self._last_loop_lag_ms = lag_ms
+
+    def record_profile_sample(self, task_name: str, stack: str) -> None:
+        with self._lock:
+            profile = self._profiles.get(task_name)
+            if profile is None:
+                profile = self._profiles[task_name] = _Profile()
+            profile.observe(stack)
+
+    async def start(self, tasks: Iterable["TaskSpec"]) -> None:
+        if not self.enabled:
+            return
+        if self._lag_task is None or self._lag_task.done():
+            self._lag_task = asyncio.create_task(self._sample_loop_lag(), name="onestep-loop-lag")
+        if self.profile_interval_s is not None and self._sampler is None:
+            codes = {}
+            for task in tasks:
+                code = _handler_code(task.handler)
+                if code is not None and task.executor != "process":
+                    codes[code] = task.name
+            if codes:
+                self._sampler = _HandlerSampler(self, codes, self.profile_interval_s)
+                self._sampler.start()
+
+    async def stop(self) -> None:
+        lag_task, self._lag_task = self._lag_task, None
+        if lag_task is not None and not lag_task.done():
+            lag_task.cancel()
+            try:
+                await lag_task
+            except asyncio.CancelledError:
+                pass
+        sampler, self._sampler = self._sampler, None
+        if sampler is not None:
+            sampler.stop()
+
+    def task_names(self) -> set[str]:
+        with self._lock:
+            return set(self._stages) | set(self._profiles)
+
+    def describe(self) -> dict[str, Any] | None:
+        """Cumulative snapshot for ``app.describe()`` (``None`` while disabled)."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            task_names = sorted(set(self._stages) | set(self._profiles))
+            return {
+                "loop_lag_interval_s": self.loop_lag_interval_s,
+                "profile_interval_s": self.profile_interval_s,
+                "loop_lag": {
+                    **self._loop_lag.total.as_dict(),
+                    "last_ms": _round_ms(self._last_loop_lag_ms),
+                },
+                "tasks": {
+                    name: self._task_snapshot(name, window=False)
+                    for name in task_names
+                },
+            }
+
+    def rotate_task(self, task_name: str) -> dict[str, Any]:
+        """Return and reset the reporting window for one task (empty when idle)."""
+        with self._lock:
+            snapshot = self._task_snapshot(task_name, window=True)
+            for series in self._stages.get(task_name, {}).values():
+                series.rotate()
+            profile = self._profiles.get(task_name)
+            if profile is not None:
+                profile.window = Counter()
+        if not snapshot["stages"] and not snapshot.get("profile"):
+            return {}
+        return snapshot
+
+    def rotate_loop_lag(self) -> dict[str, Any] | None:
+        with self._lock:
+            window = self._loop_lag.rotate()
+            if not window.count:
+                return None
+            return {**window.as_dict(), "last_ms": _round_ms(self._last_loop_lag_ms)}
+
+    def _task_snapshot(self, task_name: str, *, window: bool) -> dict[str, Any]:
+        stages = {
+            stage: (series.window if window else series.total).as_dict()
+            for stage, series in sorted(self._stages.get(task_name, {}).items())
+        }
+        if window:
+            stages = {stage: values for stage, values in stages.items() if values["count"]}
+        snapshot: dict[str, Any] = {"stages": stages}
+        profile = self._profiles.get(task_name)
+        if profile is not None:
+            counter = profile.window if window else profile.total
+            if counter:
+                snapshot["profile"] = {
+                    "samples": sum(counter.values()),
+                    "top": [
+                        {"stack": stack, "samples": samples}
+                        for stack, samples in counter.most_common(_PROFILE_TOP)
+                    ],
+                }
+        return snapshot
+
+    async def _sample_loop_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = self.loop_lag_interval_s
+        while True:
+            scheduled = loop.time()
+            await asyncio.sleep(interval)
+            self.record_loop_lag(loop.time() - scheduled - interval)
+
+
+class _HandlerSampler(threading.Thread):
+    """Samples every thread's stack and attributes frames under a handler to its task.
+
+    Only frames on-CPU at sample time are seen: a suspended coroutine handler
+    waiting on I/O does not appear, which is what separates "slow handler"
+    from "slow downstream". Process-executor handlers run elsewhere and are
+    not sampled.
+    """
+
+    def __init__(self, instrumentation: Instrumentation, codes: Mapping[Any, str], interval_s: float) -> None:
+        super().__init__(name="onestep-handler-sampler", daemon=True)
+        self._instrumentation = instrumentation
+        self._codes = dict(codes)
+        self._interval_s = interval_s
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self._interval_s):
+            own_ident = threading.get_ident()
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_ident:
+                    continue
+                self._sample(frame)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join(timeout=1.0)
+
+    def _sample(self, frame: Any) -> None:
+        stack = []
+        task_name = None
+        while frame is not None:
+            stack.append(frame)
+            task_name = self._codes.get(frame.f_code)
+            if task_name is not None:
+                break
+            frame = frame.f_back
+        if task_name is None:
+            return
+        if len(stack) > _PROFILE_MAX_DEPTH:
+            stack = stack[: _PROFILE_MAX_DEPTH - 1] + stack[-1:]
+        frames = reversed(stack)
+        self._instrumentation.record_profile_sample(
+            task_name,
+            ";".join(_frame_label(item) for item in frames),
+        )
+
+
+def _handler_code(handler: Any) -> Any:
+    target = inspect.unwrap(handler)
+    code = getattr(target, "__code__", None)
+    if code is None and callable(target):
+        code = getattr(getattr(type(target), "__call__", None), "__code__", None)
+    return code
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def _round_ms(value: float | None) -> float | None:
+    return None if value is None else round(value, 3)
+
+
+__all__ = ["Instrumentation", "LATENCY_BUCKETS_MS", "LatencyHistogram"]
@@ -1,14 +1,55 @@
 from __future__ import annotations
 
 import inspect
+import weakref
+from collections.abc import Callable
 from typing import Any
 
+# Arity -1 means "forward every positional argument" (``*args`` callbacks and
+# callables whose signature cannot be introspected).
+_ALL_ARGS = -1
+
+# Signatures are resolved once per callable. Bound methods are keyed by their
+# underlying function so a fresh ``obj.method`` object still hits the cache.
+_arity_cache: weakref.WeakKeyDictionary[Any, int] = weakref.WeakKeyDictionary()
+_method_arity_cache: weakref.WeakKeyDictionary[Any, int] = weakref.WeakKeyDictionary()
+
+
+def callback_arity(callback: Callable[..., Any]) -> int:
+    """Return how many leading positional arguments ``callback`` accepts (-1: all)."""
+    if inspect.ismethod(callback):
+        cache, key = _method_arity_cache, callback.__func__
+    else:
+        cache, key = _arity_cache, callback
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable or not weak-referenceable callables are resolved each call.
+        return _resolve_arity(callback)
+    arity = _resolve_arity(callback)
+    try:
+        cache[key] = arity
+    except TypeError:
+        pass
+    return arity
+
 
 def invoke_callback(callback, *args: Any) -> Any:
+    arity = callback_arity(callback)
+    if arity == _ALL_ARGS:
+        return callback(*args)
+    if arity == 0:
+        return callback()
+    return callback(*args[:arity])
+
+
+def _resolve_arity(callback: Callable[..., Any]) -> int:
     try:
         signature = inspect.signature(callback)
     except (TypeError, ValueError):
-        return callback(*args)
+        return _ALL_ARGS
 
     positional = [
         parameter
@@ -17,7 +58,5 @@ def invoke_callback(callback, *args: Any) -> Any:
     ]
     has_varargs = any(parameter.kind is inspect.Parameter.VAR_POSITIONAL for parameter in signature.parameters.values())
     if has_varargs:
-        return callback(*args)
-    if not positional:
-        return callback()
-    return callback(*args[: len(positional)])
+        return _ALL_ARGS
+    return len(positional)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from .envelope import Envelope, meta_path
+from .invoke import callback_arity, invoke_callback
+
+_DEFAULT_MAX_KEYS = 10_000
+
+
+class TokenBucket:
+    """``rate`` tokens per second, holding at most ``burst``.
+
+    ``acquire`` reserves its tokens immediately, borrowing against future
+    refills when the bucket is short, and then sleeps until the borrowed
+    tokens have been earned. Waiters are therefore served in arrival order
+    and the long-run rate never exceeds ``rate``.
+    """
+
+    __slots__ = ("rate", "burst", "_tokens", "_updated_at")
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> float:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        return self._tokens
+
+    def available(self) -> int:
+        return max(0, math.floor(self._refill()))
+
+    def delay_s(self, tokens: float = 1) -> float:
+        """Seconds until ``tokens`` are available."""
+        return max(0.0, (tokens - self._refill()) / self.rate)
+
+    def take(self, tokens: float = 1) -> None:
+        self._refill()
+        self._tokens -= tokens
+
+    async def acquire(self, tokens: float = 1) -> None:
+        self.take(tokens)
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+    @property
+    def is_full(self) -> bool:
+        return self._refill() >= self.burst
+
+
+class RateLimit:
+    """A token-bucket quota: ``rate`` operations per second, bursts of ``burst``.
+
+    ``burst`` defaults to ``max(1, rate)``, i.e. one second's worth. With
+    ``key`` every distinct key gets its own bucket: a string is a dotted
+    ``envelope.meta`` path (like ``ordering_key``), a callable receives the
+    ``Envelope``. Envelopes whose key is ``None`` share one bucket. At most
+    ``max_keys`` buckets are kept; full (idle) buckets are dropped first.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        *,
+        burst: float | None = None,
+        key: str | Callable[..., Any] | None = None,
+        max_keys: int = _DEFAULT_MAX_KEYS,
+    ) -> None:
+        if isinstance(rate, bool) or not isinstance(rate, (int, float)):
+            raise TypeError("rate must be a number")
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        if burst is None:
+            burst = max(1.0, float(rate))
+        if burst < 1:
+            raise ValueError("burst must be >= 1")
+        if key is not None:
+            if isinstance(key, str):
+                if not key.strip():
+                    raise ValueError("key must not be empty")
+            elif callable(key):
+                callback_arity(key)
+            else:
+                raise TypeError("key must be a meta path string or a callable")
+        if max_keys < 1:
+            raise ValueError("max_keys must be >= 1")
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.key = key
+        self.max_keys = max_keys
+
+    def new_limiter(self) -> "RateLimiter":
+        return RateLimiter(self)
+
+    def describe(self) -> dict[str, Any]:
+        key = self.key
+        if key is not None and not isinstance(key, str):
+            key = getattr(key, "__qualname__", type(key).__qualname__)
+        return {"rate": self.rate, "burst": self.burst, "key": key}
+
+
+class RateLimiter:
+    """The buckets of one ``RateLimit`` for one task runner or sink."""
+
+    def __init__(self, policy: RateLimit) -> None:
+        self.policy = policy
+        self._bucket = TokenBucket(policy.rate, policy.burst)
+        self._buckets: OrderedDict[Hashable, TokenBucket] = OrderedDict()
+
+    @property
+    def keyed(self) -> bool:
+        return self.policy.key is not None
+
+    def bucket(self, envelope: Envelope | None = None) -> TokenBucket:
+        if not self.keyed or envelope is None:
+            return self._bucket
+        key = self._key(envelope)
+        if key is None:
+            return self._bucket
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            self._buckets.move_to_end(key)
+            return bucket
+        if len(self._buckets) >= self.policy.max_keys:
+            self._evict()
+        bucket = self._buckets[key] = TokenBucket(self.policy.rate, self.policy.burst)
+        return bucket
+
+    async def acquire(self, envelope: Envelope | None = None, tokens: float = 1) -> None:
+        await self.bucket(envelope).acquire(tokens)
+
+    def _key(self, envelope: Envelope) -> Hashable | None:
+        key_spec = self.policy.key
+        if isinstance(key_spec, str):
+            key = meta_path(envelope.meta, key_spec)
+        else:
+            key = invoke_callback(key_spec, envelope)
+        if key is None:
+            return None
+        try:
+            hash(key)
+        except TypeError:
+            return repr(key)
+        return key
+
+    def _evict(self) -> None:
+        # Full buckets carry no state; dropping one is free. Otherwise drop
+        # the least recently used key, which can give it one extra burst.
+        for key, bucket in self._buckets.items():
+            if bucket.is_full:
+                del self._buckets[key]
+                return
+        self._buckets.popitem(last=False)
+
+
+__all__ = ["RateLimit", "RateLimiter", "TokenBucket"]
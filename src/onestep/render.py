@@ -123,6 +123,21 @@ class _NodeRegistry:
 
 def _task_meta(task: "TaskSpec") -> str:
     parts = [f"concurrency={task.concurrency}", f"retry={type(task.retry).__name__}"]
+    if task.batch is not None:
+        parts.insert(1, f"batch={task.batch}")
+    if task.executor != "loop":
+        parts.append(f"executor={task.executor}")
+    if isinstance(task.ordering_key, str):
+        parts.append(f"ordering_key={task.ordering_key}")
+    adaptive = task.adaptive_concurrency
+    if adaptive is not None:
+        parts[0] = f"concurrency={adaptive.algorithm}:{adaptive.min_concurrency}-{adaptive.max_concurrency}"
+    if task.emit_mode != "sequential":
+        parts.append(f"emit={task.emit_mode}")
+    if task.prefetch:
+        parts.append(f"prefetch={task.prefetch}")
+    if task.rate_limit is not None:
+        parts.append(f"rate_limit={task.rate_limit.rate:g}/s")
     if task.timeout_s is not None:
         parts.append(f"timeout={_format_seconds(task.timeout_s)}s")
     return " · ".join(parts)
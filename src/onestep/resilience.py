@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from enum import Enum
 
 
@@ -48,6 +49,19 @@ class ConnectorOperationError(Exception):
         return f"{self.backend} {self.operation.value} failed ({self.kind.value}){target}"
 
 
+class ConnectorBatchError(Exception):
+    """A bulk ``ack_many``/``retry_many``/``send_many`` call in which only some items failed.
+
+    ``errors`` maps the position of each failed item in the batch that was
+    passed in to its own exception, usually a ``ConnectorOperationError``;
+    every other item was settled.
+    """
+
+    def __init__(self, errors: Mapping[int, BaseException], *, message: str | None = None) -> None:
+        self.errors = dict(errors)
+        super().__init__(message or f"{len(self.errors)} batch entries failed")
+
+
 def is_retryable_connector_error(exc: ConnectorOperationError | ConnectorErrorKind) -> bool:
     kind = exc.kind if isinstance(exc, ConnectorOperationError) else exc
     return kind in {
@@ -14,7 +14,19 @@ from onestep.resource_registry import (
 )
 
 _HTTP_SINK_FIELDS = frozenset(
-    {"type", "name", "url", "method", "headers", "params", "body", "timeout_s", "success_statuses"}
+    {
+        "type",
+        "name",
+        "url",
+        "method",
+        "headers",
+        "params",
+        "body",
+        "timeout_s",
+        "success_statuses",
+        "max_connections",
+        "keepalive_timeout_s",
+    }
 )
 _HTTP_SINK_CATALOG = ResourceCatalogEntry(
     type="http_sink",
@@ -34,6 +46,8 @@ _HTTP_SINK_CATALOG = ResourceCatalogEntry(
         ResourceCatalogField("body", "json", secret=True),
         ResourceCatalogField("timeout_s", "number", default=5.0),
         ResourceCatalogField("success_statuses", "json"),
+        ResourceCatalogField("max_connections", "integer", default=10),
+        ResourceCatalogField("keepalive_timeout_s", "number", default=30.0),
     ),
     topology_fields=("url", "method", "timeout_s", "success_statuses"),
 )
@@ -61,6 +75,8 @@ def _build_http_sink(ctx: ResourceBuildContext, spec: Mapping[str, Any]) -> Http
         body=spec.get("body"),
         timeout_s=spec.get("timeout_s", 5.0),
         success_statuses=spec.get("success_statuses"),
+        max_connections=spec.get("max_connections", 10),
+        keepalive_timeout_s=spec.get("keepalive_timeout_s", 30.0),
     )
 
 
@@ -76,6 +92,8 @@ def _validate_http_sink(ctx: ResourceValidationContext, spec: Mapping[str, Any])
         raise TypeError(f"'{ctx.field}.params' must be a mapping")
     _validate_json_like(spec.get("body"), field=f"{ctx.field}.body")
     ctx.validate_positive_number(spec.get("timeout_s"), field=f"{ctx.field}.timeout_s")
+    ctx.validate_positive_integer(spec.get("max_connections"), field=f"{ctx.field}.max_connections")
+    ctx.validate_non_negative_number(spec.get("keepalive_timeout_s"), field=f"{ctx.field}.keepalive_timeout_s")
     raw_success_statuses = spec.get("success_statuses")
     if raw_success_statuses is not None:
         if not isinstance(raw_success_statuses, Sequence) or isinstance(raw_success_statuses, (str, bytes)):
@@ -24,8 +24,12 @@ _WEBHOOK_FIELDS = frozenset(
         "parser",
         "auth",
         "response",
+        "mode",
+        "reply_timeout_s",
         "max_body_bytes",
         "read_timeout_s",
+        "keepalive_timeout_s",
+        "max_keepalive_requests",
         "queue_maxsize",
         "batch_size",
         "poll_interval_s",
@@ -43,11 +47,15 @@ _WEBHOOK_CATALOG = ResourceCatalogEntry(
         ResourceCatalogField("methods", "string_list", default=("POST",)),
         ResourceCatalogField("host", "string", default="127.0.0.1"),
         ResourceCatalogField("port", "integer", default=8080),
-        ResourceCatalogField("parser", "string", default="auto", options=("auto", "json", "text", "bytes")),
+        ResourceCatalogField("parser", "string", default="auto", options=("auto", "json", "text", "bytes", "ndjson")),
         ResourceCatalogField("auth", "mapping", secret=True),
         ResourceCatalogField("response", "mapping"),
+        ResourceCatalogField("mode", "string", default="async", options=("async", "sync")),
+        ResourceCatalogField("reply_timeout_s", "number", default=30.0),
         ResourceCatalogField("max_body_bytes", "integer", default=1024 * 1024),
         ResourceCatalogField("read_timeout_s", "number", default=5.0),
+        ResourceCatalogField("keepalive_timeout_s", "number", default=5.0),
+        ResourceCatalogField("max_keepalive_requests", "integer", default=1000),
         ResourceCatalogField("queue_maxsize", "integer", default=1000),
         ResourceCatalogField("batch_size", "integer", default=100),
         ResourceCatalogField("poll_interval_s", "number", default=0.1),
@@ -78,8 +86,12 @@ def _build_webhook(ctx: ResourceBuildContext, spec: Mapping[str, Any]) -> Webhoo
         parser=spec.get("parser", "auto"),
         auth=_build_webhook_auth(spec.get("auth")),
         response=_build_webhook_response(ctx, spec.get("response")),
+        mode=spec.get("mode", "async"),
+        reply_timeout_s=spec.get("reply_timeout_s", 30.0),
         max_body_bytes=spec.get("max_body_bytes", 1024 * 1024),
         read_timeout_s=spec.get("read_timeout_s", 5.0),
+        keepalive_timeout_s=spec.get("keepalive_timeout_s", 5.0),
+        max_keepalive_requests=spec.get("max_keepalive_requests", 1000),
         queue_maxsize=spec.get("queue_maxsize", 1000),
         batch_size=spec.get("batch_size", 100),
         poll_interval_s=spec.get("poll_interval_s", 0.1),
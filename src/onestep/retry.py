@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import inspect
 import random
 import traceback as traceback_module
 from dataclasses import dataclass
@@ -8,6 +7,7 @@ from enum import Enum
 from typing import Protocol
 
 from .envelope import Envelope
+from .invoke import callback_arity
 
 
 class FailureKind(str, Enum):
@@ -168,17 +168,7 @@ def resolve_retry_action(
     failure: FailureInfo,
 ) -> RetryAction:
     on_error = policy.on_error
-    try:
-        signature = inspect.signature(on_error)
-    except (TypeError, ValueError):
-        return on_error(envelope, exc, failure)
-
-    positional = [
-        parameter
-        for parameter in signature.parameters.values()
-        if parameter.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
-    ]
-    has_varargs = any(parameter.kind is inspect.Parameter.VAR_POSITIONAL for parameter in signature.parameters.values())
-    if has_varargs or len(positional) >= 3:
+    arity = callback_arity(on_error)
+    if arity < 0 or arity >= 3:
         return on_error(envelope, exc, failure)
     return on_error(envelope, exc)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from onestep.resilience import ConnectorBatchError
+
+if TYPE_CHECKING:
+    from onestep.connectors.base import Delivery, Source
+
+
+_DEFAULT_MAX_BATCH = 500
+
+_GroupKey = tuple[str, "float | None"]
+
+
+@dataclass
+class _PendingSettle:
+    delivery: "Delivery"
+    future: asyncio.Future[None]
+
+
+@dataclass
+class _SettleGroup:
+    entries: list[_PendingSettle] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
+class AckCoalescer:
+    """Merge concurrent ack/retry completions into ``Source.ack_many``/``retry_many``.
+
+    Completions for the same action (and, for retries, the same delay) that
+    land within ``window_ms`` of each other are settled in one backend call.
+    Each caller still waits for the call that settles its delivery, so a
+    failed bulk call surfaces on every delivery it covered; a
+    ``ConnectorBatchError`` fails only the deliveries it lists.
+    """
+
+    def __init__(
+        self,
+        source: "Source",
+        *,
+        window_ms: float | None = None,
+        max_batch: int = _DEFAULT_MAX_BATCH,
+    ) -> None:
+        self.source = source
+        self.window_ms = source.ack_window_ms if window_ms is None else window_ms
+        self.max_batch = max_batch
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._groups: dict[_GroupKey, _SettleGroup] = {}
+        self._settling: set[asyncio.Task[None]] = set()
+
+    async def ack(self, delivery: "Delivery") -> None:
+        await self._submit(("ack", None), delivery)
+
+    async def retry(self, delivery: "Delivery", *, delay_s: float | None = None) -> None:
+        await self._submit(("retry", delay_s), delivery)
+
+    async def flush(self) -> None:
+        if self._loop is not None and self._loop is asyncio.get_running_loop():
+            for key in list(self._groups):
+                self._flush_group(key)
+        if self._settling:
+            await asyncio.gather(*self._settling, return_exceptions=True)
+
+    async def _submit(self, key: _GroupKey, delivery: "Delivery") -> None:
+        loop = self._ensure_loop()
+        group = self._groups.setdefault(key, _SettleGroup())
+        entry = _PendingSettle(delivery=delivery, future=loop.create_future())
+        group.entries.append(entry)
+        if len(group.entries) >= self.max_batch or self.window_ms <= 0:
+            self._flush_group(key)
+        elif group.timer is None:
+            group.timer = loop.call_later(self.window_ms / 1000.0, self._flush_group, key)
+        try:
+            await entry.future
+        except asyncio.CancelledError:
+            self._discard(key, entry)
+            raise
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        current_loop = asyncio.get_running_loop()
+        if self._loop is not current_loop:
+            self._loop = current_loop
+            self._groups = {}
+            self._settling = set()
+        return current_loop
+
+    def _discard(self, key: _GroupKey, entry: _PendingSettle) -> None:
+        group = self._groups.get(key)
+        if group is None:
+            return
+        try:
+            group.entries.remove(entry)
+        except ValueError:
+            return
+        if not group.entries:
+            if group.timer is not None:
+                group.timer.cancel()
+            del self._groups[key]
+
+    def _flush_group(self, key: _GroupKey) -> None:
+        group = self._groups.pop(key, None)
+        if group is None:
+            return
+        if group.timer is not None:
+            group.timer.cancel()
+        if not group.entries:
+            return
+        assert self._loop is not None
+        settle = self._loop.create_task(self._settle(key, group.entries))
+        self._settling.add(settle)
+        settle.add_done_callback(self._settling.discard)
+
+    async def _settle(self, key: _GroupKey, entries: list[_PendingSettle]) -> None:
+        action, delay_s = key
+        deliveries = [entry.delivery for entry in entries]
+        try:
+            if action == "ack":
+                await self.source.ack_many(deliveries)
+            else:
+                await self.source.retry_many(deliveries, delay_s=delay_s)
+        except asyncio.CancelledError:
+            for entry in entries:
+                entry.future.cancel()
+            raise
+        except ConnectorBatchError as exc:
+            for index, entry in enumerate(entries):
+                if entry.future.done():
+                    continue
+                error = exc.errors.get(index)
+                if error is None:
+                    entry.future.set_result(None)
+                else:
+                    entry.future.set_exception(error)
+            return
+        except Exception as exc:
+            for entry in entries:
+                if not entry.future.done():
+                    entry.future.set_exception(exc)
+            return
+        for entry in entries:
+            if not entry.future.done():
+                entry.future.set_result(None)
+
+
+__all__ = ["AckCoalescer"]
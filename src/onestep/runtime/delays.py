@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from onestep.connectors.base import Delivery
+
+
+RetrySettler = Callable[["Delivery"], Awaitable[None]]
+
+
+class DelayedRetryScheduler:
+    """Hold delayed retries in a heap instead of sleeping inside the delivery.
+
+    ``schedule()`` returns immediately, so the inflight task that decided to
+    retry finishes and frees its concurrency slot. One loop timer tracks the
+    earliest ``ready_at``; when it fires every due delivery is handed to
+    ``settle`` (which performs the undelayed ``retry()``). ``flush()`` settles
+    whatever is still waiting without further delay, which the runner does on
+    shutdown so no retry is dropped.
+    """
+
+    def __init__(self, settle: RetrySettler, *, logger: logging.Logger) -> None:
+        self._settle = settle
+        self._logger = logger
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._heap: list[tuple[float, int, "Delivery"]] = []
+        self._sequence = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._settling: set[asyncio.Task[None]] = set()
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, delivery: "Delivery", delay_s: float) -> None:
+        loop = self._ensure_loop()
+        self._sequence += 1
+        ready_at = loop.time() + max(0.0, delay_s)
+        heapq.heappush(self._heap, (ready_at, self._sequence, delivery))
+        if self._heap[0][1] == self._sequence:
+            self._arm_timer()
+
+    async def flush(self) -> None:
+        if self._loop is not None and self._loop is asyncio.get_running_loop():
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            while self._heap:
+                _, _, delivery = heapq.heappop(self._heap)
+                self._start_settle(delivery)
+        if self._settling:
+            await asyncio.gather(*self._settling, return_exceptions=True)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        current_loop = asyncio.get_running_loop()
+        if self._loop is not current_loop:
+            self._loop = current_loop
+            self._heap = []
+            self._timer = None
+            self._settling = set()
+        return current_loop
+
+    def _arm_timer(self) -> None:
+        assert self._loop is not None
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = self._loop.call_at(self._heap[0][0], self._release_due)
+
+    def _release_due(self) -> None:
+        assert self._loop is not None
+        self._timer = None
+        now = self._loop.time()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, delivery = heapq.heappop(self._heap)
+            self._start_settle(delivery)
+        if self._heap:
+            self._arm_timer()
+
+    def _start_settle(self, delivery: "Delivery") -> None:
+        assert self._loop is not None
+        settle = self._loop.create_task(self._settle_one(delivery))
+        self._settling.add(settle)
+        settle.add_done_callback(self._settling.discard)
+
+    async def _settle_one(self, delivery: "Delivery") -> None:
+        try:
+            await self._settle(delivery)
+        except Exception:
+            self._logger.exception("delayed retry failed")
+
+
+__all__ = ["DelayedRetryScheduler"]
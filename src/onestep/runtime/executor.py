@@ -1,20 +1,19 @@
 from __future__ import annotations
 
 import asyncio
-import copy
 import inspect
 import logging
 import math
 import time
 from collections.abc import Awaitable, Callable, Mapping, Sequence
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from enum import Enum
 from typing import TYPE_CHECKING, Any
 
 from onestep.capture.codec import CaptureEncodingError
 from onestep.connectors.base import Delivery, Sink
-from onestep.context import TaskContext
-from onestep.envelope import Envelope
+from onestep.context import BatchTaskContext, TaskContext, TaskScope
+from onestep.envelope import _DATACLASS_SLOTS, Envelope
 from onestep.events import TaskEvent, TaskEventKind
 from onestep.execution import (
     ExecutionCompletion,
@@ -30,8 +29,12 @@ from onestep.resilience import (
     is_retryable_connector_error,
 )
 from onestep.retry import FailureInfo, FailureKind, RetryDecision, resolve_retry_action
+from onestep.snapshot import FrozenDict, ThawingDict, freeze, thaw
 from onestep.task import EmitBinding, EmitRoute, TaskSpec
 
+from .acks import AckCoalescer
+from .delays import DelayedRetryScheduler
+
 if TYPE_CHECKING:
     from onestep.app import OneStepApp
 
@@ -46,16 +49,19 @@ class DeliveryAction(str, Enum):
     FAIL = "fail"
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ExecutionOutcome:
     completion: str
     handler_result: Any = None
-    selected_sinks: list[str] = field(default_factory=list)
+    selected_sinks: Sequence[str] = ()
     delivery_action: DeliveryAction | None = None
     retry_delay_s: float | None = None
     failure: FailureInfo | None = None
     public_failure: dict[str, str] | None = None
     failure_stage: str | None = None
+    # The failure points at an overloaded backend (a timeout or a retryable
+    # connector error); adaptive concurrency backs off on it.
+    overloaded: bool = False
     dead_letter_attempted: bool = False
     dead_letter_published: bool | None = None
     terminal: bool = False
@@ -63,6 +69,20 @@ class ExecutionOutcome:
     capture_snapshot_error_type: str | None = None
 
 
+@dataclass(**_DATACLASS_SLOTS)
+class _BatchItem:
+    stage: str
+    result: Any = None
+    error: BaseException | None = None
+
+    def unwrap(self) -> Any:
+        if self.error is not None:
+            # A whole-batch failure is shared by every item; re-raise with the
+            # original traceback so each item's FailureInfo stays the same size.
+            raise self.error.with_traceback(self.error.__traceback__)
+        return self.result
+
+
 EventEmitter = Callable[[TaskEvent], Awaitable[None]]
 SinkDispatcher = Callable[[Sink, Envelope, str], Awaitable[bool]]
 Checkpoint = Callable[[str, str, Mapping[str, Any]], Awaitable[None]]
@@ -88,33 +108,144 @@ class DeliveryExecutor:
         dispatch_sink: SinkDispatcher | None = None,
         apply_delivery_actions: bool = True,
         checkpoint: Checkpoint | None = None,
+        acks: AckCoalescer | None = None,
+        delayed_retries: DelayedRetryScheduler | None = None,
     ) -> None:
         self.app = app
         self.task = task
         self._event_emitter = emit_event or app.emit_event
+        # With the app's own emitter an event nobody listens to is skipped
+        # before its meta snapshot is taken.
+        self._emits_to_app = emit_event is None
         self._sink_dispatcher = dispatch_sink or self._dispatch_production_sink
         self.apply_delivery_actions = apply_delivery_actions
         self.checkpoint = checkpoint or _noop_checkpoint
+        self.acks = acks
+        self.delayed_retries = delayed_retries
         self.logger = logging.getLogger(f"onestep.{app.name}.{task.name}")
+        self._scope: TaskScope | None = None
 
     async def execute(self, delivery: Delivery) -> ExecutionOutcome:
-        outcome = ExecutionOutcome(completion="running")
-        ctx = TaskContext(app=self.app, task=self.task, delivery=delivery)
+        if self.task.batch is not None:
+            outcomes = await self.execute_batch((delivery,))
+            return outcomes[0]
+        return await self._execute(delivery)
+
+    async def execute_batch(self, deliveries: Sequence[Delivery]) -> list[ExecutionOutcome]:
+        """Run one batch handler call for ``deliveries``.
+
+        Start, before hooks and everything after the handler stay per item, so
+        each delivery gets its own events, routing, ack/retry/fail and failure
+        capture. Per-item completions run concurrently.
+        """
         started_at = time.perf_counter()
+        contexts = [
+            self._new_context(delivery)
+            for delivery in deliveries
+        ]
+        items: list[_BatchItem | None] = [None] * len(deliveries)
+        ready: list[int] = []
+        try:
+            for index, delivery in enumerate(deliveries):
+                stage = "delivery_action"
+                try:
+                    await delivery.start_processing()
+                    await self.emit(TaskEventKind.STARTED, delivery)
+                    stage = "before_hook"
+                    await self.checkpoint(stage, "entered", {})
+                    await self._run_hooks(self.task.hooks.before, contexts[index], delivery.payload)
+                    await self.checkpoint(stage, "completed", {})
+                except Exception as exc:
+                    items[index] = _BatchItem(stage=stage, error=exc)
+                else:
+                    ready.append(index)
+
+            if ready:
+                await self.checkpoint("handler", "entered", {"batch_size": len(ready)})
+                try:
+                    results = await self._invoke_batch_handler(
+                        BatchTaskContext(
+                            app=self.app,
+                            task=self.task,
+                            deliveries=[deliveries[index] for index in ready],
+                            scope=self._task_scope(),
+                        ),
+                        [deliveries[index] for index in ready],
+                    )
+                except Exception as exc:
+                    for index in ready:
+                        items[index] = _BatchItem(stage="handler", error=exc)
+                else:
+                    for index, result in zip(ready, results):
+                        if isinstance(result, Exception):
+                            items[index] = _BatchItem(stage="handler", error=result)
+                        else:
+                            items[index] = _BatchItem(stage="handler", result=result)
+                    await self.checkpoint("handler", "completed", {"batch_size": len(ready)})
+        except asyncio.CancelledError:
+            await asyncio.gather(
+                *(
+                    self._execute(
+                        delivery,
+                        ctx=contexts[index],
+                        started_at=started_at,
+                        batch_item=(
+                            items[index]
+                            if items[index] is not None and index not in ready
+                            else _BatchItem(stage="handler", error=asyncio.CancelledError())
+                        ),
+                    )
+                    for index, delivery in enumerate(deliveries)
+                ),
+                return_exceptions=True,
+            )
+            raise
+
+        return list(
+            await asyncio.gather(
+                *(
+                    self._execute(
+                        delivery,
+                        ctx=contexts[index],
+                        started_at=started_at,
+                        batch_item=items[index],
+                    )
+                    for index, delivery in enumerate(deliveries)
+                )
+            )
+        )
+
+    async def _execute(
+        self,
+        delivery: Delivery,
+        *,
+        ctx: TaskContext | None = None,
+        started_at: float | None = None,
+        batch_item: _BatchItem | None = None,
+    ) -> ExecutionOutcome:
+        outcome = ExecutionOutcome(completion="running")
+        if ctx is None:
+            ctx = self._new_context(delivery)
+        if started_at is None:
+            started_at = time.perf_counter()
         active_stage = "delivery_action"
         try:
-            await delivery.start_processing()
-            await self.emit(TaskEventKind.STARTED, delivery)
+            if batch_item is None:
+                await delivery.start_processing()
+                await self.emit(TaskEventKind.STARTED, delivery)
 
-            active_stage = "before_hook"
-            await self.checkpoint(active_stage, "entered", {})
-            await self._run_hooks(self.task.hooks.before, ctx, delivery.payload)
-            await self.checkpoint(active_stage, "completed", {})
+                active_stage = "before_hook"
+                await self.checkpoint(active_stage, "entered", {})
+                await self._run_hooks(self.task.hooks.before, ctx, delivery.payload)
+                await self.checkpoint(active_stage, "completed", {})
 
-            active_stage = "handler"
-            await self.checkpoint(active_stage, "entered", {})
-            outcome.handler_result = await self._invoke_handler(ctx, delivery)
-            await self.checkpoint(active_stage, "completed", {})
+                active_stage = "handler"
+                await self.checkpoint(active_stage, "entered", {})
+                outcome.handler_result = await self._invoke_handler(ctx, delivery)
+                await self.checkpoint(active_stage, "completed", {})
+            else:
+                active_stage = batch_item.stage
+                outcome.handler_result = batch_item.unwrap()
 
             active_stage = "after_success_hook"
             await self.checkpoint(active_stage, "entered", {})
@@ -151,9 +282,9 @@ class DeliveryExecutor:
                     outcome.handler_result,
                 )
                 await self.checkpoint(active_stage, "completed", {})
-                for sink, emitted in prepared:
+                if prepared:
                     active_stage = "sink"
-                    await self._sink_dispatcher(sink, emitted, "emit")
+                    await self._dispatch_emits(prepared)
 
             active_stage = "ack"
             outcome.delivery_action = DeliveryAction.ACK
@@ -165,9 +296,10 @@ class DeliveryExecutor:
                 TaskEventKind.SUCCEEDED,
                 delivery,
                 duration_s=time.perf_counter() - started_at,
-                event_meta=self._build_succeeded_event_meta(
-                    delivery,
-                    outcome.handler_result,
+                event_meta=(
+                    self._build_succeeded_event_meta(delivery, outcome.handler_result)
+                    if self._has_event_listeners()
+                    else None
                 ),
             )
             outcome.completion = "succeeded"
@@ -207,6 +339,8 @@ class DeliveryExecutor:
         failure: FailureInfo | None = None,
         event_meta: dict[str, Any] | None = None,
     ) -> None:
+        if not self._has_event_listeners():
+            return
         event = TaskEvent(
             kind=kind,
             app=self.app.name,
@@ -215,15 +349,26 @@ class DeliveryExecutor:
             attempts=delivery.envelope.attempts,
             duration_s=duration_s,
             failure=failure,
-            meta=(
-                copy.deepcopy(event_meta)
-                if event_meta is not None
-                else copy.deepcopy(delivery.envelope.meta)
-            ),
+            # Callers pass event_meta already snapshotted; handlers get a
+            # copy-on-write dict so they can still mutate it.
+            meta=ThawingDict(event_meta if event_meta is not None else delivery.envelope.snapshot_meta()),
         )
         await self._event_emitter(event)
 
+    def _task_scope(self) -> TaskScope:
+        if self._scope is None:
+            self._scope = TaskScope(self.app, self.task)
+        return self._scope
+
+    def _new_context(self, delivery: Delivery) -> TaskContext:
+        return TaskContext(app=self.app, task=self.task, delivery=delivery, scope=self._task_scope())
+
+    def _has_event_listeners(self) -> bool:
+        return not self._emits_to_app or self.app.has_event_handlers
+
     async def _invoke_handler(self, ctx: TaskContext, delivery: Delivery) -> Any:
+        if self.task.executor != "loop":
+            return await self.app.handler_pools.run(self.task, ctx, delivery.payload)
         result = self.task.handler(ctx, delivery.payload)
         if inspect.isawaitable(result):
             if self.task.timeout_s is not None:
@@ -231,6 +376,33 @@ class DeliveryExecutor:
             return await result
         return result
 
+    async def _invoke_batch_handler(
+        self,
+        ctx: BatchTaskContext,
+        deliveries: Sequence[Delivery],
+    ) -> list[Any]:
+        payloads = [delivery.payload for delivery in deliveries]
+        if self.task.executor != "loop":
+            result = await self.app.handler_pools.run(self.task, ctx, payloads)
+        else:
+            result = self.task.handler(ctx, payloads)
+        if inspect.isawaitable(result):
+            if self.task.timeout_s is not None:
+                result = await asyncio.wait_for(result, timeout=self.task.timeout_s)
+            else:
+                result = await result
+        if result is None:
+            return [None] * len(deliveries)
+        if (
+            not isinstance(result, Sequence)
+            or isinstance(result, (str, bytes, bytearray))
+            or len(result) != len(deliveries)
+        ):
+            raise TypeError(
+                f"batch handler must return None or a sequence of {len(deliveries)} per-item results"
+            )
+        return list(result)
+
     async def _select_emit_bindings(
         self,
         ctx: TaskContext,
@@ -261,16 +433,59 @@ class DeliveryExecutor:
         ctx: TaskContext,
         payload: Any,
         result: Any,
-    ) -> tuple[tuple[Sink, Envelope], ...]:
-        prepared: list[tuple[Sink, Envelope]] = []
+    ) -> tuple[tuple[EmitBinding, Envelope], ...]:
+        prepared: list[tuple[EmitBinding, Envelope]] = []
         for binding in bindings:
             body = result
             if binding.transform is not None:
                 transformed = invoke_callback(binding.transform, ctx, payload, result)
                 body = await transformed if inspect.isawaitable(transformed) else transformed
-            prepared.append((binding.sink, Envelope(body=body)))
+            prepared.append((binding, Envelope(body=body)))
         return tuple(prepared)
 
+    async def _dispatch_emits(self, prepared: tuple[tuple[EmitBinding, Envelope], ...]) -> None:
+        """Send one delivery's emits, one sink after another or all at once.
+
+        In ``parallel`` mode every sink runs to completion or to its timeout
+        even when another one fails; the delivery then fails with the first
+        failure in emit order and the others are logged. Sinks that did
+        accept the envelope are not rolled back, so a retry emits to them
+        again, as it does after a mid-list failure in sequential mode.
+        """
+        if self.task.emit_mode != "parallel" or len(prepared) == 1:
+            for binding, emitted in prepared:
+                await self._dispatch_emit(binding, emitted)
+            return
+        results = await asyncio.gather(
+            *(self._dispatch_emit(binding, emitted) for binding, emitted in prepared),
+            return_exceptions=True,
+        )
+        failures = [
+            (binding, result)
+            for (binding, _emitted), result in zip(prepared, results)
+            if isinstance(result, BaseException)
+        ]
+        if not failures:
+            return
+        for binding, exc in failures[1:]:
+            self.logger.warning(
+                "parallel emit to sink failed",
+                extra={"sink_name": getattr(binding.sink, "name", type(binding.sink).__name__)},
+                exc_info=exc,
+            )
+        raise failures[0][1]
+
+    async def _dispatch_emit(self, binding: EmitBinding, envelope: Envelope) -> None:
+        timeout_s = binding.timeout_s if binding.timeout_s is not None else self.task.emit_timeout_s
+        if timeout_s is None:
+            await self._sink_dispatcher(binding.sink, envelope, "emit")
+            return
+        try:
+            await asyncio.wait_for(self._sink_dispatcher(binding.sink, envelope, "emit"), timeout=timeout_s)
+        except asyncio.TimeoutError:
+            sink_name = getattr(binding.sink, "name", type(binding.sink).__name__)
+            raise asyncio.TimeoutError(f"sink {sink_name} did not accept the emit within {timeout_s:g}s") from None
+
     async def _handle_cancelled(
         self,
         delivery: Delivery,
@@ -342,6 +557,9 @@ class DeliveryExecutor:
         duration_s = time.perf_counter() - started_at
         failure = FailureInfo.from_exception(exc, kind=kind)
         outcome.failure = failure
+        outcome.overloaded = kind is FailureKind.TIMEOUT or (
+            isinstance(exc, ConnectorOperationError) and is_retryable_connector_error(exc)
+        )
         self._snapshot_capture_envelope(delivery, outcome)
         outcome.public_failure = self._public_failure(failure, exc)
         outcome.completion = "failed"
@@ -422,7 +640,7 @@ class DeliveryExecutor:
     ) -> bool:
         envelope = Envelope(
             body={
-                "payload": copy.deepcopy(delivery.envelope.body),
+                "payload": thaw(delivery.envelope.body),
                 "failure": failure.as_dict(),
             },
             meta={
@@ -431,7 +649,7 @@ class DeliveryExecutor:
                 "source": (
                     self.task.source.name if self.task.source is not None else None
                 ),
-                "original_meta": copy.deepcopy(delivery.envelope.meta),
+                "original_meta": thaw(delivery.envelope.meta),
                 "original_attempts": delivery.envelope.attempts,
             },
             attempts=0,
@@ -480,7 +698,12 @@ class DeliveryExecutor:
         if self.apply_delivery_actions:
             managed = self._managed_delivery(delivery)
             if managed is None:
-                await delivery.retry(delay_s=delay_s)
+                if delay_s and self.delayed_retries is not None:
+                    self.delayed_retries.schedule(delivery, delay_s)
+                elif self.acks is not None:
+                    await self.acks.retry(delivery, delay_s=delay_s)
+                else:
+                    await delivery.retry(delay_s=delay_s)
             else:
                 await self._complete_managed_execution(
                     managed,
@@ -561,7 +784,15 @@ class DeliveryExecutor:
     async def _apply_success(self, delivery: Delivery, result: Any) -> None:
         managed = self._managed_delivery(delivery)
         if managed is None:
-            await delivery.ack()
+            # Duck-typed deliveries (manual runs, test doubles) may not
+            # derive from Delivery.
+            set_result = getattr(delivery, "set_result", None)
+            if set_result is not None:
+                set_result(result)
+            if self.acks is not None:
+                await self.acks.ack(delivery)
+            else:
+                await delivery.ack()
             return
         await self._complete_managed_execution(
             managed,
@@ -590,10 +821,13 @@ class DeliveryExecutor:
         envelope: Envelope,
         kind: str,
     ) -> bool:
+        details = {"resource": getattr(sink, "name", type(sink).__name__)}
+        await self.checkpoint("sink", "entered", details)
         if kind == "dead_letter":
             await sink.send(envelope)
         else:
             await self._send_to_sink(sink, envelope)
+        await self.checkpoint("sink", "completed", details)
         return True
 
     async def _send_to_sink(self, sink: Sink, envelope: Envelope) -> None:
@@ -684,10 +918,10 @@ class DeliveryExecutor:
         delivery: Delivery,
         result: Any,
     ) -> dict[str, Any]:
-        event_meta = copy.deepcopy(delivery.envelope.meta)
+        event_meta = delivery.envelope.snapshot_meta()
         notification = self._extract_notification_payload(result)
         if notification is not None:
-            event_meta["notification"] = notification
+            event_meta = FrozenDict({**event_meta, "notification": freeze(notification)})
         return event_meta
 
     def _extract_notification_payload(self, result: Any) -> dict[str, Any] | None:
@@ -808,7 +1042,12 @@ class DeliveryExecutor:
         ) is None:
             return
         try:
-            outcome.capture_envelope = copy.deepcopy(delivery.envelope)
+            envelope = delivery.envelope
+            outcome.capture_envelope = Envelope(
+                body=thaw(envelope.body),
+                meta=thaw(envelope.meta),
+                attempts=envelope.attempts,
+            )
         except Exception as exc:
             outcome.capture_snapshot_error_type = type(exc).__name__
 
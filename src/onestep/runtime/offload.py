@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import os
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from onestep.task import TaskSpec
+
+
+class HandlerPools:
+    """Bounded per-task pools for handlers declared with ``executor="thread"|"process"``.
+
+    Thread pools are sized to the task's concurrency, process pools to
+    ``min(concurrency, cpu_count)``. Thread handlers receive the live
+    ``TaskContext``; process handlers are called as ``handler(None, payload)``
+    because only the handler reference and payload are pickled to the worker.
+    """
+
+    def __init__(self) -> None:
+        self._pools: dict[str, concurrent.futures.Executor] = {}
+
+    async def run(self, task: "TaskSpec", ctx: Any, argument: Any) -> Any:
+        pool = self._pool(task)
+        loop = asyncio.get_running_loop()
+        if task.executor == "process":
+            call = functools.partial(_call_in_process, task.handler, argument)
+        else:
+            call = functools.partial(contextvars.copy_context().run, task.handler, ctx, argument)
+        future = loop.run_in_executor(pool, call)
+        # A timed-out or cancelled call frees the delivery immediately; the
+        # worker itself cannot be interrupted and finishes in the background.
+        if task.timeout_s is not None:
+            return await asyncio.wait_for(future, timeout=task.timeout_s)
+        return await future
+
+    def shutdown(self) -> None:
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _pool(self, task: "TaskSpec") -> concurrent.futures.Executor:
+        pool = self._pools.get(task.name)
+        if pool is not None:
+            return pool
+        if task.executor == "process":
+            pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=max(1, min(task.concurrency, os.cpu_count() or 1))
+            )
+        else:
+            pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=task.concurrency,
+                thread_name_prefix=f"onestep-{task.name}",
+            )
+        self._pools[task.name] = pool
+        return pool
+
+
+def _call_in_process(handler: Any, argument: Any) -> Any:
+    return handler(None, argument)
+
+
+__all__ = ["HandlerPools"]
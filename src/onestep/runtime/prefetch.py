@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from onestep.connectors.base import Delivery
+
+
+class PrefetchBuffer:
+    """Deliveries fetched ahead of free concurrency, oldest first.
+
+    Holds at most ``capacity`` deliveries. With ``max_age_s`` a delivery that
+    waited that long is handed out by ``pop_expired`` instead of ``take`` so
+    the runner can release it before its lease runs out under it.
+    """
+
+    def __init__(self, capacity: int, *, max_age_s: float | None = None) -> None:
+        self.capacity = capacity
+        self.max_age_s = max_age_s
+        self._items: deque[tuple[float, "Delivery"]] = deque()
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def free(self) -> int:
+        return max(0, self.capacity - len(self._items))
+
+    def put(self, deliveries: list["Delivery"]) -> None:
+        if not deliveries:
+            return
+        fetched_at = time.monotonic()
+        self._items.extend((fetched_at, delivery) for delivery in deliveries)
+        self._ready.set()
+        if not self.free:
+            self._space.clear()
+
+    def take(self, limit: int) -> list["Delivery"]:
+        taken = [self._items.popleft()[1] for _ in range(min(limit, len(self._items)))]
+        self._update_events()
+        return taken
+
+    def pop_expired(self) -> list["Delivery"]:
+        if self.max_age_s is None:
+            return []
+        deadline = time.monotonic() - self.max_age_s
+        expired: list["Delivery"] = []
+        while self._items and self._items[0][0] <= deadline:
+            expired.append(self._items.popleft()[1])
+        if expired:
+            self._update_events()
+        return expired
+
+    def next_expiry_s(self) -> float | None:
+        """Seconds until the oldest buffered delivery expires."""
+        if self.max_age_s is None or not self._items:
+            return None
+        return max(0.0, self._items[0][0] + self.max_age_s - time.monotonic())
+
+    def clear(self) -> list["Delivery"]:
+        deliveries = [delivery for _fetched_at, delivery in self._items]
+        self._items.clear()
+        self._update_events()
+        return deliveries
+
+    async def wait_ready(self) -> None:
+        await self._ready.wait()
+
+    async def wait_for_space(self) -> None:
+        await self._space.wait()
+
+    def _update_events(self) -> None:
+        if self._items:
+            self._ready.set()
+        else:
+            self._ready.clear()
+        if self.free:
+            self._space.set()
+        else:
+            self._space.clear()
@@ -1,25 +1,42 @@
 from __future__ import annotations
 
 import asyncio
-import copy
 import inspect
 import logging
+import time
+from collections import deque
+from collections.abc import Hashable
 from typing import TYPE_CHECKING, Any
 
+from onestep.envelope import meta_path
 from onestep.events import TaskEvent, TaskEventKind
+from onestep.invoke import invoke_callback
 from onestep.resilience import (
     ConnectorOperationError,
     connector_retry_delay,
     is_retryable_connector_error,
 )
-from onestep.task import TaskSpec
+from onestep.snapshot import ThawingDict
+from onestep.task import SOURCE_ORDERING_KEY, TaskSpec
 
+from .acks import AckCoalescer
+from .delays import DelayedRetryScheduler
 from .executor import DeliveryExecutor
+from .prefetch import PrefetchBuffer
+from .wheel import MAX_IDLE_WAIT_S, timer_wheel
 
 if TYPE_CHECKING:
     from onestep.app import OneStepApp
     from onestep.connectors.base import Delivery
 
+# Lane used for deliveries whose ordering key could not be computed: they are
+# serialized together rather than allowed to overtake each other.
+_FALLBACK_LANE = object()
+
+# Share of the source lease a prefetched delivery may spend in the buffer
+# before it is released; the rest is left for the handler.
+_PREFETCH_LEASE_SHARE = 0.5
+
 
 class TaskRunner:
     def __init__(self, app: "OneStepApp", task: TaskSpec) -> None:
@@ -30,12 +47,65 @@ class TaskRunner:
         self._drain_parked = False
         self._pause_parked = False
         self._logger = logging.getLogger(f"onestep.{app.name}.{task.name}")
-        self._executor = DeliveryExecutor(app, task)
+        self._acks = (
+            AckCoalescer(task.source)
+            if task.source is not None and task.source.supports_bulk_ack
+            else None
+        )
+        # Ordered tasks keep one inflight delivery per ordering key. Deliveries
+        # whose key is busy wait in that key's lane and count against
+        # ``concurrency`` until they start.
+        self._lanes: dict[Hashable, deque["Delivery"]] = {}
+        self._lane_backlog = 0
+        self._lanes_closed = False
+        # Delayed retries wait in a runtime heap so they do not hold a
+        # concurrency slot. Ordered tasks keep the delay inside the delivery:
+        # the lane must stay blocked until the retry is issued.
+        self._delayed_retries = (
+            DelayedRetryScheduler(self._settle_delayed_retry, logger=self._logger)
+            if task.source is not None
+            and not task.source.native_retry_delay
+            and task.ordering_key is None
+            else None
+        )
+        self._executor = DeliveryExecutor(
+            app,
+            task,
+            checkpoint=(
+                app.instrumentation.checkpoint(task.name)
+                if app.instrumentation.enabled
+                else None
+            ),
+            acks=self._acks,
+            delayed_retries=self._delayed_retries,
+        )
+        self._limiter = (
+            task.adaptive_concurrency.new_limiter()
+            if task.adaptive_concurrency is not None
+            else None
+        )
+        self._rate_limiter = task.rate_limit.new_limiter() if task.rate_limit is not None else None
+        # Created in ``run`` when ``task.prefetch`` is set: a background fetch
+        # keeps the buffer full so free slots do not wait a broker round trip.
+        self._prefetch: PrefetchBuffer | None = None
+        self._prefetcher: asyncio.Task[None] | None = None
 
     @property
     def inflight_count(self) -> int:
         return len(self._inflight)
 
+    @property
+    def prefetched_count(self) -> int:
+        return 0 if self._prefetch is None else len(self._prefetch)
+
+    @property
+    def concurrency_limit(self) -> int:
+        return self.task.concurrency if self._limiter is None else self._limiter.limit
+
+    @property
+    def delayed_retry_count(self) -> int:
+        return 0 if self._delayed_retries is None else self._delayed_retries.pending_count
+
     @property
     def is_fetching(self) -> bool:
         return self._fetching
@@ -51,9 +121,16 @@ class TaskRunner:
     async def run(self) -> None:
         if self.task.source is None:
             return
+        if self.task.prefetch:
+            lease_s = self.task.source.lease_timeout_s()
+            self._prefetch = PrefetchBuffer(
+                self.task.prefetch,
+                max_age_s=None if lease_s is None else lease_s * _PREFETCH_LEASE_SHARE,
+            )
         try:
             while not self.app.is_stopping:
                 if self.app.is_draining:
+                    await self._stop_prefetch()
                     if self._inflight:
                         await self._wait_for_inflight(timeout=self.task.source.poll_interval_s)
                         continue
@@ -63,6 +140,7 @@ class TaskRunner:
                     break
 
                 if self.app.is_task_paused(self.task.name):
+                    await self._stop_prefetch()
                     if self._inflight:
                         await self._wait_for_inflight(timeout=self.task.source.poll_interval_s)
                         continue
@@ -82,36 +160,106 @@ class TaskRunner:
                 if resumed_from_pause:
                     await self._resume_source_after_pause()
                 self._set_pause_parked(False)
-                available = self.task.concurrency - len(self._inflight)
+                available = self.concurrency_limit - len(self._inflight) - self._lane_backlog
                 if available <= 0:
                     await self._wait_for_inflight(timeout=self.task.source.poll_interval_s)
                     continue
 
-                deliveries = await self._fetch_deliveries(available)
-                if not deliveries:
-                    if self.app.is_stopping:
-                        break
-                    if self._inflight:
-                        await self._wait_for_inflight(timeout=self.task.source.poll_interval_s)
-                    else:
-                        await asyncio.sleep(self.task.source.poll_interval_s)
-                    continue
+                batch = self.task.batch
+                limit = available if batch is None else available * batch
+                rate_limited = self._rate_limiter is not None and not self._rate_limiter.keyed
+                if rate_limited:
+                    # Only lease what the quota lets us start now; leased
+                    # deliveries would otherwise sit out their visibility
+                    # timeout waiting for tokens.
+                    bucket = self._rate_limiter.bucket()
+                    tokens = bucket.available()
+                    if tokens <= 0:
+                        await self._wait_for_tokens(bucket.delay_s())
+                        continue
+                    limit = min(limit, tokens)
+                if self._prefetch is not None:
+                    deliveries = await self._take_prefetched(limit)
+                    if not deliveries:
+                        continue
+                else:
+                    deliveries = await self._fetch_deliveries(limit)
+                    if not deliveries:
+                        if self.app.is_stopping:
+                            break
+                        await self._wait_idle()
+                        continue
+                if rate_limited:
+                    self._rate_limiter.bucket().take(len(deliveries))
                 await self._emit_batch_event(TaskEventKind.FETCHED, deliveries)
 
-                for delivery in deliveries:
-                    pending = asyncio.create_task(self._handle_delivery(delivery))
-                    self._track_inflight(pending)
+                if self.task.ordering_key is not None:
+                    for delivery in deliveries:
+                        self._dispatch_ordered(delivery)
+                elif batch is None:
+                    for delivery in deliveries:
+                        pending = asyncio.create_task(self._handle_delivery(delivery))
+                        self._track_inflight(pending)
+                else:
+                    # In batch mode concurrency bounds handler calls, not deliveries.
+                    for start in range(0, len(deliveries), batch):
+                        pending = asyncio.create_task(
+                            self._handle_batch(deliveries[start : start + batch])
+                        )
+                        self._track_inflight(pending)
         finally:
             self._set_drain_parked(False)
             self._set_pause_parked(False)
+            await self._stop_prefetch()
+            self._prefetch = None
             self._set_fetching(False)
             await self._drain_inflight()
+            await self._release_lane_backlog()
+            if self._delayed_retries is not None:
+                # Hand retries still waiting for their delay back to the
+                # source now rather than dropping them with the worker.
+                await self._delayed_retries.flush()
+            if self._acks is not None:
+                await self._acks.flush()
 
     async def _wait_for_inflight(self, timeout: float | None) -> None:
         if not self._inflight:
             return
         await asyncio.wait(self._inflight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
 
+    async def _wait_for_tokens(self, delay_s: float) -> None:
+        try:
+            await asyncio.wait_for(
+                self.app.wait_for_stop_fetching(self.task.name),
+                timeout=delay_s,
+            )
+        except asyncio.TimeoutError:
+            return
+
+    async def _wait_idle(self) -> None:
+        assert self.task.source is not None
+        poll_interval_s = self.task.source.poll_interval_s
+        delay_s = self.task.source.next_fetch_delay_s()
+        if delay_s is None or delay_s <= poll_interval_s:
+            timeout = poll_interval_s if delay_s is None else delay_s
+            if self._inflight:
+                await self._wait_for_inflight(timeout=timeout)
+            else:
+                await asyncio.sleep(timeout)
+            return
+        # The source knows when it next has work: park on the shared timer
+        # wheel until then, waking early for finished inflight work (which
+        # can release queued runs or retries) and for stop/drain/pause.
+        wake = timer_wheel().sleep(min(delay_s, MAX_IDLE_WAIT_S))
+        stop_fetching = asyncio.create_task(self.app.wait_for_stop_fetching(self.task.name))
+        waiters: set[asyncio.Future[Any]] = {wake, stop_fetching, *self._inflight}
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            wake.cancel()
+            stop_fetching.cancel()
+            await asyncio.gather(stop_fetching, return_exceptions=True)
+
     async def _fetch_deliveries(self, limit: int) -> list["Delivery"]:
         if (
             self.task.source is None
@@ -155,6 +303,73 @@ class TaskRunner:
                 pending_task.cancel()
             await asyncio.gather(*pending, return_exceptions=True)
 
+    async def _take_prefetched(self, limit: int) -> list["Delivery"]:
+        assert self._prefetch is not None and self.task.source is not None
+        buffer = self._prefetch
+        prefetcher = self._prefetcher
+        if prefetcher is not None and prefetcher.done():
+            self._prefetcher = None
+            # Surface a fetch failure the runner would not have survived.
+            prefetcher.result()
+        if self._prefetcher is None:
+            self._prefetcher = asyncio.create_task(self._prefetch_loop())
+        await self._release_expired_prefetch()
+        if buffer:
+            return buffer.take(limit)
+        ready = asyncio.create_task(buffer.wait_ready())
+        stop_fetching = asyncio.create_task(self.app.wait_for_stop_fetching(self.task.name))
+        try:
+            await asyncio.wait(
+                {ready, stop_fetching, self._prefetcher},
+                timeout=self.task.source.poll_interval_s or None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            ready.cancel()
+            stop_fetching.cancel()
+            await asyncio.gather(ready, stop_fetching, return_exceptions=True)
+        return []
+
+    async def _prefetch_loop(self) -> None:
+        assert self._prefetch is not None and self.task.source is not None
+        buffer = self._prefetch
+        while not (
+            self.app.is_stopping
+            or self.app.is_draining
+            or self.app.is_task_paused(self.task.name)
+        ):
+            await self._release_expired_prefetch()
+            if not buffer.free:
+                try:
+                    await asyncio.wait_for(
+                        buffer.wait_for_space(),
+                        timeout=buffer.next_expiry_s() or self.task.source.poll_interval_s or None,
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            deliveries = await self._fetch_deliveries(buffer.free)
+            if deliveries:
+                buffer.put(deliveries)
+                continue
+            await self._wait_idle()
+
+    async def _release_expired_prefetch(self) -> None:
+        assert self._prefetch is not None
+        expired = self._prefetch.pop_expired()
+        if expired:
+            # Hand them back while other consumers can still use the lease
+            # time that is left; starting them now could overrun it.
+            await asyncio.shield(self._release_unstarted_deliveries(expired))
+
+    async def _stop_prefetch(self) -> None:
+        prefetcher, self._prefetcher = self._prefetcher, None
+        if prefetcher is not None:
+            prefetcher.cancel()
+            await asyncio.gather(prefetcher, return_exceptions=True)
+        if self._prefetch is not None and self._prefetch:
+            await self._release_unstarted_deliveries(self._prefetch.clear())
+
     async def _resolve_fetch_task(self, fetch_task: asyncio.Task[list["Delivery"]]) -> list["Delivery"]:
         try:
             return await fetch_task
@@ -238,22 +453,137 @@ class TaskRunner:
             return
 
     async def _handle_delivery(self, delivery: "Delivery") -> None:
-        await self._executor.execute(delivery)
+        if self._rate_limiter is not None and self._rate_limiter.keyed:
+            # Keys are only known once fetched: wait for this key's bucket
+            # while holding the concurrency slot.
+            await self._acquire_rate_limit([delivery])
+        if self._limiter is None:
+            await self._executor.execute(delivery)
+            return
+        started_at = time.perf_counter()
+        outcome = await self._executor.execute(delivery)
+        self._record_latency(time.perf_counter() - started_at, outcome.overloaded)
+
+    async def _acquire_rate_limit(self, deliveries: list["Delivery"]) -> None:
+        assert self._rate_limiter is not None
+        try:
+            for delivery in deliveries:
+                await self._rate_limiter.acquire(delivery.envelope)
+        except asyncio.CancelledError:
+            # Cancelled before it started (shutdown timeout): hand it back.
+            await asyncio.shield(self._release_unstarted_deliveries(deliveries))
+            raise
+
+    def _record_latency(self, latency_s: float, overloaded: bool) -> None:
+        assert self._limiter is not None
+        previous = self._limiter.limit
+        self._limiter.on_sample(latency_s, inflight=len(self._inflight), overloaded=overloaded)
+        if self._limiter.limit != previous:
+            self.app.notify_runner_state_changed()
+
+    def _dispatch_ordered(self, delivery: "Delivery") -> None:
+        key = self._ordering_key(delivery)
+        if key is None:
+            self._track_inflight(asyncio.create_task(self._handle_delivery(delivery)))
+            return
+        lane = self._lanes.get(key)
+        if lane is not None:
+            lane.append(delivery)
+            self._lane_backlog += 1
+            return
+        self._lanes[key] = deque()
+        self._start_in_lane(key, delivery)
+
+    def _start_in_lane(self, key: Hashable, delivery: "Delivery") -> None:
+        pending = asyncio.create_task(self._handle_delivery(delivery))
+        self._track_inflight(pending)
+        pending.add_done_callback(lambda _task: self._advance_lane(key))
+
+    def _advance_lane(self, key: Hashable) -> None:
+        lane = self._lanes.get(key)
+        if lane is None:
+            return
+        if not lane:
+            del self._lanes[key]
+            return
+        if self._lanes_closed:
+            return
+        self._lane_backlog -= 1
+        self._start_in_lane(key, lane.popleft())
+
+    async def _release_lane_backlog(self) -> None:
+        # Deliveries still waiting behind their key when the runner stops were
+        # never started; hand them back to the source for redelivery.
+        waiting = [delivery for lane in self._lanes.values() for delivery in lane]
+        self._lanes = {}
+        self._lane_backlog = 0
+        self._lanes_closed = False
+        if waiting:
+            await self._release_unstarted_deliveries(waiting)
+
+    def _ordering_key(self, delivery: "Delivery") -> Hashable | None:
+        ordering_key = self.task.ordering_key
+        try:
+            if ordering_key == SOURCE_ORDERING_KEY:
+                assert self.task.source is not None
+                key = self.task.source.ordering_key(delivery)
+            elif isinstance(ordering_key, str):
+                key = meta_path(delivery.envelope.meta, ordering_key)
+            else:
+                key = invoke_callback(ordering_key, delivery.envelope)
+        except Exception:
+            self._logger.exception("computing ordering key failed; using the fallback lane")
+            return _FALLBACK_LANE
+        try:
+            hash(key)
+        except TypeError:
+            return repr(key)
+        return key
+
+    async def _settle_delayed_retry(self, delivery: "Delivery") -> None:
+        if self._acks is not None:
+            await self._acks.retry(delivery)
+        else:
+            await delivery.retry()
+
+    async def _handle_batch(self, deliveries: list["Delivery"]) -> None:
+        if self._rate_limiter is not None and self._rate_limiter.keyed:
+            await self._acquire_rate_limit(deliveries)
+        if self._limiter is None:
+            await self._executor.execute_batch(deliveries)
+            return
+        started_at = time.perf_counter()
+        outcomes = await self._executor.execute_batch(deliveries)
+        self._record_latency(
+            time.perf_counter() - started_at,
+            any(outcome.overloaded for outcome in outcomes),
+        )
 
     async def _drain_inflight(self) -> None:
         if not self._inflight:
+            self._lanes_closed = True
             return
         if self.app.shutdown_timeout_s is None:
-            await asyncio.gather(*self._inflight, return_exceptions=True)
+            # Ordered lanes start their next delivery as each one finishes,
+            # so keep waiting until no new inflight work appears.
+            while self._inflight:
+                await asyncio.gather(*self._inflight, return_exceptions=True)
+            self._lanes_closed = True
             return
         loop = asyncio.get_running_loop()
         deadline = loop.time() + self.app.shutdown_timeout_s
-        done, pending = await asyncio.wait(
-            self._inflight,
-            timeout=self.app.shutdown_timeout_s,
-        )
-        if done:
-            await asyncio.gather(*done, return_exceptions=True)
+        pending: set[asyncio.Task[None]] = set()
+        while self._inflight:
+            done, pending = await asyncio.wait(
+                set(self._inflight),
+                timeout=max(0.0, deadline - loop.time()),
+            )
+            if done:
+                await asyncio.gather(*done, return_exceptions=True)
+            if pending or loop.time() >= deadline:
+                pending = set(self._inflight)
+                break
+        self._lanes_closed = True
         if pending:
             for pending_task in pending:
                 pending_task.cancel()
@@ -274,6 +604,8 @@ class TaskRunner:
                 )
 
     async def _emit_batch_event(self, kind: TaskEventKind, deliveries: list["Delivery"]) -> None:
+        if not self.app.has_event_handlers:
+            return
         for delivery in deliveries:
             await self._emit_event(kind, delivery)
 
@@ -288,6 +620,6 @@ class TaskRunner:
             task=self.task.name,
             source=self.task.source.name if self.task.source is not None else None,
             attempts=delivery.envelope.attempts,
-            meta=copy.deepcopy(delivery.envelope.meta),
+            meta=ThawingDict(delivery.envelope.snapshot_meta()),
         )
         await self.app.emit_event(event)
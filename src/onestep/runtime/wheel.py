@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import weakref
+
+# Idle runners re-check the wall clock at least this often, so a clock step
+# (NTP, suspend/resume) delays a scheduled fire by at most this much.
+MAX_IDLE_WAIT_S = 60.0
+
+_COMPACT_MIN_CANCELLED = 64
+
+
+class TimerWheel:
+    """One deadline heap per event loop shared by idle scheduled-source runners.
+
+    Runners whose source reports the exact time of its next work
+    (``Source.next_fetch_delay_s``) park on a future from ``sleep()`` instead of
+    polling. Only the earliest deadline holds a loop timer, so hundreds of
+    schedule tasks cost one timer between fires. Waiters cancelled early
+    (inflight work finished, shutdown) are dropped lazily and compacted once
+    they make up half of the heap.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._heap: list[tuple[float, int, asyncio.Future[None]]] = []
+        self._sequence = 0
+        self._cancelled = 0
+        self._timer: asyncio.TimerHandle | None = None
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._heap) - self._cancelled
+
+    def sleep(self, delay_s: float) -> asyncio.Future[None]:
+        waiter: asyncio.Future[None] = self._loop.create_future()
+        deadline = self._loop.time() + max(0.0, delay_s)
+        self._sequence += 1
+        heapq.heappush(self._heap, (deadline, self._sequence, waiter))
+        waiter.add_done_callback(self._on_waiter_done)
+        if self._heap[0][2] is waiter:
+            self._arm()
+        return waiter
+
+    def _arm(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = self._loop.call_at(self._heap[0][0], self._fire) if self._heap else None
+
+    def _fire(self) -> None:
+        self._timer = None
+        now = self._loop.time()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, waiter = heapq.heappop(self._heap)
+            if waiter.cancelled():
+                self._cancelled -= 1
+            elif not waiter.done():
+                waiter.set_result(None)
+        if self._heap:
+            self._arm()
+
+    def _on_waiter_done(self, waiter: asyncio.Future[None]) -> None:
+        if not waiter.cancelled():
+            return
+        self._cancelled += 1
+        if self._cancelled >= _COMPACT_MIN_CANCELLED and self._cancelled * 2 >= len(self._heap):
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled()]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+            self._arm()
+
+
+_WHEELS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, TimerWheel]" = weakref.WeakKeyDictionary()
+
+
+def timer_wheel() -> TimerWheel:
+    """Return the running loop's shared ``TimerWheel``."""
+    loop = asyncio.get_running_loop()
+    wheel = _WHEELS.get(loop)
+    if wheel is None:
+        wheel = TimerWheel(loop)
+        _WHEELS[loop] = wheel
+    return wheel
+
+
+__all__ = ["MAX_IDLE_WAIT_S", "TimerWheel", "timer_wheel"]
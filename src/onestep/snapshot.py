@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import copy
+from collections.abc import ItemsView, Mapping, ValuesView
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import Any, NoReturn
+from uuid import UUID
+
+# Values of these types are never mutated in place, so snapshots share them.
+_IMMUTABLE_TYPES = frozenset(
+    {str, int, float, bool, type(None), bytes, complex, datetime, date, time, timedelta, Decimal, UUID}
+)
+_MISSING = object()
+
+
+def _read_only(self: Any, *args: Any, **kwargs: Any) -> NoReturn:
+    raise TypeError(f"{type(self).__name__} is read-only; thaw() it for a mutable copy")
+
+
+class FrozenDict(dict):
+    """A read-only ``dict`` produced by ``freeze()``.
+
+    It stays a ``dict`` so ``json.dumps``, ``==`` and ``dict(...)`` keep
+    working for event handlers and reporters; only mutation is refused.
+    Copies return the same object, since nothing can change underneath.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> FrozenDict:
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> FrozenDict:
+        return self
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (FrozenDict, (dict(self),))
+
+    def __repr__(self) -> str:
+        return f"FrozenDict({dict.__repr__(self)})"
+
+
+class FrozenList(list):
+    """A read-only ``list`` produced by ``freeze()``; see ``FrozenDict``."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __copy__(self) -> FrozenList:
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> FrozenList:
+        return self
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (FrozenList, (list(self),))
+
+    def __repr__(self) -> str:
+        return f"FrozenList({list.__repr__(self)})"
+
+
+class ThawingDict(dict):
+    """A mutable ``dict`` over a frozen snapshot, copied on write.
+
+    Only the top level is copied up front; nested ``FrozenDict`` and
+    ``FrozenList`` values stay shared with the snapshot until they are read
+    through ``[]``, ``get``, ``setdefault``, ``pop``, ``popitem`` or while
+    iterating ``items()`` and ``values()``, which swaps in a thawed copy first. Event handlers can mutate it like the plain dict they
+    used to get, while subtrees nobody touches are never copied.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: Any) -> Any:
+        value = dict.__getitem__(self, key)
+        if type(value) is FrozenDict or type(value) is FrozenList:
+            value = _thaw(value)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        dict.__setitem__(self, key, default)
+        return default
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        value = dict.pop(self, key, *default)
+        return _thaw(value) if type(value) is FrozenDict or type(value) is FrozenList else value
+
+    def popitem(self) -> tuple[Any, Any]:
+        key, value = dict.popitem(self)
+        return key, _thaw(value) if type(value) is FrozenDict or type(value) is FrozenList else value
+
+    # The generic views read every value through ``__getitem__``; replacing
+    # a value in place does not change the size, so iterating stays valid.
+    def items(self) -> ItemsView[Any, Any]:
+        return ItemsView(self)
+
+    def values(self) -> ValuesView[Any]:
+        return ValuesView(self)
+
+    def copy(self) -> ThawingDict:
+        return ThawingDict(self)
+
+
+def freeze(value: Any, base: Any = None) -> Any:
+    """Return an immutable snapshot of ``value`` that shares structure where it can.
+
+    Immutable leaves and already-frozen containers are reused as-is. When
+    ``base`` is an earlier snapshot of the same value, every subtree that is
+    unchanged since then is taken from ``base`` instead of being copied, so
+    re-snapshotting unchanged meta allocates nothing. Values of other types
+    are deep-copied, which keeps the snapshot isolated from later mutation.
+    """
+    try:
+        return _freeze(value, base)
+    except RecursionError:
+        # Self-referencing containers; deepcopy keeps its own memo.
+        return copy.deepcopy(value)
+
+
+def _freeze(value: Any, base: Any) -> Any:
+    value_type = type(value)
+    if value_type in _IMMUTABLE_TYPES or value_type is FrozenDict or value_type is FrozenList:
+        return value
+    if isinstance(value, Mapping):
+        return _freeze_mapping(value, base)
+    if value_type is list or value_type is tuple:
+        return _freeze_sequence(value, base)
+    if value_type is frozenset or isinstance(value, Enum):
+        return value
+    return copy.deepcopy(value)
+
+
+def _freeze_mapping(value: Mapping[Any, Any], base: Any) -> FrozenDict:
+    if type(base) is not FrozenDict:
+        return FrozenDict({key: _freeze(item, None) for key, item in value.items()})
+    if len(base) == len(value):
+        for key, item in value.items():
+            previous = base.get(key, _MISSING)
+            if previous is _MISSING or _freeze(item, previous) is not previous:
+                break
+        else:
+            return base
+    return FrozenDict({key: _freeze(item, base.get(key)) for key, item in value.items()})
+
+
+def _freeze_sequence(value: list[Any] | tuple[Any, ...], base: Any) -> Any:
+    if type(value) is tuple:
+        items = tuple(_freeze(item, None) for item in value)
+        # A tuple of immutable items is already a snapshot.
+        return value if all(a is b for a, b in zip(items, value)) else items
+    if type(base) is FrozenList and len(base) == len(value):
+        if all(_freeze(item, previous) is previous for item, previous in zip(value, base)):
+            return base
+        return FrozenList([_freeze(item, previous) for item, previous in zip(value, base)])
+    return FrozenList([_freeze(item, None) for item in value])
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable deep copy of ``value``, frozen or not.
+
+    Dicts, lists and tuples of plain data are copied directly; other values
+    go through ``copy.deepcopy``. This is the cheap replacement for
+    ``deepcopy`` on message bodies and meta.
+    """
+    try:
+        return _thaw(value)
+    except RecursionError:
+        return copy.deepcopy(value)
+
+
+def _thaw(value: Any) -> Any:
+    value_type = type(value)
+    if value_type in _IMMUTABLE_TYPES:
+        return value
+    if value_type is dict or value_type is FrozenDict or value_type is ThawingDict:
+        return {key: _thaw(item) for key, item in dict.items(value)}
+    if value_type is list or value_type is FrozenList:
+        return [_thaw(item) for item in value]
+    if value_type is tuple:
+        return tuple(_thaw(item) for item in value)
+    return copy.deepcopy(value)
+
+
+__all__ = ["FrozenDict", "FrozenList", "ThawingDict", "freeze", "thaw"]
@@ -6,7 +6,10 @@ from collections.abc import Callable, Iterable, Mapping, Sequence
 from dataclasses import dataclass
 from typing import Any, Union
 
+from .concurrency import AdaptiveConcurrency
 from .connectors.base import Sink, Source
+from .invoke import callback_arity
+from .ratelimit import RateLimit
 from .retry import NoRetry, RetryPolicy
 
 TaskHandler = Callable[["TaskContext", Any], Any]
@@ -14,6 +17,13 @@ TaskHook = Callable[..., Any]
 TaskPredicate = Callable[..., Any]
 TaskTransform = Callable[["TaskContext", Any, Any], Any]
 
+HANDLER_EXECUTORS = ("loop", "thread", "process")
+# ``parallel`` sends one delivery's emits to all selected sinks at once.
+EMIT_MODES = ("sequential", "parallel")
+# ``ordering_key="source"`` asks the source for its native ordering key
+# (e.g. the Kafka topic partition) instead of reading a meta path.
+SOURCE_ORDERING_KEY = "source"
+
 
 @dataclass(frozen=True)
 class TaskHooks:
@@ -27,6 +37,12 @@ class EmitBinding:
     sink: Sink
     transform: TaskTransform | None = None
     transform_ref: str | None = None
+    # Overrides the task's ``emit_timeout_s`` for this sink.
+    timeout_s: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.timeout_s is not None and self.timeout_s <= 0:
+            raise ValueError("timeout_s must be > 0")
 
 
 @dataclass(frozen=True)
@@ -90,6 +106,17 @@ class TaskSpec:
     concurrency: int
     retry: RetryPolicy
     timeout_s: float | None
+    batch: int | None = None
+    executor: str = "loop"
+    ordering_key: str | Callable[..., Any] | None = None
+    # With an adaptive policy ``concurrency`` is its upper bound; runners
+    # start lower and move the effective limit at runtime.
+    adaptive_concurrency: AdaptiveConcurrency | None = None
+    rate_limit: RateLimit | None = None
+    emit_mode: str = "sequential"
+    emit_timeout_s: float | None = None
+    # Deliveries each runner fetches ahead of free concurrency slots.
+    prefetch: int = 0
 
     @classmethod
     def build(
@@ -105,16 +132,61 @@ class TaskSpec:
         config: Mapping[str, Any] | None,
         metadata: Mapping[str, Any] | None,
         hooks: TaskHooks | None,
-        concurrency: int,
+        concurrency: int | AdaptiveConcurrency,
         retry: RetryPolicy | None,
         timeout_s: float | None,
+        batch: int | None = None,
+        executor: str = "loop",
+        ordering_key: str | Callable[..., Any] | None = None,
+        rate_limit: RateLimit | None = None,
+        emit_mode: str = "sequential",
+        emit_timeout_s: float | None = None,
+        prefetch: int = 0,
     ) -> "TaskSpec":
+        adaptive_concurrency = None
+        if isinstance(concurrency, AdaptiveConcurrency):
+            adaptive_concurrency = concurrency
+            concurrency = concurrency.max_concurrency
+        if isinstance(concurrency, bool) or not isinstance(concurrency, int):
+            raise TypeError("concurrency must be an integer or AdaptiveConcurrency")
         if concurrency < 1:
             raise ValueError("concurrency must be >= 1")
         if timeout_s is not None and timeout_s <= 0:
             raise ValueError("timeout_s must be > 0")
+        if batch is not None and (isinstance(batch, bool) or not isinstance(batch, int)):
+            raise TypeError("batch must be an integer")
+        if batch is not None and batch < 1:
+            raise ValueError("batch must be >= 1")
+        if executor not in HANDLER_EXECUTORS:
+            raise ValueError(f"executor must be one of {', '.join(HANDLER_EXECUTORS)}")
+        if executor != "loop" and (
+            inspect.iscoroutinefunction(handler) or inspect.isasyncgenfunction(handler)
+        ):
+            raise ValueError(f"executor={executor!r} requires a synchronous handler")
+        if ordering_key is not None:
+            if isinstance(ordering_key, str):
+                if not ordering_key.strip():
+                    raise ValueError("ordering_key must not be empty")
+            elif callable(ordering_key):
+                callback_arity(ordering_key)
+            else:
+                raise TypeError("ordering_key must be a meta path string or a callable")
+            if batch is not None:
+                raise ValueError("ordering_key cannot be combined with batch")
+        if rate_limit is not None and not isinstance(rate_limit, RateLimit):
+            raise TypeError("rate_limit must be a RateLimit")
+        if emit_mode not in EMIT_MODES:
+            raise ValueError(f"emit_mode must be one of {', '.join(EMIT_MODES)}")
+        if emit_timeout_s is not None and emit_timeout_s <= 0:
+            raise ValueError("emit_timeout_s must be > 0")
+        if isinstance(prefetch, bool) or not isinstance(prefetch, int):
+            raise TypeError("prefetch must be an integer")
+        if prefetch < 0:
+            raise ValueError("prefetch must be >= 0")
         resolved_emit_targets = _normalize_emit_targets(sinks)
         resolved_dead_letter_sinks = _normalize_sinks(dead_letter)
+        resolved_hooks = hooks or TaskHooks()
+        _precompile_callbacks(resolved_hooks, resolved_emit_targets)
         return cls(
             name=name,
             description=_normalize_description(description) or inspect.getdoc(handler),
@@ -130,10 +202,18 @@ class TaskSpec:
             dead_letter_sinks=resolved_dead_letter_sinks,
             config=copy.deepcopy(dict(config or {})),
             metadata=copy.deepcopy(dict(metadata or {})),
-            hooks=hooks or TaskHooks(),
+            hooks=resolved_hooks,
             concurrency=concurrency,
             retry=retry or NoRetry(),
             timeout_s=timeout_s,
+            batch=batch,
+            executor=executor,
+            ordering_key=ordering_key,
+            adaptive_concurrency=adaptive_concurrency,
+            rate_limit=rate_limit,
+            emit_mode=emit_mode,
+            emit_timeout_s=emit_timeout_s,
+            prefetch=prefetch,
         )
 
 
@@ -158,6 +238,22 @@ def _normalize_emit_targets(
     return tuple(resolved)
 
 
+def _precompile_callbacks(
+    hooks: TaskHooks,
+    targets: Iterable[EmitBinding | EmitRoute],
+) -> None:
+    # Resolve hook, predicate and transform signatures at registration so the
+    # per-delivery invoke_callback calls only hit the arity cache.
+    for hook in (*hooks.before, *hooks.after_success, *hooks.on_failure):
+        callback_arity(hook)
+    for target in targets:
+        if isinstance(target, EmitRoute) and target.predicate is not None:
+            callback_arity(target.predicate)
+    for binding in _flatten_emit_target_bindings(targets):
+        if binding.transform is not None:
+            callback_arity(binding.transform)
+
+
 def _normalize_route_bindings(
     sinks: tuple[Sink, ...],
     bindings: tuple[EmitBinding, ...],
@@ -300,6 +300,62 @@ def test_state_store_install_hints_stay_per_backend() -> None:
     )
 
 
+@pytest.mark.parametrize("backend", ("mysql", "postgres"))
+def test_table_queue_bulk_ack_and_retry_update_rows_in_one_statement(backend: str, tmp_path: Path) -> None:
+    """ack_many/retry_many settle a batch with one UPDATE, like the sqlite queue."""
+    connector = _backend_connector_cls(backend)(f"sqlite:///{tmp_path / 'bulk.db'}")
+
+    async def scenario() -> None:
+        async with connector.engine.begin() as conn:
+            await conn.execute(sa.text("CREATE TABLE jobs (id INTEGER PRIMARY KEY, status TEXT)"))
+            await conn.execute(
+                sa.text(
+                    "INSERT INTO jobs (id, status) VALUES "
+                    "(1, 'new'), (2, 'new'), (3, 'new'), (4, 'new'), (5, 'new')"
+                )
+            )
+        queue = connector.table_queue(
+            table="jobs",
+            key="id",
+            where="status='new'",
+            claim={"status": "claimed"},
+            ack={"status": "done"},
+            nack={"status": "new"},
+            batch_size=10,
+        )
+        deliveries = await queue.fetch(10)
+        assert queue.supports_bulk_ack is True
+        assert len(deliveries) == 5
+        updates: list[str] = []
+
+        def record_update(conn, cursor, statement, parameters, context, executemany) -> None:
+            if statement.lstrip().upper().startswith("UPDATE"):
+                updates.append(statement)
+
+        sa.event.listen(connector.engine.sync_engine, "before_cursor_execute", record_update)
+        try:
+            await queue.ack_many(deliveries[:3])
+            await queue.retry_many(deliveries[3:])
+            # An empty batch issues no statement at all.
+            await queue.ack_many([])
+        finally:
+            sa.event.remove(connector.engine.sync_engine, "before_cursor_execute", record_update)
+        async with connector.engine.begin() as conn:
+            rows = (await conn.execute(sa.text("SELECT id, status FROM jobs ORDER BY id"))).all()
+        assert [tuple(row) for row in rows] == [
+            (1, "done"),
+            (2, "done"),
+            (3, "done"),
+            (4, "new"),
+            (5, "new"),
+        ]
+        assert len(updates) == 2
+        assert all(" IN " in statement.upper() for statement in updates)
+        await connector.close()
+
+    asyncio.run(scenario())
+
+
 # ---------------------------------------------------------------------------
 # 3. Shared table-sink update policy behaves identically for both backends.
 # ---------------------------------------------------------------------------
@@ -148,6 +148,33 @@ def test_table_sink_insert_and_upsert(tmp_path: Path) -> None:
     asyncio.run(scenario())
 
 
+def test_table_sink_send_many_commits_batch_in_one_transaction(tmp_path: Path) -> None:
+    connector = sqlite_pkg.SQLiteConnector(f"sqlite:///{tmp_path / 'b.db'}")
+
+    async def scenario() -> None:
+        async with connector.engine.begin() as conn:
+            await conn.run_sync(
+                lambda s: s.execute(sa.text("CREATE TABLE jobs (id INTEGER PRIMARY KEY, status TEXT)"))
+            )
+        sink = connector.table_sink(table="jobs", mode="insert")
+        commits = 0
+
+        def count_commit(conn) -> None:
+            nonlocal commits
+            commits += 1
+
+        sa.event.listen(connector.engine.sync_engine, "commit", count_commit)
+        await sink.send_many([Envelope(body={"id": index, "status": "new"}) for index in range(5)])
+        sa.event.remove(connector.engine.sync_engine, "commit", count_commit)
+        async with connector.engine.begin() as conn:
+            count = (await conn.execute(sa.text("SELECT COUNT(*) FROM jobs"))).scalar_one()
+        assert count == 5
+        assert commits == 1
+        await connector.close()
+
+    asyncio.run(scenario())
+
+
 def test_table_queue_claims_without_for_update(tmp_path: Path) -> None:
     connector = sqlite_pkg.SQLiteConnector(f"sqlite:///{tmp_path / 'q.db'}")
 
@@ -180,6 +207,49 @@ def test_table_queue_claims_without_for_update(tmp_path: Path) -> None:
     asyncio.run(scenario())
 
 
+def test_table_queue_ack_many_settles_rows_in_one_statement(tmp_path: Path) -> None:
+    connector = sqlite_pkg.SQLiteConnector(f"sqlite:///{tmp_path / 'bulk.db'}")
+
+    async def scenario() -> None:
+        async with connector.engine.begin() as conn:
+            await conn.run_sync(
+                lambda s: s.execute(
+                    sa.text("CREATE TABLE jobs (id INTEGER PRIMARY KEY, status TEXT)")
+                )
+            )
+            await conn.execute(
+                sa.text("INSERT INTO jobs (id, status) VALUES (1, 'new'), (2, 'new'), (3, 'new')")
+            )
+        queue = connector.table_queue(
+            table="jobs",
+            key="id",
+            where="status='new'",
+            claim={"status": "claimed"},
+            ack={"status": "done"},
+            nack={"status": "new"},
+        )
+        deliveries = await queue.fetch(10)
+        assert queue.supports_bulk_ack is True
+        updates = 0
+
+        def count_update(conn, cursor, statement, parameters, context, executemany) -> None:
+            nonlocal updates
+            if statement.lstrip().upper().startswith("UPDATE"):
+                updates += 1
+
+        sa.event.listen(connector.engine.sync_engine, "before_cursor_execute", count_update)
+        await queue.ack_many(deliveries[:2])
+        await queue.retry_many(deliveries[2:])
+        sa.event.remove(connector.engine.sync_engine, "before_cursor_execute", count_update)
+        async with connector.engine.begin() as conn:
+            rows = (await conn.execute(sa.text("SELECT id, status FROM jobs ORDER BY id"))).all()
+        assert [tuple(row) for row in rows] == [(1, "done"), (2, "done"), (3, "new")]
+        assert updates == 2
+        await connector.close()
+
+    asyncio.run(scenario())
+
+
 def test_table_queue_delivers_post_claim_body(tmp_path: Path) -> None:
     """The returned envelope mirrors the post-claim row (status='claimed'), so the
     SQLite queue body matches the mysql/postgres contract (issue #4)."""
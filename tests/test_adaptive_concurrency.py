@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from onestep import AdaptiveConcurrency, ConnectorErrorKind, ConnectorOperation, ConnectorOperationError
+from onestep import MemoryQueue, OneStepApp, load_app_config
+
+
+def test_adaptive_limiters_grow_under_load_and_back_off_on_overload() -> None:
+    aimd = AdaptiveConcurrency(16, min_concurrency=2).new_limiter()
+    for _ in range(6):
+        aimd.on_sample(0.01, inflight=aimd.limit, overloaded=False)
+    assert aimd.limit == 8
+
+    # Idle runners do not grow the limit.
+    aimd.on_sample(0.01, inflight=1, overloaded=False)
+    assert aimd.limit == 8
+
+    aimd.on_sample(0.01, inflight=8, overloaded=True)
+    assert aimd.limit == 7
+    # Deliveries from the same window report the same overload once.
+    aimd.on_sample(0.01, inflight=7, overloaded=True)
+    assert aimd.limit == 7
+    for _ in range(7):
+        aimd.on_sample(0.01, inflight=7, overloaded=False)
+    assert aimd.limit == 7
+    for _ in range(50):
+        aimd.on_sample(0.01, inflight=2, overloaded=True)
+    assert aimd.limit >= 2
+
+    gradient = AdaptiveConcurrency(32, initial_concurrency=4, algorithm="gradient").new_limiter()
+    for _ in range(40):
+        gradient.on_sample(0.01, inflight=gradient.limit, overloaded=False)
+    grown = gradient.limit
+    assert grown > 4
+    for _ in range(40):
+        gradient.on_sample(0.2, inflight=gradient.limit, overloaded=False)
+    assert gradient.limit < grown
+
+    with pytest.raises(ValueError, match="initial_concurrency"):
+        AdaptiveConcurrency(4, min_concurrency=2, initial_concurrency=8)
+    with pytest.raises(ValueError, match="algorithm"):
+        AdaptiveConcurrency(4, algorithm="vegas")
+
+
+def test_adaptive_task_moves_its_limit_and_reports_it_in_control_snapshots() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming")
+        app = OneStepApp("adaptive")
+        active = 0
+        max_active = 0
+        handled = 0
+        throttled = True
+        limits: list[int] = []
+
+        @app.task(source=source, concurrency=AdaptiveConcurrency(8, min_concurrency=1))
+        async def handle(ctx, payload):
+            nonlocal active, max_active, handled, throttled
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.001)
+            active -= 1
+            handled += 1
+            limits.append(app.task_control_snapshot("handle")["concurrency_limit"])
+            if handled == 40 and throttled:
+                throttled = False
+                raise ConnectorOperationError(
+                    backend="test",
+                    operation=ConnectorOperation.SEND,
+                    kind=ConnectorErrorKind.THROTTLED,
+                )
+            if handled == 80:
+                ctx.app.request_shutdown()
+
+        assert app.task_control_snapshot("handle")["concurrency_limit"] == 1
+        for index in range(100):
+            await source.publish(index)
+        await asyncio.wait_for(app.serve(), timeout=5)
+
+        assert max_active <= 8
+        assert max(limits) == 8
+        peak = limits.index(8)
+        assert min(limits[peak:]) < 8
+        assert app.describe()["tasks"][0]["adaptive_concurrency"] == {
+            "algorithm": "aimd",
+            "min_concurrency": 1,
+            "max_concurrency": 8,
+            "initial_concurrency": 1,
+        }
+
+    asyncio.run(scenario())
+
+
+def test_yaml_concurrency_mapping_builds_adaptive_policy() -> None:
+    app = load_app_config(
+        {
+            "apiVersion": "onestep/v1alpha1",
+            "kind": "App",
+            "app": {"name": "adaptive-yaml"},
+            "resources": {
+                "incoming": {"type": "memory", "maxsize": 100},
+                "outgoing": {"type": "memory", "maxsize": 100},
+            },
+            "tasks": [
+                {
+                    "name": "forward",
+                    "source": "incoming",
+                    "emit": "outgoing",
+                    "concurrency": {"algorithm": "gradient", "min": 2, "max": 32, "tolerance": 1.5},
+                }
+            ],
+        },
+        strict=True,
+    )
+    task = app.tasks[0]
+    assert task.concurrency == 32
+    assert task.adaptive_concurrency is not None
+    assert task.adaptive_concurrency.algorithm == "gradient"
+    assert task.adaptive_concurrency.min_concurrency == 2
+    assert task.adaptive_concurrency.tolerance == 1.5
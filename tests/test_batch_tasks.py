@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from onestep import BatchTaskContext, MemoryQueue, NoRetry, OneStepApp
+
+
+def test_batch_task_calls_handler_once_per_batch_and_routes_results_per_item() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming", batch_size=10)
+        sink = MemoryQueue("processed")
+        app = OneStepApp("batched")
+        calls: list[list[int]] = []
+
+        @app.task(source=source, emit=sink, batch=4, concurrency=1)
+        async def double(ctx, payloads):
+            assert isinstance(ctx, BatchTaskContext)
+            assert len(ctx.envelopes) == len(payloads)
+            calls.append(list(payloads))
+            if sum(len(call) for call in calls) == 6:
+                ctx.app.request_shutdown()
+            return [payload * 2 for payload in payloads]
+
+        for index in range(6):
+            await source.publish(index)
+        await asyncio.wait_for(app.serve(), timeout=2)
+
+        assert calls == [[0, 1, 2, 3], [4, 5]]
+        emitted = await sink.fetch(10)
+        assert [delivery.payload for delivery in emitted] == [0, 2, 4, 6, 8, 10]
+
+    asyncio.run(scenario())
+
+
+def test_batch_task_fails_only_items_whose_result_is_an_exception() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming", batch_size=10)
+        app = OneStepApp("batched-partial")
+        seen: list[tuple[str, object]] = []
+
+        @app.task(source=source, batch=3, retry=NoRetry())
+        async def check(ctx, payloads):
+            ctx.app.request_shutdown()
+            return [ValueError("bad") if payload == "bad" else payload for payload in payloads]
+
+        @app.on_event
+        def record(event):
+            if event.kind.value in {"succeeded", "failed"}:
+                seen.append((event.kind.value, event.failure.exception_type if event.failure else None))
+
+        for payload in ("ok-1", "bad", "ok-2"):
+            await source.publish(payload)
+        await asyncio.wait_for(app.serve(), timeout=2)
+
+        assert sorted(seen, key=str) == [
+            ("failed", "ValueError"),
+            ("succeeded", None),
+            ("succeeded", None),
+        ]
+
+    asyncio.run(scenario())
+
+
+def test_batch_task_failure_applies_to_every_item_in_the_batch() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming", batch_size=10)
+        app = OneStepApp("batched-failure")
+        failed: list[int] = []
+
+        @app.task(source=source, batch=5, retry=NoRetry())
+        async def explode(ctx, payloads):
+            ctx.app.request_shutdown()
+            raise RuntimeError("boom")
+
+        @app.on_event
+        def record(event):
+            if event.kind.value == "failed":
+                failed.append(event.attempts)
+
+        for index in range(3):
+            await source.publish(index)
+        await asyncio.wait_for(app.serve(), timeout=2)
+
+        assert len(failed) == 3
+
+    asyncio.run(scenario())
+
+
+def test_batch_task_rejects_result_of_wrong_length() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming", batch_size=10)
+        app = OneStepApp("batched-mismatch")
+        failures: list[str] = []
+
+        @app.task(source=source, batch=2, retry=NoRetry())
+        async def short(ctx, payloads):
+            ctx.app.request_shutdown()
+            return [1]
+
+        @app.on_event
+        def record(event):
+            if event.kind.value == "failed":
+                failures.append(event.failure.exception_type)
+
+        await source.publish("a")
+        await source.publish("b")
+        await asyncio.wait_for(app.serve(), timeout=2)
+
+        assert failures == ["TypeError", "TypeError"]
+
+    asyncio.run(scenario())
+
+
+def test_batch_task_runs_manually_with_single_item_batch() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming")
+        app = OneStepApp("batched-once")
+        calls: list[list[dict]] = []
+
+        @app.task(source=source, batch=8)
+        async def collect(ctx, payloads):
+            calls.append(list(payloads))
+
+        result = await app.run_task_once("collect", payload={"id": 1})
+
+        assert result["completion"] == "complete"
+        assert calls == [[{"id": 1}]]
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("batch", [0, -1, True, "4"])
+def test_batch_task_rejects_invalid_batch_size(batch) -> None:
+    app = OneStepApp("batched-invalid")
+
+    with pytest.raises((TypeError, ValueError)):
+
+        @app.task(source=MemoryQueue("incoming"), batch=batch)
+        async def handler(ctx, payloads):
+            return None
@@ -0,0 +1,231 @@
+import asyncio
+
+import pytest
+
+from onestep import (
+    BatchingSink,
+    ConnectorBatchError,
+    ConnectorErrorKind,
+    ConnectorOperation,
+    ConnectorOperationError,
+    Envelope,
+    MemoryQueue,
+    OneStepApp,
+    Sink,
+)
+
+
+class _RecordingBulkSink(Sink):
+    def __init__(
+        self,
+        *,
+        fail_with: Exception | None = None,
+        poison: object = None,
+        atomic: bool = False,
+    ) -> None:
+        super().__init__("bulk")
+        self.send_many_is_atomic = atomic
+        self.batches: list[list[object]] = []
+        self.single_sends: list[object] = []
+        self.fail_with = fail_with
+        self.poison = poison
+        self.closed = False
+
+    async def send(self, envelope: Envelope) -> None:
+        if envelope.body == self.poison:
+            raise ValueError("poison payload")
+        self.single_sends.append(envelope.body)
+
+    async def send_many(self, envelopes) -> None:
+        bodies = [envelope.body for envelope in envelopes]
+        if self.poison in bodies:
+            raise ConnectorOperationError(
+                backend="bulk",
+                operation=ConnectorOperation.SEND,
+                kind=ConnectorErrorKind.PERMANENT,
+            )
+        if self.fail_with is not None:
+            raise self.fail_with
+        self.batches.append(bodies)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def test_batching_sink_coalesces_concurrent_sends_on_max_batch() -> None:
+    async def scenario() -> None:
+        inner = _RecordingBulkSink()
+        sink = BatchingSink(inner, max_batch=3, linger_ms=10_000)
+
+        await asyncio.wait_for(
+            asyncio.gather(*(sink.send(Envelope(body=index)) for index in range(6))),
+            timeout=1,
+        )
+
+        assert inner.batches == [[0, 1, 2], [3, 4, 5]]
+
+    asyncio.run(scenario())
+
+
+def test_batching_sink_flushes_partial_batch_after_linger() -> None:
+    async def scenario() -> None:
+        inner = _RecordingBulkSink()
+        sink = BatchingSink(inner, max_batch=100, linger_ms=5)
+
+        await asyncio.wait_for(
+            asyncio.gather(sink.send(Envelope(body="a")), sink.send(Envelope(body="b"))),
+            timeout=1,
+        )
+
+        assert inner.batches == [["a", "b"]]
+
+    asyncio.run(scenario())
+
+
+def test_batching_sink_splits_batches_on_max_bytes() -> None:
+    async def scenario() -> None:
+        inner = _RecordingBulkSink()
+        sink = BatchingSink(inner, max_batch=100, max_bytes=80, linger_ms=5)
+
+        await asyncio.wait_for(
+            asyncio.gather(*(sink.send(Envelope(body="x" * 20)) for _ in range(3))),
+            timeout=1,
+        )
+
+        assert [len(batch) for batch in inner.batches] == [1, 1, 1]
+
+    asyncio.run(scenario())
+
+
+def test_batching_sink_propagates_batch_failure_to_every_sender() -> None:
+    async def scenario() -> None:
+        failure = ConnectorOperationError(
+            backend="bulk",
+            operation=ConnectorOperation.SEND,
+            kind=ConnectorErrorKind.TRANSIENT,
+        )
+        inner = _RecordingBulkSink(fail_with=failure)
+        sink = BatchingSink(inner, max_batch=2, linger_ms=10_000)
+
+        results = await asyncio.gather(
+            sink.send(Envelope(body=1)),
+            sink.send(Envelope(body=2)),
+            return_exceptions=True,
+        )
+
+        assert results == [failure, failure]
+        assert inner.single_sends == []
+
+    asyncio.run(scenario())
+
+
+def test_batching_sink_isolates_permanent_failure_to_poison_envelope() -> None:
+    async def scenario() -> None:
+        inner = _RecordingBulkSink(poison="bad", atomic=True)
+        sink = BatchingSink(inner, max_batch=3, linger_ms=10_000)
+
+        results = await asyncio.gather(
+            sink.send(Envelope(body="ok-1")),
+            sink.send(Envelope(body="bad")),
+            sink.send(Envelope(body="ok-2")),
+            return_exceptions=True,
+        )
+
+        assert results[0] is None and results[2] is None
+        assert isinstance(results[1], ValueError)
+        assert inner.single_sends == ["ok-1", "ok-2"]
+
+    asyncio.run(scenario())
+
+
+def test_batching_sink_fails_non_atomic_batch_as_uncertain_without_replay() -> None:
+    async def scenario() -> None:
+        inner = _RecordingBulkSink(poison="bad")
+        sink = BatchingSink(inner, max_batch=3, linger_ms=10_000)
+
+        results = await asyncio.gather(
+            sink.send(Envelope(body="ok-1")),
+            sink.send(Envelope(body="bad")),
+            sink.send(Envelope(body="ok-2")),
+            return_exceptions=True,
+        )
+
+        for result in results:
+            assert isinstance(result, ConnectorOperationError)
+            assert result.kind is ConnectorErrorKind.UNCERTAIN
+            assert result.cause.kind is ConnectorErrorKind.PERMANENT
+        assert inner.single_sends == []
+
+    asyncio.run(scenario())
+
+
+def test_batching_sink_fails_only_entries_listed_in_batch_error() -> None:
+    class _PartialSink(_RecordingBulkSink):
+        async def send_many(self, envelopes) -> None:
+            bodies = [envelope.body for envelope in envelopes]
+            self.batches.append([body for body in bodies if body != "bad"])
+            rejected = ConnectorOperationError(
+                backend="bulk",
+                operation=ConnectorOperation.SEND,
+                kind=ConnectorErrorKind.PERMANENT,
+            )
+            raise ConnectorBatchError({bodies.index("bad"): rejected})
+
+    async def scenario() -> None:
+        inner = _PartialSink()
+        sink = BatchingSink(inner, max_batch=3, linger_ms=10_000)
+
+        results = await asyncio.gather(
+            sink.send(Envelope(body="ok-1")),
+            sink.send(Envelope(body="bad")),
+            sink.send(Envelope(body="ok-2")),
+            return_exceptions=True,
+        )
+
+        assert results[0] is None and results[2] is None
+        assert isinstance(results[1], ConnectorOperationError)
+        assert results[1].kind is ConnectorErrorKind.PERMANENT
+        assert inner.batches == [["ok-1", "ok-2"]]
+        assert inner.single_sends == []
+
+    asyncio.run(scenario())
+
+
+def test_batching_sink_acks_deliveries_only_after_flush_and_flushes_on_close() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming", batch_size=10)
+        inner = _RecordingBulkSink()
+        sink = BatchingSink(inner, max_batch=4, linger_ms=20)
+        app = OneStepApp("batched-sink")
+        handled = 0
+
+        @app.task(source=source, emit=sink, concurrency=4)
+        async def forward(ctx, payload):
+            nonlocal handled
+            handled += 1
+            if handled == 4:
+                ctx.app.request_shutdown()
+            return payload
+
+        for index in range(4):
+            await source.publish(index)
+        await asyncio.wait_for(app.serve(), timeout=2)
+
+        assert inner.batches == [[0, 1, 2, 3]]
+        assert inner.closed is True
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"max_batch": 0},
+        {"max_batch": True},
+        {"max_bytes": 0},
+        {"linger_ms": -1},
+    ],
+)
+def test_batching_sink_rejects_invalid_settings(options) -> None:
+    with pytest.raises((TypeError, ValueError)):
+        BatchingSink(_RecordingBulkSink(), **options)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+RUNNER = ROOT / "benchmarks" / "run.py"
+
+
+def test_benchmark_runner_writes_machine_readable_results(tmp_path: Path) -> None:
+    output = tmp_path / "results.json"
+    subprocess.run(
+        [sys.executable, str(RUNNER), "--suite", "pipeline", "--messages", "50", "--output", str(output)],
+        check=True,
+        capture_output=True,
+        timeout=120,
+    )
+
+    document = json.loads(output.read_text(encoding="utf-8"))
+    assert document["schema"] == "onestep-bench/1"
+    scenarios = {row["scenario"] for row in document["results"]}
+    assert {"baseline", "concurrency=8", "hooks=4", "routes=4", "event_handlers=4"} <= scenarios
+    for row in document["results"]:
+        assert row["messages"] == 50
+        assert row["msgs_per_s"] > 0
+        assert row["p50_ms"] is not None and row["p99_ms"] >= row["p50_ms"]
+
+
+def test_benchmark_runner_fails_on_throughput_regression(tmp_path: Path) -> None:
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(
+        json.dumps({"results": [{"suite": "pipeline", "scenario": "baseline", "msgs_per_s": 1e12}]}),
+        encoding="utf-8",
+    )
+    completed = subprocess.run(
+        [sys.executable, str(RUNNER), "--suite", "pipeline", "--messages", "20", "--compare", str(baseline)],
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+    assert completed.returncode == 1
+    assert "regression: pipeline baseline" in completed.stderr
@@ -0,0 +1,137 @@
+import asyncio
+
+from onestep import ConnectorBatchError, Delivery, Envelope, OneStepApp, RetryAction, RetryDecision, Source
+from onestep.runtime.acks import AckCoalescer
+
+
+class _BulkDelivery(Delivery):
+    def __init__(self, source: "_BulkSource", value: int) -> None:
+        super().__init__(Envelope(body=value))
+        self._source = source
+
+    async def ack(self) -> None:
+        self._source.calls.append(("ack", [self.payload]))
+
+    async def retry(self, *, delay_s: float | None = None) -> None:
+        self._source.calls.append(("retry", [self.payload]))
+
+    async def fail(self, exc: Exception | None = None) -> None:
+        self._source.calls.append(("fail", [self.payload]))
+
+
+class _BulkSource(Source):
+    supports_bulk_ack = True
+    ack_window_ms = 20.0
+
+    def __init__(self, values: list[int], *, ack_error: Exception | None = None) -> None:
+        super().__init__("bulk-source")
+        self.batch_size = len(values)
+        self.poll_interval_s = 0.01
+        self._values = list(values)
+        self.calls: list[tuple[str, list[int]]] = []
+        self.ack_error = ack_error
+
+    async def fetch(self, limit: int) -> list[Delivery]:
+        taken, self._values = self._values[:limit], self._values[limit:]
+        return [_BulkDelivery(self, value) for value in taken]
+
+    async def ack_many(self, deliveries) -> None:
+        if self.ack_error is not None:
+            raise self.ack_error
+        self.calls.append(("ack_many", sorted(delivery.payload for delivery in deliveries)))
+
+    async def retry_many(self, deliveries, *, delay_s=None) -> None:
+        self.calls.append(("retry_many", sorted(delivery.payload for delivery in deliveries)))
+
+
+def test_runtime_coalesces_concurrent_acks_into_one_bulk_call() -> None:
+    async def scenario() -> None:
+        source = _BulkSource([1, 2, 3, 4])
+        app = OneStepApp("bulk-ack")
+        handled = 0
+
+        @app.task(source=source, concurrency=4)
+        async def consume(ctx, payload):
+            nonlocal handled
+            handled += 1
+            if handled == 4:
+                ctx.app.request_shutdown()
+
+        await asyncio.wait_for(app.serve(), timeout=2)
+
+        assert source.calls == [("ack_many", [1, 2, 3, 4])]
+
+    asyncio.run(scenario())
+
+
+def test_runtime_groups_retries_separately_from_acks() -> None:
+    async def scenario() -> None:
+        source = _BulkSource([1, 2, 3])
+        app = OneStepApp("bulk-retry")
+        handled = 0
+
+        @app.task(source=source, concurrency=3, retry=_AlwaysRetry())
+        async def consume(ctx, payload):
+            nonlocal handled
+            handled += 1
+            if handled == 3:
+                ctx.app.request_shutdown()
+            if payload % 2:
+                raise RuntimeError("odd")
+
+        await asyncio.wait_for(app.serve(), timeout=2)
+
+        assert sorted(source.calls) == [("ack_many", [2]), ("retry_many", [1, 3])]
+
+    asyncio.run(scenario())
+
+
+def test_bulk_ack_failure_surfaces_on_every_delivery() -> None:
+    async def scenario() -> None:
+        source = _BulkSource([], ack_error=RuntimeError("xack failed"))
+        coalescer = AckCoalescer(source, window_ms=5)
+        deliveries = [_BulkDelivery(source, value) for value in (1, 2)]
+
+        results = await asyncio.gather(
+            *(coalescer.ack(delivery) for delivery in deliveries),
+            return_exceptions=True,
+        )
+
+        assert [str(result) for result in results] == ["xack failed", "xack failed"]
+
+    asyncio.run(scenario())
+
+
+def test_bulk_ack_batch_error_fails_only_the_listed_deliveries() -> None:
+    async def scenario() -> None:
+        rejected = RuntimeError("entry 1 rejected")
+        source = _BulkSource([], ack_error=ConnectorBatchError({1: rejected}))
+        coalescer = AckCoalescer(source, window_ms=5)
+        deliveries = [_BulkDelivery(source, value) for value in (1, 2, 3)]
+
+        results = await asyncio.gather(
+            *(coalescer.ack(delivery) for delivery in deliveries),
+            return_exceptions=True,
+        )
+
+        assert results == [None, rejected, None]
+
+    asyncio.run(scenario())
+
+
+def test_source_bulk_defaults_settle_each_delivery() -> None:
+    async def scenario() -> None:
+        source = _BulkSource([])
+        deliveries = [_BulkDelivery(source, value) for value in (1, 2)]
+
+        await Source.ack_many(source, deliveries)
+        await Source.retry_many(source, deliveries[:1], delay_s=1.0)
+
+        assert source.calls == [("ack", [1]), ("ack", [2]), ("retry", [1])]
+
+    asyncio.run(scenario())
+
+
+class _AlwaysRetry:
+    def on_error(self, envelope, exc, failure):
+        return RetryAction(RetryDecision.RETRY)
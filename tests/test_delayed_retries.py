@@ -0,0 +1,122 @@
+import asyncio
+import logging
+
+from onestep import MaxAttempts, MemoryQueue, OneStepApp
+from onestep.connectors.base import Delivery, Source
+from onestep.envelope import Envelope
+from onestep.runtime.delays import DelayedRetryScheduler
+
+
+class RecordingDelivery(Delivery):
+    def __init__(self, envelope: Envelope, retries: list[float | None]) -> None:
+        super().__init__(envelope)
+        self._retries = retries
+
+    async def ack(self) -> None:
+        return None
+
+    async def retry(self, *, delay_s: float | None = None) -> None:
+        self._retries.append(delay_s)
+
+    async def fail(self, exc: Exception | None = None) -> None:
+        return None
+
+
+class NativeDelaySource(Source):
+    native_retry_delay = True
+
+    def __init__(self) -> None:
+        super().__init__("native")
+        self.retries: list[float | None] = []
+        self._pending = [RecordingDelivery(Envelope(body={"id": 1}), self.retries)]
+
+    async def fetch(self, limit: int) -> list[Delivery]:
+        pending, self._pending = self._pending, []
+        return pending
+
+
+def test_delayed_retry_releases_the_concurrency_slot() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming")
+        app = OneStepApp("delayed-retry")
+        handled: list[tuple[str, int]] = []
+
+        @app.task(source=source, concurrency=1, retry=MaxAttempts(max_attempts=2, delay_s=0.2))
+        async def handle(ctx, payload):
+            handled.append((payload, ctx.delivery.envelope.attempts))
+            if payload == "flaky" and ctx.delivery.envelope.attempts == 0:
+                raise RuntimeError("try later")
+            if len(handled) == 3:
+                ctx.app.request_shutdown()
+
+        await source.publish("flaky")
+        await source.publish("healthy")
+
+        await asyncio.wait_for(app.serve(), timeout=2)
+
+        assert handled == [("flaky", 0), ("healthy", 0), ("flaky", 1)]
+
+    asyncio.run(scenario())
+
+
+def test_pending_delayed_retries_are_returned_to_the_source_on_shutdown() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming")
+        app = OneStepApp("delayed-retry-shutdown")
+
+        @app.task(source=source, retry=MaxAttempts(max_attempts=2, delay_s=60))
+        async def handle(ctx, payload):
+            ctx.app.request_shutdown()
+            raise RuntimeError("try later")
+
+        await source.publish("job")
+
+        await asyncio.wait_for(app.serve(), timeout=2)
+
+        redelivered = await source.fetch(1)
+        assert [delivery.envelope.body for delivery in redelivered] == ["job"]
+        assert redelivered[0].envelope.attempts == 1
+
+    asyncio.run(scenario())
+
+
+def test_sources_with_native_retry_delay_receive_the_delay() -> None:
+    async def scenario() -> None:
+        source = NativeDelaySource()
+        app = OneStepApp("native-delay")
+
+        @app.task(source=source, retry=MaxAttempts(max_attempts=2, delay_s=30))
+        async def handle(ctx, payload):
+            ctx.app.request_shutdown()
+            raise RuntimeError("try later")
+
+        await asyncio.wait_for(app.serve(), timeout=2)
+
+        assert source.retries == [30]
+
+    asyncio.run(scenario())
+
+
+def test_scheduler_settles_deliveries_in_ready_order() -> None:
+    async def scenario() -> None:
+        settled: list[str] = []
+
+        async def settle(delivery: Delivery) -> None:
+            settled.append(delivery.envelope.body)
+
+        scheduler = DelayedRetryScheduler(settle, logger=logging.getLogger("test"))
+        retries: list[float | None] = []
+        scheduler.schedule(RecordingDelivery(Envelope(body="late"), retries), 0.05)
+        scheduler.schedule(RecordingDelivery(Envelope(body="early"), retries), 0.01)
+        scheduler.schedule(RecordingDelivery(Envelope(body="never"), retries), 60)
+        assert scheduler.pending_count == 3
+
+        await asyncio.sleep(0.1)
+        assert settled == ["early", "late"]
+        assert scheduler.pending_count == 1
+
+        await scheduler.flush()
+        assert settled == ["early", "late", "never"]
+        assert scheduler.pending_count == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,110 @@
+import asyncio
+import time
+
+import pytest
+
+from onestep import Envelope, MemoryQueue, OneStepApp, TaskEventKind
+from onestep.task import EmitBinding
+
+
+class SlowSink(MemoryQueue):
+    def __init__(self, name: str, delay_s: float, *, error: Exception | None = None) -> None:
+        super().__init__(name)
+        self.delay_s = delay_s
+        self.error = error
+
+    async def send(self, envelope: Envelope) -> None:
+        await asyncio.sleep(self.delay_s)
+        if self.error is not None:
+            raise self.error
+        await super().send(envelope)
+
+
+@pytest.mark.parametrize(("emit_mode", "fast"), [("sequential", False), ("parallel", True)])
+def test_parallel_emit_pays_the_slowest_sink_instead_of_the_sum(emit_mode: str, fast: bool) -> None:
+    async def scenario() -> float:
+        source = MemoryQueue("incoming")
+        sinks = [SlowSink(f"out-{index}", 0.05) for index in range(3)]
+        app = OneStepApp("fanout")
+        durations: list[float] = []
+
+        @app.on_event
+        def record(event) -> None:
+            if event.kind is TaskEventKind.SUCCEEDED:
+                durations.append(event.duration_s)
+                app.request_shutdown()
+
+        @app.task(source=source, emit=sinks, emit_mode=emit_mode)
+        async def forward(ctx, payload):
+            return payload
+
+        await source.publish({"id": 1})
+        await asyncio.wait_for(app.serve(), timeout=2)
+        assert [sink.size() for sink in sinks] == [1, 1, 1]
+        return durations[0]
+
+    duration = asyncio.run(scenario())
+    if fast:
+        assert duration < 0.12
+    else:
+        assert duration >= 0.15
+
+
+def test_parallel_emit_runs_every_sink_and_fails_with_the_first_error() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming")
+        broken = SlowSink("broken", 0.01, error=RuntimeError("backend rejected"))
+        stuck = SlowSink("stuck", 5.0)
+        healthy = SlowSink("healthy", 0.02)
+        dead_letter = MemoryQueue("dead")
+        app = OneStepApp("fanout-failure")
+
+        @app.task(
+            source=source,
+            emit=[
+                EmitBinding(sink=stuck, timeout_s=0.05),
+                broken,
+                healthy,
+            ],
+            dead_letter=dead_letter,
+            emit_mode="parallel",
+        )
+        async def forward(ctx, payload):
+            ctx.app.request_shutdown()
+            return payload
+
+        await source.publish({"id": 1})
+        started = time.monotonic()
+        await asyncio.wait_for(app.serve(), timeout=2)
+
+        assert time.monotonic() - started < 1.0
+        # The healthy sink still received the envelope; nothing is rolled back.
+        assert healthy.size() == 1
+        [dead] = await dead_letter.fetch(1)
+        # The first failure in emit order wins: the stuck sink's timeout.
+        assert dead.payload["failure"]["kind"] == "timeout"
+        assert "sink stuck" in dead.payload["failure"]["message"]
+
+    asyncio.run(scenario())
+
+
+def test_context_emit_fans_out_in_parallel_mode() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming")
+        sinks = [SlowSink(f"out-{index}", 0.05) for index in range(3)]
+        app = OneStepApp("fanout-ctx")
+        elapsed: list[float] = []
+
+        @app.task(source=source, emit=sinks, emit_mode="parallel")
+        async def forward(ctx, payload):
+            started = time.monotonic()
+            await ctx.emit({"copy": payload["id"]})
+            elapsed.append(time.monotonic() - started)
+            ctx.app.request_shutdown()
+
+        await source.publish({"id": 1})
+        await asyncio.wait_for(app.serve(), timeout=2)
+        assert elapsed[0] < 0.12
+        assert [sink.size() for sink in sinks] == [1, 1, 1]
+
+    asyncio.run(scenario())
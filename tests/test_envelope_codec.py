@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from onestep import Envelope
+from onestep.connectors.codec import (
+    EnvelopeCodec,
+    decode_envelope,
+    encode_envelope,
+    envelope_format,
+    register_codec,
+)
+
+
+def test_envelope_formats_round_trip_and_tag_framed_messages() -> None:
+    envelope = Envelope(body={"rows": [{"id": index, "name": "x" * 20} for index in range(50)]}, meta={"k": 1}, attempts=2)
+
+    plain = envelope_format()
+    assert encode_envelope(envelope, plain) == encode_envelope(envelope)
+    assert json.loads(plain.encode(envelope))["attempts"] == 2
+    assert plain.content_type == "application/json"
+
+    compressed = envelope_format("json", "zlib")
+    framed = compressed.encode(envelope)
+    assert framed.startswith(b"\x00os1")
+    assert len(framed) < len(plain.encode(envelope)) / 4
+    assert compressed.content_type == "application/x-onestep-envelope; codec=json+zlib"
+
+    # One consumer decodes every producer, binary or text-framed.
+    for raw in (plain.encode(envelope), framed, compressed.encode_text(envelope), plain.encode_text(envelope)):
+        assert decode_envelope(raw) == envelope
+
+
+def test_custom_codecs_register_and_undecodable_frames_fall_back_to_raw_bodies() -> None:
+    register_codec(
+        EnvelopeCodec(
+            "reversed-json",
+            content_type="application/x-reversed-json",
+            dumps=lambda payload: json.dumps(payload).encode("utf-8")[::-1],
+            loads=lambda raw: json.loads(raw[::-1]),
+        )
+    )
+    fmt = envelope_format("reversed-json")
+    assert decode_envelope(fmt.encode(Envelope(body=[1, 2]))) == Envelope(body=[1, 2])
+
+    unknown = b"\x00os1\x07missing" + b"{}"
+    assert decode_envelope(unknown) == Envelope(body=unknown)
+    with pytest.raises(ValueError, match="unknown envelope codec"):
+        envelope_format("missing")
+    with pytest.raises(ValueError, match="unknown envelope compression"):
+        envelope_format("json", "brotli")
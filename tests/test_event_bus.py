@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+from onestep import InMemoryMetrics, MemoryQueue, OneStepApp, TaskEvent, TaskEventKind
+from onestep.events import EventBus
+
+
+def _event(index: int) -> TaskEvent:
+    return TaskEvent(
+        kind=TaskEventKind.SUCCEEDED,
+        app="bus",
+        task="task",
+        source=None,
+        attempts=0,
+        meta={"index": index},
+    )
+
+
+def test_event_bus_keeps_slow_handlers_off_the_delivery_path() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming")
+        app = OneStepApp("event-bus")
+        app.enable_event_bus(maxsize=1000)
+        metrics = InMemoryMetrics()
+        handled: list[int] = []
+        finished_at: list[float] = []
+
+        @app.on_event
+        async def slow(event: TaskEvent) -> None:
+            await asyncio.sleep(0.01)
+
+        app.on_event(metrics)
+
+        @app.task(source=source, concurrency=4)
+        async def handle(ctx, payload):
+            handled.append(payload)
+            if len(handled) == 20:
+                finished_at.append(time.perf_counter())
+                ctx.app.request_shutdown()
+
+        for index in range(20):
+            await source.publish(index)
+
+        started = time.perf_counter()
+        await asyncio.wait_for(app.serve(), timeout=5)
+
+        # Inline dispatch would spend 60 x 10 ms in the slow handler before
+        # the last delivery finished; the bus drains it at shutdown instead.
+        assert sorted(handled) == list(range(20))
+        assert finished_at[0] - started < 0.4
+        assert metrics.count(TaskEventKind.SUCCEEDED) == 20
+        stats = {lane["handler"]: lane for lane in app.event_bus.stats()}
+        slow_stats = stats[slow.__qualname__]
+        assert slow_stats["delivered"] == 60
+        assert slow_stats["dropped"] == 0
+        assert slow_stats["max_lag_s"] > 0
+        assert app.describe()["event_bus"]["policy"] == "drop_oldest"
+
+    asyncio.run(scenario())
+
+
+def test_event_bus_drop_policies_count_dropped_events() -> None:
+    async def scenario() -> None:
+        for policy, expected in (("drop_oldest", [2, 3]), ("drop_newest", [0, 1])):
+            bus = EventBus().enable(maxsize=2, policy=policy)
+            await bus.start()
+            seen: list[int] = []
+            release = asyncio.Event()
+
+            async def handler(event: TaskEvent) -> None:
+                await release.wait()
+                seen.append(event.meta["index"])
+
+            # The worker has not run yet, so the first two events fill the queue.
+            for index in range(4):
+                await bus.publish(_event(index), [handler])
+            release.set()
+            await bus.stop()
+
+            assert seen == expected
+            [stats] = bus.stats()
+            assert stats["dropped"] == 2
+            assert stats["delivered"] == 2
+
+    asyncio.run(scenario())
+
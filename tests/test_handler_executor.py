@@ -0,0 +1,112 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from onestep import MemoryQueue, NoRetry, OneStepApp
+
+
+def _square_in_worker(ctx, payload):
+    return {"value": payload * payload, "ctx": ctx, "pid": os.getpid()}
+
+
+def test_thread_executor_keeps_event_loop_responsive() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming")
+        sink = MemoryQueue("processed")
+        app = OneStepApp("threaded")
+        ticks = 0
+        handler_threads: list[str] = []
+
+        @app.task(source=source, emit=sink, executor="thread")
+        def blocking(ctx, payload):
+            handler_threads.append(threading.current_thread().name)
+            time.sleep(0.2)
+            ctx.app.request_shutdown()
+            return payload
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        await source.publish("job")
+        ticking = asyncio.create_task(ticker())
+        try:
+            await asyncio.wait_for(app.serve(), timeout=2)
+        finally:
+            ticking.cancel()
+
+        assert ticks >= 5
+        assert handler_threads and handler_threads[0].startswith("onestep-blocking")
+        assert [delivery.payload for delivery in await sink.fetch(1)] == ["job"]
+
+    asyncio.run(scenario())
+
+
+def test_thread_executor_respects_timeout() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming")
+        app = OneStepApp("threaded-timeout")
+        failures: list[str] = []
+
+        @app.task(source=source, executor="thread", timeout_s=0.05, retry=NoRetry())
+        def slow(ctx, payload):
+            time.sleep(0.3)
+
+        @app.on_event
+        def record(event):
+            if event.kind.value == "failed":
+                failures.append(event.failure.exception_type)
+                app.request_shutdown()
+
+        await source.publish("job")
+        await asyncio.wait_for(app.serve(), timeout=2)
+
+        assert failures == ["TimeoutError"]
+
+    asyncio.run(scenario())
+
+
+def test_process_executor_pickles_payload_and_result() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming")
+        sink = MemoryQueue("processed")
+        app = OneStepApp("processes")
+        app.task(source=source, emit=sink, executor="process")(_square_in_worker)
+
+        await source.publish(7)
+        serving = asyncio.create_task(app.serve())
+        emitted = []
+        for _ in range(200):
+            emitted = await sink.fetch(1)
+            if emitted:
+                break
+            await asyncio.sleep(0.01)
+        app.request_shutdown()
+        await asyncio.wait_for(serving, timeout=5)
+
+        assert emitted[0].payload["value"] == 49
+        assert emitted[0].payload["ctx"] is None
+        assert emitted[0].payload["pid"] != os.getpid()
+
+    asyncio.run(scenario())
+
+
+def test_offloaded_executor_rejects_async_handler_and_unknown_mode() -> None:
+    app = OneStepApp("invalid-executor")
+
+    with pytest.raises(ValueError, match="synchronous"):
+
+        @app.task(source=MemoryQueue("a"), executor="thread")
+        async def async_handler(ctx, payload):
+            return payload
+
+    with pytest.raises(ValueError, match="executor must be one of"):
+
+        @app.task(source=MemoryQueue("b"), executor="fiber")
+        def handler(ctx, payload):
+            return payload
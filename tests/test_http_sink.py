@@ -9,6 +9,7 @@ import pytest
 from onestep import Envelope, HttpSink, MemoryQueue, OneStepApp
 from onestep.config import load_app_config
 from onestep.connectors.http import HttpSinkStatusError
+from onestep.connectors.http_pool import acquire_pool, release_pool
 from onestep.resilience import ConnectorErrorKind, ConnectorOperationError
 
 
@@ -382,3 +383,282 @@ def test_strict_yaml_rejects_unknown_http_sink_fields() -> None:
             },
             strict=True,
         )
+
+
+async def _start_keepalive_server(
+    *,
+    chunked: bool = False,
+    close_after: int | None = None,
+    drop_request: int | None = None,
+) -> tuple[asyncio.AbstractServer, list[dict[str, Any]], list[int], str]:
+    requests: list[dict[str, Any]] = []
+    connections: list[int] = []
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connections.append(len(connections))
+        served = 0
+        try:
+            while close_after is None or served < close_after:
+                try:
+                    request = await _read_request(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                requests.append(request)
+                served += 1
+                if len(requests) == drop_request:
+                    # Read the request, then hang up without answering.
+                    break
+                if chunked:
+                    writer.write(
+                        b"HTTP/1.1 202 Accepted\r\nTransfer-Encoding: chunked\r\n\r\n"
+                        b"2\r\nok\r\n0\r\n\r\n"
+                    )
+                else:
+                    writer.write(b"HTTP/1.1 202 Accepted\r\nContent-Length: 2\r\n\r\nok")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    assert server.sockets is not None
+    host, port = server.sockets[0].getsockname()[:2]
+    return server, requests, connections, f"http://{host}:{port}"
+
+
+def test_http_sink_reuses_keepalive_connections_across_sinks() -> None:
+    async def scenario() -> None:
+        server, requests, connections, base_url = await _start_keepalive_server(chunked=True)
+        try:
+            first = HttpSink("first", url=f"{base_url}/a", timeout_s=1.0)
+            second = HttpSink("second", url=f"{base_url}/b", timeout_s=1.0, max_connections=4)
+            for index in range(3):
+                await first.send(Envelope(body={"id": index}))
+                await second.send(Envelope(body={"id": index}))
+
+            [stats] = first.pool_stats()
+            assert second.pool_stats() == [stats]
+            assert stats["origin"] == base_url
+            assert stats["max_connections"] == 10
+            assert stats["connects"] == 1
+            assert stats["reuses"] == 5
+            assert stats["requests"] == 6
+            assert stats["idle"] == 1
+            assert stats["in_use"] == 0
+
+            await first.close()
+            await second.close()
+            assert first.pool_stats() == []
+        finally:
+            await _close_server(server)
+
+        assert len(connections) == 1
+        assert [request["target"] for request in requests] == ["/a", "/b"] * 3
+        assert requests[0]["headers"]["host"] == base_url.removeprefix("http://")
+
+    asyncio.run(scenario())
+
+
+def test_http_sink_retries_once_when_an_idle_connection_was_dropped() -> None:
+    async def scenario() -> None:
+        server, requests, connections, base_url = await _start_keepalive_server(close_after=1)
+        try:
+            sink = HttpSink("notify", url=f"{base_url}/events", timeout_s=1.0)
+            await sink.send(Envelope(body={"id": 1}))
+            await asyncio.sleep(0.05)
+            await sink.send(Envelope(body={"id": 2}))
+            [stats] = sink.pool_stats()
+            await sink.close()
+        finally:
+            await _close_server(server)
+
+        assert len(requests) == 2
+        assert len(connections) == 2
+        assert stats["connects"] == 2
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize(("method", "resent"), [("POST", False), ("PUT", True)])
+def test_http_sink_resends_after_a_dropped_reused_connection_only_when_idempotent(
+    method: str,
+    resent: bool,
+) -> None:
+    async def scenario() -> None:
+        server, requests, connections, base_url = await _start_keepalive_server(drop_request=2)
+        try:
+            sink = HttpSink("notify", url=f"{base_url}/events", method=method, timeout_s=1.0)
+            await sink.send(Envelope(body={"id": 1}))
+            if resent:
+                await sink.send(Envelope(body={"id": 2}))
+            else:
+                with pytest.raises(ConnectorOperationError) as exc_info:
+                    await sink.send(Envelope(body={"id": 2}))
+                assert exc_info.value.kind is ConnectorErrorKind.DISCONNECTED
+            [stats] = sink.pool_stats()
+            await sink.close()
+        finally:
+            await _close_server(server)
+
+        bodies = [json.loads(request["body"]) for request in requests]
+        assert bodies == ([{"id": 1}, {"id": 2}, {"id": 2}] if resent else [{"id": 1}, {"id": 2}])
+        assert stats["stale_retries"] == (1 if resent else 0)
+
+    asyncio.run(scenario())
+
+
+async def _start_redirect_server(
+    routes: dict[str, tuple[int, str | None]],
+) -> tuple[asyncio.AbstractServer, list[dict[str, Any]], str]:
+    requests: list[dict[str, Any]] = []
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                requests.append(request)
+                status, location = routes.get(request["target"].split("?")[0], (202, None))
+                extra = f"Location: {location}\r\n" if location else ""
+                writer.write(f"HTTP/1.1 {status} Status\r\n{extra}Content-Length: 0\r\n\r\n".encode("ascii"))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    assert server.sockets is not None
+    host, port = server.sockets[0].getsockname()[:2]
+    return server, requests, f"http://{host}:{port}"
+
+
+def test_http_sink_follows_redirects_like_urllib() -> None:
+    async def scenario() -> None:
+        server, requests, base_url = await _start_redirect_server(
+            {
+                "/moved": (301, "/step"),
+                "/step": (308, "/final"),
+                "/kept": (307, "/final"),
+            }
+        )
+        try:
+            post = HttpSink("post", url=f"{base_url}/moved", timeout_s=1.0)
+            get = HttpSink("get", url=f"{base_url}/moved", method="GET", timeout_s=1.0)
+            kept = HttpSink("kept", url=f"{base_url}/kept", timeout_s=1.0)
+            await post.send(Envelope(body={"id": 1}))
+            await get.send(Envelope(body={"id": 2}))
+            with pytest.raises(ConnectorOperationError, match="HTTP 307"):
+                await kept.send(Envelope(body={"id": 3}))
+            for sink in (post, get, kept):
+                await sink.close()
+        finally:
+            await _close_server(server)
+
+        seen = [(request["method"], request["target"].split("?")[0], request["body"]) for request in requests]
+        assert seen == [
+            # A POST answered with 301 is re-sent as a bodyless GET.
+            ("POST", "/moved", b'{"id": 1}'),
+            ("GET", "/step", b""),
+            ("GET", "/final", b""),
+            ("GET", "/moved", b""),
+            ("GET", "/step", b""),
+            ("GET", "/final", b""),
+            # A POST answered with 307 must not change method: not followed.
+            ("POST", "/kept", b'{"id": 3}'),
+        ]
+        assert "content-type" not in requests[1]["headers"]
+
+    asyncio.run(scenario())
+
+
+def test_http_sink_limits_connections_per_origin() -> None:
+    async def scenario() -> None:
+        server, requests, connections, base_url = await _start_keepalive_server()
+        try:
+            sink = HttpSink("notify", url=f"{base_url}/events", timeout_s=1.0, max_connections=2)
+            await asyncio.gather(*(sink.send(Envelope(body={"id": index})) for index in range(8)))
+            [stats] = sink.pool_stats()
+            await sink.close()
+        finally:
+            await _close_server(server)
+
+        assert len(requests) == 8
+        assert len(connections) <= 2
+        assert stats["connects"] <= 2
+        assert stats["idle"] == stats["connects"]
+
+    asyncio.run(scenario())
+
+
+def test_http_sink_skips_interim_responses_and_sends_a_user_agent() -> None:
+    async def scenario() -> None:
+        requests: list[dict[str, Any]] = []
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            try:
+                while True:
+                    try:
+                        requests.append(await _read_request(reader))
+                    except asyncio.IncompleteReadError:
+                        break
+                    writer.write(
+                        b"HTTP/1.1 100 Continue\r\n\r\n"
+                        b"HTTP/1.1 103 Early Hints\r\nLink: </style.css>; rel=preload\r\n\r\n"
+                        b"HTTP/1.1 202 Accepted\r\nContent-Length: 2\r\n\r\nok"
+                    )
+                    await writer.drain()
+            finally:
+                writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+        try:
+            sink = HttpSink("notify", url=f"http://{host}:{port}/events", timeout_s=1.0)
+            await sink.send(Envelope(body={"id": 1}))
+            await sink.send(Envelope(body={"id": 2}))
+            [stats] = sink.pool_stats()
+            await sink.close()
+        finally:
+            await _close_server(server)
+
+        # The interim responses were consumed, so the connection stayed in sync.
+        assert stats["connects"] == 1 and stats["reuses"] == 1
+        assert len(requests) == 2
+        assert requests[0]["headers"]["user-agent"].startswith("Python-urllib/")
+
+    asyncio.run(scenario())
+
+
+def test_http_pools_left_by_a_previous_event_loop_are_shut_down() -> None:
+    state: dict[str, Any] = {}
+
+    async def first_loop() -> None:
+        server, _, _, base_url = await _start_keepalive_server()
+        sink = HttpSink("notify", url=f"{base_url}/events", timeout_s=1.0)
+        await sink.send(Envelope(body={"id": 1}))
+        [pool] = sink._pools.values()
+        state["pool"] = pool
+        state["origin"] = pool.origin
+        # Keep a duplicate of the pooled socket to observe it after the loop ends.
+        state["socket"] = pool._idle[0].writer.get_extra_info("socket").dup()
+        server.close()
+
+    async def second_loop() -> None:
+        pool = acquire_pool(state["origin"])
+        try:
+            assert pool is not state["pool"]
+        finally:
+            await release_pool(pool)
+
+    asyncio.run(first_loop())
+    asyncio.run(second_loop())
+
+    stale = state["pool"]
+    duplicate = state["socket"]
+    try:
+        assert stale.closed
+        assert stale.stats()["idle"] == 0
+        with pytest.raises(OSError):
+            duplicate.send(b"GET / HTTP/1.1\r\n\r\n")
+    finally:
+        duplicate.close()
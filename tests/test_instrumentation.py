@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+import pytest
+
+from onestep import MemoryQueue, OneStepApp
+from onestep.instrumentation import LatencyHistogram
+
+
+def _spin_cpu(duration_s):
+    deadline = time.perf_counter() + duration_s
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_instrumentation_records_stage_latency_histograms() -> None:
+    async def scenario() -> dict:
+        source = MemoryQueue("incoming")
+        sink = MemoryQueue("processed")
+        app = OneStepApp("instrumented")
+        app.enable_instrumentation(loop_lag_interval_s=0.01)
+        handled = 0
+
+        @app.task(source=source, emit=sink, concurrency=2)
+        async def slow(ctx, payload):
+            nonlocal handled
+            await asyncio.sleep(0.02)
+            handled += 1
+            if handled == 3:
+                ctx.app.request_shutdown()
+            return payload
+
+        for index in range(3):
+            await source.publish(index)
+        await asyncio.wait_for(app.serve(), timeout=2)
+        return app.describe()["instrumentation"]
+
+    instrumentation = asyncio.run(scenario())
+
+    stages = instrumentation["tasks"]["slow"]["stages"]
+    assert {"before_hook", "handler", "after_success_hook", "route", "transform", "sink", "ack"} <= set(stages)
+    assert stages["handler"]["count"] == 3
+    assert stages["handler"]["p50_ms"] >= 10
+    assert stages["ack"]["max_ms"] < stages["handler"]["p50_ms"]
+    assert sum(bucket["count"] for bucket in stages["handler"]["buckets"]) == 3
+    assert instrumentation["loop_lag"]["count"] >= 1
+
+
+def test_loop_lag_sampler_detects_a_blocked_loop() -> None:
+    async def scenario() -> dict:
+        source = MemoryQueue("incoming")
+        app = OneStepApp("starved")
+        app.enable_instrumentation(loop_lag_interval_s=0.005)
+
+        @app.task(source=source)
+        async def blocking(ctx, payload):
+            await asyncio.sleep(0.02)
+            time.sleep(0.1)
+            await asyncio.sleep(0.02)
+            ctx.app.request_shutdown()
+
+        await source.publish("job")
+        await asyncio.wait_for(app.serve(), timeout=2)
+        return app.describe()["instrumentation"]["loop_lag"]
+
+    loop_lag = asyncio.run(scenario())
+
+    assert loop_lag["max_ms"] >= 50
+
+
+def test_sampling_profiler_attributes_handler_frames_to_the_task() -> None:
+    async def scenario() -> dict:
+        source = MemoryQueue("incoming")
+        app = OneStepApp("profiled")
+        app.enable_instrumentation(profile_interval_s=0.001)
+
+        @app.task(source=source, executor="thread")
+        def crunch(ctx, payload):
+            _spin_cpu(0.2)
+            ctx.app.request_shutdown()
+
+        await source.publish("job")
+        await asyncio.wait_for(app.serve(), timeout=2)
+        return app.describe()["instrumentation"]["tasks"]["crunch"]["profile"]
+
+    profile = asyncio.run(scenario())
+
+    assert profile["samples"] > 0
+    assert profile["top"][0]["stack"].startswith("crunch (")
+    assert "_spin_cpu" in profile["top"][0]["stack"]
+
+
+def test_instrumentation_is_off_by_default_and_validates_intervals() -> None:
+    app = OneStepApp("plain")
+
+    assert app.describe()["instrumentation"] is None
+    with pytest.raises(ValueError, match="loop_lag_interval_s"):
+        app.enable_instrumentation(loop_lag_interval_s=0)
+    with pytest.raises(ValueError, match="profile_interval_s"):
+        app.enable_instrumentation(profile_interval_s=-1)
+
+
+def test_latency_histogram_quantiles_resolve_to_bucket_bounds() -> None:
+    histogram = LatencyHistogram()
+    for value in (0.2, 0.3, 4.0, 40.0, 12_000.0):
+        histogram.observe(value)
+
+    snapshot = histogram.as_dict()
+    assert snapshot["p50_ms"] == 5.0
+    assert snapshot["p99_ms"] == 12_000.0
+    assert snapshot["max_ms"] == 12_000.0
+    assert snapshot["buckets"][-1] == {"le_ms": None, "count": 1}
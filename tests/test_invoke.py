@@ -0,0 +1,90 @@
+import inspect
+
+from onestep import MemoryQueue, OneStepApp
+from onestep.invoke import callback_arity, invoke_callback
+from onestep.task import TaskHooks
+
+
+def test_invoke_callback_forwards_only_accepted_positional_args() -> None:
+    def none():
+        return ()
+
+    def two(a, b):
+        return (a, b)
+
+    def variadic(*args):
+        return args
+
+    assert invoke_callback(none, 1, 2, 3) == ()
+    assert invoke_callback(two, 1, 2, 3) == (1, 2)
+    assert invoke_callback(variadic, 1, 2, 3) == (1, 2, 3)
+
+
+def test_callback_signature_is_resolved_once(monkeypatch) -> None:
+    calls = 0
+    original = inspect.signature
+
+    def counting_signature(callback, *args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return original(callback, *args, **kwargs)
+
+    def hook(ctx, payload):
+        return payload
+
+    monkeypatch.setattr(inspect, "signature", counting_signature)
+    for _ in range(5):
+        assert invoke_callback(hook, None, "payload", "extra") == "payload"
+
+    assert calls == 1
+
+
+def test_bound_methods_share_cached_arity_per_function(monkeypatch) -> None:
+    class Handler:
+        def __call__(self, event):
+            return event
+
+        def on_event(self, event):
+            return event
+
+    handler = Handler()
+    assert invoke_callback(handler.on_event, "event", "extra") == "event"
+
+    monkeypatch.setattr(inspect, "signature", _fail_signature)
+    assert invoke_callback(Handler().on_event, "event", "extra") == "event"
+    assert invoke_callback(handler.on_event, "event") == "event"
+
+
+def test_unhashable_callables_are_still_invoked() -> None:
+    class Unhashable:
+        __hash__ = None
+
+        def __call__(self, event):
+            return event
+
+    assert callback_arity(Unhashable()) == 1
+    assert invoke_callback(Unhashable(), "event", "extra") == "event"
+
+
+def test_task_build_and_on_event_resolve_signatures_at_registration(monkeypatch) -> None:
+    app = OneStepApp("precompiled")
+
+    def before(ctx, payload):
+        return None
+
+    def on_event(event):
+        return None
+
+    @app.task(source=MemoryQueue("incoming"), hooks=TaskHooks(before=(before,)))
+    async def handler(ctx, payload):
+        return payload
+
+    app.on_event(on_event)
+
+    monkeypatch.setattr(inspect, "signature", _fail_signature)
+    assert callback_arity(before) == 2
+    assert callback_arity(on_event) == 1
+
+
+def _fail_signature(*args, **kwargs):
+    raise AssertionError("signature should have been cached")
@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from onestep import MemoryQueue, OneStepApp
+from onestep.connectors.memory import MemoryDelivery
+
+
+def test_ordering_key_serializes_per_key_and_parallelizes_across_keys() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming")
+        app = OneStepApp("ordered")
+        active: dict[str, int] = {}
+        max_active_per_key: dict[str, int] = {}
+        max_active_total = 0
+        seen: dict[str, list[int]] = {}
+
+        @app.task(source=source, concurrency=4, ordering_key="entity.id")
+        async def handle(ctx, payload):
+            nonlocal max_active_total
+            key = ctx.delivery.envelope.meta["entity"]["id"]
+            active[key] = active.get(key, 0) + 1
+            max_active_per_key[key] = max(max_active_per_key.get(key, 0), active[key])
+            max_active_total = max(max_active_total, sum(active.values()))
+            # Later messages finish faster: without lanes they would overtake.
+            await asyncio.sleep(0.02 / (payload + 1))
+            seen.setdefault(key, []).append(payload)
+            active[key] -= 1
+            if sum(len(values) for values in seen.values()) == 8:
+                ctx.app.request_shutdown()
+
+        for index in range(4):
+            for key in ("a", "b"):
+                await source.publish(index, meta={"entity": {"id": key}})
+
+        await asyncio.wait_for(app.serve(), timeout=2)
+
+        assert seen == {"a": [0, 1, 2, 3], "b": [0, 1, 2, 3]}
+        assert max_active_per_key == {"a": 1, "b": 1}
+        assert max_active_total == 2
+
+    asyncio.run(scenario())
+
+
+def test_callable_ordering_key_and_unkeyed_deliveries() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming")
+        app = OneStepApp("ordered-callable")
+        order: list[tuple[str | None, int]] = []
+        started = 0
+        max_started_unkeyed = 0
+        running_unkeyed = 0
+
+        @app.task(
+            source=source,
+            concurrency=4,
+            ordering_key=lambda envelope: envelope.body.get("customer"),
+        )
+        async def handle(ctx, payload):
+            nonlocal started, max_started_unkeyed, running_unkeyed
+            customer = payload.get("customer")
+            if customer is None:
+                running_unkeyed += 1
+                max_started_unkeyed = max(max_started_unkeyed, running_unkeyed)
+            await asyncio.sleep(0.01 if payload["seq"] == 0 else 0)
+            if customer is None:
+                running_unkeyed -= 1
+            order.append((customer, payload["seq"]))
+            started += 1
+            if started == 4:
+                ctx.app.request_shutdown()
+
+        await source.publish({"customer": "c1", "seq": 0})
+        await source.publish({"customer": "c1", "seq": 1})
+        await source.publish({"seq": 0})
+        await source.publish({"seq": 1})
+
+        await asyncio.wait_for(app.serve(), timeout=2)
+
+        keyed = [seq for customer, seq in order if customer == "c1"]
+        assert keyed == [0, 1]
+        assert max_started_unkeyed == 2
+
+    asyncio.run(scenario())
+
+
+def test_ordering_key_releases_waiting_deliveries_on_shutdown_timeout() -> None:
+    class TrackingDelivery(MemoryDelivery):
+        __slots__ = ("released",)
+
+        async def release_unstarted(self) -> None:
+            self.released.append(self.payload)
+
+    class TrackingQueue(MemoryQueue):
+        released: list
+
+        async def fetch(self, limit):
+            deliveries = []
+            for delivery in await super().fetch(limit):
+                tracked = TrackingDelivery(delivery._queue, delivery.envelope)
+                tracked.released = self.released
+                deliveries.append(tracked)
+            return deliveries
+
+    async def scenario() -> None:
+        source = TrackingQueue("incoming")
+        source.released = []
+        app = OneStepApp("ordered-shutdown", shutdown_timeout_s=0.05)
+
+        @app.task(source=source, concurrency=3, ordering_key="key")
+        async def handle(ctx, payload):
+            ctx.app.request_shutdown()
+            await asyncio.sleep(1)
+
+        for index in range(3):
+            await source.publish(index, meta={"key": "same"})
+
+        await asyncio.wait_for(app.serve(), timeout=2)
+
+        assert source.released == [1, 2]
+
+    asyncio.run(scenario())
+
+
+def test_ordering_key_validation_and_describe() -> None:
+    app = OneStepApp("ordered-validation")
+
+    with pytest.raises(ValueError, match="cannot be combined with batch"):
+        app.task(source=MemoryQueue("a"), batch=10, ordering_key="key")(lambda ctx, items: None)
+    with pytest.raises(TypeError, match="meta path string or a callable"):
+        app.task(source=MemoryQueue("b"), ordering_key=42)(lambda ctx, payload: None)
+
+    app.task(name="ordered", source=MemoryQueue("c"), ordering_key="source")(lambda ctx, payload: None)
+    assert app.describe()["tasks"][0]["ordering_key"] == "source"
@@ -0,0 +1,126 @@
+import asyncio
+import time
+
+import pytest
+
+from onestep import MemoryQueue, OneStepApp
+from onestep.connectors.base import Delivery, Source
+from onestep.envelope import Envelope
+
+
+class LeasedDelivery(Delivery):
+    __slots__ = ("queue",)
+
+    def __init__(self, queue: "LeasedQueue", envelope: Envelope) -> None:
+        super().__init__(envelope)
+        self.queue = queue
+
+    async def ack(self) -> None:
+        return None
+
+    async def retry(self, *, delay_s: float | None = None) -> None:
+        self.queue.pending.append(self.envelope)
+
+    async def fail(self, exc: Exception | None = None) -> None:
+        return None
+
+    async def release_unstarted(self) -> None:
+        self.queue.released.append(self.envelope.body)
+        self.queue.pending.append(self.envelope)
+
+
+class LeasedQueue(Source):
+    """Every fetch pays a broker round trip; leases expire after ``lease_s``."""
+
+    def __init__(self, name: str, *, round_trip_s: float, lease_s: float | None = None) -> None:
+        super().__init__(name)
+        self.batch_size = 10
+        self.poll_interval_s = 0.01
+        self.round_trip_s = round_trip_s
+        self.lease_s = lease_s
+        self.pending: list[Envelope] = []
+        self.released: list[object] = []
+
+    def lease_timeout_s(self) -> float | None:
+        return self.lease_s
+
+    async def fetch(self, limit: int) -> list[Delivery]:
+        await asyncio.sleep(self.round_trip_s)
+        taken = self.pending[: min(limit, self.batch_size)]
+        del self.pending[: len(taken)]
+        return [LeasedDelivery(self, envelope) for envelope in taken]
+
+
+@pytest.mark.parametrize(("prefetch", "fast"), [(0, False), (4, True)])
+def test_prefetch_hides_the_fetch_round_trip(prefetch: int, fast: bool) -> None:
+    async def scenario() -> float:
+        source = LeasedQueue("incoming", round_trip_s=0.04)
+        source.pending.extend(Envelope(body=index) for index in range(8))
+        app = OneStepApp("prefetch")
+        handled: list[int] = []
+
+        @app.task(source=source, prefetch=prefetch)
+        async def handle(ctx, payload):
+            await asyncio.sleep(0.02)
+            handled.append(payload)
+            if len(handled) == 8:
+                ctx.app.request_shutdown()
+
+        started = time.monotonic()
+        await asyncio.wait_for(app.serve(), timeout=5)
+        assert handled == list(range(8))
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(scenario())
+    if fast:
+        # Fetches overlap the handler: roughly 8 handler calls back to back.
+        assert elapsed < 0.35
+    else:
+        # One round trip plus one handler call per delivery.
+        assert elapsed >= 0.45
+
+
+def test_prefetch_releases_deliveries_close_to_their_lease() -> None:
+    async def scenario() -> None:
+        source = LeasedQueue("incoming", round_trip_s=0.0, lease_s=0.1)
+        source.pending.extend(Envelope(body=index) for index in range(3))
+        app = OneStepApp("prefetch-lease")
+        handled: list[int] = []
+
+        @app.task(source=source, prefetch=2)
+        async def handle(ctx, payload):
+            handled.append(payload)
+            if payload == 0:
+                # Longer than half the lease: the buffered deliveries must
+                # go back to the queue instead of being started late.
+                await asyncio.sleep(0.15)
+            if len(handled) == 3:
+                ctx.app.request_shutdown()
+
+        await asyncio.wait_for(app.serve(), timeout=5)
+        assert source.released[:2] == [1, 2]
+        assert handled == [0, 1, 2]
+
+    asyncio.run(scenario())
+
+
+def test_prefetch_hands_buffered_deliveries_back_on_shutdown() -> None:
+    async def scenario() -> None:
+        source = LeasedQueue("incoming", round_trip_s=0.0)
+        source.pending.extend(Envelope(body=index) for index in range(5))
+        app = OneStepApp("prefetch-shutdown")
+
+        @app.task(source=source, prefetch=3)
+        async def handle(ctx, payload):
+            await asyncio.sleep(0.05)
+            ctx.app.request_shutdown()
+
+        await asyncio.wait_for(app.serve(), timeout=5)
+        assert sorted(source.released) == [1, 2, 3]
+        assert sorted(envelope.body for envelope in source.pending) == [1, 2, 3, 4]
+        assert app.describe()["tasks"][0]["prefetch"] == 3
+
+    asyncio.run(scenario())
+
+    with pytest.raises(ValueError, match="prefetch"):
+        OneStepApp("invalid").task(source=MemoryQueue("q"), prefetch=-1)(lambda ctx, payload: None)
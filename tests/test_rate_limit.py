@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+import pytest
+
+from onestep import Envelope, MemoryQueue, OneStepApp, RateLimit, RateLimitedSink
+
+
+def test_token_bucket_bursts_then_paces_and_keys_get_their_own_buckets() -> None:
+    async def scenario() -> None:
+        limiter = RateLimit(100, burst=3, key="tenant", max_keys=2).new_limiter()
+        acme = Envelope(body=None, meta={"tenant": "acme"})
+        globex = Envelope(body=None, meta={"tenant": "globex"})
+
+        started = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire(acme)
+        assert time.monotonic() - started < 0.02
+        assert limiter.bucket(acme).available() == 0
+        assert limiter.bucket(globex).available() == 3
+
+        await limiter.acquire(acme)
+        assert time.monotonic() - started >= 0.009
+
+        # A third key evicts the least recently used bucket once the limit
+        # of two keys is reached; globex is still full, so it goes first.
+        limiter.bucket(Envelope(body=None, meta={"tenant": "initech"}))
+        assert limiter.bucket(acme).available() == 0
+
+    asyncio.run(scenario())
+
+    with pytest.raises(ValueError, match="rate"):
+        RateLimit(0)
+    with pytest.raises(TypeError, match="key"):
+        RateLimit(10, key=42)
+
+
+class RecordingQueue(MemoryQueue):
+    def __init__(self, name: str) -> None:
+        super().__init__(name, batch_size=100)
+        self.fetch_limits: list[int] = []
+
+    async def fetch(self, limit: int):
+        self.fetch_limits.append(limit)
+        return await super().fetch(limit)
+
+
+def test_task_rate_limit_sizes_fetches_to_the_available_tokens() -> None:
+    async def scenario() -> None:
+        source = RecordingQueue("incoming")
+        app = OneStepApp("rate-limited")
+        handled = 0
+
+        @app.task(source=source, concurrency=16, rate_limit=RateLimit(100, burst=5))
+        async def handle(ctx, payload):
+            nonlocal handled
+            handled += 1
+            if handled == 25:
+                ctx.app.request_shutdown()
+
+        for index in range(25):
+            await source.publish(index)
+        started = time.monotonic()
+        await asyncio.wait_for(app.serve(), timeout=5)
+
+        assert time.monotonic() - started >= 0.18
+        assert max(source.fetch_limits) <= 5
+        assert app.describe()["tasks"][0]["rate_limit"] == {"rate": 100.0, "burst": 5.0, "key": None}
+
+    asyncio.run(scenario())
+
+
+def test_keyed_task_rate_limit_paces_each_key_independently() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming")
+        app = OneStepApp("rate-limited-keyed")
+        seen: dict[str, list[float]] = {"acme": [], "globex": []}
+
+        @app.task(source=source, concurrency=32, rate_limit=RateLimit(50, burst=1, key="tenant"))
+        async def handle(ctx, payload):
+            seen[ctx.delivery.envelope.meta["tenant"]].append(time.monotonic())
+            if sum(len(times) for times in seen.values()) == 12:
+                ctx.app.request_shutdown()
+
+        for index in range(6):
+            for tenant in seen:
+                await source.publish(index, meta={"tenant": tenant})
+        await asyncio.wait_for(app.serve(), timeout=5)
+
+        for times in seen.values():
+            assert len(times) == 6
+            # Six calls at 50/s with a burst of one take at least 0.1 s.
+            assert times[-1] - times[0] >= 0.09
+        # The keys ran side by side rather than sharing one quota.
+        assert abs(seen["acme"][-1] - seen["globex"][-1]) < 0.05
+
+    asyncio.run(scenario())
+
+
+def test_rate_limited_sink_counts_backend_calls() -> None:
+    async def scenario() -> None:
+        inner = MemoryQueue("outgoing")
+        sink = RateLimitedSink(inner, RateLimit(50, burst=1))
+        started = time.monotonic()
+        await sink.send_many([Envelope(body=index) for index in range(10)])
+        assert time.monotonic() - started < 0.02
+        await sink.send(Envelope(body=10))
+        await sink.send(Envelope(body=11))
+        assert time.monotonic() - started >= 0.035
+        assert inner.size() == 12
+
+    asyncio.run(scenario())
@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
 from onestep import CronSource, IntervalSource
+from onestep.connectors.schedule import CronSchedule
 
 
 class FakeClock:
@@ -179,3 +180,62 @@ def test_cron_source_hourly_alias() -> None:
         await second[0].ack()
 
     asyncio.run(scenario())
+
+
+def test_cron_schedule_skips_to_sparse_fire_times() -> None:
+    schedule = CronSchedule("0 0 29 2 *", timezone="UTC")
+    utc = ZoneInfo("UTC")
+
+    assert schedule.next_after(datetime(2026, 3, 1, tzinfo=utc)) == datetime(2028, 2, 29, tzinfo=utc)
+    assert schedule.next_after(datetime(2096, 3, 1, tzinfo=utc)) == datetime(2104, 2, 29, tzinfo=utc)
+
+    weekdays = CronSchedule("30 9 13 * fri", timezone="UTC")
+    # Day-of-month and day-of-week restricted together match either one.
+    assert weekdays.next_after(datetime(2026, 3, 7, tzinfo=utc)) == datetime(2026, 3, 13, 9, 30, tzinfo=utc)
+    assert weekdays.next_after(datetime(2026, 3, 13, 9, 30, tzinfo=utc)) == datetime(2026, 3, 20, 9, 30, tzinfo=utc)
+
+
+def test_cron_schedule_cached_fire_times_match_a_fresh_schedule() -> None:
+    tz = ZoneInfo("Asia/Shanghai")
+    cached = CronSchedule("*/13 */2 * * *", timezone="Asia/Shanghai")
+    current = datetime(2026, 3, 1, tzinfo=tz)
+    for _ in range(100):
+        expected = CronSchedule("*/13 */2 * * *", timezone="Asia/Shanghai").next_after(current)
+        current = cached.next_after(current)
+        assert current == expected
+        assert current.minute % 13 == 0 and current.hour % 2 == 0
+
+    # Looking up an earlier time after the cache moved on still works.
+    assert cached.next_after(datetime(2026, 3, 1, tzinfo=tz)) == datetime(2026, 3, 1, 0, 13, tzinfo=tz)
+
+
+def test_cron_schedule_handles_dst_transitions() -> None:
+    tz = ZoneInfo("America/New_York")
+    half_hourly = CronSchedule("*/30 * * * *", timezone="America/New_York")
+
+    fires = [datetime(2026, 3, 8, 1, 0, tzinfo=tz)]
+    for _ in range(3):
+        fires.append(half_hourly.next_after(fires[-1]))
+    # 02:00 and 02:30 do not exist; each moves forward by the one-hour gap.
+    assert [fire.isoformat() for fire in fires[1:]] == [
+        "2026-03-08T01:30:00-05:00",
+        "2026-03-08T03:00:00-04:00",
+        "2026-03-08T03:30:00-04:00",
+    ]
+
+    skipped = CronSchedule("30 2 * * *", timezone="America/New_York")
+    assert skipped.next_after(datetime(2026, 3, 7, 12, tzinfo=tz)).isoformat() == "2026-03-08T03:30:00-04:00"
+
+    # A half-hour gap (02:00 -> 02:30) moves 02:15 to 02:45, not to the
+    # 02:30 boundary; the next day fires at 02:15 again.
+    lord_howe = ZoneInfo("Australia/Lord_Howe")
+    short_gap = CronSchedule("15 2 * * *", timezone="Australia/Lord_Howe")
+    in_gap = short_gap.next_after(datetime(2026, 10, 3, 12, tzinfo=lord_howe))
+    assert in_gap.isoformat() == "2026-10-04T02:45:00+11:00"
+    assert short_gap.next_after(in_gap).isoformat() == "2026-10-05T02:15:00+11:00"
+
+    # The repeated 01:30 fires once, at its first occurrence.
+    repeated = CronSchedule("30 1 * * *", timezone="America/New_York")
+    first = repeated.next_after(datetime(2026, 11, 1, 0, 0, tzinfo=tz))
+    assert first.isoformat() == "2026-11-01T01:30:00-04:00"
+    assert repeated.next_after(first).isoformat() == "2026-11-02T01:30:00-05:00"
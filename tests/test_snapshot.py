@@ -0,0 +1,125 @@
+import asyncio
+import copy
+import json
+from dataclasses import asdict, fields, replace
+
+import pytest
+
+from onestep import Envelope, FrozenDict, FrozenList, MemoryQueue, OneStepApp, TaskEvent, TaskEventKind
+from onestep.snapshot import ThawingDict, freeze, thaw
+
+
+def test_freeze_shares_unchanged_subtrees_with_the_previous_snapshot() -> None:
+    meta = {"trace_id": "t-1", "headers": {"x": "1"}, "tags": ["a", "b"]}
+
+    first = freeze(meta)
+    assert freeze(meta, first) is first
+
+    meta["headers"]["x"] = "2"
+    second = freeze(meta, first)
+
+    assert second is not first
+    assert second["tags"] is first["tags"]
+    assert second["headers"] == {"x": "2"}
+    assert first["headers"] == {"x": "1"}
+    assert json.loads(json.dumps(second)) == {"trace_id": "t-1", "headers": {"x": "2"}, "tags": ["a", "b"]}
+    assert copy.deepcopy(second) is second
+    with pytest.raises(TypeError):
+        second["trace_id"] = "t-2"
+    with pytest.raises(TypeError):
+        second["tags"].append("c")
+
+    thawed = thaw(second)
+    thawed["tags"].append("c")
+    assert type(thawed) is dict and type(thawed["tags"]) is list
+    assert second["tags"] == ["a", "b"]
+
+
+def test_thawing_dict_iteration_thaws_values_lazily() -> None:
+    snapshot = freeze({"trace_id": "t-1", "headers": {"x": "1"}, "tags": ["a"]})
+    meta = ThawingDict(snapshot)
+
+    for key, value in meta.items():
+        if key == "headers":
+            value["seen"] = "1"
+            break
+    assert meta["headers"] == {"x": "1", "seen": "1"}
+    assert isinstance(dict.__getitem__(meta, "tags"), FrozenList)
+
+    values = list(meta.values())
+    values[2].append("b")
+    assert meta["tags"] == ["a", "b"]
+    assert len(meta.items()) == 3 and ("trace_id", "t-1") in meta.items()
+    assert snapshot == {"trace_id": "t-1", "headers": {"x": "1"}, "tags": ["a"]}
+    assert json.loads(json.dumps(meta)) == {"trace_id": "t-1", "headers": {"x": "1", "seen": "1"}, "tags": ["a", "b"]}
+
+
+def test_events_of_one_delivery_share_a_meta_snapshot() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming")
+        app = OneStepApp("snapshot")
+        events: list[TaskEvent] = []
+        app.on_event(events.append)
+
+        @app.task(source=source)
+        async def handle(ctx, payload):
+            ctx.delivery.envelope.meta["seen"] = True
+            ctx.app.request_shutdown()
+
+        await source.send(Envelope(body=1, meta={"headers": {"x": "1"}}))
+        await asyncio.wait_for(app.serve(), timeout=2)
+
+        by_kind = {event.kind: event.meta for event in events}
+        fetched = by_kind[TaskEventKind.FETCHED]
+        started = by_kind[TaskEventKind.STARTED]
+        succeeded = by_kind[TaskEventKind.SUCCEEDED]
+        assert isinstance(fetched, ThawingDict)
+        # Nested values stay shared with the envelope's snapshot until read.
+        assert dict.__getitem__(started, "headers") is dict.__getitem__(fetched, "headers")
+        assert isinstance(dict.__getitem__(fetched, "headers"), FrozenDict)
+        # The handler's write shows up in later events without copying headers again.
+        assert succeeded == {"headers": {"x": "1"}, "seen": True}
+        assert dict.__getitem__(succeeded, "headers") is dict.__getitem__(fetched, "headers")
+        assert "seen" not in fetched
+
+    asyncio.run(scenario())
+
+
+def test_event_handlers_can_mutate_event_meta() -> None:
+    async def scenario() -> None:
+        source = MemoryQueue("incoming")
+        app = OneStepApp("snapshot-mutate")
+        events: list[TaskEvent] = []
+
+        def enrich(event: TaskEvent) -> None:
+            event.meta["kind"] = event.kind.value
+            event.meta["headers"]["seen"] = "1"
+            event.meta.setdefault("tags", []).append(event.kind.value)
+            events.append(event)
+
+        app.on_event(enrich)
+
+        @app.task(source=source)
+        async def handle(ctx, payload):
+            ctx.app.request_shutdown()
+
+        await source.send(Envelope(body=1, meta={"headers": {"x": "1"}, "tags": ["a"]}))
+        await asyncio.wait_for(app.serve(), timeout=2)
+
+        for event in events:
+            assert event.meta["kind"] == event.kind.value
+            assert event.meta["headers"] == {"x": "1", "seen": "1"}
+            assert event.meta["tags"] == ["a", event.kind.value]
+        assert len(events) >= 3
+
+    asyncio.run(scenario())
+
+
+def test_envelope_meta_snapshot_is_not_a_dataclass_field() -> None:
+    envelope = Envelope(body=1, meta={"trace_id": "t-1"})
+    envelope.snapshot_meta()
+
+    assert [item.name for item in fields(envelope)] == ["body", "meta", "attempts"]
+    assert asdict(envelope) == {"body": 1, "meta": {"trace_id": "t-1"}, "attempts": 0}
+    copied = replace(envelope, attempts=1)
+    assert copied.snapshot_meta() == {"trace_id": "t-1"}
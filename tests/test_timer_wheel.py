@@ -0,0 +1,78 @@
+import asyncio
+from datetime import timedelta
+
+from onestep import IntervalSource, OneStepApp
+from onestep.runtime.wheel import TimerWheel, timer_wheel
+
+
+class CountingIntervalSource(IntervalSource):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.fetch_calls = 0
+
+    async def fetch(self, limit: int):
+        self.fetch_calls += 1
+        return await super().fetch(limit)
+
+
+def test_timer_wheel_wakes_waiters_in_deadline_order() -> None:
+    async def scenario() -> None:
+        wheel = TimerWheel(asyncio.get_running_loop())
+        woken: list[str] = []
+        late = wheel.sleep(0.05)
+        early = wheel.sleep(0.01)
+        cancelled = wheel.sleep(0.02)
+        late.add_done_callback(lambda _: woken.append("late"))
+        early.add_done_callback(lambda _: woken.append("early"))
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        assert wheel.pending_count == 2
+
+        await asyncio.wait({late, early})
+
+        assert woken == ["early", "late"]
+        assert wheel.pending_count == 0
+        assert timer_wheel() is timer_wheel()
+
+    asyncio.run(scenario())
+
+
+def test_idle_interval_runner_sleeps_until_the_next_tick() -> None:
+    async def scenario() -> None:
+        source = CountingIntervalSource(timedelta(seconds=0.3), immediate=True, poll_interval_s=0.01)
+        app = OneStepApp("interval-wheel")
+        runs: list[str] = []
+
+        @app.task(source=source)
+        async def tick(ctx, payload):
+            runs.append(ctx.delivery.envelope.meta["scheduled_at"])
+            if len(runs) == 2:
+                ctx.app.request_shutdown()
+
+        await asyncio.wait_for(app.serve(), timeout=2)
+
+        assert len(runs) == 2
+        # Polling every 10 ms would fetch about 30 times in 300 ms.
+        assert source.fetch_calls < 10
+
+    asyncio.run(scenario())
+
+
+def test_parked_runner_wakes_on_shutdown() -> None:
+    async def scenario() -> None:
+        source = IntervalSource.every(hours=1)
+        app = OneStepApp("interval-shutdown")
+
+        @app.task(source=source)
+        async def tick(ctx, payload):
+            return None
+
+        async def stop_soon() -> None:
+            await asyncio.sleep(0.05)
+            app.request_shutdown()
+
+        stopper = asyncio.create_task(stop_soon())
+        await asyncio.wait_for(app.serve(), timeout=1)
+        await stopper
+
+    asyncio.run(scenario())
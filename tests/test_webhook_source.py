@@ -1,7 +1,8 @@
 import asyncio
+import json
 import socket
 
-from onestep import BearerAuth, MemoryQueue, OneStepApp, WebhookSource
+from onestep import BearerAuth, MaxAttempts, MemoryQueue, OneStepApp, WebhookSource
 
 
 def _reserve_port() -> int:
@@ -14,7 +15,8 @@ def _reserve_port() -> int:
 
 async def _http_request(host: str, port: int, request: bytes) -> bytes:
     reader, writer = await asyncio.open_connection(host, port)
-    writer.write(request)
+    # One request per connection: ask the server to close after responding.
+    writer.write(request.replace(b"\r\n", b"\r\nConnection: close\r\n", 1))
     await writer.drain()
     response = await reader.read()
     writer.close()
@@ -227,3 +229,192 @@ def test_webhook_source_rejects_missing_or_invalid_bearer_token() -> None:
         await source.close()
 
     asyncio.run(scenario())
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[bytes, dict[str, str], bytes]:
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("iso-8859-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get("content-length", "0")))
+    return lines[0].encode("iso-8859-1"), headers, body
+
+
+def _post(path: str, body: bytes, *extra_headers: bytes) -> bytes:
+    return (
+        f"POST {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Length: {len(body)}\r\n".encode("ascii")
+        + b"".join(header + b"\r\n" for header in extra_headers)
+        + b"\r\n"
+        + body
+    )
+
+
+def test_webhook_source_serves_pipelined_requests_on_one_connection() -> None:
+    async def scenario() -> None:
+        source = WebhookSource(path="/hooks/events", host="127.0.0.1", port=0, parser="json")
+        await source.open()
+        reader, writer = await asyncio.open_connection("127.0.0.1", source.bound_port)
+        try:
+            writer.write(_post("/hooks/events", b'{"n":1}') + _post("/hooks/events", b'{"n":2}'))
+            writer.write(
+                b"POST /hooks/events HTTP/1.1\r\nHost: 127.0.0.1\r\nTransfer-Encoding: chunked\r\n\r\n"
+                b"3\r\n{\"n\r\n4\r\n\":3}\r\n0\r\n\r\n"
+            )
+            await writer.drain()
+            responses = [await _read_response(reader) for _ in range(3)]
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+        assert [status for status, _, _ in responses] == [b"HTTP/1.1 202 Accepted"] * 3
+        assert all(headers["connection"] == "keep-alive" for _, headers, _ in responses)
+        deliveries = await source.fetch(10)
+        assert [delivery.payload["body"] for delivery in deliveries] == [{"n": 1}, {"n": 2}, {"n": 3}]
+
+        await source.close()
+
+    asyncio.run(scenario())
+
+
+def test_webhook_source_closes_idle_and_exhausted_connections() -> None:
+    async def scenario() -> None:
+        source = WebhookSource(
+            path="/hooks/events",
+            host="127.0.0.1",
+            port=0,
+            keepalive_timeout_s=0.05,
+            max_keepalive_requests=2,
+        )
+        await source.open()
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", source.bound_port)
+        writer.write(_post("/hooks/events", b"one"))
+        _, headers, _ = await _read_response(reader)
+        assert headers["connection"] == "keep-alive"
+        assert await asyncio.wait_for(reader.read(), timeout=1.0) == b""
+        writer.close()
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", source.bound_port)
+        writer.write(_post("/hooks/events", b"one") + _post("/hooks/events", b"two"))
+        first = await _read_response(reader)
+        second = await _read_response(reader)
+        assert first[1]["connection"] == "keep-alive"
+        assert second[1]["connection"] == "close"
+        assert await asyncio.wait_for(reader.read(), timeout=1.0) == b""
+        writer.close()
+
+        assert len(await source.fetch(10)) == 3
+        await source.close()
+
+    asyncio.run(scenario())
+
+
+def test_webhook_source_ndjson_batch_is_enqueued_whole_or_rejected() -> None:
+    async def scenario() -> None:
+        source = WebhookSource(path="/hooks/bulk", host="127.0.0.1", port=0, parser="ndjson", queue_maxsize=3)
+        await source.open()
+        port = source.bound_port
+
+        accepted = await _http_request("127.0.0.1", port, _post("/hooks/bulk", b'{"id":1}\n\n{"id":2}\n'))
+        too_many = await _http_request("127.0.0.1", port, _post("/hooks/bulk", b'{"id":3}\n{"id":4}\n'))
+        invalid = await _http_request("127.0.0.1", port, _post("/hooks/bulk", b'{"id":5}\nnope\n'))
+
+        assert accepted.startswith(b"HTTP/1.1 202 Accepted")
+        assert too_many.startswith(b"HTTP/1.1 503 Service Unavailable")
+        assert invalid.startswith(b"HTTP/1.1 400 Bad Request")
+        assert b'"line": 2' in invalid
+        deliveries = await source.fetch(10)
+        assert [delivery.payload["body"] for delivery in deliveries] == [{"id": 1}, {"id": 2}]
+        assert [delivery.envelope.meta["batch_index"] for delivery in deliveries] == [0, 1]
+
+        await source.close()
+
+    asyncio.run(scenario())
+
+
+def test_webhook_source_sync_mode_replies_with_the_handler_result() -> None:
+    async def scenario() -> None:
+        source = WebhookSource(path="/rpc/quote", host="127.0.0.1", port=0, mode="sync", parser="json")
+        app = OneStepApp("webhook-sync")
+
+        seen_meta: list[dict] = []
+
+        @app.task(source=source)
+        async def quote(ctx, event):
+            seen_meta.append(dict(ctx.delivery.envelope.meta))
+            if event["body"]["sku"] == "broken":
+                raise ValueError("no price")
+            return {"sku": event["body"]["sku"], "price": 42}
+
+        serving = asyncio.create_task(app.serve())
+        while source.bound_port == 0:
+            await asyncio.sleep(0.001)
+        reader, writer = await asyncio.open_connection("127.0.0.1", source.bound_port)
+        try:
+            writer.write(_post("/rpc/quote", b'{"sku":"a-1"}'))
+            ok_status, ok_headers, ok_body = await asyncio.wait_for(_read_response(reader), timeout=1.0)
+            writer.write(_post("/rpc/quote", b'{"sku":"broken"}'))
+            failed_status, _, failed_body = await asyncio.wait_for(_read_response(reader), timeout=1.0)
+        finally:
+            writer.close()
+            app.request_shutdown()
+            await asyncio.wait_for(serving, timeout=1.0)
+
+        assert ok_status == b"HTTP/1.1 200 OK"
+        assert ok_headers["content-type"] == "application/json"
+        assert json.loads(ok_body) == {"sku": "a-1", "price": 42}
+        assert failed_status == b"HTTP/1.1 500 Internal Server Error"
+        assert json.loads(failed_body) == {"error": "handler_failed", "type": "ValueError"}
+        # The reply correlation stays on the delivery, out of user-visible meta.
+        assert len(seen_meta) == 2
+        assert all("webhook_reply_id" not in meta for meta in seen_meta)
+
+    asyncio.run(scenario())
+
+
+def test_webhook_source_sync_mode_reply_survives_a_retry() -> None:
+    async def scenario() -> None:
+        source = WebhookSource(path="/rpc/flaky", host="127.0.0.1", port=0, mode="sync", parser="json")
+        app = OneStepApp("webhook-sync-retry")
+        attempts: list[int] = []
+
+        @app.task(source=source, retry=MaxAttempts(2))
+        async def flaky(ctx, event):
+            attempts.append(ctx.delivery.envelope.attempts)
+            if len(attempts) == 1:
+                raise RuntimeError("transient")
+            return {"ok": True}
+
+        serving = asyncio.create_task(app.serve())
+        while source.bound_port == 0:
+            await asyncio.sleep(0.001)
+        try:
+            response = await _http_request("127.0.0.1", source.bound_port, _post("/rpc/flaky", b"{}"))
+        finally:
+            app.request_shutdown()
+            await asyncio.wait_for(serving, timeout=1.0)
+
+        assert attempts == [0, 1]
+        assert response.startswith(b"HTTP/1.1 200 OK")
+        assert response.endswith(b'{"ok":true}') or response.endswith(b'{"ok": true}')
+
+    asyncio.run(scenario())
+
+
+def test_webhook_source_sync_mode_times_out_without_a_reply() -> None:
+    async def scenario() -> None:
+        source = WebhookSource(path="/rpc/slow", host="127.0.0.1", port=0, mode="sync", reply_timeout_s=0.05)
+        await source.open()
+
+        response = await _http_request("127.0.0.1", source.bound_port, _post("/rpc/slow", b"{}"))
+
+        assert response.startswith(b"HTTP/1.1 504 Gateway Timeout")
+        [delivery] = await source.fetch(1)
+        await delivery.ack()
+        assert not source._replies
+        await source.close()
+
+    asyncio.run(scenario())